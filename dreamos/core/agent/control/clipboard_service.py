@@ -0,0 +1,542 @@
+"""
+Clipboard Service
+-----------------
+Captures agent responses through the clipboard with change sequencing.
+
+Reading the clipboard right after clicking an agent's copy button cannot
+tell a fresh copy from whatever was on the clipboard before, so stale
+contents get re-read and saved twice. The service instead:
+
+- Keeps one persistent clipboard handle per process (a native binding
+  rather than a subprocess per read).
+- Tracks a clipboard sequence number. Windows provides one natively, X11
+  derives one from selection ownership changes, and other backends fall
+  back to content hashes.
+- Serialises copy operations. The first change after an agent's copy
+  click is attributed to that agent; text the service pasted itself is
+  never mistaken for a copy.
+- Remembers content hashes per agent so callers can drop duplicates
+  before saving.
+
+Backends implement ``read``, ``write``, ``sequence`` (``None`` when there
+is no native counter) and ``owner``. ``FakeClipboardBackend`` simulates a
+clipboard for tests and benchmarks.
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2)
+
+
+class ClipboardError(Exception):
+    """The clipboard could not be read or written."""
+
+
+def content_digest(text: str) -> str:
+    """Short content hash used for dedupe."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+@dataclass
+class ClipboardCapture:
+    """Clipboard text captured for an agent's copy operation."""
+    agent_id: str
+    text: str
+    sequence: int
+    digest: str
+    latency: float  # copy click to text in hand, in seconds
+    owner: Any = None  # clipboard owner reported by the backend (e.g. a window handle)
+    duplicate: bool = False  # the agent already produced this text recently
+
+
+class Win32ClipboardBackend:
+    """Native Windows clipboard with its system-wide sequence number."""
+
+    def __init__(self, open_attempts: int = 5, open_retry_delay: float = 0.01):
+        import win32clipboard
+        import win32con
+        self._clipboard = win32clipboard
+        self._format = win32con.CF_UNICODETEXT
+        self.open_attempts = open_attempts
+        self.open_retry_delay = open_retry_delay
+
+    def _open(self) -> None:
+        # Another process may hold the clipboard for a moment after copying
+        for attempt in range(self.open_attempts):
+            try:
+                self._clipboard.OpenClipboard()
+                return
+            except Exception as e:
+                if attempt == self.open_attempts - 1:
+                    raise ClipboardError(f"Clipboard is locked: {e}") from e
+                time.sleep(self.open_retry_delay)
+
+    def read(self) -> Optional[str]:
+        self._open()
+        try:
+            if not self._clipboard.IsClipboardFormatAvailable(self._format):
+                return None
+            return self._clipboard.GetClipboardData(self._format)
+        finally:
+            self._clipboard.CloseClipboard()
+
+    def write(self, text: str) -> None:
+        self._open()
+        try:
+            self._clipboard.EmptyClipboard()
+            self._clipboard.SetClipboardData(self._format, text)
+        finally:
+            self._clipboard.CloseClipboard()
+
+    def sequence(self) -> Optional[int]:
+        return self._clipboard.GetClipboardSequenceNumber()
+
+    def owner(self) -> Any:
+        return self._clipboard.GetClipboardOwner()
+
+
+class XlibClipboardBackend:
+    """X11 CLIPBOARD selection over one persistent python-xlib connection.
+
+    Ownership changes drive the sequence number: with the XFIXES extension
+    they arrive as events, otherwise the selection's TIMESTAMP target is
+    polled, which changes on every copy without transferring the text.
+    Writing needs a process that serves the selection, so it goes through
+    pyperclip.
+    """
+
+    def __init__(self, display_name: Optional[str] = None, reply_timeout: float = 0.5):
+        from Xlib import X, display
+        self._X = X
+        self._display = display.Display(display_name)
+        self._window = self._display.screen().root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+        self._clipboard = self._display.intern_atom("CLIPBOARD")
+        self._utf8 = self._display.intern_atom("UTF8_STRING")
+        self._timestamp = self._display.intern_atom("TIMESTAMP")
+        self._incr = self._display.intern_atom("INCR")
+        self._property = self._display.intern_atom("DREAMOS_CLIPBOARD")
+        self.reply_timeout = reply_timeout
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._last_stamp = None
+        self._owner_event = self._watch_owner()
+        try:
+            import pyperclip
+            self._pyperclip = pyperclip
+        except ImportError:
+            logger.debug("pyperclip not installed, clipboard writes unavailable")
+            self._pyperclip = None
+
+    def _watch_owner(self):
+        """Subscribe to selection owner changes; None when XFIXES is missing."""
+        try:
+            from Xlib.ext import xfixes
+            if not self._display.has_extension("XFIXES"):
+                return None
+            self._display.xfixes_query_version()
+            self._display.xfixes_select_selection_input(
+                self._window, self._clipboard, xfixes.XFixesSetSelectionOwnerNotifyMask
+            )
+            return self._display.extension_event.SetSelectionOwnerNotify
+        except Exception as e:
+            logger.debug(f"XFIXES selection events unavailable, polling TIMESTAMP: {e}")
+            return None
+
+    def _is_owner_event(self, event) -> bool:
+        return self._owner_event is not None and (
+            (event.type, getattr(event, "sub_code", None)) == self._owner_event
+            or event.type == self._owner_event
+        )
+
+    def _drain(self) -> None:
+        """Count queued ownership events."""
+        while self._display.pending_events():
+            if self._is_owner_event(self._display.next_event()):
+                self._sequence += 1
+
+    def _convert(self, target) -> Optional[Any]:
+        """Request the selection as ``target`` and wait for the owner's reply."""
+        self._window.convert_selection(self._clipboard, target, self._property, self._X.CurrentTime)
+        self._display.flush()
+        deadline = time.monotonic() + self.reply_timeout
+        while time.monotonic() < deadline:
+            while self._display.pending_events():
+                event = self._display.next_event()
+                if self._is_owner_event(event):
+                    self._sequence += 1
+                elif event.type == self._X.SelectionNotify:
+                    if event.property == self._X.NONE:
+                        return None
+                    prop = self._window.get_full_property(self._property, self._X.AnyPropertyType)
+                    self._window.delete_property(self._property)
+                    if prop is None or prop.property_type == self._incr:
+                        return None  # incremental transfers are left to pyperclip
+                    return prop.value
+            time.sleep(0.001)
+        return None
+
+    def read(self) -> Optional[str]:
+        with self._lock:
+            if self._display.get_selection_owner(self._clipboard) == self._X.NONE:
+                return None
+            value = self._convert(self._utf8)
+        if value is None:
+            if self._pyperclip is not None:
+                return self._pyperclip.paste()
+            return None
+        return value.decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+
+    def write(self, text: str) -> None:
+        if self._pyperclip is None:
+            raise ClipboardError("pyperclip is required to write the X11 clipboard")
+        self._pyperclip.copy(text)
+
+    def sequence(self) -> Optional[int]:
+        with self._lock:
+            if self._owner_event is not None:
+                self._drain()
+                return self._sequence
+            owner = self._display.get_selection_owner(self._clipboard)
+            stamp = (owner, None)
+            if owner != self._X.NONE:
+                value = self._convert(self._timestamp)
+                stamp = (owner, tuple(value) if value is not None else None)
+            if stamp != self._last_stamp:
+                self._last_stamp = stamp
+                self._sequence += 1
+            return self._sequence
+
+    def owner(self) -> Any:
+        with self._lock:
+            return self._display.get_selection_owner(self._clipboard)
+
+
+class PyperclipBackend:
+    """Portable fallback through pyperclip; no sequence number of its own."""
+
+    def __init__(self):
+        import pyperclip
+        self._pyperclip = pyperclip
+
+    def read(self) -> Optional[str]:
+        try:
+            return self._pyperclip.paste()
+        except self._pyperclip.PyperclipException as e:
+            raise ClipboardError(str(e)) from e
+
+    def write(self, text: str) -> None:
+        try:
+            self._pyperclip.copy(text)
+        except self._pyperclip.PyperclipException as e:
+            raise ClipboardError(str(e)) from e
+
+    def sequence(self) -> Optional[int]:
+        return None
+
+    def owner(self) -> Any:
+        return None
+
+
+class FakeClipboardBackend:
+    """In-memory clipboard for tests and benchmarks.
+
+    ``copy_later`` simulates an application filling the clipboard some
+    time after its copy button was clicked. ``read_latency`` is the cost of
+    one read (a subprocess round trip for pyperclip's command-line
+    backends). With ``native_sequence=False`` the backend reports no
+    sequence number, like ``PyperclipBackend``.
+    """
+
+    def __init__(self, text: str = "", read_latency: float = 0.0,
+                 native_sequence: bool = True):
+        self.read_latency = read_latency
+        self.native_sequence = native_sequence
+        self.reads = 0
+        self._text = text
+        self._owner = None
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def set_text(self, text: str, owner: Any = None) -> None:
+        """Another application copies ``text``."""
+        with self._lock:
+            self._text = text
+            self._owner = owner
+            self._sequence += 1
+
+    def copy_later(self, text: str, delay: float, owner: Any = None) -> threading.Timer:
+        timer = threading.Timer(delay, self.set_text, args=(text, owner))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def read(self) -> Optional[str]:
+        if self.read_latency:
+            time.sleep(self.read_latency)
+        with self._lock:
+            self.reads += 1
+            return self._text
+
+    def write(self, text: str) -> None:
+        self.set_text(text, owner="self")
+
+    def sequence(self) -> Optional[int]:
+        with self._lock:
+            return self._sequence if self.native_sequence else None
+
+    def owner(self) -> Any:
+        with self._lock:
+            return self._owner
+
+
+def default_clipboard_backend():
+    """Best available clipboard backend for this platform, or None."""
+    candidates = []
+    if sys.platform == "win32":
+        candidates.append(Win32ClipboardBackend)
+    elif os.environ.get("DISPLAY"):
+        candidates.append(XlibClipboardBackend)
+    candidates.append(PyperclipBackend)
+    for backend in candidates:
+        try:
+            return backend()
+        except Exception as e:
+            logger.debug(f"{backend.__name__} unavailable: {e}")
+    logger.warning("No clipboard backend available")
+    return None
+
+
+class ClipboardService:
+    """Sequenced clipboard access shared by copy capture and paste."""
+
+    def __init__(self, backend=None, poll_interval: float = 0.005,
+                 copy_timeout: float = 1.0, history: int = 64):
+        """Initialize the clipboard service.
+
+        Args:
+            backend: Clipboard backend (defaults to the best available one)
+            poll_interval: Delay between sequence checks while waiting for a copy
+            copy_timeout: Default time to wait for a copy to reach the clipboard
+            history: Number of content hashes remembered per agent for dedupe
+        """
+        self.backend = backend if backend is not None else default_clipboard_backend()
+        self.poll_interval = poll_interval
+        self.copy_timeout = copy_timeout
+        self.history = history
+        self._copy_lock = threading.Lock()  # one copy in flight, so changes attribute unambiguously
+        self._state_lock = threading.Lock()
+        self._hash_sequence = 0
+        self._last_digest: Optional[str] = None
+        self._last_text: Optional[str] = None
+        self._emulated = False  # sequence() reads the contents itself
+        self._own_writes: Deque[str] = deque(maxlen=16)
+        self._seen: Dict[str, "OrderedDict[str, None]"] = {}
+        self._attribution: "OrderedDict[int, str]" = OrderedDict()
+        self.capture_latency = LatencyHistogram(CAPTURE_LATENCY_BUCKETS)
+        self.stats = {
+            "captures": 0,
+            "timeouts": 0,
+            "trigger_failures": 0,
+            "ignored_own_writes": 0,
+            "duplicates": 0,
+            "writes": 0,
+            "errors": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def read(self) -> Optional[str]:
+        """Current clipboard text, or None if it cannot be read."""
+        if self.backend is None:
+            return None
+        try:
+            text = self.backend.read()
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error reading clipboard: {e}")
+            return None
+        self._last_text = text
+        return text
+
+    def write(self, text: str) -> bool:
+        """Put text on the clipboard for pasting.
+
+        Args:
+            text: Text to write
+
+        Returns:
+            bool: True if the clipboard now holds the text
+        """
+        if self.backend is None:
+            return False
+        with self._state_lock:
+            self._own_writes.append(content_digest(text))
+        try:
+            self.backend.write(text)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.debug(f"Clipboard write failed: {e}")
+            return False
+        self.stats["writes"] += 1
+        return True
+
+    def sequence(self) -> int:
+        """Clipboard change counter; bumps whenever the contents change."""
+        native = self.backend.sequence() if self.backend is not None else None
+        self._emulated = native is None
+        if native is not None:
+            return native
+        # No native counter: every check is a read, and only content changes count
+        text = self.read()
+        digest = content_digest(text) if text is not None else None
+        with self._state_lock:
+            if digest != self._last_digest:
+                self._last_digest = digest
+                self._hash_sequence += 1
+            return self._hash_sequence
+
+    def capture(self, agent_id: str, trigger: Callable[[], bool],
+                timeout: Optional[float] = None) -> Optional[ClipboardCapture]:
+        """Run a copy operation and return the text it put on the clipboard.
+
+        Contents already on the clipboard before ``trigger`` never count,
+        so a copy that silently fails yields None rather than stale text.
+
+        Args:
+            agent_id: Agent the copy belongs to
+            trigger: Performs the copy (e.g. clicks the copy button); returns False on failure
+            timeout: Time to wait for the clipboard to change (defaults to copy_timeout)
+
+        Returns:
+            The captured text, or None if nothing was copied in time
+        """
+        if self.backend is None:
+            return None
+        timeout = self.copy_timeout if timeout is None else timeout
+        with self._copy_lock:
+            before = self.sequence()
+            started = time.monotonic()
+            if not trigger():
+                self.stats["trigger_failures"] += 1
+                return None
+            deadline = started + timeout
+            while True:
+                sequence = self.sequence()
+                if sequence != before:
+                    text = self._last_text if self._emulated else self.read()
+                    if text and not self._is_own_write(text):
+                        break
+                    if text:
+                        self.stats["ignored_own_writes"] += 1
+                    before = sequence  # a paste of ours or an emptied clipboard
+                if time.monotonic() >= deadline:
+                    self.stats["timeouts"] += 1
+                    logger.debug(f"No clipboard change within {timeout}s of copying for {agent_id}")
+                    return None
+                time.sleep(self.poll_interval)
+            latency = time.monotonic() - started
+
+        digest = content_digest(text)
+        capture = ClipboardCapture(
+            agent_id=agent_id,
+            text=text,
+            sequence=sequence,
+            digest=digest,
+            latency=latency,
+            owner=self._owner(),
+            duplicate=self.seen(agent_id, text)
+        )
+        with self._state_lock:
+            self._attribution[sequence] = agent_id
+            while len(self._attribution) > self.history:
+                self._attribution.popitem(last=False)
+        self.capture_latency.observe(latency)
+        self.stats["captures"] += 1
+        return capture
+
+    def _is_own_write(self, text: str) -> bool:
+        digest = content_digest(text)
+        with self._state_lock:
+            return digest in self._own_writes
+
+    def _owner(self) -> Any:
+        try:
+            return self.backend.owner()
+        except Exception as e:
+            logger.debug(f"Clipboard owner unavailable: {e}")
+            return None
+
+    def attributed_to(self, sequence: int) -> Optional[str]:
+        """Agent whose copy produced the given clipboard sequence number."""
+        with self._state_lock:
+            return self._attribution.get(sequence)
+
+    def seen(self, agent_id: str, text: str) -> bool:
+        """Whether the agent recently produced this exact text (without recording it)."""
+        digest = content_digest(text)
+        with self._state_lock:
+            return digest in self._seen.get(agent_id, ())
+
+    def is_new(self, agent_id: str, text: str) -> bool:
+        """Record text for an agent and report whether it is new.
+
+        Args:
+            agent_id: Agent the text belongs to
+            text: Response text
+
+        Returns:
+            bool: False if the agent produced the same text recently
+        """
+        digest = content_digest(text)
+        with self._state_lock:
+            seen = self._seen.setdefault(agent_id, OrderedDict())
+            if digest in seen:
+                seen.move_to_end(digest)
+                self.stats["duplicates"] += 1
+                return False
+            seen[digest] = None
+            while len(seen) > self.history:
+                seen.popitem(last=False)
+            return True
+
+    def get_stats(self) -> Dict:
+        """Capture counters and latency histogram."""
+        return {
+            **self.stats,
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "capture_latency": self.capture_latency.snapshot(),
+        }
+
+
+_shared_service: Optional[ClipboardService] = None
+_shared_lock = threading.Lock()
+
+
+def get_clipboard_service() -> ClipboardService:
+    """Process-wide clipboard service, so pastes and copies see each other."""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = ClipboardService()
+        return _shared_service
+
+
+def set_clipboard_service(service: Optional[ClipboardService]) -> None:
+    """Replace the shared service (e.g. with a fake backend)."""
+    global _shared_service
+    with _shared_lock:
+        _shared_service = service
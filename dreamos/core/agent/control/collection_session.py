@@ -0,0 +1,355 @@
+"""
+Collection Session Module
+
+Collects responses from every watched agent region at once instead of
+polling one agent at a time.
+
+Each agent moves through a small state machine driven by frame-change
+events from the shared frame grabber:
+
+    idle --(tiles change)--> generating --(no change for dwell)--> stable
+    stable --(response copied, outbox written)--> copied
+    stable --(tiles change again)--> generating
+
+A region is compared against a snapshot taken before the prompt was sent
+when the caller passes one, so a response that finished before the
+session started is still collected. Without a snapshot, a region that
+already shows content (``initial_content`` share of non-flat tiles) starts
+out generating and is collected once it has been still for the dwell; a
+blank region waits for its first change.
+
+The session waits for new frames and hashes regions on a screen worker
+thread, and runs copy-button clicks, clipboard reads and outbox writes on
+a separate clipboard worker, so neither blocks the event loop and a slow
+copy never delays change detection for other agents. Each completed
+response is written to ``<outbox_dir>/agent-<id>.json`` as soon as its
+agent finishes.
+
+Latency from the moment a region is declared stable to its outbox write
+is recorded in a histogram.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .frame_grabber import Frame, get_frame_grabber
+from .metrics import LatencyHistogram
+from .region_stability import StabilityEngine, StabilityResult
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10)
+
+
+class CollectionState(Enum):
+    """Where an agent is in producing its response."""
+    IDLE = "idle"
+    GENERATING = "generating"
+    STABLE = "stable"
+    COPIED = "copied"
+
+
+@dataclass
+class AgentCollection:
+    """Collection progress of one agent region."""
+    name: str
+    agent_id: Optional[str] = None
+    state: CollectionState = CollectionState.IDLE
+    generation: int = 0  # bumped on every new burst of changes; stale copies are discarded
+    generating_since: Optional[float] = None
+    stable_at: Optional[float] = None
+    copied_at: Optional[float] = None
+    response: Optional[str] = None
+
+    @property
+    def outbox_name(self) -> str:
+        return f"agent-{self.agent_id or self.name}.json"
+
+
+class CollectionSession:
+    """Watches agent regions concurrently and emits responses as agents finish."""
+
+    def __init__(self,
+                 read_response: Callable[[str], Optional[str]],
+                 grabber=None,
+                 outbox_dir: str = "runtime/bridge_outbox",
+                 config: Optional[Dict] = None,
+                 on_complete: Optional[Callable[[AgentCollection], None]] = None):
+        """Initialize the session.
+
+        Args:
+            read_response: Blocking callable copying the response of a region
+                (by name), e.g. click its copy button and read the clipboard
+            grabber: FrameGrabber to watch (defaults to the shared one)
+            outbox_dir: Directory for ``agent-<id>.json`` outbox files
+            config: Optional configuration dictionary
+            on_complete: Called on the clipboard worker after an outbox write
+        """
+        self.read_response = read_response
+        self.grabber = grabber if grabber is not None else get_frame_grabber()
+        self.outbox_dir = Path(outbox_dir)
+        self.config = config or {}
+        self.on_complete = on_complete
+
+        self.hz = self.config.get("collection_hz", 10.0)
+        self.frame_timeout = self.config.get("frame_timeout", 0.5)
+        self.copy_attempts = self.config.get("copy_attempts", 3)
+        self.copy_retry_delay = self.config.get("copy_retry_delay", 0.2)
+        self.initial_content = self.config.get("initial_content", 0.1)
+
+        self.engine = StabilityEngine(self.grabber, dwell=self.config.get("stability_dwell", 1.0))
+        self.agents: Dict[str, AgentCollection] = {}
+        self.outbox_latency = LatencyHistogram(OUTBOX_LATENCY_BUCKETS)
+        self.stats = {"frames": 0, "copies": 0, "copy_failures": 0, "discarded": 0, "completed": 0}
+
+        self._screen = ThreadPoolExecutor(max_workers=1, thread_name_prefix="collection-screen")
+        self._clipboard = ThreadPoolExecutor(max_workers=1, thread_name_prefix="collection-clipboard")
+        self._awaiting_baseline: Set[str] = set()
+        self._lock = threading.Lock()  # agent state is shared by the event loop and the clipboard worker
+        self._seq = 0
+        self._started_at = time.time()
+
+    def watch(self, name: str, region: Tuple[int, int, int, int],
+              agent_id: Optional[str] = None, baseline: Optional[np.ndarray] = None,
+              **tracker_overrides) -> AgentCollection:
+        """Add an agent region to the session.
+
+        Args:
+            name: Region name
+            region: Screen region (FrameGrabber convention)
+            agent_id: Optional SWARM agent ID used for the outbox file
+            baseline: Optional pixels of the region from before the prompt was
+                sent; any difference from it counts as the response
+            **tracker_overrides: RegionStabilityTracker arguments, e.g. dwell or masks
+
+        Returns:
+            The agent's collection state
+        """
+        tracker = self.engine.watch(name, region, **tracker_overrides)
+        self.agents[name] = AgentCollection(name=name, agent_id=agent_id)
+        if baseline is not None:
+            tracker.update(baseline, time.monotonic())
+        else:
+            self._awaiting_baseline.add(name)
+        return self.agents[name]
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.agents) and all(a.state is CollectionState.COPIED for a in self.agents.values())
+
+    @property
+    def completed(self) -> int:
+        return sum(1 for a in self.agents.values() if a.state is CollectionState.COPIED)
+
+    # ------------------------------------------------------------------
+    # Running
+
+    async def run(self, timeout: float = 300.0, wait_all: bool = True) -> Dict[str, str]:
+        """Collect until every agent has been copied or the timeout expires.
+
+        With ``wait_all=False`` the session returns as soon as the first
+        agent's response has been copied.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            wait_all: Wait for every agent rather than the first response
+
+        Returns:
+            Mapping of region name to collected response
+        """
+        loop = asyncio.get_running_loop()
+        self._started_at = time.time()
+        deadline = time.monotonic() + timeout
+        copies: Set[asyncio.Future] = set()
+        subscription = self.grabber.subscribe(self.hz)
+        try:
+            while not self.finished and (wait_all or not self.completed):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    waiting = [a.name for a in self.agents.values() if a.state is not CollectionState.COPIED]
+                    logger.warning(f"Response collection timed out waiting for {', '.join(waiting)}")
+                    break
+                update = await loop.run_in_executor(
+                    self._screen, self._next_update, min(self.frame_timeout, remaining)
+                )
+                if update is None:
+                    continue
+                frame, results, showing = update
+                for name in self._advance(results, frame.timestamp, showing):
+                    agent = self.agents[name]
+                    copy = loop.run_in_executor(
+                        self._clipboard, self._copy, name, agent.generation, agent.stable_at
+                    )
+                    copies.add(copy)
+                    copy.add_done_callback(copies.discard)
+        finally:
+            self.grabber.unsubscribe(subscription)
+            # Clipboard work cannot be interrupted; let in-flight copies land
+            if copies:
+                await asyncio.gather(*copies, return_exceptions=True)
+        return {name: a.response for name, a in self.agents.items() if a.state is CollectionState.COPIED}
+
+    def collect(self, timeout: float = 300.0, wait_all: bool = True) -> Dict[str, str]:
+        """Blocking wrapper around ``run``.
+
+        Called from a thread that is already running an event loop, the
+        session runs on a loop of its own in a helper thread; coroutines
+        should await ``run`` instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run(timeout, wait_all))
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="collection-loop") as runner:
+            return runner.submit(asyncio.run, self.run(timeout, wait_all)).result()
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._screen.shutdown(wait=True)
+        self._clipboard.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Screen worker
+
+    def _next_update(self, timeout: float) -> Optional[Tuple[Frame, Dict[str, StabilityResult], Set[str]]]:
+        frame = self.grabber.wait_for_frame(self._seq, timeout)
+        if frame is None:
+            return None
+        self._seq = frame.seq
+        self.stats["frames"] += 1
+        # Regions seen for the first time that already show a response
+        showing = {
+            name for name in self._awaiting_baseline
+            if self.engine.trackers[name].content_fraction(
+                frame.view(self.grabber.regions[name])
+            ) >= self.initial_content
+        }
+        return frame, self.engine.update_frame(frame), showing
+
+    # ------------------------------------------------------------------
+    # State machine (event loop)
+
+    def _advance(self, results: Dict[str, StabilityResult], now: float,
+                 showing: Set[str] = frozenset()) -> List[str]:
+        """Apply one frame's stability results; returns agents that just became stable."""
+        became_stable = []
+        with self._lock:
+            for name, result in results.items():
+                if self._advance_agent(self.agents[name], result, now, name in showing):
+                    became_stable.append(name)
+        return became_stable
+
+    def _advance_agent(self, agent: AgentCollection, result: StabilityResult, now: float,
+                       showing: bool = False) -> bool:
+        """Move one agent along its state machine; True when it just became stable."""
+        name = agent.name
+        if agent.state is CollectionState.COPIED:
+            return False
+        if name in self._awaiting_baseline:
+            # The first frame of a region sets its reference, it is not a change;
+            # a region already showing content may hold a finished response
+            self._awaiting_baseline.discard(name)
+            if showing:
+                self._start_generating(agent, now)
+            return False
+        if result.changed_tiles:
+            if agent.state is not CollectionState.GENERATING:
+                if agent.state is CollectionState.STABLE:
+                    logger.debug(f"Region {name} changed again before its response was copied")
+                self._start_generating(agent, now)
+            return False
+        if agent.state is CollectionState.GENERATING and result.stable:
+            agent.state = CollectionState.STABLE
+            agent.stable_at = now
+            logger.info(f"Agent {agent.agent_id or name} response stabilized")
+            return True
+        return False
+
+    @staticmethod
+    def _start_generating(agent: AgentCollection, now: float) -> None:
+        agent.state = CollectionState.GENERATING
+        agent.generation += 1
+        agent.generating_since = now
+        agent.stable_at = None
+
+    # ------------------------------------------------------------------
+    # Clipboard worker
+
+    def _copy(self, name: str, generation: int, stable_at: float) -> Optional[str]:
+        agent = self.agents[name]
+        for attempt in range(1, self.copy_attempts + 1):
+            try:
+                response = self.read_response(name)
+            except Exception as e:
+                logger.error(f"Error copying response from {name}: {e}")
+                response = None
+            if response:
+                break
+            if attempt < self.copy_attempts:
+                time.sleep(self.copy_retry_delay)
+        else:
+            logger.warning(f"Could not copy response from {name} after {self.copy_attempts} attempts")
+            self.stats["copy_failures"] += 1
+            return None
+        self.stats["copies"] += 1
+
+        with self._lock:
+            if agent.generation != generation:
+                # The region started changing again while we were copying
+                self.stats["discarded"] += 1
+                return None
+            completed_at = time.time()
+            try:
+                self._write_outbox(agent, response, completed_at)
+            except OSError as e:
+                logger.error(f"Error writing outbox for {name}: {e}")
+                return None
+            self.outbox_latency.observe(time.monotonic() - stable_at)
+            agent.response = response
+            agent.copied_at = completed_at
+            agent.state = CollectionState.COPIED
+            self.stats["completed"] += 1
+
+        if self.on_complete is not None:
+            try:
+                self.on_complete(agent)
+            except Exception as e:
+                logger.error(f"Error in completion callback for {name}: {e}")
+        return response
+
+    def _write_outbox(self, agent: AgentCollection, response: str, completed_at: float) -> None:
+        self.outbox_dir.mkdir(parents=True, exist_ok=True)
+        path = self.outbox_dir / agent.outbox_name
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump({
+                "status": "complete",
+                "agent_id": agent.agent_id,
+                "region": agent.name,
+                "response": response,
+                "started_at": self._started_at,
+                "completed_at": completed_at,
+            }, f, indent=2)
+        os.replace(temp_path, path)
+
+    # ------------------------------------------------------------------
+    # Reporting
+
+    def get_metrics(self) -> Dict:
+        """Session counters, per-agent state and stable-to-outbox latency."""
+        return {
+            **self.stats,
+            "agents": {name: agent.state.value for name, agent in self.agents.items()},
+            "outbox_latency": self.outbox_latency.snapshot(),
+        }
@@ -0,0 +1,323 @@
+"""
+Frame Grabber
+------------
+Shared screen capture for every agent-region consumer.
+
+Instead of each consumer calling ``pyautogui.screenshot(region=...)``, the
+grabber captures the whole screen once per tick and hands out numpy views of
+the requested regions. Views share the frame's buffer (no copy) and frames
+are read-only, so a view stays valid while a consumer holds it. The last
+``ring_size`` frames are kept for previous-frame comparisons.
+
+Frames are captured either on demand - ``get_frame(max_age)`` reuses the
+latest frame if it is fresh enough, so all consumers polling in the same
+tick share one capture - or by a background thread whose rate follows the
+fastest active subscription and which stops capturing when there are none.
+
+Captures use mss (XShm on X11) when installed, falling back to pyautogui.
+``SyntheticFrameSource`` produces frames without a display for tests and
+benchmarks.
+
+Regions follow pyautogui's convention: ``(left, top, width, height)``.
+Frames are BGRA ``uint8`` arrays of shape ``(height, width, 4)``.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+Region = Tuple[int, int, int, int]
+
+
+class Frame:
+    """One full-screen capture."""
+
+    __slots__ = ("seq", "timestamp", "pixels", "left", "top")
+
+    def __init__(self, seq: int, pixels: np.ndarray, left: int = 0, top: int = 0):
+        self.seq = seq
+        self.timestamp = time.monotonic()
+        self.pixels = pixels
+        self.left = left
+        self.top = top
+
+    def view(self, region: Region) -> np.ndarray:
+        """Zero-copy BGRA view of a screen region, clipped to the frame."""
+        left, top, width, height = region
+        x, y = left - self.left, top - self.top
+        return self.pixels[max(0, y):max(0, y + height), max(0, x):max(0, x + width)]
+
+
+class MSSFrameSource:
+    """Full-screen capture through mss."""
+
+    def __init__(self):
+        import mss  # fail early when unavailable
+        self._mss = mss
+        self._local = threading.local()
+
+    def grab(self) -> Tuple[np.ndarray, int, int]:
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss.mss()  # mss handles are per thread
+        monitor = sct.monitors[0]
+        shot = sct.grab(monitor)
+        pixels = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return pixels, monitor["left"], monitor["top"]
+
+
+class PyAutoGUIFrameSource:
+    """Full-screen capture through pyautogui (one PIL conversion per frame)."""
+
+    def grab(self) -> Tuple[np.ndarray, int, int]:
+        import pyautogui
+        rgb = np.asarray(pyautogui.screenshot())
+        pixels = np.empty(rgb.shape[:2] + (4,), dtype=np.uint8)
+        pixels[..., 0] = rgb[..., 2]
+        pixels[..., 1] = rgb[..., 1]
+        pixels[..., 2] = rgb[..., 0]
+        pixels[..., 3] = 255
+        return pixels, 0, 0
+
+
+class SyntheticFrameSource:
+    """Headless frame source: a static desktop where regions slowly fill with "text".
+
+    Each grab draws a few new text-like rows into every region listed in
+    ``active_regions``, so change detection has something to find.
+    """
+
+    def __init__(self, width: int = 1920, height: int = 1080,
+                 active_regions: Optional[List[Region]] = None,
+                 rows_per_frame: int = 2, seed: int = 0):
+        self.width = width
+        self.height = height
+        self.active_regions = list(active_regions or [])
+        self.rows_per_frame = rows_per_frame
+        self._rng = np.random.default_rng(seed)
+        self._canvas = np.full((height, width, 4), 40, dtype=np.uint8)
+        self._canvas[..., 3] = 255
+        self._cursor: Dict[Region, int] = {}
+        self.grabs = 0
+
+    def grab(self) -> Tuple[np.ndarray, int, int]:
+        self.grabs += 1
+        for region in self.active_regions:
+            left, top, width, height = region
+            row = self._cursor.get(region, 0)
+            for _ in range(self.rows_per_frame):
+                y = top + (row * 4) % max(4, height - 4)
+                glyphs = self._rng.integers(0, 2, size=(3, width), dtype=np.uint8) * 200
+                self._canvas[y:y + 3, left:left + width, :3] = glyphs[..., None]
+                row += 1
+            self._cursor[region] = row
+        return self._canvas.copy(), 0, 0
+
+
+def default_frame_source():
+    """Best available capture backend."""
+    try:
+        return MSSFrameSource()
+    except ImportError:
+        logger.debug("mss not installed, capturing through pyautogui")
+        return PyAutoGUIFrameSource()
+
+
+class FrameGrabber:
+    """Captures the screen once per tick and fans regions out to consumers."""
+
+    def __init__(self, source=None, ring_size: int = 3, max_hz: float = 30.0):
+        """Initialize the grabber.
+
+        Args:
+            source: Frame source (defaults to mss, then pyautogui)
+            ring_size: Number of recent frames kept
+            max_hz: Upper bound on the background capture rate
+        """
+        self.source = source if source is not None else default_frame_source()
+        self.max_hz = max_hz
+        self.regions: Dict[str, Region] = {}
+        self._ring: Deque[Frame] = deque(maxlen=ring_size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._capture_lock = threading.Lock()
+        self._subscriptions: Dict[int, float] = {}  # id -> requested hz
+        self._next_subscription = 0
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._demand = threading.Event()
+        self.stats = {"captures": 0, "reused": 0}
+
+    # ------------------------------------------------------------------
+    # Regions
+
+    def register_region(self, name: str, region: Region) -> None:
+        """Name a region so consumers can ask for it by name."""
+        self.regions[name] = tuple(region)
+
+    def unregister_region(self, name: str) -> None:
+        self.regions.pop(name, None)
+
+    def _resolve(self, region: Union[str, Region]) -> Region:
+        return self.regions[region] if isinstance(region, str) else tuple(region)
+
+    # ------------------------------------------------------------------
+    # Capture
+
+    def grab(self) -> Frame:
+        """Capture a new frame now."""
+        with self._capture_lock:
+            return self._grab()
+
+    def _grab(self) -> Frame:
+        pixels, left, top = self.source.grab()
+        pixels.flags.writeable = False
+        with self._lock:
+            self._seq += 1
+            frame = Frame(self._seq, pixels, left, top)
+            self._ring.append(frame)
+            self.stats["captures"] += 1
+            self._new_frame.notify_all()
+        return frame
+
+    def get_frame(self, max_age: float = 0.05) -> Frame:
+        """Latest frame if younger than ``max_age`` seconds, else a fresh capture."""
+        with self._lock:
+            frame = self._ring[-1] if self._ring else None
+            if frame is not None and time.monotonic() - frame.timestamp <= max_age:
+                self.stats["reused"] += 1
+                return frame
+        with self._capture_lock:
+            # Another consumer may have captured while we waited
+            with self._lock:
+                frame = self._ring[-1] if self._ring else None
+                if frame is not None and time.monotonic() - frame.timestamp <= max_age:
+                    self.stats["reused"] += 1
+                    return frame
+            return self._grab()
+
+    def latest(self) -> Optional[Frame]:
+        with self._lock:
+            return self._ring[-1] if self._ring else None
+
+    def previous(self, steps: int = 1) -> Optional[Frame]:
+        """Frame ``steps`` captures before the latest one, if still in the ring."""
+        with self._lock:
+            return self._ring[-1 - steps] if len(self._ring) > steps else None
+
+    def wait_for_frame(self, after_seq: int, timeout: Optional[float] = None) -> Optional[Frame]:
+        """Block until a frame newer than ``after_seq`` is captured."""
+        with self._new_frame:
+            if not self._new_frame.wait_for(lambda: self._seq > after_seq, timeout):
+                return None
+            return self._ring[-1]
+
+    # ------------------------------------------------------------------
+    # Region access
+
+    def region(self, region: Union[str, Region], max_age: float = 0.05) -> np.ndarray:
+        """Zero-copy BGRA view of a region from a fresh-enough frame."""
+        return self.get_frame(max_age).view(self._resolve(region))
+
+    def region_image(self, region: Union[str, Region], max_age: float = 0.05) -> Image.Image:
+        """Region as an RGB PIL image (copies; for PIL/OCR consumers)."""
+        return to_image(self.region(region, max_age))
+
+    def region_hash(self, region: Union[str, Region], max_age: float = 0.05) -> str:
+        """MD5 of a region's pixels."""
+        return hashlib.md5(np.ascontiguousarray(self.region(region, max_age)).tobytes()).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Background capture
+
+    def subscribe(self, hz: float) -> int:
+        """Request background frames at ``hz``; the grabber runs at the fastest request.
+
+        Returns:
+            Subscription id for ``unsubscribe``
+        """
+        with self._lock:
+            self._next_subscription += 1
+            self._subscriptions[self._next_subscription] = hz
+        self._demand.set()
+        self._ensure_thread()
+        return self._next_subscription
+
+    def unsubscribe(self, subscription: int) -> None:
+        with self._lock:
+            self._subscriptions.pop(subscription, None)
+
+    @property
+    def capture_hz(self) -> float:
+        """Current background capture rate (0 when nobody subscribes)."""
+        with self._lock:
+            return min(self.max_hz, max(self._subscriptions.values(), default=0.0))
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="frame-grabber", daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self) -> None:
+        while self._running:
+            hz = self.capture_hz
+            if hz <= 0:
+                # Idle until someone subscribes
+                self._demand.clear()
+                self._demand.wait(1.0)
+                continue
+            started = time.monotonic()
+            try:
+                self.grab()
+            except Exception as e:
+                logger.error(f"Frame capture failed: {e}")
+            time.sleep(max(0.0, 1.0 / hz - (time.monotonic() - started)))
+
+    def stop(self) -> None:
+        """Stop background capture."""
+        self._running = False
+        self._demand.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+
+def to_image(view: np.ndarray) -> Image.Image:
+    """Convert a BGRA view to an RGB PIL image."""
+    return Image.fromarray(np.ascontiguousarray(view[..., 2::-1]), "RGB")
+
+
+def to_bgr(view: np.ndarray) -> np.ndarray:
+    """Contiguous BGR copy of a BGRA view (for OpenCV)."""
+    return np.ascontiguousarray(view[..., :3])
+
+
+_shared_grabber: Optional[FrameGrabber] = None
+_shared_lock = threading.Lock()
+
+
+def get_frame_grabber() -> FrameGrabber:
+    """Process-wide frame grabber shared by all consumers."""
+    global _shared_grabber
+    with _shared_lock:
+        if _shared_grabber is None:
+            _shared_grabber = FrameGrabber()
+        return _shared_grabber
+
+
+def set_frame_grabber(grabber: Optional[FrameGrabber]) -> None:
+    """Replace the shared grabber (e.g. with a synthetic source)."""
+    global _shared_grabber
+    with _shared_lock:
+        _shared_grabber = grabber
@@ -0,0 +1,367 @@
+"""
+Input Scheduler
+--------------
+Owns the single physical keyboard and mouse and serialises every message
+injection through one worker thread, fed from a queue.
+
+Compared to typing each message with fixed sleeps in between:
+
+- Text is pasted from the clipboard instead of typed key by key.
+- Focus is verified (active window title) instead of waited for, where
+  the title can be read; otherwise the scheduler waits
+  ``FOCUS_ESTABLISH_DELAY`` after the click, as before.
+- Agents are pipelined. After pressing Enter in agent A the keyboard
+  moves on to agent B at once; only the next message to A waits for A's
+  send to settle (``send_settle``, plus the backend's readiness check).
+- Callers get a future, so asyncio code can ``await send(...)`` without
+  blocking the event loop.
+
+Backends implement ``click``, ``hotkey``, ``press``, ``paste``,
+``is_focused`` and ``is_ready``. ``FakeInputBackend`` simulates a desktop
+for tests and benchmarks.
+"""
+
+import asyncio
+import logging
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .clipboard_service import ClipboardService, get_clipboard_service
+from .timing import FOCUS_ESTABLISH_DELAY, MESSAGE_SEND_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+class InputError(Exception):
+    """Input could not be delivered (e.g. focus never arrived)."""
+
+
+@dataclass
+class InputTarget:
+    """Where an agent's messages are typed."""
+    agent_id: str
+    x: int
+    y: int
+    window_title: Optional[str] = None
+
+
+@dataclass
+class _InputJob:
+    target: InputTarget
+    text: str
+    future: Future = field(default_factory=Future)
+
+
+def _active_window_title() -> Optional[str]:
+    """Title of the focused window, or None if it cannot be determined.
+
+    Uses pygetwindow on Windows and macOS, and xdotool (falling back to
+    xprop and the EWMH ``_NET_ACTIVE_WINDOW`` property) on X11.
+    """
+    if sys.platform in ("win32", "darwin"):
+        try:
+            import pygetwindow
+            window = pygetwindow.getActiveWindow()
+        except Exception:
+            return None
+        if window is None:
+            return ""
+        return window if isinstance(window, str) else window.title
+
+    try:
+        if shutil.which("xdotool"):
+            result = subprocess.run(["xdotool", "getactivewindow", "getwindowname"],
+                                    capture_output=True, text=True, timeout=1)
+            return result.stdout.strip() if result.returncode == 0 else ""
+        if shutil.which("xprop"):
+            active = subprocess.run(["xprop", "-root", "_NET_ACTIVE_WINDOW"],
+                                    capture_output=True, text=True, timeout=1)
+            window_id = active.stdout.strip().split()[-1] if active.returncode == 0 else ""
+            if not window_id.startswith("0x") or int(window_id, 16) == 0:
+                return ""
+            name = subprocess.run(["xprop", "-id", window_id, "_NET_WM_NAME"],
+                                  capture_output=True, text=True, timeout=1)
+            _, _, title = name.stdout.partition("=")
+            return title.strip().strip('"')
+    except (OSError, ValueError, subprocess.SubprocessError):
+        pass
+    return None
+
+
+class PyAutoGUIInputBackend:
+    """Real input through pyautogui, pasting through the shared clipboard service.
+
+    Focus is confirmed from the active window title when the target has one
+    and the platform can report it; otherwise the input box counts as
+    focused ``FOCUS_ESTABLISH_DELAY`` after the click.
+    """
+
+    def __init__(self, clipboard: Optional[ClipboardService] = None,
+                 focus_delay: float = FOCUS_ESTABLISH_DELAY):
+        import pyautogui
+        self._pyautogui = pyautogui
+        # Shared with response capture, so our pastes are never taken for copies
+        self._clipboard = clipboard or get_clipboard_service()
+        self.focus_delay = focus_delay
+        self._clicked_at = 0.0
+        self._titles_available: Optional[bool] = None
+
+    # pyautogui sleeps PAUSE after every call; the scheduler does its own waiting
+    def click(self, x: int, y: int) -> None:
+        self._pyautogui.click(x, y, _pause=False)
+        self._clicked_at = time.monotonic()
+
+    def hotkey(self, *keys: str) -> None:
+        self._pyautogui.hotkey(*keys, _pause=False)
+
+    def press(self, key: str) -> None:
+        self._pyautogui.press(key, _pause=False)
+
+    def paste(self, text: str) -> None:
+        if self._clipboard.write(text):
+            self.hotkey("ctrl", "v")
+            return
+        logger.debug("Clipboard unavailable, typing instead")
+        self._pyautogui.write(text, _pause=False)
+
+    def is_focused(self, target: InputTarget) -> bool:
+        if target.window_title and self._titles_available is not False:
+            title = _active_window_title()
+            if title is not None:
+                self._titles_available = True
+                return target.window_title in title
+            logger.debug("Active window title unavailable, waiting for focus instead")
+            self._titles_available = False
+        # Nothing to verify against: give the click time to take effect
+        return time.monotonic() - self._clicked_at >= self.focus_delay
+
+    def is_ready(self, target: InputTarget) -> bool:
+        # A real desktop gives no readiness signal; send_settle paces each agent
+        return True
+
+
+class FakeInputBackend:
+    """Simulated desktop: agents' input boxes, focus latency and send processing.
+
+    ``targets`` registers each agent's input box position. Clicking a box
+    focuses its window after ``focus_latency``; Enter sends the box's text
+    and keeps the agent busy (not ready) for ``processing`` seconds. Every
+    action costs ``action_delay``, and ``write`` (keystroke typing) costs
+    ``typing_interval`` per character.
+    """
+
+    def __init__(self, targets: List[InputTarget], action_delay: float = 0.002,
+                 focus_latency: float = 0.02, processing: float = 0.5,
+                 typing_interval: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.targets = {(t.x, t.y): t for t in targets}
+        self.action_delay = action_delay
+        self.focus_latency = focus_latency
+        self.processing = processing
+        self.typing_interval = typing_interval
+        self.clock = clock
+        self.boxes: Dict[str, str] = {t.agent_id: "" for t in targets}
+        self.sent: List[Tuple[str, str, float]] = []  # (agent_id, text, time)
+        self._focus: Optional[str] = None
+        self._focus_at = 0.0
+        self._busy_until: Dict[str, float] = {}
+        self._selected = False
+
+    def _act(self) -> None:
+        time.sleep(self.action_delay)
+
+    def _focused(self) -> Optional[str]:
+        return self._focus if self.clock() >= self._focus_at else None
+
+    def click(self, x: int, y: int) -> None:
+        self._act()
+        target = self.targets.get((x, y))
+        self._focus = target.agent_id if target else None
+        self._focus_at = self.clock() + self.focus_latency
+        self._selected = False
+
+    def hotkey(self, *keys: str) -> None:
+        self._act()
+        agent = self._focused()
+        if agent is None:
+            return
+        if keys == ("ctrl", "a"):
+            self._selected = True
+
+    def press(self, key: str) -> None:
+        self._act()
+        agent = self._focused()
+        if agent is None:
+            return
+        if key == "backspace":
+            self.boxes[agent] = "" if self._selected else self.boxes[agent][:-1]
+            self._selected = False
+        elif key == "enter":
+            self.sent.append((agent, self.boxes[agent], self.clock()))
+            self.boxes[agent] = ""
+            self._busy_until[agent] = self.clock() + self.processing
+
+    def paste(self, text: str) -> None:
+        self._act()
+        agent = self._focused()
+        if agent is not None:
+            self.boxes[agent] += text
+
+    def write(self, text: str, interval: float = 0.0) -> None:
+        time.sleep(len(text) * (interval or self.typing_interval))
+        agent = self._focused()
+        if agent is not None:
+            self.boxes[agent] += text
+
+    def is_focused(self, target: InputTarget) -> bool:
+        return self._focused() == target.agent_id
+
+    def is_ready(self, target: InputTarget) -> bool:
+        return self.clock() >= self._busy_until.get(target.agent_id, 0.0)
+
+
+class InputScheduler:
+    """Single owner of keyboard and mouse, pipelining messages across agents."""
+
+    def __init__(self, backend=None, send_settle: float = MESSAGE_SEND_DELAY,
+                 focus_timeout: float = 2.0, focus_attempts: int = 2,
+                 poll_interval: float = 0.01, clock: Callable[[], float] = time.monotonic):
+        """Initialize the scheduler.
+
+        Args:
+            backend: Input backend (defaults to pyautogui, created on first use)
+            send_settle: Minimum time before the same agent gets another message
+            focus_timeout: Seconds to wait for focus per click
+            focus_attempts: Clicks before giving up on focus
+            poll_interval: Readiness polling interval
+            clock: Time source
+        """
+        self._backend = backend
+        self.send_settle = send_settle
+        self.focus_timeout = focus_timeout
+        self.focus_attempts = focus_attempts
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._queues: Dict[str, Deque[_InputJob]] = {}
+        self._order: Deque[str] = deque()
+        self._ready_at: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {"sent": 0, "failed": 0, "focus_retries": 0}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = PyAutoGUIInputBackend()
+        return self._backend
+
+    # ------------------------------------------------------------------
+    # Submission
+
+    def submit(self, target: InputTarget, text: str) -> Future:
+        """Queue a message; the future resolves to True once it was sent."""
+        job = _InputJob(target, text)
+        with self._cond:
+            if target.agent_id not in self._queues:
+                self._queues[target.agent_id] = deque()
+                self._order.append(target.agent_id)
+            self._queues[target.agent_id].append(job)
+            self._cond.notify()
+        self._ensure_thread()
+        return job.future
+
+    async def send(self, target: InputTarget, text: str) -> bool:
+        """Queue a message and wait for it without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(target, text))
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(len(queue) for queue in self._queues.values())
+
+    # ------------------------------------------------------------------
+    # Worker
+
+    def _ensure_thread(self) -> None:
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="input-scheduler", daemon=True)
+            self._thread.start()
+
+    def _next_job(self) -> Optional[_InputJob]:
+        """First agent in round-robin order with a message and a settled previous send."""
+        now = self.clock()
+        for _ in range(len(self._order)):
+            agent_id = self._order[0]
+            self._order.rotate(-1)
+            queue = self._queues[agent_id]
+            if not queue or now < self._ready_at.get(agent_id, 0.0):
+                continue
+            if not self.backend.is_ready(queue[0].target):
+                continue
+            return queue.popleft()
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                if job is None:
+                    if not self._running and not any(self._queues.values()):
+                        return
+                    # Wake for new work, or poll readiness while sends settle
+                    self._cond.wait(self.poll_interval if any(self._queues.values()) else 1.0)
+                    continue
+            if job.future.set_running_or_notify_cancel():
+                self._deliver(job)
+
+    def _deliver(self, job: _InputJob) -> None:
+        target = job.target
+        try:
+            self._focus(target)
+            self.backend.hotkey("ctrl", "a")
+            self.backend.press("backspace")
+            self.backend.paste(job.text)
+            self.backend.press("enter")
+            self.stats["sent"] += 1
+            job.future.set_result(True)
+        except Exception as e:
+            logger.error(f"Failed to send message to {target.agent_id}: {e}")
+            self.stats["failed"] += 1
+            job.future.set_result(False)
+        finally:
+            with self._cond:
+                self._ready_at[target.agent_id] = self.clock() + self.send_settle
+
+    def _focus(self, target: InputTarget) -> None:
+        for attempt in range(self.focus_attempts):
+            if attempt:
+                self.stats["focus_retries"] += 1
+            self.backend.click(target.x, target.y)
+            deadline = self.clock() + self.focus_timeout
+            while self.clock() < deadline:
+                if self.backend.is_focused(target):
+                    return
+                time.sleep(self.poll_interval)
+        raise InputError(f"Input box of {target.agent_id} did not take focus")
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop the worker once queued messages are delivered (or drop them)."""
+        with self._cond:
+            self._running = False
+            if not wait:
+                for queue in self._queues.values():
+                    while queue:
+                        queue.popleft().future.cancel()
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
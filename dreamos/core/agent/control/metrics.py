@@ -0,0 +1,53 @@
+"""
+Metrics for agent control.
+
+Small, dependency-free measurement helpers shared by the control services,
+so importing them does not pull in any GUI automation backend.
+"""
+
+import bisect
+import math
+from typing import Dict, Sequence
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    DEFAULT_BUCKETS = (1, 2, 5, 10, 15, 30, 60, 120, 300, math.inf)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return self.max if bound == math.inf else bound
+        return self.max
+
+    def snapshot(self) -> Dict:
+        return {
+            "buckets": {("+Inf" if b == math.inf else f"{b:g}"): c for b, c in zip(self.buckets, self.counts)},
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
@@ -0,0 +1,248 @@
+"""
+OCR Service
+----------
+Incremental OCR of agent response regions.
+
+Instead of running tesseract over the whole region on every read, the
+region is segmented into text lines by its ink profile, and each line is
+recognised on its own. Results are cached by a hash of the line's pixels,
+so unchanged lines, and lines that only moved because the response
+scrolled, are never recognised twice. Misses are recognised in parallel
+and the text is assembled top to bottom.
+
+Recognition uses a persistent tesseract handle per worker thread through
+tesserocr when installed, falling back to pytesseract (one tesseract
+process per line, run from the worker pool).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SINGLE_LINE_PSM = 7
+
+
+@dataclass
+class OCRLine:
+    """One recognised text line, in region coordinates."""
+    top: int
+    bottom: int
+    left: int
+    right: int
+    text: str
+    cached: bool = False
+
+
+class TesserocrBackend:
+    """Recognition through persistent tesserocr API handles (one per thread)."""
+
+    def __init__(self, lang: str = "eng", psm: int = SINGLE_LINE_PSM):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self.psm = psm
+        self._local = threading.local()
+        self._apis = []
+        self._lock = threading.Lock()
+
+    def _api(self):
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = self._local.api = self._tesserocr.PyTessBaseAPI(lang=self.lang, psm=self.psm)
+            with self._lock:
+                self._apis.append(api)
+        return api
+
+    def recognize(self, image: Image.Image) -> str:
+        api = self._api()
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+    def close(self) -> None:
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis.clear()
+
+
+class PytesseractBackend:
+    """Recognition through pytesseract (spawns tesseract per call)."""
+
+    def __init__(self, psm: int = SINGLE_LINE_PSM, config: str = ""):
+        import pytesseract
+        self._pytesseract = pytesseract
+        self.config = f"--psm {psm} {config}".strip()
+
+    def recognize(self, image: Image.Image) -> str:
+        return self._pytesseract.image_to_string(image, config=self.config)
+
+
+def default_ocr_backend():
+    """Best available OCR backend."""
+    try:
+        return TesserocrBackend()
+    except ImportError:
+        logger.debug("tesserocr not installed, recognising through pytesseract")
+        return PytesseractBackend()
+
+
+def to_gray(pixels: np.ndarray) -> np.ndarray:
+    """Grayscale uint8 array from BGR(A) pixels, grayscale pixels or a PIL image."""
+    if isinstance(pixels, Image.Image):
+        return np.asarray(pixels.convert("L"))
+    if pixels.ndim == 2:
+        return pixels
+    # ITU-R 601 luma on the BGR channels
+    b, g, r = (pixels[..., i].astype(np.uint16) for i in range(3))
+    return ((r * 77 + g * 150 + b * 29) >> 8).astype(np.uint8)
+
+
+class OCRService:
+    """Line-segmented OCR with a per-line recognition cache."""
+
+    def __init__(self, backend=None, cache_size: int = 4096, max_workers: int = 4,
+                 ink_threshold: int = 48, line_gap: int = 1, pad: int = 3):
+        """Initialize the service.
+
+        Args:
+            backend: Object with ``recognize(image) -> str`` (defaults to
+                tesserocr, then pytesseract; created on first use)
+            cache_size: Number of line results kept
+            max_workers: Lines recognised in parallel
+            ink_threshold: Gray-level distance from the background that counts as ink
+            line_gap: Blank rows inside a line that do not split it (e.g. the dot of an "i")
+            pad: Background pixels kept around each line crop
+        """
+        self._backend = backend
+        self.cache_size = cache_size
+        self.max_workers = max_workers
+        self.ink_threshold = ink_threshold
+        self.line_gap = line_gap
+        self.pad = pad
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {"reads": 0, "lines": 0, "hits": 0, "misses": 0, "ocr_seconds": 0.0}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = default_ocr_backend()
+        return self._backend
+
+    # ------------------------------------------------------------------
+    # Segmentation
+
+    def segment(self, gray: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """Find text lines in a grayscale region.
+
+        Returns:
+            (top, bottom, left, right) boxes, top to bottom, bottom/right exclusive
+        """
+        if gray.size == 0:
+            return []
+        background = int(np.median(gray[::4, ::4]))
+        ink = np.abs(gray.astype(np.int16) - background) > self.ink_threshold
+        rows = np.flatnonzero(ink.any(axis=1))
+        if not len(rows):
+            return []
+
+        # Split where blank runs are longer than line_gap
+        breaks = np.flatnonzero(np.diff(rows) > self.line_gap + 1)
+        starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+        ends = np.concatenate((rows[breaks], [rows[-1]])) + 1
+
+        height, width = gray.shape
+        boxes = []
+        for start, end in zip(starts, ends):
+            cols = np.flatnonzero(ink[start:end].any(axis=0))
+            boxes.append((
+                max(0, int(start) - self.pad),
+                min(height, int(end) + self.pad),
+                max(0, int(cols[0]) - self.pad),
+                min(width, int(cols[-1]) + 1 + self.pad),
+            ))
+        return boxes
+
+    # ------------------------------------------------------------------
+    # Recognition
+
+    def read_lines(self, pixels) -> List[OCRLine]:
+        """Recognise every line of a region, reusing cached lines.
+
+        Args:
+            pixels: Region as BGR(A)/grayscale array (e.g. a FrameGrabber view) or PIL image
+
+        Returns:
+            Lines top to bottom
+        """
+        gray = to_gray(pixels)
+        lines, keys, misses = [], [], {}
+        for top, bottom, left, right in self.segment(gray):
+            crop = np.ascontiguousarray(gray[top:bottom, left:right])
+            digest = hashlib.blake2b(np.array(crop.shape, dtype=np.int32).tobytes(), digest_size=16)
+            digest.update(crop.data)
+            key = digest.digest()
+            with self._lock:
+                text = self._cache.get(key)
+                if text is not None:
+                    self._cache.move_to_end(key)
+            lines.append(OCRLine(top, bottom, left, right, text or "", text is not None))
+            keys.append(key)
+            if text is None:
+                misses.setdefault(key, crop)
+
+        if misses:
+            started = time.perf_counter()
+            results = self._recognize(list(misses.values()))
+            self.stats["ocr_seconds"] += time.perf_counter() - started
+            recognised = dict(zip(misses.keys(), results))
+            with self._lock:
+                for key, text in recognised.items():
+                    self._cache[key] = text
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            for line, key in zip(lines, keys):
+                if not line.cached:
+                    line.text = recognised[key]
+
+        self.stats["reads"] += 1
+        self.stats["lines"] += len(lines)
+        self.stats["hits"] += sum(line.cached for line in lines)
+        self.stats["misses"] += len(misses)
+        return lines
+
+    def read(self, pixels) -> str:
+        """Text of a region, lines joined top to bottom."""
+        return "\n".join(line.text for line in self.read_lines(pixels) if line.text)
+
+    def _recognize(self, crops: List[np.ndarray]) -> List[str]:
+        backend = self.backend
+        images = [Image.fromarray(crop, "L") for crop in crops]
+        if len(images) == 1 or self.max_workers <= 1:
+            return [backend.recognize(image).strip() for image in images]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ocr")
+        return [text.strip() for text in self._executor.map(backend.recognize, images)]
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        """Stop the worker pool and release tesseract handles."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._backend is not None and hasattr(self._backend, "close"):
+            self._backend.close()
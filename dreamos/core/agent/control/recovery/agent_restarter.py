@@ -25,6 +25,8 @@ import psutil
 from dreamos.core.agent_control.agent_operations import AgentOperations
 from dreamos.core.agent_control.agent_status import AgentStatus
 
+from .heartbeat_supervisor import HeartbeatSupervisor
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,7 +79,16 @@ class AgentRestarter:
         self._retry_counts: Dict[str, int] = {}
         self._last_restart: Dict[str, float] = {}
         self._monitoring = False
-        self._monitor_task = None
+
+        # Concurrent, adaptive heartbeat probing; restarts run on their own workers,
+        # which overlap their cooldowns but take turns on the keyboard
+        self._ui_lock = asyncio.Lock()
+        self.supervisor = HeartbeatSupervisor(
+            self.agent_ops.list_agents,
+            self._probe_agent,
+            self._recover_agent,
+            config={"restart_workers": 4, **self.config},
+        )
 
     async def initialize(self) -> bool:
         """Initialize the restarter.
@@ -314,8 +325,10 @@ class AgentRestarter:
             # Wait for cooldown
             await asyncio.sleep(self.retry_cooldown)
 
-            # Restart conversation
-            if not await self._restart_conversation(agent_id, resume_reason):
+            # Restart conversation (one agent at a time on the shared keyboard)
+            async with self._ui_lock:
+                restarted = await self._restart_conversation(agent_id, resume_reason)
+            if not restarted:
                 logger.error(f"Failed to restart conversation for agent {agent_id}")
                 return False
 
@@ -336,35 +349,44 @@ class AgentRestarter:
             logger.error(f"Error handling agent {agent_id} recovery: {e}")
             return False
 
-    async def _monitor_heartbeats(self) -> None:
-        """Monitor agent heartbeats and trigger recovery if needed."""
-        try:
-            while self._monitoring:
-                for agent_id in await self.agent_ops.list_agents():
-                    try:
-                        # Check heartbeat
-                        if await self._check_heartbeat(agent_id):
-                            # Update activity timestamp
-                            self.last_activity[agent_id] = time.time()
-                            continue
+    async def _probe_agent(self, agent_id: str) -> bool:
+        """Heartbeat probe used by the supervisor.
+
+        Args:
+            agent_id: ID of the agent to probe
+
+        Returns:
+            bool: True if the agent is healthy
+        """
+        if await self._check_heartbeat(agent_id):
+            # Update activity timestamp
+            self.last_activity[agent_id] = time.time()
+            return True
+        return False
 
-                        # Check if Cursor is idle
-                        if await self._check_cursor_idle(agent_id):
-                            logger.warning(f"Agent {agent_id} Cursor window idle")
-                            await self.handle_agent_error(agent_id)
-                            continue
+    async def _recover_agent(self, agent_id: str) -> bool:
+        """Recover an agent the supervisor found unhealthy.
 
-                        logger.warning(f"Agent {agent_id} heartbeat timeout")
-                        await self.handle_agent_error(agent_id)
+        Args:
+            agent_id: ID of the agent to recover
 
-                    except Exception as e:
-                        logger.error(f"Error monitoring agent {agent_id}: {e}")
+        Returns:
+            bool: True if recovery successful
+        """
+        # Check if Cursor is idle
+        if await self._check_cursor_idle(agent_id):
+            logger.warning(f"Agent {agent_id} Cursor window idle")
+        else:
+            logger.warning(f"Agent {agent_id} heartbeat timeout")
+        return await self.handle_agent_error(agent_id)
 
-                await asyncio.sleep(10)  # Check every 10 seconds
+    def get_metrics(self) -> Dict:
+        """Get heartbeat probing metrics, including detection latency.
 
-        except asyncio.CancelledError:
-            logger.info("Heartbeat monitoring cancelled")
-            raise
+        Returns:
+            Dict: Supervisor metrics
+        """
+        return self.supervisor.get_metrics()
 
     async def start(self) -> bool:
         """Start the restarter.
@@ -377,7 +399,7 @@ class AgentRestarter:
 
         try:
             self._monitoring = True
-            self._monitor_task = asyncio.create_task(self._monitor_heartbeats())
+            await self.supervisor.start()
             return True
 
         except Exception as e:
@@ -396,9 +418,7 @@ class AgentRestarter:
 
         try:
             self._monitoring = False
-            if self._monitor_task:
-                self._monitor_task.cancel()
-                self._monitor_task = None
+            await self.supervisor.stop()
             return True
 
         except Exception as e:
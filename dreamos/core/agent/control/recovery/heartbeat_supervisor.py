@@ -0,0 +1,260 @@
+"""
+Heartbeat Supervisor Module
+
+Probes agent heartbeats concurrently on adaptive per-agent schedules and
+hands failed agents to a bounded restart queue.
+
+- Every probe runs in its own task with a timeout, so one slow or hung
+  agent delays nobody else.
+- Healthy agents are probed less often: the interval grows by
+  ``heartbeat_growth`` up to ``heartbeat_max_interval``. A failed probe
+  drops the agent to ``heartbeat_min_interval`` so failure is confirmed
+  quickly.
+- After ``failure_threshold`` consecutive failures the agent is queued for
+  restart. Restarts run on ``restart_workers`` separate workers, so a long
+  restart never stalls probing.
+- Detection latency, from the last successful probe to the restart being
+  queued, is recorded in a histogram.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AgentHealth:
+    """Probe schedule and health of one agent."""
+    interval: float
+    due: float = 0.0
+    failures: int = 0
+    last_ok: Optional[float] = None
+    first_seen: float = 0.0
+    probing: bool = False
+    restarting: bool = False
+
+    @property
+    def degraded(self) -> bool:
+        return self.failures > 0
+
+
+class HeartbeatSupervisor:
+    """Concurrent, adaptive heartbeat probing with a bounded restart queue."""
+
+    def __init__(self,
+                 list_agents: Callable[[], Awaitable[List[str]]],
+                 probe: Callable[[str], Awaitable[bool]],
+                 restart: Callable[[str], Awaitable[bool]],
+                 config: Optional[Dict] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the supervisor.
+
+        Args:
+            list_agents: Coroutine returning the agents to supervise
+            probe: Coroutine returning True if an agent's heartbeat is healthy
+            restart: Coroutine restarting an agent
+            config: Optional configuration dictionary
+            clock: Time source
+        """
+        self.list_agents = list_agents
+        self.probe = probe
+        self.restart = restart
+        self.config = config or {}
+        self.clock = clock
+
+        self.base_interval = self.config.get("heartbeat_interval", 10.0)
+        self.min_interval = self.config.get("heartbeat_min_interval", 2.0)
+        self.max_interval = self.config.get("heartbeat_max_interval", 60.0)
+        self.growth = self.config.get("heartbeat_growth", 1.5)
+        self.probe_timeout = self.config.get("probe_timeout", 5.0)
+        self.failure_threshold = self.config.get("failure_threshold", 2)
+        self.max_concurrent_probes = self.config.get("max_concurrent_probes", 32)
+        self.restart_workers = self.config.get("restart_workers", 1)
+        self.restart_queue_size = self.config.get("restart_queue_size", 32)
+        self.refresh_interval = self.config.get("agent_refresh_interval", 30.0)
+
+        self.agents: Dict[str, AgentHealth] = {}
+        self.detection_latency = LatencyHistogram()
+        self.stats = {"probes": 0, "failures": 0, "timeouts": 0, "restarts": 0, "restart_drops": 0}
+
+        self._heap: List[Tuple[float, str]] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._restart_queue: Optional[asyncio.Queue] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._workers: List[asyncio.Task] = []
+        self._loop_task: Optional[asyncio.Task] = None
+        self._next_refresh = 0.0
+        self._running = False
+
+    async def start(self) -> None:
+        """Start probing and the restart workers."""
+        if self._running:
+            return
+        self._running = True
+        self._wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_probes)
+        self._restart_queue = asyncio.Queue(maxsize=self.restart_queue_size)
+        self._workers = [
+            asyncio.create_task(self._restart_worker(), name=f"restart-worker-{i}")
+            for i in range(self.restart_workers)
+        ]
+        self._loop_task = asyncio.create_task(self._run(), name="heartbeat-supervisor")
+
+    async def stop(self) -> None:
+        """Stop probing; in-flight probes and restarts are cancelled."""
+        self._running = False
+        tasks = [t for t in (self._loop_task, *self._workers, *self._tasks) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._workers = []
+        self._tasks.clear()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+
+    def _schedule(self, agent_id: str, delay: float) -> None:
+        state = self.agents[agent_id]
+        state.due = self.clock() + delay
+        heapq.heappush(self._heap, (state.due, agent_id))
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _refresh_agents(self) -> None:
+        try:
+            current = set(await self.list_agents())
+        except Exception as e:
+            logger.error(f"Error listing agents: {e}")
+            return
+        for agent_id in set(self.agents) - current:
+            del self.agents[agent_id]
+        now = self.clock()
+        for agent_id in current - set(self.agents):
+            self.agents[agent_id] = AgentHealth(interval=self.base_interval, first_seen=now)
+            self._schedule(agent_id, 0.0)
+
+    async def _run(self) -> None:
+        while self._running:
+            now = self.clock()
+            if now >= self._next_refresh:
+                await self._refresh_agents()
+                self._next_refresh = now + self.refresh_interval
+
+            # Launch every due probe; entries are stale if the agent was rescheduled or removed
+            while self._heap and self._heap[0][0] <= now:
+                due, agent_id = heapq.heappop(self._heap)
+                state = self.agents.get(agent_id)
+                if state is None or state.due != due or state.probing or state.restarting:
+                    continue
+                state.probing = True
+                task = asyncio.create_task(self._probe(agent_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            next_due = self._heap[0][0] if self._heap else math.inf
+            wait = max(0.0, min(next_due, self._next_refresh) - self.clock())
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Probing
+
+    async def _probe(self, agent_id: str) -> None:
+        async with self._semaphore:
+            try:
+                healthy = bool(await asyncio.wait_for(self.probe(agent_id), self.probe_timeout))
+            except asyncio.TimeoutError:
+                logger.warning(f"Heartbeat probe for agent {agent_id} timed out")
+                self.stats["timeouts"] += 1
+                healthy = False
+            except Exception as e:
+                logger.error(f"Error probing agent {agent_id}: {e}")
+                healthy = False
+        self.stats["probes"] += 1
+        self._record(agent_id, healthy)
+
+    def _record(self, agent_id: str, healthy: bool) -> None:
+        state = self.agents.get(agent_id)
+        if state is None:
+            return
+        state.probing = False
+        now = self.clock()
+
+        if healthy:
+            # Back to the base interval after trouble, otherwise back off gradually
+            state.interval = self.base_interval if state.degraded else min(
+                self.max_interval, state.interval * self.growth
+            )
+            state.failures = 0
+            state.last_ok = now
+            self._schedule(agent_id, state.interval)
+            return
+
+        self.stats["failures"] += 1
+        state.failures += 1
+        state.interval = self.min_interval
+        if state.failures < self.failure_threshold:
+            self._schedule(agent_id, state.interval)
+            return
+
+        logger.warning(f"Agent {agent_id} failed {state.failures} heartbeat probes, queueing restart")
+        try:
+            self._restart_queue.put_nowait(agent_id)
+        except asyncio.QueueFull:
+            logger.error(f"Restart queue full, agent {agent_id} will be retried")
+            self.stats["restart_drops"] += 1
+            self._schedule(agent_id, state.interval)
+            return
+        state.restarting = True
+        self.detection_latency.observe(now - (state.last_ok if state.last_ok is not None else state.first_seen))
+
+    async def _restart_worker(self) -> None:
+        while True:
+            agent_id = await self._restart_queue.get()
+            try:
+                await self.restart(agent_id)
+                self.stats["restarts"] += 1
+            except Exception as e:
+                logger.error(f"Error restarting agent {agent_id}: {e}")
+            finally:
+                self._restart_queue.task_done()
+                state = self.agents.get(agent_id)
+                if state is not None:
+                    # Fresh start: probe at the base rate; last_ok resets detection latency
+                    state.restarting = False
+                    state.failures = 0
+                    state.interval = self.base_interval
+                    state.last_ok = self.clock()
+                    self._schedule(agent_id, state.interval)
+
+    # ------------------------------------------------------------------
+    # Reporting
+
+    def get_metrics(self) -> Dict:
+        """Probe counters, per-agent schedule and detection latency histogram."""
+        return {
+            **self.stats,
+            "restart_queue": self._restart_queue.qsize() if self._restart_queue else 0,
+            "agents": {
+                agent_id: {
+                    "interval": state.interval,
+                    "failures": state.failures,
+                    "restarting": state.restarting,
+                }
+                for agent_id, state in self.agents.items()
+            },
+            "detection_latency": self.detection_latency.snapshot(),
+        }
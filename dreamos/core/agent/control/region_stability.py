@@ -0,0 +1,223 @@
+"""
+Region Stability
+---------------
+Perceptual-hash stability detection for screen regions.
+
+Each region is split into ``tile_size`` tiles. A frame is converted to
+grayscale and area-downsampled once, to ``hash_size`` x ``hash_size``
+cells per tile, and every tile gets a 64-bit perceptual hash (dHash by
+default, aHash optionally). A tile has changed
+when its hash is more than ``max_distance`` bits away from the reference
+hash, i.e. the hash taken at the last change. Hashes only see structure,
+so a tile also changes when its mean brightness moves by more than
+``max_mean_delta`` (a flat panel filling with a solid colour).
+
+Small flickers like a blinking caret move only a few bits of one tile and
+stay under the threshold. Known blinking areas can also be masked out
+entirely. A region is stable once no tile has changed for ``dwell``
+seconds.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+Rect = Tuple[int, int, int, int]  # (left, top, width, height), region relative
+
+
+@dataclass
+class StabilityResult:
+    """Outcome of one stability update."""
+    changed_tiles: List[Tuple[int, int]] = field(default_factory=list)  # (row, col)
+    stable: bool = False
+    stable_for: float = 0.0
+
+
+class RegionStabilityTracker:
+    """Tracks tile hashes of one region across frames."""
+
+    def __init__(self,
+                 tile_size: int = 64,
+                 hash_size: int = 8,
+                 max_distance: int = 3,
+                 max_mean_delta: float = 16.0,
+                 dwell: float = 1.0,
+                 method: str = "dhash",
+                 masks: Optional[List[Rect]] = None):
+        """Initialize the tracker.
+
+        Args:
+            tile_size: Tile edge in pixels
+            hash_size: Hash cells per tile edge (hash has hash_size ** 2 bits)
+            max_distance: Hamming distance (bits) a tile may drift before it counts as changed
+            max_mean_delta: Mean grayscale shift a tile may drift before it counts as changed
+            dwell: Seconds without changes before the region is stable
+            method: "dhash" (gradient) or "ahash" (mean)
+            masks: Region-relative rectangles to ignore, e.g. a blinking caret
+        """
+        if method not in ("dhash", "ahash"):
+            raise ValueError(f"Unknown hash method: {method}")
+        self.tile_size = tile_size
+        self.hash_size = hash_size
+        self.max_distance = max_distance
+        self.max_mean_delta = max_mean_delta
+        self.dwell = dwell
+        self.method = method
+        self.masks = list(masks or [])
+        positions = np.linspace(0, hash_size - 1, hash_size + 1)
+        self._dhash_left = np.floor(positions).astype(int)
+        self._dhash_right = np.minimum(self._dhash_left + 1, hash_size - 1)
+        self._dhash_frac = (positions - self._dhash_left).astype(np.float32)
+        self._dhash_keep = 1.0 - self._dhash_frac
+        self.reference: Optional[np.ndarray] = None  # (rows, cols, bits) bool
+        self.reference_means: Optional[np.ndarray] = None  # (rows, cols) float
+        self.last_change: Optional[float] = None
+
+    def add_mask(self, rect: Rect) -> None:
+        """Ignore a region-relative rectangle from now on."""
+        self.masks.append(tuple(rect))
+
+    def tile_hashes(self, pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-tile hash bits and mean brightness of a BGR(A) or grayscale region.
+
+        Returns:
+            Bool array of shape (tile rows, tile cols, hash_size ** 2) and
+            float array of shape (tile rows, tile cols)
+        """
+        if pixels.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            gray = cv2.cvtColor(pixels, code)
+        else:
+            gray = np.array(pixels, dtype=np.uint8)
+        for left, top, width, height in self.masks:
+            gray[max(0, top):max(0, top + height), max(0, left):max(0, left + width)] = 0
+
+        height, width = gray.shape
+        rows = max(1, -(-height // self.tile_size))
+        cols = max(1, -(-width // self.tile_size))
+        hs = self.hash_size
+        # Pad to whole tiles so the area downsample runs at an integer ratio (much faster)
+        gray = cv2.copyMakeBorder(gray, 0, rows * self.tile_size - height, 0, cols * self.tile_size - width,
+                                  cv2.BORDER_REPLICATE)
+        small = cv2.resize(gray, (cols * hs, rows * hs), interpolation=cv2.INTER_AREA)
+        tiles = small.reshape(rows, hs, cols, hs).transpose(0, 2, 1, 3).astype(np.float32)
+        means = tiles.mean(axis=(2, 3))
+        if self.method == "dhash":
+            # hs + 1 samples per row, interpolated inside the tile, give hs gradients
+            tiles = tiles[..., self._dhash_left] * self._dhash_keep + tiles[..., self._dhash_right] * self._dhash_frac
+            bits = tiles[..., 1:] > tiles[..., :-1]
+        else:
+            bits = tiles > means[..., None, None]
+        return bits.reshape(rows, cols, hs * hs), means
+
+    def update(self, pixels: np.ndarray, now: Optional[float] = None) -> StabilityResult:
+        """Hash a new frame of the region and update stability.
+
+        Args:
+            pixels: Region pixels (e.g. a FrameGrabber view)
+            now: Optional timestamp (defaults to time.monotonic())
+
+        Returns:
+            Changed tiles and whether the region is stable
+        """
+        now = time.monotonic() if now is None else now
+        hashes, means = self.tile_hashes(pixels)
+
+        if self.reference is None or self.reference.shape != hashes.shape:
+            rows, cols = hashes.shape[:2]
+            self.reference = hashes
+            self.reference_means = means
+            self.last_change = now
+            return StabilityResult([(r, c) for r in range(rows) for c in range(cols)], False, 0.0)
+
+        distance = np.count_nonzero(hashes != self.reference, axis=2)
+        moved = (distance > self.max_distance) | (np.abs(means - self.reference_means) > self.max_mean_delta)
+        changed = np.argwhere(moved)
+        if len(changed):
+            # Only changed tiles move their reference, so slow drift elsewhere still accumulates
+            self.reference[moved] = hashes[moved]
+            self.reference_means[moved] = means[moved]
+            self.last_change = now
+
+        stable_for = now - self.last_change
+        return StabilityResult(
+            [tuple(int(i) for i in tile) for tile in changed],
+            stable_for >= self.dwell,
+            stable_for
+        )
+
+    def content_fraction(self, pixels: np.ndarray, min_std: float = 8.0) -> float:
+        """Fraction of tiles holding something other than flat background.
+
+        Masked areas are filled with the region's median, so they neither
+        count as content nor add edges of their own.
+
+        Args:
+            pixels: Region pixels (BGR(A) or grayscale)
+            min_std: Gray-level standard deviation above which a tile has content
+
+        Returns:
+            Share of tiles, between 0 and 1, whose pixels are not flat
+        """
+        if pixels.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            gray = cv2.cvtColor(pixels, code)
+        else:
+            gray = np.array(pixels, dtype=np.uint8)
+        background = int(np.median(gray))
+        for left, top, width, height in self.masks:
+            gray[max(0, top):max(0, top + height), max(0, left):max(0, left + width)] = background
+
+        height, width = gray.shape
+        rows = max(1, -(-height // self.tile_size))
+        cols = max(1, -(-width // self.tile_size))
+        gray = cv2.copyMakeBorder(gray, 0, rows * self.tile_size - height, 0, cols * self.tile_size - width,
+                                  cv2.BORDER_REPLICATE)
+        tiles = gray.reshape(rows, self.tile_size, cols, self.tile_size).astype(np.float32)
+        return float(np.mean(tiles.std(axis=(1, 3)) > min_std))
+
+    def reset(self) -> None:
+        """Forget the reference; the next frame starts a new dwell."""
+        self.reference = None
+        self.reference_means = None
+        self.last_change = None
+
+
+class StabilityEngine:
+    """Stability trackers for named regions fed from a shared frame grabber."""
+
+    def __init__(self, grabber, **tracker_defaults):
+        """Initialize the engine.
+
+        Args:
+            grabber: FrameGrabber supplying region views
+            **tracker_defaults: Default RegionStabilityTracker arguments
+        """
+        self.grabber = grabber
+        self.tracker_defaults = tracker_defaults
+        self.trackers: Dict[str, RegionStabilityTracker] = {}
+
+    def watch(self, name: str, region: Tuple[int, int, int, int], **overrides) -> RegionStabilityTracker:
+        """Start tracking a region (screen coordinates, pyautogui convention)."""
+        self.grabber.register_region(name, region)
+        tracker = RegionStabilityTracker(**{**self.tracker_defaults, **overrides})
+        self.trackers[name] = tracker
+        return tracker
+
+    def unwatch(self, name: str) -> None:
+        self.trackers.pop(name, None)
+        self.grabber.unregister_region(name)
+
+    def update(self, max_age: float = 0.05) -> Dict[str, StabilityResult]:
+        """Update every region from one shared frame."""
+        return self.update_frame(self.grabber.get_frame(max_age))
+
+    def update_frame(self, frame) -> Dict[str, StabilityResult]:
+        """Update every region from a given frame, timed at its capture."""
+        return {
+            name: tracker.update(frame.view(self.grabber.regions[name]), frame.timestamp)
+            for name, tracker in self.trackers.items()
+        }
@@ -0,0 +1,410 @@
+"""
+Screenshot Archive Module
+
+Compact, indexed storage for debug screenshots.
+
+Screenshots are appended to pack segments instead of one PNG per shot:
+
+- The first shot of a name, a shot whose size changed, every
+  ``keyframe_interval``-th shot and the first shot in a new segment are
+  stored as PNG keyframes.
+- Every other shot is stored as a zlib-compressed XOR delta against the
+  previous shot of the same name. Consecutive debug screenshots differ in
+  a few places, so most of a delta is zeros.
+
+Every shot gets an index entry with its position, its chain and a tile
+perceptual-hash signature. The index lives in memory and in an
+append-only ``index.jsonl`` file. Lookups by agent, name and time go
+through the index. Similarity between two shots is computed from their
+signatures, so comparing never touches the pack files.
+
+Retention is byte-budgeted: whole segments are dropped, oldest first, once
+the archive outgrows ``byte_budget``. Chains never cross segments, so
+dropping a segment never breaks a younger shot.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .region_stability import RegionStabilityTracker
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_SIZE = 512  # shots are hashed at SIGNATURE_SIZE x SIGNATURE_SIZE, in 8 x 8 tiles
+
+
+@dataclass
+class ScreenshotEntry:
+    """Index entry of one archived screenshot."""
+    seq: int
+    agent_id: str
+    name: str
+    timestamp: float
+    segment: int
+    offset: int
+    length: int
+    keyframe: bool
+    prev_seq: Optional[int]
+    shape: Tuple[int, ...]
+    signature: str
+    similarity: Optional[float] = None  # to the previous shot of the same name
+    window: Dict = field(default_factory=dict)
+    region: Optional[Tuple[int, ...]] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScreenshotEntry":
+        data = dict(data)
+        data["shape"] = tuple(data["shape"])
+        if data.get("region") is not None:
+            data["region"] = tuple(data["region"])
+        return cls(**data)
+
+
+class ScreenshotArchive:
+    """Keyframe + delta screenshot store with an index and a byte budget."""
+
+    def __init__(self, root: Path,
+                 byte_budget: int = 256 * 1024 * 1024,
+                 segment_bytes: Optional[int] = None,
+                 keyframe_interval: int = 20,
+                 max_cached_frames: int = 8,
+                 compress_level: int = 6):
+        """Initialize the archive, loading an existing index from ``root``.
+
+        Args:
+            root: Archive directory
+            byte_budget: Maximum bytes of pack segments kept on disk
+            segment_bytes: Segment size before rolling over (default: budget / 8)
+            keyframe_interval: Maximum shots per keyframe chain
+            max_cached_frames: Last frames kept in memory to diff against
+            compress_level: zlib/PNG compression level
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.byte_budget = byte_budget
+        self.segment_bytes = segment_bytes or max(1, byte_budget // 8)
+        self.keyframe_interval = keyframe_interval
+        self.max_cached_frames = max_cached_frames
+        self.compress_level = compress_level
+
+        self._hasher = RegionStabilityTracker()
+        self._lock = threading.RLock()
+        self._entries: Dict[int, ScreenshotEntry] = {}
+        self._by_key: Dict[Tuple[str, str], List[ScreenshotEntry]] = {}
+        self._segment_sizes: Dict[int, int] = {}
+        # (agent_id, name) -> (seq, pixels, chain length) of the last shot, to diff against
+        self._last: "OrderedDict[Tuple[str, str], Tuple[int, np.ndarray, int]]" = OrderedDict()
+        self._index_file = None
+        self._seq = 0
+        self._segment = 1
+        self.stats = {"keyframes": 0, "deltas": 0, "dropped_segments": 0}
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # Paths and index
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:06d}.pack"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "index.jsonl"
+
+    def _load_index(self) -> None:
+        for path in self.root.glob("segment-*.pack"):
+            self._segment_sizes[int(path.stem.split("-")[1])] = path.stat().st_size
+        if self._index_path.exists():
+            with self._index_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = ScreenshotEntry.from_dict(json.loads(line))
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Skipping corrupt screenshot index line: {e}")
+                        continue
+                    if entry.segment in self._segment_sizes:
+                        self._add_entry(entry)
+        self._seq = max(self._entries, default=0)
+        # Never append to a segment written by an earlier run: start a fresh one
+        self._segment = max(self._segment_sizes, default=0) + 1
+
+    def _add_entry(self, entry: ScreenshotEntry) -> None:
+        self._entries[entry.seq] = entry
+        self._by_key.setdefault((entry.agent_id, entry.name), []).append(entry)
+
+    def _append_index(self, entry: ScreenshotEntry) -> None:
+        if self._index_file is None:
+            self._index_file = self._index_path.open("a", encoding="utf-8")
+        self._index_file.write(json.dumps(entry.to_dict()) + "\n")
+        self._index_file.flush()
+
+    def _rewrite_index(self) -> None:
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        temp_path = self._index_path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as f:
+            for seq in sorted(self._entries):
+                f.write(json.dumps(self._entries[seq].to_dict()) + "\n")
+        os.replace(temp_path, self._index_path)
+
+    # ------------------------------------------------------------------
+    # Writing
+
+    def signature(self, pixels: np.ndarray) -> str:
+        """Tile hash signature of an RGB/BGR or grayscale image."""
+        if pixels.ndim == 3:
+            pixels = cv2.cvtColor(pixels, cv2.COLOR_RGBA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_RGB2GRAY)
+        small = cv2.resize(pixels, (SIGNATURE_SIZE, SIGNATURE_SIZE), interpolation=cv2.INTER_AREA)
+        bits, means = self._hasher.tile_hashes(small)
+        return np.packbits(bits).tobytes().hex() + np.round(means).astype(np.uint8).tobytes().hex()
+
+    def add(self, agent_id: str, name: str, pixels: np.ndarray,
+            timestamp: Optional[float] = None, window: Optional[Dict] = None,
+            region: Optional[tuple] = None) -> ScreenshotEntry:
+        """Archive a screenshot.
+
+        Args:
+            agent_id: Agent the screenshot belongs to
+            name: Screenshot name; deltas are taken against the previous shot of this name
+            pixels: uint8 image array (channel order is stored as given)
+            timestamp: Capture time (defaults to now)
+            window: Optional active window details
+            region: Optional captured screen region
+
+        Returns:
+            The new index entry
+        """
+        pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+        key = (agent_id, name)
+        signature = self.signature(pixels)
+        with self._lock:
+            last = self._last.get(key)
+            previous = self._by_key.get(key, [])
+            previous = previous[-1] if previous else None
+            keyframe = (
+                last is None
+                or previous is None
+                or last[0] != previous.seq
+                or last[1].shape != pixels.shape
+                or last[2] >= self.keyframe_interval
+                or previous.segment != self._segment
+            )
+            if keyframe:
+                ok, encoded = cv2.imencode(".png", pixels, [cv2.IMWRITE_PNG_COMPRESSION, self.compress_level])
+                if not ok:
+                    raise ValueError(f"Could not encode screenshot {name}")
+                payload = encoded.tobytes()
+                chain = 1
+                self.stats["keyframes"] += 1
+            else:
+                payload = zlib.compress(np.bitwise_xor(pixels, last[1]).tobytes(), self.compress_level)
+                chain = last[2] + 1
+                self.stats["deltas"] += 1
+
+            self._seq += 1
+            segment_path = self._segment_path(self._segment)
+            offset = self._segment_sizes.get(self._segment, 0)
+            with segment_path.open("ab") as f:
+                f.write(payload)
+            self._segment_sizes[self._segment] = offset + len(payload)
+
+            entry = ScreenshotEntry(
+                seq=self._seq,
+                agent_id=agent_id,
+                name=name,
+                timestamp=time.time() if timestamp is None else timestamp,
+                segment=self._segment,
+                offset=offset,
+                length=len(payload),
+                keyframe=keyframe,
+                prev_seq=None if keyframe else previous.seq,
+                shape=tuple(pixels.shape),
+                signature=signature,
+                similarity=self.similarity(previous.signature, signature) if previous else None,
+                window=window or {},
+                region=tuple(region) if region is not None else None,
+            )
+            self._add_entry(entry)
+            self._append_index(entry)
+
+            self._last[key] = (entry.seq, pixels, chain)
+            self._last.move_to_end(key)
+            while len(self._last) > self.max_cached_frames:
+                self._last.popitem(last=False)
+
+            if self._segment_sizes[self._segment] >= self.segment_bytes:
+                self._segment += 1
+            self.enforce_budget()
+            return entry
+
+    def enforce_budget(self) -> int:
+        """Drop the oldest segments until the archive fits its byte budget.
+
+        Returns:
+            Number of segments dropped
+        """
+        dropped = 0
+        with self._lock:
+            while self.total_bytes > self.byte_budget:
+                oldest = min(self._segment_sizes)
+                if oldest >= self._segment and len(self._segment_sizes) == 1:
+                    break  # never drop the segment being written
+                self._drop_segment(oldest)
+                dropped += 1
+            if dropped:
+                self._rewrite_index()
+        return dropped
+
+    def _drop_segment(self, segment: int) -> None:
+        logger.debug(f"Dropping screenshot segment {segment}")
+        self._segment_path(segment).unlink(missing_ok=True)
+        del self._segment_sizes[segment]
+        for seq in [seq for seq, entry in self._entries.items() if entry.segment == segment]:
+            entry = self._entries.pop(seq)
+            self._by_key[(entry.agent_id, entry.name)].remove(entry)
+        for key in [key for key, entries in self._by_key.items() if not entries]:
+            del self._by_key[key]
+        if segment == self._segment:
+            self._segment += 1
+        self.stats["dropped_segments"] += 1
+
+    # ------------------------------------------------------------------
+    # Reading
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._segment_sizes.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, seq: int) -> Optional[ScreenshotEntry]:
+        return self._entries.get(seq)
+
+    def entries(self, agent_id: Optional[str] = None, name: Optional[str] = None,
+                since: Optional[float] = None, until: Optional[float] = None) -> List[ScreenshotEntry]:
+        """Index entries matching agent, name and time range, oldest first."""
+        with self._lock:
+            keys = [
+                key for key in self._by_key
+                if (agent_id is None or key[0] == agent_id) and (name is None or key[1] == name)
+            ]
+            found = []
+            for key in keys:
+                entries = self._by_key[key]
+                times = [entry.timestamp for entry in entries]
+                start = 0 if since is None else bisect.bisect_left(times, since)
+                end = len(entries) if until is None else bisect.bisect_right(times, until)
+                found.extend(entries[start:end])
+        return sorted(found, key=lambda entry: entry.seq)
+
+    def latest(self, agent_id: Optional[str] = None, name: Optional[str] = None) -> Optional[ScreenshotEntry]:
+        """Most recent entry for an agent and/or name."""
+        with self._lock:
+            candidates = [
+                entries[-1] for (agent, shot), entries in self._by_key.items()
+                if (agent_id is None or agent == agent_id) and (name is None or shot == name)
+            ]
+        return max(candidates, key=lambda entry: entry.seq, default=None)
+
+    def _read_payload(self, entry: ScreenshotEntry) -> bytes:
+        with self._segment_path(entry.segment).open("rb") as f:
+            f.seek(entry.offset)
+            return f.read(entry.length)
+
+    def load(self, entry: ScreenshotEntry) -> np.ndarray:
+        """Decode a screenshot by replaying its chain from the keyframe."""
+        with self._lock:
+            chain = [entry]
+            while not chain[-1].keyframe:
+                chain.append(self._entries[chain[-1].prev_seq])
+            payloads = [self._read_payload(link) for link in reversed(chain)]
+        pixels = cv2.imdecode(np.frombuffer(payloads[0], dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        pixels = pixels.reshape(entry.shape)
+        for payload in payloads[1:]:
+            delta = np.frombuffer(zlib.decompress(payload), dtype=np.uint8).reshape(entry.shape)
+            pixels = np.bitwise_xor(pixels, delta)
+        return pixels
+
+    def export(self, entry: ScreenshotEntry, path: Path) -> Path:
+        """Write a screenshot out as a standalone PNG.
+
+        Colour shots are taken to be RGB(A), the order ScreenshotLogger
+        archives PIL captures in; OpenCV writes BGR(A), so they are swapped.
+        """
+        pixels = self.load(entry)
+        if pixels.ndim == 3 and pixels.shape[2] in (3, 4):
+            pixels = cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR if pixels.shape[2] == 3 else cv2.COLOR_RGBA2BGRA)
+        if not cv2.imwrite(str(path), pixels):
+            raise ValueError(f"Could not write screenshot to {path}")
+        return Path(path)
+
+    @staticmethod
+    def similarity(signature1: str, signature2: str,
+                   max_distance: int = 3, max_mean_delta: float = 16.0) -> float:
+        """Fraction of signature tiles that did not change between two shots (0-1)."""
+        a = bytes.fromhex(signature1)
+        b = bytes.fromhex(signature2)
+        tiles = len(a) // 9  # 8 hash bytes + 1 mean byte per tile
+        bits_a = np.unpackbits(np.frombuffer(a[:tiles * 8], dtype=np.uint8)).reshape(tiles, 64)
+        bits_b = np.unpackbits(np.frombuffer(b[:tiles * 8], dtype=np.uint8)).reshape(tiles, 64)
+        means_a = np.frombuffer(a[tiles * 8:], dtype=np.uint8).astype(np.int16)
+        means_b = np.frombuffer(b[tiles * 8:], dtype=np.uint8).astype(np.int16)
+        distance = np.count_nonzero(bits_a != bits_b, axis=1)
+        same = (distance <= max_distance) & (np.abs(means_a - means_b) <= max_mean_delta)
+        return float(np.count_nonzero(same)) / tiles
+
+    def get_stats(self) -> Dict:
+        """Shot counts, on-disk bytes and bytes per screenshot."""
+        count = len(self._entries)
+        return {
+            **self.stats,
+            "screenshots": count,
+            "bytes": self.total_bytes,
+            "bytes_per_screenshot": self.total_bytes / count if count else 0.0,
+            "segments": len(self._segment_sizes),
+        }
+
+    def close(self) -> None:
+        """Close the index file."""
+        with self._lock:
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+            self._last.clear()
+
+
+_shared_archives: Dict[Path, ScreenshotArchive] = {}
+_shared_lock = threading.Lock()
+
+
+def get_screenshot_archive(root: Path, **kwargs) -> ScreenshotArchive:
+    """Process-wide archive for a directory, so loggers sharing it never write the same segment twice.
+
+    Args:
+        root: Archive directory
+        **kwargs: ScreenshotArchive arguments, used when the archive is first opened
+
+    Returns:
+        The shared archive for ``root``
+    """
+    key = Path(root).resolve()
+    with _shared_lock:
+        if key not in _shared_archives:
+            _shared_archives[key] = ScreenshotArchive(key, **kwargs)
+        return _shared_archives[key]
@@ -2,176 +2,163 @@
 Screenshot logging functionality for UI automation.
 
 This module provides a class for tracking and managing debug screenshots
-taken during UI automation operations.
+taken during UI automation operations. Screenshots are kept in a shared
+``ScreenshotArchive`` (keyframes plus deltas, byte-budgeted) rather than as
+one PNG per shot.
 """
 
 import time
 import logging
 from pathlib import Path
 from typing import Optional, List, Dict
+import numpy as np
 from PIL import Image
 import pygetwindow as gw
 
+from .screenshot_archive import ScreenshotArchive, ScreenshotEntry, get_screenshot_archive
+
 logger = logging.getLogger('agent_control.screenshot_logger')
 
 class ScreenshotLogger:
     """Tracks and manages debug screenshots for UI automation."""
-    
-    def __init__(self, agent_id: str, debug_dir: Optional[Path] = None):
+
+    def __init__(self, agent_id: str, debug_dir: Optional[Path] = None,
+                 archive: Optional[ScreenshotArchive] = None):
         """Initialize screenshot logger.
-        
+
         Args:
             agent_id: ID of the agent being monitored
             debug_dir: Optional custom debug directory
+            archive: Optional archive to store screenshots in (defaults to the
+                shared archive of ``debug_dir``)
         """
         self.agent_id = agent_id
         self.debug_dir = debug_dir or Path("runtime/debug/screenshots")
-        self.debug_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Track screenshots for this session
-        self.screenshots: List[Dict] = []
-        
-        # Create session directory
-        self.session_dir = self.debug_dir / f"{agent_id}_{time.strftime('%Y%m%d_%H%M%S')}"
-        self.session_dir.mkdir(exist_ok=True)
-        
+        self.archive = archive or get_screenshot_archive(self.debug_dir)
+        self.session_start = time.time()
+
         logger.debug(f"Initialized screenshot logger for {agent_id}")
-        logger.debug(f"Session directory: {self.session_dir}")
-        
-    def capture(self, name: str, region: Optional[tuple] = None) -> Optional[Path]:
+        logger.debug(f"Archive directory: {self.archive.root}")
+
+    def capture(self, name: str, region: Optional[tuple] = None) -> Optional[ScreenshotEntry]:
         """Capture a screenshot and log its details.
-        
+
         Args:
             name: Name for the screenshot
             region: Optional region to capture
-            
+
         Returns:
-            Path to saved screenshot if successful, None otherwise
+            Archive entry of the screenshot if successful, None otherwise
         """
         try:
             # Get active window info
             win = gw.getActiveWindow()
             window_info = {
                 "title": win.title if win else "No active window",
-                "position": win.topleft if win else (0, 0),
-                "size": win.size if win else (0, 0)
+                "position": tuple(win.topleft) if win else (0, 0),
+                "size": tuple(win.size) if win else (0, 0)
             }
-            
+
             # Take screenshot
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"{name}_{timestamp}.png"
-            path = self.session_dir / filename
-            
             screenshot = Image.grab(bbox=region)
-            screenshot.save(path)
-            
-            # Log screenshot details
-            screenshot_info = {
-                "timestamp": timestamp,
-                "name": name,
-                "path": str(path),
-                "window": window_info,
-                "region": region
-            }
-            self.screenshots.append(screenshot_info)
-            
-            logger.debug(f"Captured screenshot: {path}")
+            entry = self.archive.add(
+                self.agent_id, name, np.asarray(screenshot),
+                window=window_info, region=region
+            )
+
+            logger.debug(f"Captured screenshot {name} (#{entry.seq}, "
+                         f"{'keyframe' if entry.keyframe else 'delta'}, {entry.length} bytes)")
             logger.debug(f"Window info: {window_info}")
-            
-            return path
-            
+
+            return entry
+
         except Exception as e:
             logger.error(f"Error capturing screenshot: {e}")
             return None
-            
-    def get_screenshots(self, name: Optional[str] = None) -> List[Dict]:
+
+    def capture_screenshot(self, name: str, region: Optional[tuple] = None) -> Optional[ScreenshotEntry]:
+        """Alias for capture."""
+        return self.capture(name, region)
+
+    def get_screenshots(self, name: Optional[str] = None, since: Optional[float] = None) -> List[Dict]:
         """Get list of captured screenshots.
-        
+
         Args:
             name: Optional filter by screenshot name
-            
+            since: Optional start time (defaults to the start of this session)
+
         Returns:
             List of screenshot info dictionaries
         """
-        if name:
-            return [s for s in self.screenshots if s["name"] == name]
-        return self.screenshots
-        
+        since = self.session_start if since is None else since
+        return [entry.to_dict() for entry in self.archive.entries(self.agent_id, name, since=since)]
+
     def get_latest_screenshot(self, name: Optional[str] = None) -> Optional[Dict]:
         """Get the most recent screenshot.
-        
+
         Args:
             name: Optional filter by screenshot name
-            
+
         Returns:
             Most recent screenshot info dictionary or None
         """
-        screenshots = self.get_screenshots(name)
-        return screenshots[-1] if screenshots else None
-        
+        entry = self.archive.latest(self.agent_id, name)
+        return entry.to_dict() if entry else None
+
+    def load_screenshot(self, name: Optional[str] = None) -> Optional[Image.Image]:
+        """Decode the most recent screenshot.
+
+        Args:
+            name: Optional filter by screenshot name
+
+        Returns:
+            The screenshot image or None
+        """
+        entry = self.archive.latest(self.agent_id, name)
+        return Image.fromarray(self.archive.load(entry)) if entry else None
+
     def compare_screenshots(self, name1: str, name2: str) -> Optional[float]:
         """Compare two screenshots and return similarity score.
-        
+
+        The score is the fraction of perceptual-hash tiles that match, taken
+        from the signatures in the archive index; no image is decoded.
+
         Args:
             name1: Name of first screenshot
             name2: Name of second screenshot
-            
+
         Returns:
             Similarity score (0-1) or None if comparison fails
         """
         try:
-            shot1 = self.get_latest_screenshot(name1)
-            shot2 = self.get_latest_screenshot(name2)
-            
+            shot1 = self.archive.latest(self.agent_id, name1)
+            shot2 = self.archive.latest(self.agent_id, name2)
+
             if not shot1 or not shot2:
                 return None
-                
-            # Load images
-            img1 = Image.open(shot1["path"])
-            img2 = Image.open(shot2["path"])
-            
-            # Ensure same size
-            if img1.size != img2.size:
-                img2 = img2.resize(img1.size)
-                
-            # Calculate difference
-            diff = Image.new('RGB', img1.size)
-            for x in range(img1.width):
-                for y in range(img1.height):
-                    r1, g1, b1 = img1.getpixel((x, y))
-                    r2, g2, b2 = img2.getpixel((x, y))
-                    diff.putpixel((x, y), (
-                        abs(r1 - r2),
-                        abs(g1 - g2),
-                        abs(b1 - b2)
-                    ))
-                    
-            # Calculate similarity score
-            total_pixels = img1.width * img1.height
-            diff_pixels = sum(1 for x in range(img1.width) for y in range(img1.height)
-                            if any(c > 30 for c in diff.getpixel((x, y))))
-            similarity = 1 - (diff_pixels / total_pixels)
-            
+
+            similarity = self.archive.similarity(shot1.signature, shot2.signature)
+
             logger.debug(f"Screenshot comparison: {name1} vs {name2}")
             logger.debug(f"Similarity score: {similarity:.2f}")
-            
+
             return similarity
-            
+
         except Exception as e:
             logger.error(f"Error comparing screenshots: {e}")
             return None
-            
+
     def cleanup(self):
         """Clean up old screenshots."""
         try:
-            # Keep only last 10 sessions
-            sessions = sorted(self.debug_dir.glob(f"{self.agent_id}_*"))
-            if len(sessions) > 10:
-                for session in sessions[:-10]:
-                    logger.debug(f"Removing old session: {session}")
-                    for file in session.glob("*"):
-                        file.unlink()
-                    session.rmdir()
-                    
+            # Keep the archive within its byte budget
+            dropped = self.archive.enforce_budget()
+            if dropped:
+                logger.debug(f"Dropped {dropped} old screenshot segments")
+
         except Exception as e:
-            logger.error(f"Error cleaning up screenshots: {e}") 
+            logger.error(f"Error cleaning up screenshots: {e}")
+
+    def close(self):
+        """Flush the archive index."""
+        self.archive.close()
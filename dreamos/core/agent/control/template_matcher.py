@@ -0,0 +1,244 @@
+"""
+Template Matcher
+---------------
+Multi-scale, cached template matching for UI elements such as the Cursor
+copy button.
+
+A search goes through up to three stages, cheapest first:
+
+1. Cache - each search key (usually a screen region) keeps exact per-tile
+   hashes of the last frame it searched. If no tile changed, the previous
+   result is returned without matching; if a match exists and the changed
+   tiles miss it, it is still valid.
+2. Last-known location - the template at the scale it was last found is
+   matched in a small window around the previous hit.
+3. Full search - coarse to fine. The grayscale frame and every scaled
+   template are downsampled by ``coarse_factor`` and matched. The best
+   coarse candidates are then refined at full resolution in a few-pixel
+   window. When nothing was found before, only the bounding box of the
+   changed tiles is searched.
+
+Scales cover DPI differences between where the template was captured and
+the current display (e.g. 1.25 for a 100% template on a 125% display).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .region_stability import RegionStabilityTracker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TemplateMatch:
+    """Location of a template match, relative to the searched pixels."""
+    x: int
+    y: int
+    width: int
+    height: int
+    score: float
+    scale: float
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        return self.x + self.width // 2, self.y + self.height // 2
+
+
+@dataclass
+class _ScaledTemplate:
+    scale: float
+    full: np.ndarray
+    coarse: Optional[np.ndarray]  # None when too small to downsample
+
+
+@dataclass
+class _SearchState:
+    tracker: RegionStabilityTracker
+    match: Optional[TemplateMatch] = None
+    searched: bool = False
+
+
+def to_gray(pixels: np.ndarray) -> np.ndarray:
+    """Grayscale copy of BGR, BGRA or grayscale pixels."""
+    if pixels.ndim == 2:
+        return np.ascontiguousarray(pixels)
+    code = cv2.COLOR_BGRA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+    return cv2.cvtColor(pixels, code)
+
+
+class TemplateMatcher:
+    """Finds one template in frames across scales, reusing earlier work."""
+
+    def __init__(self, template: np.ndarray,
+                 scales: Sequence[float] = (0.67, 0.8, 1.0, 1.25, 1.5),
+                 threshold: float = 0.8,
+                 coarse_factor: float = 0.5,
+                 min_coarse_size: int = 8,
+                 roi_margin: int = 24,
+                 cache_tile_size: int = 32):
+        """Initialize the matcher.
+
+        Args:
+            template: Template image (BGR, BGRA or grayscale)
+            scales: Template scale factors to try
+            threshold: Minimum TM_CCOEFF_NORMED score for a match
+            coarse_factor: Downsampling of the coarse search (1.0 disables it)
+            min_coarse_size: Templates smaller than this (pixels) once
+                downsampled are matched at full resolution instead
+            roi_margin: Pixels searched around the last known location
+            cache_tile_size: Tile size of the change cache
+        """
+        self.threshold = threshold
+        self.coarse_factor = coarse_factor
+        self.roi_margin = roi_margin
+        self.cache_tile_size = cache_tile_size
+        self.templates: List[_ScaledTemplate] = []
+        gray = to_gray(template)
+        for scale in sorted(scales):
+            size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+            full = cv2.resize(gray, size, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+            coarse = None
+            if coarse_factor < 1 and min(full.shape) * coarse_factor >= min_coarse_size:
+                coarse = cv2.resize(full, None, fx=coarse_factor, fy=coarse_factor, interpolation=cv2.INTER_AREA)
+            self.templates.append(_ScaledTemplate(scale, full, coarse))
+        self._states: Dict[Hashable, _SearchState] = {}
+        self.stats = {"cached": 0, "roi": 0, "full": 0}
+
+    # ------------------------------------------------------------------
+    # Search
+
+    def find(self, pixels: np.ndarray, key: Hashable = None) -> Optional[TemplateMatch]:
+        """Find the template in ``pixels``.
+
+        Args:
+            pixels: Frame or region pixels (BGR, BGRA or grayscale)
+            key: Identifies the searched area across calls (e.g. the screen
+                region) so unchanged frames can reuse the previous result
+
+        Returns:
+            Best match at or above the threshold, or None
+        """
+        gray = to_gray(pixels)
+        state = self._states.get(key)
+        if state is None:
+            # Exact cache: any hash bit or brightness step counts as a change
+            tracker = RegionStabilityTracker(tile_size=self.cache_tile_size, max_distance=0,
+                                             max_mean_delta=0.5, dwell=0.0)
+            state = self._states[key] = _SearchState(tracker)
+
+        changed = state.tracker.update(gray).changed_tiles
+        if state.searched and not changed:
+            self.stats["cached"] += 1
+            return state.match
+        if state.searched and state.match is not None and not self._touches(changed, state.match):
+            self.stats["cached"] += 1
+            return state.match
+
+        match = None
+        if state.match is not None:
+            match = self._search_roi(gray, state.match)
+            if match is not None:
+                self.stats["roi"] += 1
+        if match is None:
+            bounds = None if not state.searched or state.match is not None else self._dirty_bounds(changed, gray.shape)
+            match = self._search_full(gray, bounds)
+            self.stats["full"] += 1
+
+        state.match = match
+        state.searched = True
+        return match
+
+    def forget(self, key: Hashable = None) -> None:
+        """Drop the cached result for a key."""
+        self._states.pop(key, None)
+
+    def _touches(self, tiles: List[Tuple[int, int]], match: TemplateMatch) -> bool:
+        size = self.cache_tile_size
+        rows = range(match.y // size, (match.y + match.height - 1) // size + 1)
+        cols = range(match.x // size, (match.x + match.width - 1) // size + 1)
+        return any(row in rows and col in cols for row, col in tiles)
+
+    def _dirty_bounds(self, tiles: List[Tuple[int, int]], shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """Pixel box around changed tiles, grown by the largest template."""
+        size = self.cache_tile_size
+        pad_y = max(t.full.shape[0] for t in self.templates)
+        pad_x = max(t.full.shape[1] for t in self.templates)
+        rows = [row for row, _ in tiles]
+        cols = [col for _, col in tiles]
+        top = max(0, min(rows) * size - pad_y)
+        left = max(0, min(cols) * size - pad_x)
+        bottom = min(shape[0], (max(rows) + 1) * size + pad_y)
+        right = min(shape[1], (max(cols) + 1) * size + pad_x)
+        return left, top, right, bottom
+
+    def _search_roi(self, gray: np.ndarray, last: TemplateMatch) -> Optional[TemplateMatch]:
+        template = next(t for t in self.templates if t.scale == last.scale)
+        match = self._match_window(gray, template, last.x, last.y, self.roi_margin)
+        return match if match is not None and match.score >= self.threshold else None
+
+    def _search_full(self, gray: np.ndarray,
+                     bounds: Optional[Tuple[int, int, int, int]] = None) -> Optional[TemplateMatch]:
+        left, top = 0, 0
+        if bounds is not None:
+            left, top, right, bottom = bounds
+            gray = gray[top:bottom, left:right]
+
+        coarse_gray = None
+        if self.coarse_factor < 1:
+            coarse_gray = cv2.resize(gray, None, fx=self.coarse_factor, fy=self.coarse_factor,
+                                     interpolation=cv2.INTER_AREA)
+
+        candidates = []
+        for template in self.templates:
+            if template.coarse is not None and coarse_gray is not None:
+                score, (x, y) = _best(coarse_gray, template.coarse)
+                if score is not None:
+                    x, y = round(x / self.coarse_factor), round(y / self.coarse_factor)
+                    candidates.append((score, template, x, y, True))
+            else:
+                score, (x, y) = _best(gray, template.full)
+                if score is not None:
+                    candidates.append((score, template, x, y, False))
+
+        best = None
+        for score, template, x, y, coarse in sorted(candidates, key=lambda c: c[0], reverse=True)[:2]:
+            if coarse:
+                # Refine the coarse hit at full resolution
+                match = self._match_window(gray, template, x, y, round(2 / self.coarse_factor))
+            else:
+                h, w = template.full.shape
+                match = TemplateMatch(x, y, w, h, score, template.scale)
+            if match is not None and (best is None or match.score > best.score):
+                best = match
+
+        if best is None or best.score < self.threshold:
+            return None
+        best.x += left
+        best.y += top
+        return best
+
+    def _match_window(self, gray: np.ndarray, template: _ScaledTemplate,
+                      x: int, y: int, margin: int) -> Optional[TemplateMatch]:
+        h, w = template.full.shape
+        x0, y0 = max(0, x - margin), max(0, y - margin)
+        window = gray[y0:y + h + margin, x0:x + w + margin]
+        score, (dx, dy) = _best(window, template.full)
+        if score is None:
+            return None
+        return TemplateMatch(x0 + dx, y0 + dy, w, h, score, template.scale)
+
+
+def _best(image: np.ndarray, template: np.ndarray) -> Tuple[Optional[float], Tuple[int, int]]:
+    """Best TM_CCOEFF_NORMED score and location, or None if the template does not fit."""
+    if template.shape[0] > image.shape[0] or template.shape[1] > image.shape[1]:
+        return None, (0, 0)
+    result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+    _, score, _, loc = cv2.minMaxLoc(result)
+    if not np.isfinite(score):
+        return None, (0, 0)
+    return float(score), loc
@@ -10,6 +10,7 @@ import signal
 import threading
 import time
 import os
+from concurrent.futures import Future
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
@@ -17,31 +18,32 @@ from typing import Dict, List, Optional, Tuple, Union
 import keyboard
 import pyautogui
 import pygetwindow as gw
-import pytesseract
 import screeninfo
 from PIL import Image
 from screeninfo import get_monitors
 
+from .clipboard_service import get_clipboard_service
 from .cursor_controller import CursorController
+from .frame_grabber import get_frame_grabber
+from .input_scheduler import InputScheduler, InputTarget
+from .ocr_service import OCRService
 from .response_capture import ResponseCapture
 from .screenshot_logger import ScreenshotLogger
 from .timing import (
     COPY_BUTTON_DELAY,
     DEBUG_SCREENSHOT_DELAY,
-    FOCUS_ESTABLISH_DELAY,
     MESSAGE_SEND_DELAY,
     RESPONSE_CAPTURE_DELAY,
-    TEXT_CLEAR_DELAY,
     TEXT_DELETE_DELAY,
-    TYPING_COMPLETE_DELAY,
     TYPING_INTERVAL,
     WINDOW_ACTIVATION_DELAY,
 )
-from ..shared.coordinate_manager import (
+from ...shared.coordinate_manager import (
     CoordinateManager,
-    load_coordinates,
     save_coordinates,
 )
+from ...shared.coordinate_utils import has_duplicate_coordinates, regions_overlap
+from ...shared.layout_engine import LayoutEngine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -62,6 +64,10 @@ class UIAutomation:
         self.calibrating = False
         self.screenshot_loggers = {}
         self.coordinate_manager = CoordinateManager()
+        self.layout = LayoutEngine(source_resolution=(1920, 1080))
+        self.ocr = OCRService()
+        self.clipboard = get_clipboard_service()
+        self.input_scheduler = InputScheduler()
         self.logger = logging.getLogger(__name__)
 
     def _get_screen_resolution(self) -> Tuple[int, int]:
@@ -128,36 +134,6 @@ class UIAutomation:
             self.logger.error(f"Error clicking: {e}")
             return False
 
-    def _type_text(self, text: str) -> bool:
-        """Type text.
-
-        Args:
-            text: Text to type
-
-        Returns:
-            bool: True if successful
-        """
-        try:
-            pyautogui.write(text)
-            return True
-        except Exception as e:
-            self.logger.error(f"Error typing text: {e}")
-            return False
-
-    def _clear_text(self) -> bool:
-        """Clear text field.
-
-        Returns:
-            bool: True if successful
-        """
-        try:
-            pyautogui.hotkey("ctrl", "a")
-            pyautogui.press("backspace")
-            return True
-        except Exception as e:
-            self.logger.error(f"Error clearing text: {e}")
-            return False
-
     def _delete_text(self, length: int) -> bool:
         """Delete text.
 
@@ -198,7 +174,7 @@ class UIAutomation:
             Screenshot image or None if failed
         """
         try:
-            return pyautogui.screenshot(region=(x, y, width, height))
+            return get_frame_grabber().region_image((x, y, width, height))
         except Exception as e:
             self.logger.error(f"Error capturing region: {e}")
             return None
@@ -216,10 +192,7 @@ class UIAutomation:
             Extracted text
         """
         try:
-            screenshot = self._capture_region(x, y, width, height)
-            if screenshot:
-                return pytesseract.image_to_string(screenshot)
-            return ""
+            return self.ocr.read(get_frame_grabber().region((x, y, width, height)))
         except Exception as e:
             self.logger.error(f"Error getting text from region: {e}")
             return ""
@@ -257,11 +230,14 @@ class UIAutomation:
             bool: True if valid, False otherwise
         """
         try:
-            self.coord_manager = CoordinateManager(coords)
-            return True
+            self.layout.load(coords)
+            issues = self.layout.validate()
         except Exception as e:
             self.logger.error(f"Invalid coordinates: {e}")
             return False
+        for issue in issues:
+            self.logger.error(f"Invalid coordinates for {issue.agent_id}: {issue.message}")
+        return not issues
 
     def _has_duplicate_coordinates(self, coords: Dict) -> bool:
         """Check if there are any duplicate coordinates.
@@ -272,7 +248,7 @@ class UIAutomation:
         Returns:
             bool: True if duplicates found
         """
-        return self.coord_manager.has_duplicate_coordinates(coords)
+        return has_duplicate_coordinates(coords)
 
     def _check_region_overlap(self, region1: Dict, region2: Dict) -> bool:
         """Check if two regions overlap.
@@ -284,10 +260,13 @@ class UIAutomation:
         Returns:
             bool: True if regions overlap
         """
-        return self.coord_manager.check_region_overlap(region1, region2)
+        return regions_overlap(region1, region2)
 
     def get_agent_coordinates(self, agent_id: str) -> Optional[Dict]:
-        """Get coordinates for an agent.
+        """Get coordinates for an agent, as recorded in config.
+
+        These are untransformed; ``click`` and ``move_to`` apply the
+        transform themselves.
 
         Args:
             agent_id: ID of the agent
@@ -295,10 +274,21 @@ class UIAutomation:
         Returns:
             Dictionary of coordinates or None if not found
         """
-        return self.coord_manager.get_agent_coordinates(agent_id)
+        return self.layout.recorded(agent_id)
+
+    def get_layout_coordinates(self, agent_id: str) -> Optional[Dict]:
+        """Get an agent's coordinates transformed to the current monitors.
+
+        Args:
+            agent_id: ID of the agent
+
+        Returns:
+            Dictionary of screen coordinates or None if not found
+        """
+        return self.layout.get(agent_id)
 
     def get_response_region(self, agent_id: str) -> Optional[Dict]:
-        """Get response region for an agent.
+        """Get response region for an agent, as recorded in config.
 
         Args:
             agent_id: ID of the agent
@@ -306,18 +296,18 @@ class UIAutomation:
         Returns:
             Response region coordinates or None if not found
         """
-        return self.coord_manager.get_response_region(agent_id)
+        coords = self.get_agent_coordinates(agent_id)
+        return coords.get("response_region") if coords else None
 
     def _load_config(self, config_path):
         """Load coordinates from config file."""
         try:
             self.logger.debug("Loading coordinates from file")
-            coords = load_coordinates(config_path)
-            self.coord_manager = CoordinateManager(coords)
-            self.logger.info(f"Loaded coordinates for {len(coords)} agents")
+            self.layout.load_file(config_path)
+            self.logger.info(f"Loaded coordinates for {len(self.layout.agents())} agents")
         except Exception as e:
             self.logger.error(f"Error loading config: {e}")
-            self.coord_manager = CoordinateManager({})
+            self.layout.load({})
 
     def _save_coordinates(self, agent_id: str, coords: Dict) -> bool:
         """Save coordinates for an agent.
@@ -331,7 +321,7 @@ class UIAutomation:
         """
         try:
             save_coordinates(coords, self.config_path)
-            self.coord_manager = CoordinateManager(load_coordinates(self.config_path))
+            self.layout.load_file(self.config_path)
             return True
         except Exception as e:
             self.logger.error(f"Error saving coordinates: {e}")
@@ -466,6 +456,9 @@ class UIAutomation:
     ) -> Tuple[int, int]:
         """Transform coordinates between resolutions.
 
+        Without explicit resolutions the layout engine's cached transform
+        for the current monitor topology is used.
+
         Args:
             x: X coordinate
             y: Y coordinate
@@ -475,6 +468,8 @@ class UIAutomation:
         Returns:
             Tuple of transformed coordinates
         """
+        if source_res is None and target_res is None:
+            return self.layout.transform_point(x, y)
         if not source_res:
             source_res = (1920, 1080)  # Default source
         if not target_res:
@@ -501,17 +496,27 @@ class UIAutomation:
         Returns:
             Transformed coordinate dictionary
         """
+        # Resolve the transform once for the whole dictionary
+        if source_res is None and target_res is None:
+            transform = self.layout.transform_point
+            scale_x, scale_y = self.layout.scale
+        else:
+            source_res = source_res or (1920, 1080)
+            target_res = target_res or self._get_screen_resolution()
+            scale_x = target_res[0] / source_res[0]
+            scale_y = target_res[1] / source_res[1]
+
+            def transform(x, y):
+                return int(x * scale_x), int(y * scale_y)
+
         transformed = {}
         for key, coord in coords.items():
+            x, y = transform(coord["x"], coord["y"])
             transformed[key] = {
-                "x": self._transform_coordinates(
-                    coord["x"], coord["y"], source_res, target_res
-                )[0],
-                "y": self._transform_coordinates(
-                    coord["x"], coord["y"], source_res, target_res
-                )[1],
-                "width": int(coord["width"] * (target_res[0] / source_res[0])),
-                "height": int(coord["height"] * (target_res[1] / source_res[1])),
+                "x": x,
+                "y": y,
+                "width": int(coord["width"] * scale_x),
+                "height": int(coord["height"] * scale_y),
             }
         return transformed
 
@@ -565,79 +570,75 @@ class UIAutomation:
             self.logger.error(f"Error getting default coordinates: {e}")
             return {}
 
-    def _click_focus(self, x: int, y: int, max_attempts: int = 3) -> Tuple[int, int]:
-        """Click to focus window at coordinates.
+    def _input_target(self, agent_id: str) -> Optional[InputTarget]:
+        """Get the input box target for an agent.
 
         Args:
-            x: X coordinate
-            y: Y coordinate
-            max_attempts: Maximum number of click attempts
+            agent_id: ID of the agent
 
         Returns:
-            Tuple of final coordinates
+            InputTarget or None if the agent has no input box
         """
-        for attempt in range(max_attempts):
-            try:
-                # Transform coordinates
-                screen_x, screen_y = self._transform_coordinates(x, y)
+        coords = self.get_layout_coordinates(agent_id)
+        if not coords:
+            self.logger.error(f"No coordinates found for agent {agent_id}")
+            return None
 
-                # Click to focus
-                pyautogui.click(screen_x, screen_y)
+        input_box = coords.get("input_box", {})
+        if not input_box:
+            self.logger.error("No input box coordinates found")
+            return None
 
-                # Wait for focus
-                time.sleep(FOCUS_ESTABLISH_DELAY)
+        # Layout coordinates are already transformed for the current monitors
+        return InputTarget(agent_id, input_box["x"], input_box["y"], coords.get("window_title"))
 
-                return screen_x, screen_y
-            except Exception as e:
-                self.logger.warning(f"Click focus attempt {attempt + 1} failed: {e}")
-                if attempt == max_attempts - 1:
-                    raise
-                time.sleep(0.5)
+    def send_message_async(self, agent_id: str, message: str) -> Future:
+        """Queue a message for an agent without waiting for it.
 
-        return x, y
-
-    def send_message(self, agent_id: str, message: str) -> bool:
-        """Send message to agent.
+        Messages to different agents are pipelined by the input scheduler.
 
         Args:
             agent_id: ID of the agent
             message: Message to send
 
         Returns:
-            bool: True if successful
+            Future resolving to True if the message was sent
         """
         try:
-            # Get coordinates
-            coords = self.get_agent_coordinates(agent_id)
-            if not coords:
-                self.logger.error(f"No coordinates found for agent {agent_id}")
-                return False
+            target = self._input_target(agent_id)
+        except Exception as e:
+            self.logger.error(f"Error sending message: {e}")
+            target = None
+        if target is None:
+            future = Future()
+            future.set_result(False)
+            return future
+        return self.input_scheduler.submit(target, message)
 
-            # Click input box
-            input_box = coords.get("input_box", {})
-            if not input_box:
-                self.logger.error("No input box coordinates found")
-                return False
+    def send_message(self, agent_id: str, message: str) -> bool:
+        """Send message to agent.
 
-            x, y = input_box["x"], input_box["y"]
-            screen_x, screen_y = self._click_focus(x, y)
+        Args:
+            agent_id: ID of the agent
+            message: Message to send
 
-            # Clear existing text
-            self._clear_text()
-            time.sleep(TEXT_CLEAR_DELAY)
+        Returns:
+            bool: True if successful
+        """
+        return self.send_message_async(agent_id, message).result()
 
-            # Type message
-            self._type_text(message)
-            time.sleep(TYPING_COMPLETE_DELAY)
+    def broadcast_message(self, agent_ids: List[str], message: str) -> Dict[str, bool]:
+        """Send the same message to several agents, pipelined.
 
-            # Send message
-            pyautogui.press("enter")
-            time.sleep(MESSAGE_SEND_DELAY)
+        Args:
+            agent_ids: IDs of the agents
+            message: Message to send
 
-            return True
-        except Exception as e:
-            self.logger.error(f"Error sending message: {e}")
-            return False
+        Returns:
+            Dict of agent ID to success
+        """
+        futures = {agent_id: self.send_message_async(agent_id, message) for agent_id in agent_ids}
+        return {agent_id: future.result() for agent_id, future in futures.items()}
 
     def _load_onboarding_prompt(self, agent_id: str) -> str:
         """Load onboarding prompt for agent.
@@ -677,49 +678,16 @@ class UIAutomation:
                 self.logger.error("No onboarding prompt available")
                 return False
 
-            # Split message if needed
-            messages = self._split_message(prompt)
-
-            # Send each message
-            for msg in messages:
-                if not self.send_message(agent_id, msg):
-                    self.logger.error("Failed to send onboarding message")
-                    return False
-                time.sleep(MESSAGE_SEND_DELAY)
+            # Pasted in one piece, so no need to split long prompts
+            if not self.send_message(agent_id, prompt):
+                self.logger.error("Failed to send onboarding message")
+                return False
 
             return True
         except Exception as e:
             self.logger.error(f"Error during onboarding: {e}")
             return False
 
-    def _split_message(self, message: str, max_length: int = 100) -> list:
-        """Split message into smaller chunks.
-
-        Args:
-            message: Message to split
-            max_length: Maximum length per chunk
-
-        Returns:
-            List of message chunks
-        """
-        if len(message) <= max_length:
-            return [message]
-
-        chunks = []
-        current_chunk = ""
-
-        for word in message.split():
-            if len(current_chunk) + len(word) + 1 <= max_length:
-                current_chunk += word + " "
-            else:
-                chunks.append(current_chunk.strip())
-                current_chunk = word + " "
-
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-
-        return chunks
-
     def cleanup(self):
         """Clean up resources."""
         try:
@@ -731,6 +699,9 @@ class UIAutomation:
             for logger in self.screenshot_loggers.values():
                 logger.close()
 
+            self.ocr.close()
+            self.input_scheduler.stop()
+
             self.logger.debug("Cleanup completed")
         except Exception as e:
             self.logger.error(f"Error during cleanup: {e}")
@@ -839,6 +810,18 @@ class UIAutomation:
         try:
             # Get coordinates for the agent
             coords = self.coords.get(agent_id)
+
+            # Copy button first; OCR only when no copy reached the clipboard
+            if coords and "copy_button" in coords:
+                capture = self.clipboard.capture(
+                    agent_id, lambda: self.click_copy_button(agent_id)
+                )
+                if capture:
+                    self.logger.debug(
+                        f"Copied response for {agent_id} in {capture.latency * 1000:.0f} ms"
+                    )
+                    return capture.text.strip()
+
             if not coords or "response_region" not in coords:
                 self.logger.error(
                     f"No response region coordinates found for {agent_id}"
@@ -866,23 +849,14 @@ class UIAutomation:
                 self.logger.error(f"Invalid response region dimensions for {agent_id}")
                 return None
 
-            # Capture screenshot of response region
+            # Response region of the shared frame
             region_width = right - left
             region_height = bottom - top
-            screenshot = pyautogui.screenshot(
-                region=(left, top, region_width, region_height)
-            )
-
-            # Convert screenshot to PIL Image if it's not already
-            if not isinstance(screenshot, Image.Image):
-                screenshot = Image.fromarray(screenshot)
-
-            # Convert to grayscale for better OCR
-            screenshot = screenshot.convert("L")
+            view = get_frame_grabber().region((left, top, region_width, region_height))
 
-            # Use OCR to extract text
+            # OCR changed lines only; unchanged and scrolled lines come from the cache
             try:
-                text = pytesseract.image_to_string(screenshot)
+                text = self.ocr.read(view)
                 if text:
                     self.logger.debug(f"Captured response for {agent_id}: {text}")
                     return text.strip()
@@ -2,25 +2,51 @@
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
 import time
-from typing import Tuple
+from typing import List, Optional, Tuple
 
-import pyautogui
+from .frame_grabber import get_frame_grabber
+from .region_stability import RegionStabilityTracker
 
 
 def hash_screen_region(region: Tuple[int, int, int, int]) -> str:
-    """Capture a region of the screen and return an MD5 hash."""
-    screenshot = pyautogui.screenshot(region=region)
-    return hashlib.md5(screenshot.tobytes()).hexdigest()
-
-
-def has_region_stabilized(region: Tuple[int, int, int, int], duration: int = 5) -> bool:
-    """Return True if the region is unchanged for the given duration."""
-    previous = hash_screen_region(region)
-    for _ in range(duration):
-        time.sleep(1)
-        current = hash_screen_region(region)
-        if current != previous:
+    """Hash a region of the shared screen frame (MD5)."""
+    return get_frame_grabber().region_hash(region)
+
+
+def has_region_stabilized(region: Tuple[int, int, int, int], duration: int = 5,
+                          poll_interval: float = 0.25,
+                          masks: Optional[List[Tuple[int, int, int, int]]] = None) -> bool:
+    """Return True if the region is unchanged for the given duration.
+
+    Changes are judged per tile by perceptual hash, so a blinking caret or
+    other small flicker does not count; ``masks`` ignores known noisy areas.
+    Returns False as soon as a tile changes.
+    """
+    tracker = RegionStabilityTracker(dwell=duration, masks=masks)
+    tracker.update(get_frame_grabber().region(region, max_age=poll_interval))
+    while True:
+        time.sleep(poll_interval)
+        result = tracker.update(get_frame_grabber().region(region, max_age=poll_interval))
+        if result.changed_tiles:
             return False
-    return True
+        if result.stable:
+            return True
+
+
+async def wait_for_region_stable(region: Tuple[int, int, int, int], dwell: float = 2.0,
+                                 timeout: float = 60.0, poll_interval: float = 0.25,
+                                 masks: Optional[List[Tuple[int, int, int, int]]] = None) -> bool:
+    """Wait until the region has not changed for ``dwell`` seconds.
+
+    Unlike has_region_stabilized, changes restart the dwell instead of
+    failing. Returns False if the region is still changing at ``timeout``.
+    """
+    tracker = RegionStabilityTracker(dwell=dwell, masks=masks)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if tracker.update(get_frame_grabber().region(region, max_age=poll_interval)).stable:
+            return True
+        await asyncio.sleep(poll_interval)
+    return False
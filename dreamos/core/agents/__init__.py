@@ -1,8 +1,10 @@
 # AUTO-GENERATED __init__.py
 # DO NOT EDIT MANUALLY - changes may be overwritten
 
+from . import fix_scheduler
 from . import perpetual_test_fixer
 
 __all__ = [
+    'fix_scheduler',
     'perpetual_test_fixer',
 ]
@@ -0,0 +1,228 @@
+"""
+Fix Dispatch Scheduler
+--------------------
+Assigns failing tests to agents concurrently and verifies their fixes in
+parallel.
+
+Failures are grouped into one batch per test file, handed over once the
+file has finished running. Ready batches go to the
+least-loaded agents, up to ``max_in_flight`` batches per agent, and prompts
+are sent concurrently. Responses are verified with at most
+``max_parallel_verifications`` running at once. A batch whose fix fails is
+retried after an exponential backoff, and batches with more failed attempts
+are dispatched after those with fewer, so repeatedly unfixable tests stop
+starving the rest.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGENTS = ["agent1", "agent2", "agent3", "agent4"]
+
+
+class FixBatch:
+    """Failing tests of one file awaiting a fix."""
+
+    __slots__ = ("test_file", "test_names", "attempts", "not_before", "first_seen", "agent_id")
+
+    def __init__(self, test_file: str):
+        self.test_file = test_file
+        self.test_names: List[str] = []
+        self.attempts = 0
+        self.not_before = 0.0
+        self.first_seen = time.monotonic()
+        self.agent_id: Optional[str] = None
+
+
+class FixDispatchScheduler:
+    """Concurrent, budgeted dispatch of failing tests to agents."""
+
+    def __init__(self,
+                 config: Optional[Dict[str, Any]] = None,
+                 send: Optional[Callable[[str, FixBatch], Awaitable[Any]]] = None,
+                 verify: Optional[Callable[[str, str, str], Awaitable[bool]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the scheduler.
+
+        Args:
+            config: Optional scheduler configuration
+            send: ``send(agent_id, batch)`` delivers a batch's prompt to an agent
+            verify: ``verify(agent_id, test_file, response)`` applies and checks a fix
+            clock: Monotonic clock in seconds
+        """
+        self.config = config or {}
+        self.agents: List[str] = list(self.config.get("agents", DEFAULT_AGENTS))
+        self.max_in_flight = self.config.get("max_in_flight", 2)
+        self.max_parallel_verifications = self.config.get("max_parallel_verifications", 4)
+        self.backoff_base = self.config.get("backoff_base", 60.0)
+        self.backoff_max = self.config.get("backoff_max", 3600.0)
+        self.send = send
+        self.verify = verify
+        self.clock = clock
+
+        self.batches: Dict[str, FixBatch] = {}  # test_file -> batch
+        self.assignments: Dict[str, str] = {}  # test_file -> agent_id
+        self.in_flight: Dict[str, Set[str]] = {agent: set() for agent in self.agents}
+        self._verify_slots = asyncio.Semaphore(self.max_parallel_verifications)
+        self._dispatch_lock = asyncio.Lock()
+        self.stats = {"dispatched": 0, "fixed": 0, "failed_attempts": 0, "verifications": 0}
+
+    # ------------------------------------------------------------------
+    # Failures
+
+    def add_failure(self, test_file: str, test_name: str) -> FixBatch:
+        """Record a failing test in its file's batch."""
+        batch = self.batches.get(test_file)
+        if batch is None:
+            batch = self.batches[test_file] = FixBatch(test_file)
+        if test_name not in batch.test_names:
+            batch.test_names.append(test_name)
+        return batch
+
+    def set_failures(self, test_file: str, test_names: List[str]) -> FixBatch:
+        """Replace a file's batch with the failures of its latest run.
+
+        A batch already sent to an agent keeps the tests it was sent with;
+        its fix is verified against the whole file, and a retry picks up
+        the names from the next run.
+        """
+        batch = self.batches.get(test_file)
+        if batch is None:
+            batch = self.batches[test_file] = FixBatch(test_file)
+        if batch.agent_id is None:
+            batch.test_names = list(test_names)
+        return batch
+
+    def discard(self, test_file: str) -> None:
+        """Drop a file's batch once its tests pass.
+
+        A response still outstanding for it is ignored when it arrives.
+        """
+        batch = self.batches.pop(test_file, None)
+        if batch is not None and batch.agent_id is not None:
+            self.in_flight.get(batch.agent_id, set()).discard(test_file)
+            self.assignments.pop(test_file, None)
+            batch.agent_id = None
+
+    def reset(self) -> None:
+        """Forget all batches and assignments (e.g. after a green run)."""
+        self.batches.clear()
+        self.assignments.clear()
+        for tasks in self.in_flight.values():
+            tasks.clear()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+
+    def available_agent(self) -> Optional[str]:
+        """Least-loaded agent with in-flight capacity, if any."""
+        candidates = [a for a in self.agents if len(self.in_flight[a]) < self.max_in_flight]
+        return min(candidates, key=lambda a: len(self.in_flight[a])) if candidates else None
+
+    def ready_batches(self) -> List[FixBatch]:
+        """Unassigned batches past their backoff, fewest attempts first."""
+        now = self.clock()
+        ready = [
+            b for b in self.batches.values()
+            if b.agent_id is None and b.not_before <= now
+        ]
+        return sorted(ready, key=lambda b: (b.attempts, b.first_seen))
+
+    async def dispatch(self) -> int:
+        """Assign ready batches to agents and send their prompts concurrently.
+
+        Returns:
+            Number of batches dispatched
+        """
+        async with self._dispatch_lock:
+            assigned = []
+            for batch in self.ready_batches():
+                agent_id = self.available_agent()
+                if agent_id is None:
+                    break
+                batch.agent_id = agent_id
+                self.assignments[batch.test_file] = agent_id
+                self.in_flight[agent_id].add(batch.test_file)
+                assigned.append(batch)
+
+        if not assigned:
+            return 0
+        self.stats["dispatched"] += len(assigned)
+        if self.send is not None:
+            results = await asyncio.gather(
+                *(self.send(batch.agent_id, batch) for batch in assigned),
+                return_exceptions=True
+            )
+            for batch, result in zip(assigned, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Sending {batch.test_file} to {batch.agent_id} failed: {result}")
+                    self._release(batch, fixed=False)
+        return len(assigned)
+
+    # ------------------------------------------------------------------
+    # Responses
+
+    async def handle_response(self, agent_id: str, test_file: str, response: str) -> bool:
+        """Verify an agent's fix, with bounded parallelism, and redispatch.
+
+        Args:
+            agent_id: ID of responding agent
+            test_file: Test file being fixed
+            response: Agent's proposed fix
+
+        Returns:
+            True if the fix was verified
+        """
+        batch = self.batches.get(test_file)
+        if batch is None or batch.agent_id != agent_id:
+            logger.warning(f"Ignoring response from {agent_id} for unassigned {test_file}")
+            return False
+
+        async with self._verify_slots:
+            self.stats["verifications"] += 1
+            try:
+                fixed = bool(await self.verify(agent_id, test_file, response))
+            except Exception as e:
+                logger.error(f"Verifying fix for {test_file} from {agent_id} failed: {e}")
+                fixed = False
+
+        self._release(batch, fixed)
+        await self.dispatch()
+        return fixed
+
+    def _release(self, batch: FixBatch, fixed: bool) -> None:
+        """Free the agent's slot and retire or back off the batch."""
+        if batch.agent_id is not None:
+            self.in_flight.get(batch.agent_id, set()).discard(batch.test_file)
+        self.assignments.pop(batch.test_file, None)
+        batch.agent_id = None
+
+        if fixed:
+            self.batches.pop(batch.test_file, None)
+            self.stats["fixed"] += 1
+            return
+
+        batch.attempts += 1
+        self.stats["failed_attempts"] += 1
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (batch.attempts - 1))
+        batch.not_before = self.clock() + delay
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        # Retry once the backoff expires even if nothing else triggers dispatch
+        loop.call_later(delay, lambda: asyncio.ensure_future(self.dispatch()))
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue, in-flight and backoff state."""
+        now = self.clock()
+        return {
+            **self.stats,
+            "pending": len(self.batches),
+            "in_flight": {agent: len(files) for agent, files in self.in_flight.items()},
+            "backing_off": sum(1 for b in self.batches.values() if b.agent_id is None and b.not_before > now)
+        }
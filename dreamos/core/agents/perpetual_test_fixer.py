@@ -9,7 +9,6 @@ Coordinates test failures with agents and Codex validation:
 """
 
 import asyncio
-import json
 import logging
 import os
 import time
@@ -21,7 +20,9 @@ import pytest
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from ..autonomy.base.result_stream import TestResultEvent, run_pytest_streaming
 from ..codex.codex_quality_controller import CodexController
+from .fix_scheduler import FixBatch, FixDispatchScheduler
 from ..logging.log_manager import LogManager
 
 # Configure logging
@@ -53,10 +54,18 @@ class PerpetualTestFixer:
         # Initialize components
         self.codex = CodexController(config)
         
+        # Concurrent dispatch of failing test files to agents
+        self.scheduler = FixDispatchScheduler(
+            self.config.get("dispatch", {}),
+            send=self._send_batch,
+            verify=self._verify_fix
+        )
+        
         # Track state
         self.failing_tests: Dict[str, List[str]] = {}  # test_file -> [test_names]
-        self.agent_assignments: Dict[str, str] = {}  # test_file -> agent_id
+        self.agent_assignments: Dict[str, str] = self.scheduler.assignments  # test_file -> agent_id
         self.fixed_tests: Set[str] = set()
+        self.last_run_metrics: Dict = {}
         
         # Setup file watcher
         self.observer = Observer()
@@ -134,30 +143,31 @@ class PerpetualTestFixer:
             True if all tests pass, False otherwise
         """
         try:
-            # Run pytest
-            process = await asyncio.create_subprocess_exec(
-                "pytest",
-                "-v",
-                "--json-report",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+            # Failing test names per file in this run, routed once the file is done
+            results: Dict[str, List[str]] = {}
+            
+            async def on_result(event: TestResultEvent):
+                await self._on_test_result(results, event)
+                
+            async def on_file_finished(test_file: str):
+                await self._finish_file(results, test_file)
+                
+            run = await run_pytest_streaming(
+                ["pytest", "-v"], on_result=on_result, on_file_finished=on_file_finished
             )
-            stdout, stderr = await process.communicate()
+            self.last_run_metrics = run.metrics()
+            
+            # Files the stream did not report as finished (e.g. under xdist)
+            for test_file in list(results):
+                await self._finish_file(results, test_file)
             
             # Parse test results
-            if process.returncode == 0:
+            if run.exit_code == 0:
                 self.failing_tests.clear()
-                self.agent_assignments.clear()
+                self.scheduler.reset()
                 self.fixed_tests.clear()
                 return True
                 
-            # Process failures
-            report = json.loads(stdout)
-            self._process_failures(report)
-            
-            # Route failures to agents
-            await self._route_failures()
-            
             return False
             
         except Exception as e:
@@ -169,45 +179,37 @@ class PerpetualTestFixer:
             )
             return False
             
-    def _process_failures(self, report: Dict):
-        """Process pytest failure report."""
-        for test in report.get("tests", []):
-            if test.get("outcome") == "failed":
-                test_file = test.get("nodeid", "").split("::")[0]
-                test_name = test.get("nodeid", "").split("::")[-1]
-                
-                if test_file not in self.failing_tests:
-                    self.failing_tests[test_file] = []
-                self.failing_tests[test_file].append(test_name)
+    async def _on_test_result(self, results: Dict[str, List[str]], event: TestResultEvent):
+        """Record a streamed result until its file has finished."""
+        test_names = results.setdefault(event.test_file, [])
+        if event.failed and event.test_name not in test_names:
+            test_names.append(event.test_name)
+            
+    async def _finish_file(self, results: Dict[str, List[str]], test_file: str):
+        """Route a finished file's failures, or drop its batch if it passed."""
+        test_names = results.pop(test_file, None)
+        if test_names is None:
+            return
+        if not test_names:
+            self.failing_tests.pop(test_file, None)
+            self.scheduler.discard(test_file)
+            return
+        self.failing_tests[test_file] = test_names
+        self.scheduler.set_failures(test_file, test_names)
+        await self._route_failures()
                 
     async def _route_failures(self):
         """Route test failures to appropriate agents."""
-        for test_file, test_names in self.failing_tests.items():
-            # Skip if already assigned
-            if test_file in self.agent_assignments:
-                continue
-                
-            # Find available agent
-            agent_id = await self._get_available_agent()
-            if not agent_id:
-                continue
-                
-            # Assign test to agent
-            self.agent_assignments[test_file] = agent_id
-            
-            # Get agent's debug prompt
-            prompt = await self._get_agent_prompt(agent_id, test_file, test_names)
-            
-            # Send prompt to agent
-            await self._send_to_agent(agent_id, prompt)
+        await self.scheduler.dispatch()
             
     async def _get_available_agent(self) -> Optional[str]:
-        """Get next available agent ID."""
-        # Simple round-robin for now
-        assigned_agents = set(self.agent_assignments.values())
-        all_agents = {"agent1", "agent2", "agent3", "agent4"}
-        available = all_agents - assigned_agents
-        return next(iter(available)) if available else None
+        """Get the least-loaded agent with spare capacity."""
+        return self.scheduler.available_agent()
+        
+    async def _send_batch(self, agent_id: str, batch: FixBatch):
+        """Send a batch of failing tests to an agent."""
+        prompt = await self._get_agent_prompt(agent_id, batch.test_file, batch.test_names)
+        await self._send_to_agent(agent_id, prompt)
         
     async def _get_agent_prompt(self, agent_id: str, test_file: str, test_names: List[str]) -> str:
         """Get debug prompt for agent."""
@@ -241,6 +243,10 @@ Please analyze and fix the failing tests.
         Returns:
             True if fix was successful, False otherwise
         """
+        return await self.scheduler.handle_response(agent_id, test_file, response)
+        
+    async def _verify_fix(self, agent_id: str, test_file: str, response: str) -> bool:
+        """Apply a fix through Codex and re-run the affected test file."""
         try:
             # Validate through Codex
             success, error = await self.codex.validate_and_patch(test_file, response)
@@ -254,11 +260,12 @@ Please analyze and fix the failing tests.
                 )
                 return False
                 
-            # Run tests again
-            if await self.run_tests():
+            # Run the fixed file's tests again
+            run = await run_pytest_streaming(["pytest", "-q", test_file])
+            if run.exit_code == 0:
                 # Fix successful
                 self.fixed_tests.add(test_file)
-                del self.agent_assignments[test_file]
+                self.failing_tests.pop(test_file, None)
                 return True
                 
             return False
@@ -277,5 +284,7 @@ Please analyze and fix the failing tests.
         return {
             "failing_tests": self.failing_tests,
             "agent_assignments": self.agent_assignments,
-            "fixed_tests": list(self.fixed_tests)
+            "fixed_tests": list(self.fixed_tests),
+            "dispatch": self.scheduler.get_status(),
+            "last_run": self.last_run_metrics
         } 
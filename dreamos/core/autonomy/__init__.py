@@ -20,6 +20,7 @@ __all__ = [
     "core_response_loop_daemon",
     "core_response_processor",
     "cursor_agent_bridge",
+    "duplicate_index",
     "enhanced_response_loop_daemon",
     "error_tracking",
     "midnight_runner",
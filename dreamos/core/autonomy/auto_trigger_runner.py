@@ -48,7 +48,7 @@ class AutoTriggerRunner(RunnerCore[str]):
             
             if result["exit_code"] != 0:
                 # Parse failures
-                failures = self.parse_test_failures(result["stdout"])
+                failures = self.get_test_failures(result)
                 
                 # Process each failure
                 for test_name, error in failures.items():
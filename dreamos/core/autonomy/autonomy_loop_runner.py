@@ -34,6 +34,9 @@ from dreamos.core.autonomy.base.response_loop import BaseResponseLoop
 from dreamos.core.autonomy.base.state_manager import BaseStateManager
 from dreamos.core.autonomy.base.file_handler import BaseFileHandler
 from dreamos.core.autonomy.base.runner_lifecycle import RunnerLifecycleMixin
+from dreamos.core.autonomy.base.pytest_pool import PytestWorkerPool
+from dreamos.core.autonomy.base.commit_service import GitCommitService
+from dreamos.core.autonomy.base.result_stream import TestResultEvent
 from .error import ErrorTracker, ErrorHandler, ErrorSeverity
 
 # Configure logging
@@ -74,6 +77,13 @@ class AutonomyLoopRunner(RunnerCore[str]):
         self.agent_ownership = self._load_agent_ownership()
         self.codex_agent = "codex"  # Special agent for quality control
         
+        # Fixes are batched into one commit per ownership area
+        self.commit_service = GitCommitService(
+            self.config.get("project_root", "."),
+            self.agent_ownership,
+            self.config.get("commit_service", {})
+        )
+        
         # Set up bridge outbox
         self.bridge_outbox = Path("bridge_outbox")
         self.bridge_outbox.mkdir(exist_ok=True)
@@ -114,6 +124,15 @@ class AutonomyLoopRunner(RunnerCore[str]):
         # Thread pool for parallel operations
         self.thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
         
+        # Warm pytest workers for per-test verification
+        pool_config = self.config.get("test_pool", {})
+        self.test_pool: Optional[PytestWorkerPool] = None
+        if pool_config.get("enabled", True):
+            self.test_pool = PytestWorkerPool(
+                self.config.get("project_root", "."),
+                {"warm_paths": [self.test_dir], **pool_config}
+            )
+        
         # Autonomy loop specific settings
         self.loop_interval = self.config.get("loop_interval", 60)  # 1 minute
         self.max_iterations = self.config.get("max_iterations", 10)
@@ -170,6 +189,11 @@ class AutonomyLoopRunner(RunnerCore[str]):
             
         self.is_running = False
         
+        if self.test_pool:
+            await self.test_pool.close()
+        
+        await self.commit_service.stop()
+        
         # Cancel both tasks
         if self.agent_loop_task:
             self.agent_loop_task.cancel()
@@ -202,12 +226,13 @@ class AutonomyLoopRunner(RunnerCore[str]):
                     result = await self.error_handler.with_retry(
                         operation="run_tests",
                         agent_id=self.platform,
-                        func=self.run_tests
+                        func=self.run_tests,
+                        on_result=self._on_test_result
                     )
                     
                     if result["exit_code"] != 0:
-                        # Parse failures
-                        failures = self.parse_test_failures(result["stdout"])
+                        # Failures not already dispatched while streaming
+                        failures = self.get_test_failures(result)
                         
                         # Process each failure
                         for test_name, error in failures.items():
@@ -254,6 +279,15 @@ class AutonomyLoopRunner(RunnerCore[str]):
             
         return False
     
+    async def _on_test_result(self, event: TestResultEvent):
+        """Dispatch a streamed failure while the suite is still running.
+        
+        Args:
+            event: Streamed test result
+        """
+        if event.failed and event.nodeid not in self.in_progress_items:
+            await self._handle_test_failure(event.nodeid, event.error)
+    
     async def _handle_test_failure(self, test_name: str, error: str):
         """Handle a test failure.
         
@@ -305,6 +339,16 @@ class AutonomyLoopRunner(RunnerCore[str]):
         Returns:
             Path to test file
         """
+        if self.test_pool:
+            try:
+                node_ids = await self.test_pool.collect(self._test_selector(test_name))
+                for node_id in node_ids:
+                    if self._node_matches(node_id, test_name):
+                        return node_id.split("::")[0]
+                return None
+            except Exception as e:
+                logger.warning(f"Test pool collect failed, falling back to subprocess: {e}")
+                
         try:
             # Run pytest with --collect-only to get test info
             result = await asyncio.create_subprocess_exec(
@@ -320,10 +364,8 @@ class AutonomyLoopRunner(RunnerCore[str]):
             
             # Parse output to get file path
             for line in stdout.decode().splitlines():
-                if test_name in line:
-                    parts = line.split("::")
-                    if len(parts) >= 2:
-                        return parts[0]
+                if "::" in line and self._node_matches(line.strip(), test_name):
+                    return line.split("::")[0]
             
             return None
             
@@ -331,6 +373,40 @@ class AutonomyLoopRunner(RunnerCore[str]):
             logger.error(f"Error getting test file: {str(e)}")
             return None
     
+    def _test_selector(self, test_name: str) -> List[str]:
+        """Build pytest arguments selecting a test by node id or bare name.
+        
+        Args:
+            test_name: Node id, path or bare test function name
+            
+        Returns:
+            Pytest arguments
+        """
+        if "::" in test_name or os.path.exists(test_name):
+            return [test_name]
+        return [self.test_dir, "-k", test_name]
+    
+    def _node_matches(self, node_id: str, test_name: str) -> bool:
+        """Check whether a collected node id is the requested test.
+        
+        Compares whole path and name components, so ``test_add`` does not
+        match ``test_add_many`` or ``tests/test_add/test_x.py``.
+        
+        Args:
+            node_id: Collected pytest node id
+            test_name: Node id, path or bare test function name
+            
+        Returns:
+            True if the node id names the test
+        """
+        path, _, names = node_id.partition("::")
+        if "::" in test_name:
+            return node_id == test_name or node_id.startswith(test_name + "[") or node_id.startswith(test_name + "::")
+        if os.path.exists(test_name):
+            wanted = Path(os.path.normpath(test_name)).parts
+            return Path(os.path.normpath(path)).parts[:len(wanted)] == wanted
+        return any(name.split("[")[0] == test_name for name in names.split("::"))
+    
     def _determine_responsible_agent(self, file_path: Optional[str]) -> str:
         """Determine which agent is responsible for a file.
         
@@ -469,6 +545,13 @@ Respond with the complete fixed code."""
         Returns:
             True if test passes, False otherwise
         """
+        if self.test_pool:
+            try:
+                result = await self.test_pool.run(self._test_selector(test_name))
+                return result["exit_code"] == 0
+            except Exception as e:
+                logger.warning(f"Test pool run failed, falling back to subprocess: {e}")
+                
         result = await asyncio.create_subprocess_exec(
             "pytest",
             test_name,
@@ -480,53 +563,74 @@ Respond with the complete fixed code."""
         stdout, stderr = await result.communicate()
         return result.returncode == 0
     
-    def commit_code(self, file_path: str, message: str):
-        """Commit code changes.
+    async def commit_code(self, file_path: str, message: str) -> asyncio.Future:
+        """Queue code changes for commit.
+        
+        The fix is committed together with other fixes for the same
+        ownership area that arrive within the commit service's batch window.
         
         Args:
             file_path: Path to the file
             message: Commit message
-        """
-        try:
-            subprocess.run(["git", "add", file_path], check=True)
-            subprocess.run(["git", "commit", "-m", message], check=True)
             
+        Returns:
+            Future resolving to the commit hash
+        """
+        future = await self.commit_service.submit(file_path, message)
+        future.add_done_callback(
+            lambda done: self._on_commit_done(done, file_path, message)
+        )
+        return future
+    
+    def _on_commit_done(self, future: asyncio.Future, file_path: str, message: str):
+        """Log the outcome of a queued commit.
+        
+        Args:
+            future: Completed commit future
+            file_path: Path to the file
+            message: Commit message
+        """
+        if future.cancelled():
+            return
+        
+        error = future.exception()
+        if error is None:
             self.logger.info(
                 platform=self.platform,
                 status="success",
                 message=f"Committed changes to {file_path}",
                 tags=["commit", "success"]
             )
-            
-        except Exception as e:
-            self.error_tracker.record_error(
-                error_type=type(e).__name__,
-                message=str(e),
-                severity=ErrorSeverity.MEDIUM,
-                agent_id=self.platform,
-                context={
-                    "operation": "commit_code",
-                    "file_path": file_path,
-                    "message": message
-                }
-            )
-            self.logger.error(
-                platform=self.platform,
-                status="error",
-                message=f"Error committing changes: {str(e)}",
-                tags=["commit", "error"]
-            )
+            return
+        
+        self.error_tracker.record_error(
+            error_type=type(error).__name__,
+            message=str(error),
+            severity=ErrorSeverity.MEDIUM,
+            agent_id=self.platform,
+            context={
+                "operation": "commit_code",
+                "file_path": file_path,
+                "message": message
+            }
+        )
+        self.logger.error(
+            platform=self.platform,
+            status="error",
+            message=f"Error committing changes: {str(error)}",
+            tags=["commit", "error"]
+        )
     
     async def _run_iteration(self):
         """Run a single iteration of the test-fix loop."""
         # Check if we should run iteration
         if self._should_run_iteration():
             # Run tests
-            result = await self.run_tests()
+            result = await self.run_tests(on_result=self._on_test_result)
             
             if result["exit_code"] != 0:
-                # Parse failures
-                failures = self.parse_test_failures(result["stdout"])
+                # Failures not already dispatched while streaming
+                failures = self.get_test_failures(result)
                 
                 # Process each failure
                 for test_name, error in failures.items():
@@ -540,6 +644,9 @@ Respond with the complete fixed code."""
     async def _handle_result(self, result: Any):
         """Handle a test result.
         
+        A passing result for an in-progress test that names the patched
+        ``file_path`` queues that file for commit.
+        
         Args:
             result: Test result to handle
         """
@@ -554,6 +661,13 @@ Respond with the complete fixed code."""
                     self.passed_items.add(test_name)
                     if test_name in self.failed_items:
                         self.failed_items.remove(test_name)
+                    
+                    file_path = result.get("file_path")
+                    if file_path:
+                        await self.commit_code(
+                            file_path,
+                            self.commit_message_template.format(description=f"fix {test_name}")
+                        )
                 else:
                     self.failed_items.add(test_name)
                     if test_name in self.passed_items:
@@ -3,22 +3,32 @@
 
 from . import autonomy_loop_runner
 from . import bridge_outbox_handler
+from . import commit_service
 from . import file_handler
+from . import impact_analysis
+from . import pytest_pool
 from . import response_loop
 from . import response_loop_daemon
+from . import result_stream
 from . import runner_core
 from . import runner_lifecycle
 from . import state_manager
 from . import test_imports
+from . import timer_wheel
 
 __all__ = [
     'autonomy_loop_runner',
     'bridge_outbox_handler',
+    'commit_service',
     'file_handler',
+    'impact_analysis',
+    'pytest_pool',
     'response_loop',
     'response_loop_daemon',
+    'result_stream',
     'runner_core',
     'runner_lifecycle',
     'state_manager',
     'test_imports',
+    'timer_wheel',
 ]
@@ -0,0 +1,263 @@
+"""
+Git Commit Service
+----------------
+Non-blocking commits for autonomous fixes.
+
+Fixes are submitted to a queue and grouped by ownership area: the first fix
+for an area opens a ``batch_window`` and every fix for that area arriving
+inside it lands in the same commit. Closed groups are committed by a single
+git worker task, so ``git add``/``git commit`` never contend for the index
+lock, and git runs as an asyncio subprocess instead of blocking the loop.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Ownership = Dict[str, Union[str, List[str]]]
+
+
+class _PendingFix:
+    """A submitted fix waiting for its commit."""
+
+    __slots__ = ("file_path", "message", "submitted_at", "future")
+
+    def __init__(self, file_path: str, message: str, future: asyncio.Future):
+        self.file_path = file_path
+        self.message = message
+        self.submitted_at = time.monotonic()
+        self.future = future
+
+
+class GitCommitError(RuntimeError):
+    """Raised when a git command fails."""
+
+
+class GitCommitService:
+    """Batches fixes into one commit per ownership area."""
+
+    def __init__(self, repo_path: str = ".", ownership: Optional[Ownership] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        """Initialize the commit service.
+
+        Args:
+            repo_path: Git working tree to commit in
+            ownership: Either agent -> owned path prefixes, or path prefix -> agent
+            config: Optional service configuration
+        """
+        self.config = config or {}
+        self.repo_path = Path(repo_path)
+        self.ownership = ownership or {}
+        self.batch_window = self.config.get("batch_window", 2.0)
+        self.max_batch_files = self.config.get("max_batch_files", 50)
+        self.default_area = self.config.get("default_area", "codex")
+        self.git_timeout = self.config.get("git_timeout", 120)
+        self.author = self.config.get("author")
+
+        self._groups: Dict[str, List[_PendingFix]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._queued_fixes = 0
+        self._stopping = False
+        self._latencies: List[float] = []
+        self.stats = {"fixes": 0, "commits": 0, "failed_commits": 0, "empty_commits": 0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+
+    async def start(self) -> None:
+        """Start the git worker."""
+        self._stopping = False
+        if self._worker is not None and not self._worker.done():
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._git_worker())
+
+    async def stop(self) -> None:
+        """Commit everything still pending, then stop the worker.
+
+        Submissions are rejected from here on until ``start()`` is called
+        again; a fix queued behind the stop sentinel would never commit.
+        """
+        self._stopping = True
+        if self._worker is None:
+            return
+        for area in list(self._groups):
+            self._close_group(area)
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    # ------------------------------------------------------------------
+    # Submission
+
+    def area_for(self, file_path: str) -> str:
+        """Ownership area (agent) responsible for a file.
+
+        Paths are matched relative to the repository, one component at a
+        time, so ``core/`` owns ``core/a.py`` but not ``core_old/a.py``.
+        """
+        parts = self._relative_parts(file_path)
+        for key, value in self.ownership.items():
+            if isinstance(value, str):
+                if self._owns(key, parts):
+                    return value
+            elif any(self._owns(prefix, parts) for prefix in value):
+                return key
+        return self.default_area
+
+    def _relative_parts(self, file_path: str) -> Tuple[str, ...]:
+        path = Path(file_path)
+        if path.is_absolute():
+            try:
+                path = path.resolve().relative_to(self.repo_path.resolve())
+            except ValueError:
+                pass
+        return path.parts
+
+    @staticmethod
+    def _owns(prefix: str, parts: Tuple[str, ...]) -> bool:
+        prefix_parts = Path(prefix).parts
+        return bool(prefix_parts) and parts[:len(prefix_parts)] == prefix_parts
+
+    async def submit(self, file_path: str, message: str) -> asyncio.Future:
+        """Queue a fix for commit.
+
+        Args:
+            file_path: Path of the fixed file
+            message: Commit message for this fix
+
+        Returns:
+            Future resolving to the commit hash (None if nothing changed)
+
+        Raises:
+            RuntimeError: If the service is stopping
+        """
+        if self._stopping:
+            raise RuntimeError("commit service is stopping")
+        await self.start()
+        loop = asyncio.get_running_loop()
+        fix = _PendingFix(str(file_path), message, loop.create_future())
+        area = self.area_for(fix.file_path)
+        group = self._groups.setdefault(area, [])
+        group.append(fix)
+        self.stats["fixes"] += 1
+
+        if len(group) >= self.max_batch_files:
+            self._close_group(area)
+        elif area not in self._timers:
+            self._timers[area] = loop.call_later(self.batch_window, self._close_group, area)
+        return fix.future
+
+    def _close_group(self, area: str) -> None:
+        """Hand an area's fixes to the git worker."""
+        timer = self._timers.pop(area, None)
+        if timer is not None:
+            timer.cancel()
+        group = self._groups.pop(area, None)
+        if group:
+            self._queued_fixes += len(group)
+            self._queue.put_nowait((area, group))
+
+    # ------------------------------------------------------------------
+    # Git worker
+
+    async def _git_worker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                break
+            area, group = item
+            self._queued_fixes -= len(group)
+            try:
+                sha = await self._commit_group(area, group)
+            except Exception as e:
+                self.stats["failed_commits"] += 1
+                logger.error(f"Commit for {area} failed: {e}")
+                for fix in group:
+                    if not fix.future.done():
+                        fix.future.set_exception(e)
+                continue
+
+            now = time.monotonic()
+            for fix in group:
+                self._latencies.append(now - fix.submitted_at)
+                if not fix.future.done():
+                    fix.future.set_result(sha)
+            del self._latencies[:-1000]
+
+    async def _commit_group(self, area: str, group: List[_PendingFix]) -> Optional[str]:
+        files = list(dict.fromkeys(fix.file_path for fix in group))
+        await self._git("add", "--", *files)
+        returncode, _, _ = await self._run_git("diff", "--cached", "--quiet", "--", *files)
+        if returncode == 0:
+            self.stats["empty_commits"] += 1
+            return None
+
+        args = ["commit", "-m", self._message(area, group)]
+        if self.author:
+            args += ["--author", self.author]
+        await self._git(*args, "--", *files)
+        self.stats["commits"] += 1
+        sha = await self._git("rev-parse", "HEAD")
+        logger.info(f"Committed {len(files)} file(s) for {area} as {sha[:8]}")
+        return sha
+
+    def _message(self, area: str, group: List[_PendingFix]) -> str:
+        messages = list(dict.fromkeys(fix.message for fix in group))
+        if len(messages) == 1:
+            return messages[0]
+        return f"{area}: {len(group)} fixes\n\n" + "\n".join(f"- {message}" for message in messages)
+
+    async def _run_git(self, *args: str) -> Tuple[int, str, str]:
+        """Run git in the repository.
+
+        Returns:
+            Tuple of (return code, stdout, stderr)
+        """
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=str(self.repo_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.git_timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise GitCommitError(f"git {args[0]} timed out")
+        return process.returncode, stdout.decode(errors="replace").strip(), stderr.decode(errors="replace").strip()
+
+    async def _git(self, *args: str) -> str:
+        """Run git and return its stdout, raising on failure."""
+        returncode, stdout, stderr = await self._run_git(*args)
+        if returncode != 0:
+            raise GitCommitError(f"git {args[0]} failed: {stderr or stdout}")
+        return stdout
+
+    # ------------------------------------------------------------------
+    # Metrics
+
+    @property
+    def queue_depth(self) -> int:
+        """Fixes submitted but not yet committed."""
+        return self._queued_fixes + sum(len(group) for group in self._groups.values())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Commit latency (submission to commit) and queue depth."""
+        latencies = sorted(self._latencies)
+        return {
+            **self.stats,
+            "queue_depth": self.queue_depth,
+            "open_groups": len(self._groups),
+            "latency_mean": sum(latencies) / len(latencies) if latencies else None,
+            "latency_p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        }
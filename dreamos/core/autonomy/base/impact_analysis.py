@@ -0,0 +1,499 @@
+"""
+Impact Analysis
+-------------
+Change-aware test selection for autonomous runners.
+
+Maintains a persisted map from source files to the tests that exercise
+them, built from two sources:
+
+1. Per-test coverage contexts (``pytest --cov-context=test``) - which test
+   node ids executed lines in which files.
+2. The static import graph of test files - which test files (transitively)
+   import which project modules.
+
+Each iteration the files changed since the previous one (``git diff`` or,
+outside a repository, mtimes) are mapped to the affected tests, and the
+tests that failed in the previous iteration are selected again. Anything
+that cannot be attributed - a changed conftest, ini file or a file the map
+has never seen - forces a full run, as does a periodic safety-net interval.
+"""
+
+import ast
+import json
+import logging
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Changes to these always invalidate selection
+GLOBAL_INPUTS = {"conftest.py", "pytest.ini", "setup.cfg", "tox.ini", "pyproject.toml", "setup.py"}
+
+
+class ImpactSelection:
+    """Outcome of a test selection."""
+
+    def __init__(
+        self,
+        full_run: bool,
+        targets: Optional[List[str]] = None,
+        changed_files: Optional[List[str]] = None,
+        reason: str = "",
+        total_tests: int = 0,
+        selected_tests: Optional[int] = None
+    ):
+        self.full_run = full_run
+        self.targets = targets or []
+        self.changed_files = changed_files or []
+        self.reason = reason
+        self.total_tests = total_tests
+        # When changes were last looked at; the next selection diffs from here
+        self.selected_at = time.time()
+        # Number of tests the targets expand to; defaults to one per target
+        self.selected_tests = len(self.targets) if selected_tests is None else selected_tests
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Fraction of the known suite skipped by this selection."""
+        if self.full_run or not self.total_tests:
+            return 0.0
+        return max(0.0, 1.0 - self.selected_tests / self.total_tests)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "full_run": self.full_run,
+            "targets": self.targets,
+            "changed_files": self.changed_files,
+            "reason": self.reason,
+            "skipped_fraction": round(self.skipped_fraction, 4)
+        }
+
+
+class TestImpactEngine:
+    """Selects the tests affected by changes since the last iteration."""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, project_root: str = ".", config: Optional[Dict[str, Any]] = None):
+        """Initialize the impact engine.
+
+        Args:
+            project_root: Root of the project under test
+            config: Optional ``test_impact`` configuration
+        """
+        self.config = config or {}
+        self.project_root = Path(project_root).resolve()
+        self.test_dir = self.config.get("test_dir", "tests")
+        self.map_path = self.project_root / self.config.get(
+            "map_path", "runtime/test_impact/impact_map.json"
+        )
+        self.coverage_file = self.map_path.parent / ".coverage"
+        self.full_run_every = self.config.get("full_run_every", 10)
+        self.full_run_interval = self.config.get("full_run_interval", 3600)
+        self.max_targets = self.config.get("max_targets", 500)
+
+        # source file -> test node ids that executed it
+        self.coverage_map: Dict[str, Set[str]] = {}
+        # test file -> project modules it imports (direct)
+        self.test_imports: Dict[str, Set[str]] = {}
+        # project file -> project modules it imports (direct)
+        self.module_imports: Dict[str, Set[str]] = {}
+        self.state: Dict[str, Any] = {
+            "last_commit": None,
+            "last_run": 0.0,
+            "last_failed": [],
+            "last_full_run": 0.0,
+            "iterations_since_full": 0,
+            "last_full_duration": None
+        }
+        self.history: List[Dict[str, Any]] = []
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+
+    def _load(self) -> None:
+        """Load the persisted impact map."""
+        if not self.map_path.exists():
+            return
+        try:
+            with open(self.map_path) as f:
+                data = json.load(f)
+            self.coverage_map = {k: set(v) for k, v in data.get("coverage", {}).items()}
+            self.test_imports = {k: set(v) for k, v in data.get("test_imports", {}).items()}
+            self.module_imports = {k: set(v) for k, v in data.get("module_imports", {}).items()}
+            self.state.update(data.get("state", {}))
+        except Exception as e:
+            logger.warning(f"Discarding unreadable impact map {self.map_path}: {e}")
+
+    def save(self) -> None:
+        """Persist the impact map."""
+        self.map_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": 1,
+            "coverage": {k: sorted(v) for k, v in self.coverage_map.items()},
+            "test_imports": {k: sorted(v) for k, v in self.test_imports.items()},
+            "module_imports": {k: sorted(v) for k, v in self.module_imports.items()},
+            "state": self.state
+        }
+        tmp_path = self.map_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.map_path)
+
+    # ------------------------------------------------------------------
+    # Change detection
+
+    def _git(self, *args: str) -> Optional[str]:
+        """Run a git command in the project root."""
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.project_root,
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            return result.stdout if result.returncode == 0 else None
+        except Exception:
+            return None
+
+    def current_commit(self) -> Optional[str]:
+        """Return the HEAD commit, or None outside a git repository."""
+        out = self._git("rev-parse", "HEAD")
+        return out.strip() if out else None
+
+    def changed_files(self) -> Optional[List[str]]:
+        """List project files changed since the last iteration.
+
+        Returns:
+            Relative paths, or None if changes cannot be determined
+        """
+        last_commit = self.state.get("last_commit")
+        if last_commit and self.current_commit():
+            committed = self._git("diff", "--name-only", last_commit, "HEAD")
+            working = self._git("diff", "--name-only", "HEAD")
+            untracked = self._git("ls-files", "--others", "--exclude-standard")
+            if None not in (committed, working, untracked):
+                files = set(committed.splitlines())
+                # Uncommitted edits count only if made since the last run
+                for rel_path in set(working.splitlines()) | set(untracked.splitlines()):
+                    mtime = self._mtime(rel_path)
+                    if mtime == 0.0 or mtime > self.state["last_run"]:
+                        files.add(rel_path)
+                return sorted(files)
+
+        if not self.state.get("last_run"):
+            return None
+        return sorted(
+            str(p.relative_to(self.project_root))
+            for p in self._iter_python_files()
+            if p.stat().st_mtime > self.state["last_run"]
+        )
+
+    def _mtime(self, rel_path: str) -> float:
+        try:
+            return (self.project_root / rel_path).stat().st_mtime
+        except OSError:
+            return 0.0
+
+    def _iter_python_files(self) -> Iterable[Path]:
+        """Yield project Python files, skipping runtime and VCS directories."""
+        skip = {".git", "__pycache__", "runtime", ".venv", "venv", "node_modules"}
+        for dirpath, dirnames, filenames in os.walk(self.project_root):
+            dirnames[:] = [d for d in dirnames if d not in skip and not d.startswith(".")]
+            for name in filenames:
+                if name.endswith(".py"):
+                    yield Path(dirpath) / name
+
+    # ------------------------------------------------------------------
+    # Static import graph
+
+    def _is_test_file(self, rel_path: str) -> bool:
+        name = Path(rel_path).name
+        return rel_path.startswith(self.test_dir) and (
+            name.startswith("test_") or name.endswith("_test.py")
+        )
+
+    def _module_to_file(self, module: str) -> Optional[str]:
+        """Resolve a dotted module name to a project-relative file."""
+        base = self.project_root.joinpath(*module.split("."))
+        for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+            if candidate.exists():
+                return str(candidate.relative_to(self.project_root))
+        return None
+
+    def _parse_imports(self, rel_path: str) -> Set[str]:
+        """Return project files directly imported by a file."""
+        path = self.project_root / rel_path
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        except (OSError, SyntaxError, ValueError):
+            return set()
+
+        package = ".".join(Path(rel_path).with_suffix("").parts[:-1])
+        modules: Set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    parts = package.split(".") if package else []
+                    parts = parts[:len(parts) - node.level + 1]
+                    base = ".".join(parts + ([node.module] if node.module else []))
+                else:
+                    base = node.module or ""
+                modules.add(base)
+                modules.update(f"{base}.{alias.name}" for alias in node.names)
+
+        files = set()
+        for module in modules:
+            resolved = self._module_to_file(module) if module else None
+            if resolved and resolved != rel_path:
+                files.add(resolved)
+        return files
+
+    def update_import_graph(self, changed: Optional[Iterable[str]] = None) -> None:
+        """Re-parse imports for changed files, or every file if none given.
+
+        Args:
+            changed: Project-relative paths to re-parse
+        """
+        if changed is None:
+            self.test_imports.clear()
+            self.module_imports.clear()
+            paths = [str(p.relative_to(self.project_root)) for p in self._iter_python_files()]
+        else:
+            paths = [p for p in changed if p.endswith(".py")]
+
+        for rel_path in paths:
+            target = self.test_imports if self._is_test_file(rel_path) else self.module_imports
+            if not (self.project_root / rel_path).exists():
+                self.test_imports.pop(rel_path, None)
+                self.module_imports.pop(rel_path, None)
+                continue
+            target[rel_path] = self._parse_imports(rel_path)
+
+    def _tests_importing(self, changed: Set[str]) -> Set[str]:
+        """Test files that transitively import any changed module."""
+        reverse: Dict[str, Set[str]] = {}
+        for importer, imported in self.module_imports.items():
+            for module in imported:
+                reverse.setdefault(module, set()).add(importer)
+
+        affected = set(changed)
+        frontier = list(changed)
+        while frontier:
+            module = frontier.pop()
+            for importer in reverse.get(module, ()):
+                if importer not in affected:
+                    affected.add(importer)
+                    frontier.append(importer)
+
+        return {
+            test_file for test_file, imported in self.test_imports.items()
+            if imported & affected
+        }
+
+    # ------------------------------------------------------------------
+    # Coverage contexts
+
+    def pytest_args(self) -> List[str]:
+        """Extra pytest arguments that record per-test coverage contexts."""
+        return ["--cov-context=test"]
+
+    def pytest_env(self) -> Dict[str, str]:
+        """Environment that keeps the context database out of the worktree."""
+        self.coverage_file.parent.mkdir(parents=True, exist_ok=True)
+        return {**os.environ, "COVERAGE_FILE": str(self.coverage_file)}
+
+    def ingest_coverage(self, full_run: bool) -> None:
+        """Update the coverage map from the last run's context database.
+
+        On a full run the map is replaced; otherwise only the entries of the
+        tests that ran are refreshed.
+
+        Args:
+            full_run: Whether the last run covered the whole suite
+        """
+        try:
+            from coverage import CoverageData
+        except ImportError:
+            logger.debug("coverage not installed, relying on the import graph only")
+            return
+        if not self.coverage_file.exists():
+            return
+
+        data = CoverageData(basename=str(self.coverage_file))
+        data.read()
+
+        fresh: Dict[str, Set[str]] = {}
+        ran: Set[str] = set()
+        for measured in data.measured_files():
+            try:
+                rel_path = str(Path(measured).resolve().relative_to(self.project_root))
+            except ValueError:
+                continue
+            contexts = set()
+            for ctxs in data.contexts_by_lineno(measured).values():
+                for ctx in ctxs:
+                    if ctx:
+                        # Context names look like "tests/x.py::test_y|run"
+                        contexts.add(ctx.split("|")[0])
+            if contexts:
+                fresh[rel_path] = contexts
+                ran |= contexts
+
+        if full_run:
+            self.coverage_map = fresh
+            return
+
+        for tests in self.coverage_map.values():
+            tests -= ran
+        for rel_path, tests in fresh.items():
+            self.coverage_map.setdefault(rel_path, set()).update(tests)
+
+    def known_tests(self) -> Set[str]:
+        """All test node ids seen in coverage contexts."""
+        tests: Set[str] = set()
+        for node_ids in self.coverage_map.values():
+            tests |= node_ids
+        return tests
+
+    # ------------------------------------------------------------------
+    # Selection
+
+    def select(self) -> ImpactSelection:
+        """Choose the tests to run this iteration.
+
+        Returns:
+            ImpactSelection with pytest targets or a full-run decision
+        """
+        # Taken before looking at the tree, so edits made while the tests
+        # run are newer than the cursor and picked up next iteration
+        selected_at = time.time()
+        selection = self._select()
+        selection.selected_at = selected_at
+        return selection
+
+    def _select(self) -> ImpactSelection:
+        known = self.known_tests()
+        total = len(known) or len(self.test_imports)
+
+        if not self.coverage_map and not self.test_imports:
+            return ImpactSelection(True, reason="no impact map yet", total_tests=total)
+        if self.state["iterations_since_full"] >= self.full_run_every:
+            return ImpactSelection(True, reason="periodic full run", total_tests=total)
+        if time.time() - self.state["last_full_run"] >= self.full_run_interval:
+            return ImpactSelection(True, reason="full run interval elapsed", total_tests=total)
+        if self.state.get("last_failed") is None:
+            return ImpactSelection(True, reason="previous failures unknown", total_tests=total)
+
+        changed = self.changed_files()
+        if changed is None:
+            return ImpactSelection(True, reason="changes unknown", total_tests=total)
+
+        self.update_import_graph(changed)
+        targets: Set[str] = set()
+        sources: Set[str] = set()
+        for rel_path in changed:
+            if Path(rel_path).name in GLOBAL_INPUTS:
+                return ImpactSelection(True, changed_files=changed, reason=f"{rel_path} changed", total_tests=total)
+            if not rel_path.endswith(".py"):
+                continue
+            if self._is_test_file(rel_path):
+                targets.add(rel_path)
+                continue
+            if rel_path not in self.coverage_map and rel_path not in self.module_imports:
+                return ImpactSelection(True, changed_files=changed, reason=f"unmapped file {rel_path}", total_tests=total)
+            sources.add(rel_path)
+            targets.update(self.coverage_map.get(rel_path, ()))
+
+        targets.update(self._tests_importing(sources))
+        # Keep running red tests until they pass, changed or not
+        targets.update(self.state["last_failed"])
+
+        # Node ids inside a selected test file are redundant
+        files = {t for t in targets if "::" not in t}
+        targets = {t for t in targets if "::" not in t or t.split("::")[0] not in files}
+        # Drop tests whose file no longer exists
+        targets = {t for t in targets if (self.project_root / t.split("::")[0]).exists()}
+
+        if len(targets) > self.max_targets:
+            targets = {t.split("::")[0] for t in targets}
+            if len(targets) > self.max_targets:
+                return ImpactSelection(True, changed_files=changed, reason="too many affected tests", total_tests=total)
+
+        return ImpactSelection(
+            False, sorted(targets), changed, "changed files", total,
+            selected_tests=self._count_selected(targets, known)
+        )
+
+    def _count_selected(self, targets: Set[str], known: Set[str]) -> int:
+        """Count the tests a selection runs.
+
+        File targets expand to the node ids collected for that file; a file
+        with no known node ids (only seen in the import graph) counts once.
+
+        Args:
+            targets: Selected node ids and test files
+            known: All node ids seen in coverage contexts
+
+        Returns:
+            Number of selected tests
+        """
+        if not known:
+            return len(targets)
+        per_file: Dict[str, int] = {}
+        for node_id in known:
+            test_file = node_id.split("::")[0]
+            per_file[test_file] = per_file.get(test_file, 0) + 1
+        return sum(1 if "::" in t else per_file.get(t, 1) for t in targets)
+
+    def record_run(
+        self,
+        selection: ImpactSelection,
+        duration: float,
+        failed: Optional[Iterable[str]] = ()
+    ) -> Dict[str, Any]:
+        """Update state after a run and report the savings.
+
+        Args:
+            selection: Selection that was executed
+            duration: Wall-clock seconds of the run
+            failed: Node ids that failed, or None if the run failed without
+                reporting which tests did (forces a full run next time)
+
+        Returns:
+            Per-iteration impact report
+        """
+        self.ingest_coverage(selection.full_run)
+        if selection.full_run:
+            self.update_import_graph()
+            self.state["last_full_run"] = time.time()
+            self.state["iterations_since_full"] = 0
+            self.state["last_full_duration"] = duration
+        else:
+            self.state["iterations_since_full"] += 1
+
+        self.state["last_commit"] = self.current_commit()
+        self.state["last_run"] = selection.selected_at
+        self.state["last_failed"] = None if failed is None else sorted(set(failed))
+        self.save()
+
+        full_duration = self.state.get("last_full_duration")
+        report = {
+            **selection.to_dict(),
+            "duration": round(duration, 3),
+            "time_saved": round(max(full_duration - duration, 0.0), 3) if full_duration and not selection.full_run else 0.0
+        }
+        self.history.append(report)
+        logger.info(
+            f"Test impact: {'full run' if selection.full_run else f'{len(selection.targets)} targets'} "
+            f"({selection.reason}), skipped {report['skipped_fraction']:.0%} of suite, "
+            f"saved {report['time_saved']:.1f}s"
+        )
+        return report
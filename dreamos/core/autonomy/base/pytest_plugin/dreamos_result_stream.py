@@ -0,0 +1,109 @@
+"""
+Result Stream Plugin
+------------------
+Loaded inside the pytest process by ``run_pytest_streaming`` (see
+``result_stream``). Writes one JSON line per test outcome, and one per
+finished test file, to the runner's listener named in
+``DREAMOS_RESULT_STREAM``.
+
+Only uses the standard library; this directory is put on ``PYTHONPATH``
+on its own, so the module name must not clash with a project's modules.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, Optional
+
+STREAM_ENV = "DREAMOS_RESULT_STREAM"
+MAX_LONGREPR_CHARS = 4000
+
+_channel: Optional[socket.socket] = None
+# Node ids of the last test collected from each file
+_file_ends: set = set()
+
+
+def _emit(message: Dict[str, Any]) -> None:
+    global _channel
+    if _channel is None:
+        return
+    try:
+        _channel.sendall((json.dumps(message) + "\n").encode())
+    except OSError:
+        _channel = None
+
+
+def _report_event(report) -> Dict[str, Any]:
+    longrepr = ""
+    message = ""
+    if report.outcome != "passed" and report.longrepr is not None:
+        longrepr = str(report.longrepr)
+        crash = getattr(report.longrepr, "reprcrash", None)
+        if crash is not None:
+            message = crash.message.splitlines()[0] if crash.message else ""
+        elif isinstance(report.longrepr, tuple):
+            message = str(report.longrepr[-1])
+        else:
+            message = longrepr.strip().splitlines()[-1] if longrepr.strip() else ""
+
+    # Location plus message identifies "the same failure" across runs
+    crash = getattr(report.longrepr, "reprcrash", None)
+    location = f"{crash.path}:{crash.lineno}" if crash is not None else report.nodeid
+    digest = hashlib.sha1(f"{location}|{message}".encode()).hexdigest()[:12] if message else ""
+
+    return {
+        "event": "result",
+        "nodeid": report.nodeid,
+        "outcome": report.outcome,
+        "when": report.when,
+        "duration": getattr(report, "duration", 0.0),
+        "message": message,
+        "digest": digest,
+        "longrepr": longrepr[-MAX_LONGREPR_CHARS:],
+        "timestamp": time.time()
+    }
+
+
+def pytest_configure(config):
+    global _channel
+    address = os.environ.get(STREAM_ENV)
+    # xdist workers' reports are re-emitted by the controller
+    if not address or hasattr(config, "workerinput"):
+        return
+    host, port = address.rsplit(":", 1)
+    try:
+        _channel = socket.create_connection((host, int(port)), timeout=5)
+    except OSError:
+        _channel = None
+
+
+def pytest_collection_finish(session):
+    _emit({"event": "collected", "count": len(session.items)})
+    last = {item.nodeid.split("::")[0]: item.nodeid for item in session.items}
+    _file_ends.clear()
+    _file_ends.update(last.values())
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    if nodeid in _file_ends:
+        _emit({"event": "file_finished", "file": nodeid.split("::")[0]})
+
+
+def pytest_runtest_logreport(report):
+    if report.when == "call" or report.outcome != "passed":
+        _emit(_report_event(report))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _emit({"event": "finished", "exit_code": int(exitstatus)})
+
+
+def pytest_unconfigure(config):
+    global _channel
+    if _channel is not None:
+        try:
+            _channel.close()
+        finally:
+            _channel = None
@@ -0,0 +1,385 @@
+"""
+Pytest Worker Pool
+----------------
+Long-lived pytest worker processes for per-test verification.
+
+Spawning ``pytest`` per test pays interpreter startup, plugin loading and
+third-party imports every time. Workers in this pool stay resident: each
+one runs ``pytest.main`` in-process for every request, so imported modules
+(pytest plugins, aiohttp, the project's own dependencies) are reused.
+Before a run the worker evicts project modules whose source changed - and
+the project modules holding references to them - plus all test modules, so
+verification always sees the patched code.
+
+Workers speak JSON lines over stdin/stdout and are recycled after
+``max_runs`` requests or once their RSS exceeds ``max_memory_mb``.
+
+This file doubles as the worker entry point and is launched by path, so
+the worker does not import the ``dreamos`` package itself.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Response lines carry every collected node id; asyncio's 64 KiB default
+# line limit overflows at around a thousand tests
+STREAM_LIMIT = 64 * 1024 * 1024
+
+
+class PytestWorker:
+    """Handle on one resident pytest worker process."""
+
+    def __init__(self, project_root: Path, extra_args: List[str]):
+        self.project_root = project_root
+        self.extra_args = extra_args
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.runs = 0
+        self.rss_mb = 0.0
+
+    async def start(self, warm_paths: List[str]) -> None:
+        """Launch the worker and optionally pre-collect warm paths.
+
+        Raises:
+            Exception: If the warm-up fails; the process is killed first
+        """
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), "--worker",
+            "--root", str(self.project_root),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=str(self.project_root),
+            limit=STREAM_LIMIT
+        )
+        if warm_paths:
+            try:
+                await self.request({"cmd": "collect", "args": warm_paths}, timeout=None)
+            except BaseException:
+                await self.kill()
+                raise
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def request(self, payload: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        """Send a request and wait for its response line."""
+        if not self.alive:
+            raise RuntimeError("pytest worker is not running")
+        payload = {**payload, "extra_args": self.extra_args}
+        self.process.stdin.write((json.dumps(payload) + "\n").encode())
+        await self.process.stdin.drain()
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        if not line:
+            raise RuntimeError("pytest worker exited unexpectedly")
+        response = json.loads(line)
+        self.runs += 1
+        self.rss_mb = response.get("rss_mb", 0.0)
+        return response
+
+    async def stop(self) -> None:
+        """Terminate the worker."""
+        if not self.alive:
+            return
+        try:
+            self.process.stdin.close()
+            await asyncio.wait_for(self.process.wait(), 5)
+        except Exception:
+            await self.kill()
+
+    async def kill(self) -> None:
+        """Kill the worker without waiting for it to finish."""
+        if self.alive:
+            self.process.kill()
+        if self.process is not None:
+            await self.process.wait()
+
+
+class PytestWorkerPool:
+    """Pool of warm pytest workers."""
+
+    def __init__(self, project_root: str = ".", config: Optional[Dict[str, Any]] = None):
+        """Initialize the pool.
+
+        Args:
+            project_root: Root directory tests run from
+            config: Optional ``test_pool`` configuration
+        """
+        self.config = config or {}
+        self.project_root = Path(project_root).resolve()
+        self.size = self.config.get("size", 2)
+        self.max_runs = self.config.get("max_runs", 100)
+        self.max_memory_mb = self.config.get("max_memory_mb", 1024)
+        self.timeout = self.config.get("timeout", 300)
+        self.warm_paths = self.config.get("warm_paths", [])
+        # Repo addopts (coverage in particular) would accumulate across in-process runs
+        self.extra_args = self.config.get("pytest_args", ["-p", "no:cacheprovider", "-o", "addopts="])
+
+        # None entries are close() waking up pending acquires
+        self._idle: "asyncio.Queue[Optional[PytestWorker]]" = asyncio.Queue()
+        self._workers: List[PytestWorker] = []
+        self._waiting = 0
+        self._generation = 0
+        self._started = False
+        self.stats = {"requests": 0, "recycled": 0, "crashed": 0}
+
+    async def start(self) -> None:
+        """Start all workers.
+
+        If any worker fails to start, all of them are stopped and the pool
+        is left unstarted so callers can fall back to plain subprocesses.
+        """
+        if self._started:
+            return
+        self._started = True
+        results = await asyncio.gather(
+            *[self._spawn() for _ in range(self.size)], return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await self.close()
+            raise errors[0]
+
+    async def _spawn(self) -> None:
+        worker = PytestWorker(self.project_root, self.extra_args)
+        await worker.start(self.warm_paths)
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+
+    async def _replace(self, worker: PytestWorker) -> None:
+        await worker.stop()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        if not self._started:
+            return
+        try:
+            await self._spawn()
+        except Exception as e:
+            logger.warning(f"Failed to replace pytest worker: {e}")
+            if not self._workers:
+                # Nothing left to serve requests; restart on the next one
+                await self.close()
+
+    async def _acquire(self) -> PytestWorker:
+        """Wait for an idle worker.
+
+        Raises:
+            RuntimeError: If the pool is closed while waiting
+        """
+        await self.start()
+        generation = self._generation
+        while True:
+            self._waiting += 1
+            try:
+                worker = await self._idle.get()
+            finally:
+                self._waiting -= 1
+            if worker is not None:
+                return worker
+            if generation != self._generation:
+                raise RuntimeError("pytest worker pool was closed")
+            # Wake-up left over from an earlier close; keep waiting
+
+    async def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        worker = await self._acquire()
+        self.stats["requests"] += 1
+        try:
+            response = await worker.request(payload, self.timeout)
+        except Exception:
+            self.stats["crashed"] += 1
+            await self._replace(worker)
+            raise
+
+        if worker.runs >= self.max_runs or worker.rss_mb >= self.max_memory_mb:
+            self.stats["recycled"] += 1
+            logger.debug(f"Recycling pytest worker after {worker.runs} runs at {worker.rss_mb:.0f}MB")
+            await self._replace(worker)
+        elif worker in self._workers:
+            self._idle.put_nowait(worker)
+        return response
+
+    async def run(self, node_ids: List[str]) -> Dict[str, Any]:
+        """Run node ids in a warm worker.
+
+        Args:
+            node_ids: Pytest node ids or paths
+
+        Returns:
+            Dict with exit_code, per-node outcomes and duration
+        """
+        return await self._request({"cmd": "run", "args": list(node_ids)})
+
+    async def collect(self, args: List[str]) -> List[str]:
+        """Collect node ids matching pytest arguments.
+
+        Args:
+            args: Pytest arguments (paths, node ids or ``-k`` expressions)
+
+        Returns:
+            Collected node ids
+        """
+        response = await self._request({"cmd": "collect", "args": list(args)})
+        return response.get("node_ids", [])
+
+    async def close(self) -> None:
+        """Stop all workers.
+
+        Requests waiting for a worker fail with ``RuntimeError``.
+        """
+        self._started = False
+        self._generation += 1
+        workers, self._workers = self._workers, []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for _ in range(self._waiting):
+            self._idle.put_nowait(None)
+        await asyncio.gather(*[worker.stop() for worker in workers])
+
+
+# ----------------------------------------------------------------------
+# Worker side
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class _WorkerState:
+    """Tracks which project modules were loaded from which source mtime."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.loaded_mtimes: Dict[str, float] = {}
+
+    def _project_modules(self) -> Dict[str, Any]:
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if path and Path(path).resolve().is_relative_to(self.root):
+                modules[name] = module
+        return modules
+
+    def evict_stale(self) -> None:
+        """Drop test modules and project modules with changed sources."""
+        project = self._project_modules()
+        stale = set()
+        for name, module in project.items():
+            path = Path(module.__file__)
+            leaf = path.name
+            if leaf.startswith("test_") or leaf.endswith("_test.py") or leaf == "conftest.py":
+                stale.add(name)
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                stale.add(name)
+                continue
+            if self.loaded_mtimes.get(name, mtime) != mtime:
+                stale.add(name)
+
+        # Project modules holding references into stale modules are stale too
+        changed = True
+        while changed:
+            changed = False
+            stale_objects = {id(project[name]) for name in stale}
+            for name, module in project.items():
+                if name in stale:
+                    continue
+                for value in list(vars(module).values()):
+                    try:
+                        owner = getattr(value, "__module__", None)
+                    except Exception:
+                        owner = None
+                    if id(value) in stale_objects or owner in stale:
+                        stale.add(name)
+                        changed = True
+                        break
+
+        for name in stale:
+            sys.modules.pop(name, None)
+            self.loaded_mtimes.pop(name, None)
+
+    def snapshot(self) -> None:
+        """Record source mtimes of project modules loaded by the last run."""
+        for name, module in self._project_modules().items():
+            if name not in self.loaded_mtimes:
+                try:
+                    self.loaded_mtimes[name] = Path(module.__file__).stat().st_mtime
+                except OSError:
+                    continue
+
+
+class _ResultPlugin:
+    """Collects outcomes and collected node ids in-process."""
+
+    def __init__(self):
+        self.outcomes: Dict[str, str] = {}
+        self.node_ids: List[str] = []
+
+    def pytest_collection_modifyitems(self, items):
+        self.node_ids = [item.nodeid for item in items]
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" or report.outcome != "passed":
+            self.outcomes[report.nodeid] = report.outcome
+
+
+def _worker_main(root: str) -> None:
+    """Serve run/collect requests until stdin closes."""
+    # Keep the protocol channel private; pytest output goes to /dev/null
+    protocol = os.fdopen(os.dup(1), "w")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    sys.stdout = open(os.devnull, "w")
+
+    root_path = Path(root).resolve()
+    sys.path.insert(0, str(root_path))
+    os.chdir(root_path)
+
+    import pytest
+
+    state = _WorkerState(root_path)
+    for line in sys.stdin:
+        request = json.loads(line)
+        state.evict_stale()
+        plugin = _ResultPlugin()
+        args = request.get("extra_args", []) + request.get("args", [])
+        if request.get("cmd") == "collect":
+            args = ["--collect-only", "-q"] + args
+
+        start = time.time()
+        try:
+            exit_code = int(pytest.main(args, plugins=[plugin]))
+        except SystemExit as e:
+            exit_code = int(e.code or 0)
+        except Exception as e:
+            exit_code = 3
+            plugin.outcomes["<internal>"] = f"error: {e}"
+        state.snapshot()
+
+        protocol.write(json.dumps({
+            "exit_code": exit_code,
+            "outcomes": plugin.outcomes,
+            "node_ids": plugin.node_ids,
+            "duration": time.time() - start,
+            "rss_mb": _rss_mb()
+        }) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__" and "--worker" in sys.argv:
+    _worker_main(sys.argv[sys.argv.index("--root") + 1])
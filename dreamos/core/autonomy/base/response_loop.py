@@ -101,7 +101,9 @@ class BaseResponseLoop(Generic[T], ABC):
                 await self.worker_task
             except asyncio.CancelledError:
                 pass
-        
+
+        await self.file_watcher.stop()
+
         # Cleanup
         self.processed_items.clear()
         self.failed_items.clear()
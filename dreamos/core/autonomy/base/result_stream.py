@@ -0,0 +1,281 @@
+"""
+Result Stream
+-----------
+Streams structured pytest results to the runner while the suite is running.
+
+The runner opens a local TCP listener and starts pytest with the
+``dreamos_result_stream`` plugin loaded. The plugin writes one JSON line
+per test outcome - node id, outcome, phase, duration, crash message and a
+digest of the failure - as soon as pytest reports it, and a marker once
+the last test of a file has finished, so consumers can dispatch fix work
+per file while the suite is still running instead of parsing stdout once
+the whole suite has finished.
+
+The plugin lives alone in the ``pytest_plugin`` directory next to this
+file, which is put on the child's ``PYTHONPATH``: the pytest process does
+not import the ``dreamos`` package, and no other module shadows the names
+of the project under test.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Must match the plugin module
+STREAM_ENV = "DREAMOS_RESULT_STREAM"
+PLUGIN_NAME = "dreamos_result_stream"
+PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pytest_plugin")
+
+
+@dataclass
+class TestResultEvent:
+    """One streamed test outcome."""
+
+    __test__ = False
+
+    nodeid: str
+    outcome: str
+    when: str = "call"
+    duration: float = 0.0
+    message: str = ""
+    digest: str = ""
+    longrepr: str = ""
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def test_file(self) -> str:
+        return self.nodeid.split("::")[0]
+
+    @property
+    def test_name(self) -> str:
+        return self.nodeid.split("::")[-1]
+
+    @property
+    def failed(self) -> bool:
+        return self.outcome == "failed"
+
+    @property
+    def error(self) -> str:
+        """Failure text suitable for a fix request."""
+        return self.longrepr or self.message
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestResultEvent":
+        return cls(
+            nodeid=data["nodeid"],
+            outcome=data["outcome"],
+            when=data.get("when", "call"),
+            duration=data.get("duration", 0.0),
+            message=data.get("message", ""),
+            digest=data.get("digest", ""),
+            longrepr=data.get("longrepr", ""),
+            timestamp=data.get("timestamp", time.time())
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodeid": self.nodeid,
+            "outcome": self.outcome,
+            "when": self.when,
+            "duration": self.duration,
+            "message": self.message,
+            "digest": self.digest,
+            "longrepr": self.longrepr,
+            "timestamp": self.timestamp
+        }
+
+
+class StreamedRun:
+    """Outcome of a streamed pytest run."""
+
+    def __init__(self):
+        self.exit_code: Optional[int] = None
+        self.stdout = ""
+        self.stderr = ""
+        self.collected = 0
+        self.events: List[TestResultEvent] = []
+        self.started_at = time.monotonic()
+        self.first_failure_at: Optional[float] = None
+        self.first_dispatch_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def streamed(self) -> bool:
+        """Whether the plugin reported anything at all."""
+        return bool(self.events) or self.collected > 0
+
+    def failures(self) -> Dict[str, str]:
+        """Failed tests mapped to their failure text, by node id."""
+        return {event.nodeid: event.error for event in self.events if event.failed}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Timing metrics relative to the start of the run, in seconds."""
+        def since_start(moment: Optional[float]) -> Optional[float]:
+            return None if moment is None else moment - self.started_at
+
+        return {
+            "collected": self.collected,
+            "results": len(self.events),
+            "failed": sum(1 for event in self.events if event.failed),
+            "time_to_first_failure": since_start(self.first_failure_at),
+            "time_to_first_dispatch": since_start(self.first_dispatch_at),
+            "duration": since_start(self.finished_at)
+        }
+
+
+class ResultStreamServer:
+    """Local listener receiving events from the plugin."""
+
+    def __init__(self, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    async def start(self) -> None:
+        """Start listening on a free port."""
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    def env(self, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Environment variables enabling the plugin in a pytest subprocess.
+
+        Args:
+            base: Environment whose ``PYTHONPATH`` is extended (defaults
+                to this process's)
+        """
+        python_path = (os.environ if base is None else base).get("PYTHONPATH", "")
+        return {
+            STREAM_ENV: f"{self.host}:{self.port}",
+            "PYTHONPATH": os.pathsep.join(p for p in (PLUGIN_DIR, python_path) if p)
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self.queue.put_nowait(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Dropping malformed result line: {line[:200]!r}")
+        finally:
+            writer.close()
+            self._connections.discard(task)
+
+    async def drain(self, timeout: float = 5) -> None:
+        """Wait for open plugin connections to reach EOF."""
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=timeout)
+
+    async def close(self) -> None:
+        """Stop listening."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def run_pytest_streaming(
+    args: List[str],
+    on_result: Optional[Callable[[TestResultEvent], Awaitable[None]]] = None,
+    env: Optional[Dict[str, str]] = None,
+    cwd: Optional[str] = None,
+    on_file_finished: Optional[Callable[[str], Awaitable[None]]] = None
+) -> StreamedRun:
+    """Run pytest in a subprocess and stream its results.
+
+    ``on_result`` is awaited for every outcome as it arrives, while pytest
+    keeps running; the time the first failure's callback completes is
+    recorded as the time to first dispatch. With ``on_file_finished``,
+    which is awaited with a test file once its last test has run, that
+    time is instead when the first file with a failure was handed over.
+    Files are only reported when pytest runs them in order, so not under
+    xdist; consumers must still flush what is left once the run ends.
+
+    Args:
+        args: Command line, starting with the pytest executable
+        on_result: Optional coroutine called for each result event
+        env: Optional base environment for the subprocess
+        cwd: Optional working directory
+        on_file_finished: Optional coroutine called with each finished file
+
+    Returns:
+        StreamedRun with exit code, captured output, events and metrics
+    """
+    run = StreamedRun()
+    server = ResultStreamServer()
+    await server.start()
+    try:
+        process_env = dict(env if env is not None else os.environ)
+        process_env.update(server.env(process_env))
+        process = await asyncio.create_subprocess_exec(
+            *args, "-p", PLUGIN_NAME,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=process_env,
+            cwd=cwd
+        )
+        communicate = asyncio.ensure_future(process.communicate())
+
+        async def consume(message: Dict[str, Any]) -> None:
+            kind = message.get("event")
+            if kind == "collected":
+                run.collected = message.get("count", 0)
+                return
+            if kind == "file_finished":
+                if on_file_finished:
+                    test_file = message.get("file", "")
+                    try:
+                        await on_file_finished(test_file)
+                    except Exception as e:
+                        logger.error(f"Error handling finished file {test_file}: {e}")
+                    if run.first_dispatch_at is None and any(
+                        event.failed and event.test_file == test_file for event in run.events
+                    ):
+                        run.first_dispatch_at = time.monotonic()
+                return
+            if kind != "result":
+                return
+            event = TestResultEvent.from_dict(message)
+            run.events.append(event)
+            if event.failed and run.first_failure_at is None:
+                run.first_failure_at = time.monotonic()
+            if on_result:
+                try:
+                    await on_result(event)
+                except Exception as e:
+                    logger.error(f"Error handling result for {event.nodeid}: {e}")
+                if event.failed and on_file_finished is None and run.first_dispatch_at is None:
+                    run.first_dispatch_at = time.monotonic()
+
+        while not communicate.done():
+            getter = asyncio.ensure_future(server.queue.get())
+            done, _ = await asyncio.wait({getter, communicate}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await consume(getter.result())
+            else:
+                getter.cancel()
+
+        await server.drain()
+        while not server.queue.empty():
+            await consume(server.queue.get_nowait())
+
+        stdout, stderr = communicate.result()
+        run.exit_code = process.returncode
+        run.stdout = stdout.decode(errors="replace")
+        run.stderr = stderr.decode(errors="replace")
+        run.finished_at = time.monotonic()
+        return run
+    finally:
+        await server.close()
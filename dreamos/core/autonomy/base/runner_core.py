@@ -7,11 +7,14 @@ Provides unified core functionality for all autonomous runners.
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set, Protocol, TypeVar, Generic
+from typing import Dict, List, Any, Optional, Set, Protocol, TypeVar, Generic, Callable, Awaitable
 
 from ..logging.log_manager import LogManager
+from .impact_analysis import TestImpactEngine
+from .result_stream import TestResultEvent, run_pytest_streaming
 from ...utils.testing_utils import parse_test_failures as parse_failures
 
 # Configure logging
@@ -52,6 +55,15 @@ class RunnerCore(Generic[T]):
         self.test_timeout = self.config.get("test_timeout", 300)  # 5 minutes
         self.max_concurrent_tests = self.config.get("max_concurrent_tests", 10)
         
+        # Change-aware test selection
+        impact_config = self.config.get("test_impact", {})
+        self.impact_engine: Optional[TestImpactEngine] = None
+        if impact_config.get("enabled", True):
+            self.impact_engine = TestImpactEngine(
+                self.config.get("project_root", "."),
+                impact_config
+            )
+        
         # Runtime state
         self.is_running = False
         self.worker_task = None
@@ -158,29 +170,72 @@ class RunnerCore(Generic[T]):
             self.logger.error(f"[{self.platform}] Error loading config: {str(e)} [config, error]")
             return {}
     
-    async def run_tests(self) -> Dict[str, Any]:
-        """Run test suite and return results.
+    async def run_tests(
+        self,
+        on_result: Optional[Callable[[TestResultEvent], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Run the tests affected by recent changes and return results.
+        
+        With the impact engine enabled only tests affected by files changed
+        since the last iteration, and the tests that failed in it, run, with
+        a periodic full run as a safety net. The result carries an ``impact``
+        report with the fraction of the suite skipped and the time saved; an
+        iteration with nothing to run is returned with ``skipped`` set.
+        
+        Results are streamed from pytest as they happen: ``on_result`` is
+        awaited for each test outcome while the suite is still running, and
+        the result carries the streamed ``failures`` and ``stream`` metrics
+        (including time to first dispatch).
+        
+        Args:
+            on_result: Optional coroutine called for each streamed result
         
         Returns:
             Dictionary containing test results
         """
-        try:
-            # Run pytest with coverage
-            result = await asyncio.create_subprocess_exec(
-                "pytest",
-                "--cov=.",
-                "--cov-report=term-missing",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+        selection = self.impact_engine.select() if self.impact_engine else None
+        
+        if selection is not None and not selection.full_run and not selection.targets:
+            # Nothing changed and nothing failed last time; leave the
+            # engine's cursor where it is so no change is skipped over
+            return {
+                "exit_code": 0,
+                "skipped": True,
+                "stdout": "",
+                "stderr": "",
+                "impact": selection.to_dict()
+            }
+        
+        args = ["pytest", "--cov=.", "--cov-report=term-missing"]
+        env = None
+        if self.impact_engine:
+            args += self.impact_engine.pytest_args()
+            env = self.impact_engine.pytest_env()
+        if selection is not None and not selection.full_run:
+            args += selection.targets
             
-            stdout, stderr = await result.communicate()
+        try:
+            start = time.monotonic()
+            run = await run_pytest_streaming(args, on_result=on_result, env=env)
             
-            return {
-                "exit_code": result.returncode,
-                "stdout": stdout.decode(),
-                "stderr": stderr.decode()
+            results = {
+                "exit_code": run.exit_code,
+                "stdout": run.stdout,
+                "stderr": run.stderr,
+                "stream": run.metrics()
             }
+            if run.streamed:
+                results["failures"] = run.failures()
+            if selection is not None:
+                failed = [event.nodeid for event in run.events if event.failed]
+                if run.exit_code not in (0, 5) and not failed:
+                    failed = None  # red run without node ids, e.g. a collection error
+                results["impact"] = self.impact_engine.record_run(selection, time.monotonic() - start, failed)
+            
+            first_dispatch = results["stream"]["time_to_first_dispatch"]
+            if first_dispatch is not None:
+                self.logger.info(f"[{self.platform}] First failure dispatched after {first_dispatch:.2f}s [test, metrics]")
+            return results
             
         except Exception as e:
             self.logger.error(f"[{self.platform}] Error running tests: {str(e)} [test, error]")
@@ -190,6 +245,23 @@ class RunnerCore(Generic[T]):
                 "stderr": str(e)
             }
     
+    def get_test_failures(self, result: Dict[str, Any]) -> Dict[str, str]:
+        """Get failures from a run_tests result.
+        
+        Prefers the streamed structured results and falls back to parsing
+        stdout when the stream plugin reported nothing.
+        
+        Args:
+            result: Result of run_tests
+            
+        Returns:
+            Mapping of node ids (bare test names when parsed from stdout)
+            to errors
+        """
+        if "failures" in result:
+            return result["failures"]
+        return self.parse_test_failures(result.get("stdout", ""))
+    
     def parse_test_failures(self, output: str) -> Dict[str, str]:
         """Parse test failures from pytest output."""
         return parse_failures(output)
@@ -2,16 +2,26 @@
 Base State Manager
 ----------------
 Provides unified state management functionality for all agents.
+
+Stuck detection arms a timer-wheel deadline on every state transition, so
+stuck agents are found when their timeout expires instead of by sweeping
+all agents. Each transition is appended to a per-agent journal; the journal
+is periodically compacted into a snapshot, and recovery replays the
+snapshot plus the journal tail.
 """
 
 import logging
 import json
 import asyncio
+import os
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Set
+from typing import Callable, Dict, List, Optional, Any, Tuple, Set
 from enum import Enum, auto
 
+from .timer_wheel import TimerWheel
+
 logger = logging.getLogger(__name__)
 
 class AgentStateType(Enum):
@@ -53,6 +63,9 @@ class BaseStateManager:
         self.agents: Dict[str, Dict] = {}  # agent_id -> state_data
         self._recovery_attempts: Dict[str, int] = {}  # agent_id -> attempt count
         self._state_locks: Dict[str, asyncio.Lock] = {}  # agent_id -> lock
+        self._stuck_agents: Set[str] = set()
+        self._stuck_callbacks: List[Callable[[str], Any]] = []
+        self.timer_wheel = TimerWheel(tick=self.config.get("stuck_check_tick", 1.0))
         self._setup_metrics()
         self._setup_recovery()
     
@@ -100,15 +113,137 @@ class BaseStateManager:
         """Set up recovery infrastructure."""
         self.backup_dir = Path(self.config.get("backup_dir", "state_backups"))
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.journal_compact_every = self.config.get("journal_compact_every", 100)
+        self.journal_fsync = self.config.get("journal_fsync", False)
+        self._journal_seq: Dict[str, int] = {}  # agent_id -> last journal sequence
+        self._journal_entries: Dict[str, int] = {}  # agent_id -> entries since snapshot
         
         # Create recovery event queue
         self.recovery_events = asyncio.Queue()
     
-    async def _backup_state(self, agent_id: str) -> Tuple[bool, Optional[str]]:
-        """Backup current state to disk.
+    def _snapshot_file(self, agent_id: str) -> Path:
+        return self.backup_dir / f"{agent_id}_state.json"
+    
+    def _journal_file(self, agent_id: str) -> Path:
+        return self.backup_dir / f"{agent_id}_journal.jsonl"
+    
+    @staticmethod
+    def _history_to_json(history: List[Dict]) -> List[Dict]:
+        return [
+            {
+                "state": entry["state"].name if isinstance(entry["state"], AgentStateType) else entry["state"],
+                "timestamp": entry["timestamp"].isoformat() if isinstance(entry["timestamp"], datetime) else entry["timestamp"],
+                "metadata": entry.get("metadata", {})
+            }
+            for entry in history
+        ]
+    
+    @staticmethod
+    def _history_from_json(history: List[Dict]) -> List[Dict]:
+        return [
+            {
+                "state": AgentStateType[entry["state"]],
+                "timestamp": datetime.fromisoformat(entry["timestamp"]),
+                "metadata": entry.get("metadata", {})
+            }
+            for entry in history
+        ]
+    
+    def _journal_append(self, agent_id: str, op: str) -> None:
+        """Append the agent's current state to its journal.
+        
+        Args:
+            agent_id: Agent identifier
+            op: "transition" or "reset"
+        """
+        if agent_id not in self._journal_seq:
+            self._seed_journal(agent_id)
+        agent_data = self.agents[agent_id]
+        seq = self._journal_seq[agent_id] + 1
+        entry = {
+            "seq": seq,
+            "op": op,
+            "state": agent_data["state"].name,
+            "last_update": agent_data["last_update"].isoformat(),
+            "metadata": agent_data["metadata"]
+        }
+        with open(self._journal_file(agent_id), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+            if self.journal_fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self._journal_seq[agent_id] = seq
+        self._journal_entries[agent_id] = self._journal_entries.get(agent_id, 0) + 1
+    
+    def _seed_journal(self, agent_id: str) -> None:
+        """Resume sequence numbers from an existing snapshot and journal.
+        
+        Without this, the first append after a restart would restart at
+        seq 1 and replay would skip it as already covered. A torn line at
+        the journal tail is cut off so new entries start on a fresh line.
+        
+        Args:
+            agent_id: Agent identifier
+        """
+        seq = 0
+        snapshot_file = self._snapshot_file(agent_id)
+        if snapshot_file.exists():
+            try:
+                with open(snapshot_file) as f:
+                    seq = json.load(f).get("seq", 0)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Unreadable snapshot for agent {agent_id}: {e}")
+        
+        entries = 0
+        journal_file = self._journal_file(agent_id)
+        if journal_file.exists():
+            valid_end = 0
+            with open(journal_file, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_end += len(line)
+                    if entry["seq"] > seq:
+                        seq = entry["seq"]
+                        entries += 1
+            if valid_end < journal_file.stat().st_size:
+                os.truncate(journal_file, valid_end)
+        
+        self._journal_seq[agent_id] = seq
+        self._journal_entries[agent_id] = entries
+    
+    def _compact_journal(self, agent_id: str) -> None:
+        """Write a full snapshot and truncate the journal it covers."""
+        agent_data = self.agents[agent_id]
+        snapshot = {
+            "agent_id": agent_id,
+            "state": agent_data["state"].name,
+            "last_update": agent_data["last_update"].isoformat(),
+            "history": self._history_to_json(agent_data["history"]),
+            "metadata": agent_data["metadata"],
+            "backup_time": datetime.utcnow().isoformat(),
+            "seq": self._journal_seq.get(agent_id, 0)
+        }
+        snapshot_file = self._snapshot_file(agent_id)
+        tmp_file = snapshot_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, default=str)
+        os.replace(tmp_file, snapshot_file)
+        # Entries up to ``seq`` are now in the snapshot; replay skips them
+        # even if the process dies before the truncation below
+        open(self._journal_file(agent_id), "w").close()
+        self._journal_entries[agent_id] = 0
+    
+    async def _backup_state(self, agent_id: str, op: str = "transition") -> Tuple[bool, Optional[str]]:
+        """Journal the current state, compacting the journal when due.
         
         Args:
             agent_id: Agent identifier
+            op: Journal operation ("transition" or "reset")
             
         Returns:
             Tuple of (success, error_message)
@@ -117,18 +252,9 @@ class BaseStateManager:
             if agent_id not in self.agents:
                 return False, f"No state to backup for agent {agent_id}"
             
-            backup_file = self.backup_dir / f"{agent_id}_state.json"
-            backup_data = {
-                "agent_id": agent_id,
-                "state": self.agents[agent_id]["state"].name,
-                "last_update": self.agents[agent_id]["last_update"].isoformat(),
-                "history": self.agents[agent_id]["history"],
-                "metadata": self.agents[agent_id]["metadata"],
-                "backup_time": datetime.utcnow().isoformat()
-            }
-            
-            with open(backup_file, 'w') as f:
-                json.dump(backup_data, f, indent=2)
+            self._journal_append(agent_id, op)
+            if self._journal_entries[agent_id] >= self.journal_compact_every:
+                self._compact_journal(agent_id)
             
             self.state_backups.labels(
                 agent_id=agent_id,
@@ -147,7 +273,7 @@ class BaseStateManager:
             return False, error_msg
     
     async def _load_backup(self, agent_id: str) -> Tuple[bool, Optional[str]]:
-        """Load state from backup.
+        """Load state from the latest snapshot plus the journal tail.
         
         Args:
             agent_id: Agent identifier
@@ -156,24 +282,66 @@ class BaseStateManager:
             Tuple of (success, error_message)
         """
         try:
-            backup_file = self.backup_dir / f"{agent_id}_state.json"
-            if not backup_file.exists():
+            snapshot_file = self._snapshot_file(agent_id)
+            journal_file = self._journal_file(agent_id)
+            if not snapshot_file.exists() and not journal_file.exists():
                 return False, f"No backup found for agent {agent_id}"
             
-            with open(backup_file) as f:
-                backup_data = json.load(f)
-            
-            # Validate backup data
-            if not self._validate_backup(backup_data):
-                raise StateCorruptionError(f"Invalid backup data for agent {agent_id}")
+            agent_data = None
+            seq = 0
+            if snapshot_file.exists():
+                with open(snapshot_file) as f:
+                    backup_data = json.load(f)
+                
+                # Validate backup data
+                if not self._validate_backup(backup_data):
+                    raise StateCorruptionError(f"Invalid backup data for agent {agent_id}")
+                
+                agent_data = {
+                    "state": AgentStateType[backup_data["state"]],
+                    "last_update": datetime.fromisoformat(backup_data["last_update"]),
+                    "history": self._history_from_json(backup_data["history"]),
+                    "metadata": backup_data["metadata"]
+                }
+                seq = backup_data.get("seq", 0)
+            
+            # Replay the journal tail
+            entries = 0
+            if journal_file.exists():
+                with open(journal_file) as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            break  # Torn write at the tail
+                        if entry["seq"] <= seq:
+                            continue
+                        if agent_data is not None and entry["op"] == "transition":
+                            agent_data["history"].append({
+                                "state": agent_data["state"],
+                                "timestamp": agent_data["last_update"],
+                                "metadata": agent_data["metadata"]
+                            })
+                            history = agent_data["history"]
+                        else:
+                            history = []
+                        agent_data = {
+                            "state": AgentStateType[entry["state"]],
+                            "last_update": datetime.fromisoformat(entry["last_update"]),
+                            "history": history,
+                            "metadata": entry["metadata"]
+                        }
+                        seq = entry["seq"]
+                        entries += 1
+            
+            if agent_data is None:
+                return False, f"No backup found for agent {agent_id}"
             
             # Restore state
-            self.agents[agent_id] = {
-                "state": AgentStateType[backup_data["state"]],
-                "last_update": datetime.fromisoformat(backup_data["last_update"]),
-                "history": backup_data["history"],
-                "metadata": backup_data["metadata"]
-            }
+            self.agents[agent_id] = agent_data
+            self._journal_seq[agent_id] = seq
+            self._journal_entries[agent_id] = entries
+            self._arm_stuck_timer(agent_id)
             
             return True, None
             
@@ -281,6 +449,9 @@ class BaseStateManager:
                     self.agents[agent_id]["last_update"] = datetime.utcnow()
                     self.agents[agent_id]["metadata"] = metadata or {}
                 
+                # Re-arm stuck detection for the new state
+                self._arm_stuck_timer(agent_id)
+                
                 # Backup state
                 backup_success, backup_error = await self._backup_state(agent_id)
                 if not backup_success:
@@ -372,9 +543,6 @@ class BaseStateManager:
                 if agent_id not in self.agents:
                     return False, f"No state to reset for agent {agent_id}"
                 
-                # Backup current state
-                await self._backup_state(agent_id)
-                
                 # Reset to IDLE state
                 self.agents[agent_id] = {
                     "state": AgentStateType.IDLE,
@@ -382,6 +550,10 @@ class BaseStateManager:
                     "history": [],
                     "metadata": {}
                 }
+                self._arm_stuck_timer(agent_id)
+                
+                # Journal the reset
+                await self._backup_state(agent_id, op="reset")
                 
                 # Reset recovery attempts
                 self._recovery_attempts[agent_id] = 0
@@ -460,6 +632,16 @@ class BaseStateManager:
         """
         return self.agents.get(agent_id, {}).get("history", [])
     
+    def _state_timeout(self, state: AgentStateType) -> Optional[timedelta]:
+        """Timeout after which an agent in ``state`` counts as stuck."""
+        if state == AgentStateType.IDLE:
+            return self.IDLE_TIMEOUT
+        elif state == AgentStateType.PROCESSING:
+            return self.PROCESSING_TIMEOUT
+        elif state == AgentStateType.ERROR:
+            return self.ERROR_RETRY_TIMEOUT
+        return None
+    
     def is_stuck(self, agent_id: str) -> bool:
         """Check if an agent is stuck in its current state.
         
@@ -473,18 +655,54 @@ class BaseStateManager:
         if not agent_data:
             return False
         
-        current_state = agent_data["state"]
-        time_in_state = datetime.utcnow() - agent_data["last_update"]
+        timeout = self._state_timeout(agent_data["state"])
+        if timeout is None:
+            return False
+        return datetime.utcnow() - agent_data["last_update"] > timeout
+    
+    def _arm_stuck_timer(self, agent_id: str) -> None:
+        """(Re)arm the agent's stuck deadline for its current state."""
+        self._stuck_agents.discard(agent_id)
+        agent_data = self.agents[agent_id]
+        timeout = self._state_timeout(agent_data["state"])
+        if timeout is None:
+            self.timer_wheel.cancel(agent_id)
+            return
         
-        # Check against appropriate timeout
-        if current_state == AgentStateType.IDLE:
-            return time_in_state > self.IDLE_TIMEOUT
-        elif current_state == AgentStateType.PROCESSING:
-            return time_in_state > self.PROCESSING_TIMEOUT
-        elif current_state == AgentStateType.ERROR:
-            return time_in_state > self.ERROR_RETRY_TIMEOUT
+        remaining = timeout - (datetime.utcnow() - agent_data["last_update"])
+        self.timer_wheel.schedule(
+            agent_id,
+            time.monotonic() + remaining.total_seconds(),
+            self._on_stuck
+        )
+    
+    def _on_stuck(self, agent_id: str) -> None:
+        """Timer callback: the agent's state timeout expired."""
+        self._stuck_agents.add(agent_id)
+        logger.warning(f"Agent {agent_id} stuck in {self.get_state(agent_id)}")
+        for callback in self._stuck_callbacks:
+            try:
+                result = callback(agent_id)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error(f"Stuck callback failed for agent {agent_id}: {e}")
+    
+    def add_stuck_callback(self, callback: Callable[[str], Any]) -> None:
+        """Register a callback fired with the agent ID when an agent gets stuck.
         
-        return False
+        Args:
+            callback: Function or coroutine function taking the agent ID
+        """
+        self._stuck_callbacks.append(callback)
+    
+    def start_stuck_monitor(self) -> None:
+        """Fire stuck callbacks in the background as deadlines expire."""
+        self.timer_wheel.start()
+    
+    async def stop_stuck_monitor(self) -> None:
+        """Stop the background stuck monitor."""
+        await self.timer_wheel.stop()
     
     def get_stuck_agents(self) -> List[str]:
         """Get list of stuck agents.
@@ -492,10 +710,8 @@ class BaseStateManager:
         Returns:
             List of agent IDs that are stuck
         """
-        return [
-            agent_id for agent_id in self.agents
-            if self.is_stuck(agent_id)
-        ]
+        self.timer_wheel.advance()
+        return list(self._stuck_agents)
     
     def _update_metrics(self, agent_id: str, state: AgentStateType) -> None:
         """Update monitoring metrics.
@@ -0,0 +1,158 @@
+"""
+Timer Wheel
+---------
+Hierarchical timer wheel for large numbers of re-armable deadlines.
+
+Timers live in ``levels`` wheels of ``slots`` buckets; level ``i`` buckets
+span ``slots ** i`` ticks. Scheduling, re-arming and cancelling a timer are
+O(1) dictionary operations. Advancing the wheel only touches the bucket
+for each elapsed tick, cascading coarser buckets into finer ones as their
+time comes, so the cost of a sweep is proportional to the timers that fire
+rather than to the timers that exist.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_Entry = Tuple[int, Callable[[Hashable], Any]]  # (deadline tick, callback)
+
+
+class TimerWheel:
+    """Hierarchical timer wheel keyed by timer id."""
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the wheel.
+
+        Args:
+            tick: Resolution in seconds; timers fire within one tick of their deadline
+            slots: Buckets per level
+            levels: Number of levels (range is ``slots ** levels`` ticks)
+            clock: Monotonic clock in seconds
+        """
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self._origin = clock()
+        self._current = 0
+        self._wheels: List[List[Dict[Hashable, _Entry]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _tick_at(self, when: float) -> int:
+        return int(math.ceil((when - self._origin) / self.tick))
+
+    def schedule(self, key: Hashable, deadline: float, callback: Callable[[Hashable], Any]) -> None:
+        """Arm (or re-arm) the timer ``key`` to call ``callback(key)`` at ``deadline``.
+
+        Args:
+            key: Timer id; an existing timer with this id is replaced
+            deadline: Clock time at which to fire
+            callback: Called with the key when the timer fires
+        """
+        self.cancel(key)
+        self._insert(key, (max(self._tick_at(deadline), self._current + 1), callback))
+
+    def _insert(self, key: Hashable, entry: _Entry) -> None:
+        delta = entry[0] - self._current
+        level = 0
+        span = self.slots
+        while delta >= span and level < self.levels - 1:
+            level += 1
+            span *= self.slots
+        if delta >= span:
+            # Beyond the wheel's range: park in the farthest bucket, re-placed on cascade
+            target = self._current + span - 1
+        else:
+            target = entry[0]
+        slot = (target // (self.slots ** level)) % self.slots
+        self._wheels[level][slot][key] = entry
+        self._where[key] = (level, slot)
+
+    def cancel(self, key: Hashable) -> bool:
+        """Disarm a timer.
+
+        Returns:
+            True if the timer was armed
+        """
+        location = self._where.pop(key, None)
+        if location is None:
+            return False
+        level, slot = location
+        self._wheels[level][slot].pop(key, None)
+        return True
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """Fire every timer due by ``now``.
+
+        Returns:
+            Number of timers fired
+        """
+        now = self.clock() if now is None else now
+        target = int((now - self._origin) / self.tick)
+        fired = 0
+        while self._current < target:
+            self._current += 1
+            self._cascade()
+            bucket = self._wheels[0][self._current % self.slots]
+            if not bucket:
+                continue
+            due = [(key, entry) for key, entry in bucket.items() if entry[0] <= self._current]
+            for key, entry in due:
+                del bucket[key]
+                del self._where[key]
+            for key, (_, callback) in due:
+                fired += 1
+                try:
+                    callback(key)
+                except Exception as e:
+                    logger.error(f"Timer callback for {key!r} failed: {e}")
+        return fired
+
+    def _cascade(self) -> None:
+        """Move coarse buckets whose span starts at the current tick down a level."""
+        span = 1
+        for level in range(1, self.levels):
+            span *= self.slots
+            if self._current % span:
+                break
+            slot = (self._current // span) % self.slots
+            bucket = self._wheels[level][slot]
+            self._wheels[level][slot] = {}
+            for key, entry in bucket.items():
+                self._insert(key, entry)
+
+    async def run(self) -> None:
+        """Advance the wheel every tick until cancelled."""
+        while True:
+            self.advance()
+            await asyncio.sleep(self.tick)
+
+    def start(self) -> None:
+        """Run the wheel in a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -4,32 +4,46 @@ Codex Patch Tracker
 Tracks and manages code patches generated by Codex.
 """
 
+import asyncio
 import logging
 import json
 import subprocess
 import os
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 from agent_tools.swarm_tools.scanner.scanner import Scanner, ScanResults
 
 from .base_tracker import BaseTracker
+from .duplicate_index import DuplicateIndex
 
 class CodexPatchTracker(BaseTracker):
     """Tracks and manages code patches generated by Codex."""
     
-    def __init__(self, failure_log_dir: Optional[str] = None):
+    def __init__(self, failure_log_dir: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
         """Initialize the patch tracker.
         
         Args:
             failure_log_dir: Directory to store failure logs. Defaults to runtime/scanner/codex_failures/
+            config: Optional configuration; ``incremental`` (default True) checks
+                patched files against a resident DuplicateIndex instead of
+                scanning the whole project per patch. Between checks the
+                index re-reads only the files of tracked patches, and
+                re-stats the whole tree every ``full_refresh_every``
+                (default 50) checks to pick up edits made elsewhere
         """
+        self.config = config or {}
         super().__init__(
             log_dir=failure_log_dir or "runtime/scanner/codex_failures",
             platform="codex",
             tracker_type="patch_tracker"
         )
         self.scanner = Scanner(str(Path.cwd()))
+        self.incremental = self.config.get("incremental", True)
+        self.index = DuplicateIndex(str(Path.cwd()), self.config.get("index", {}))
+        self.full_refresh_every = max(1, self.config.get("full_refresh_every", 50))
+        self._changed_files: Set[str] = set()  # patched since the last refresh
+        self._checks = 0
         self.patches: Dict[str, Dict[str, Any]] = {}  # patch_id -> patch_info
     
     async def validate_with_scanner(self, patch_id: str, file_path: str) -> Tuple[bool, Dict[str, Any]]:
@@ -43,15 +57,30 @@ class CodexPatchTracker(BaseTracker):
             Tuple of (is_valid, results)
         """
         try:
-            # Run scanner on the project
-            results = await self.scanner.scan_project()
-            
-            # Check if the patched file has duplicates
-            file_duplicates = [
-                item for category in results.duplicates.values()
-                for item in category
-                if item['file'] == file_path
-            ]
+            if self.incremental and self.index.built_at is not None:
+                # Pick up files patched since the last check, then
+                # re-fingerprint the patched file
+                self._checks += 1
+                changed, self._changed_files = self._changed_files, set()
+                paths = None if self._checks % self.full_refresh_every == 0 else changed
+                await asyncio.get_event_loop().run_in_executor(None, self.index.refresh, paths)
+                duplicates = self.index.check_file(file_path)
+                file_duplicates = [item for category in duplicates.values() for item in category]
+                summary = self.index.summary()
+            else:
+                # Run scanner on the project
+                results = await self.scanner.scan_project()
+                
+                # Check if the patched file has duplicates
+                file_duplicates = [
+                    item for category in results.duplicates.values()
+                    for item in category
+                    if item['file'] == file_path
+                ]
+                summary = results.summary()
+                
+                if self.incremental:
+                    await asyncio.get_event_loop().run_in_executor(None, self.index.build)
             
             if file_duplicates:
                 # Log the failure
@@ -59,14 +88,14 @@ class CodexPatchTracker(BaseTracker):
                     patch_id,
                     {
                         "file": file_path,
-                        "scanner_results": results.summary(),
+                        "scanner_results": summary,
                         "duplicates": file_duplicates
                     },
                     "scanner_validation_failed"
                 )
-                return False, results.summary()
+                return False, summary
             
-            return True, results.summary()
+            return True, summary
             
         except Exception as e:
             self.logger.error(f"Scanner validation failed: {str(e)}")
@@ -77,21 +106,35 @@ class CodexPatchTracker(BaseTracker):
             )
             return False, {"error": str(e)}
     
-    async def track_patch(self, patch_id: str, file_path: str, outcome: str) -> None:
+    async def track_patch(
+        self,
+        patch_id: str,
+        file_path: str,
+        outcome: str,
+        validation: Optional[Tuple[bool, Dict[str, Any]]] = None
+    ) -> None:
         """Track a patch with its outcome.
         
         Args:
             patch_id: Unique identifier for the patch
             file_path: Path to the file being patched
             outcome: Outcome of the patch (success, failure, scanner_failed)
+            validation: Result of a validate_with_scanner call already made
+                for this patch, to avoid validating twice
         """
         # Validate with scanner first
-        is_valid, scanner_results = await self.validate_with_scanner(patch_id, file_path)
+        if validation is None:
+            validation = await self.validate_with_scanner(patch_id, file_path)
+        is_valid, scanner_results = validation
         
         # Update outcome if scanner validation failed
         if not is_valid and outcome == "success":
             outcome = "scanner_failed"
         
+        # Re-read on the next incremental check; the patch may have been
+        # reverted since it was validated
+        self._changed_files.add(file_path)
+        
         # Store patch metadata
         self.patches[patch_id] = {
             "file": file_path,
@@ -0,0 +1,367 @@
+"""
+Duplicate Index
+-------------
+Resident per-file fingerprint index for incremental duplicate checks.
+
+Every function and class in the project is recorded with:
+
+1. A structural fingerprint - a hash of its AST dump with the docstring
+   removed and its own name blanked - so renamed copies match exactly.
+2. An AST signature - argument count and number of top-level statements -
+   bucketing functions that may be near-duplicates. Within a bucket,
+   functions are compared by token-set similarity, as the project scanner
+   does.
+3. For classes, the names of their methods and base classes, compared with
+   the scanner's weighting (0.7 method overlap, 0.3 base overlap).
+
+Checking a patched file re-parses only that file and looks its definitions
+up in the index, so the cost scales with the patch rather than the repo.
+``refresh`` re-indexes only the files whose mtime or size changed; given
+the paths a caller knows have changed, it stats only those.
+
+Differences from ``tools/swarm/scanner.py``, which compares every pair:
+
+- Near-duplicate functions are only compared within a signature bucket, so
+  copies that gained an argument or a statement are not flagged.
+- Definitions shorter than ``min_statements`` are not indexed.
+- Nested and async functions are indexed; the scanner skips async ones.
+- A renamed copy with identical structure always matches, even when
+  renaming its variables pushes token similarity below the threshold.
+"""
+
+import ast
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SKIP_DIRS = {".git", ".venv", "venv", "node_modules", "__pycache__", "build", "dist", ".tox"}
+
+DefKey = Tuple[str, str]  # (relative file, qualified name)
+
+
+class _Definition:
+    """One indexed function or class."""
+
+    __slots__ = ("file", "name", "category", "fingerprint", "signature", "tokens", "methods", "bases")
+
+    def __init__(self, file: str, name: str, category: str, fingerprint: str,
+                 signature: Optional[Tuple[int, int]], tokens: Optional[frozenset],
+                 methods: frozenset = frozenset(), bases: frozenset = frozenset()):
+        self.file = file
+        self.name = name
+        self.category = category
+        self.fingerprint = fingerprint
+        self.signature = signature
+        self.tokens = tokens
+        self.methods = methods
+        self.bases = bases
+
+    @property
+    def key(self) -> DefKey:
+        return (self.file, self.name)
+
+
+def _strip_docstring(body: List[ast.stmt]) -> List[ast.stmt]:
+    if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        return body[1:]
+    return body
+
+
+def _statement_count(node: ast.AST) -> int:
+    return sum(1 for child in ast.walk(node) if isinstance(child, ast.stmt)) - 1
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+class DuplicateIndex:
+    """Project-wide index of definition fingerprints."""
+
+    def __init__(self, project_root: str = ".", config: Optional[Dict[str, Any]] = None):
+        """Initialize the index.
+
+        Args:
+            project_root: Root directory to index
+            config: Optional index configuration
+        """
+        self.config = config or {}
+        self.root = Path(project_root).resolve()
+        self.similarity_threshold = self.config.get("similarity_threshold", 0.8)
+        self.min_statements = self.config.get("min_statements", 3)
+
+        self._lock = threading.RLock()
+        self._files: Dict[str, Tuple[int, int]] = {}  # file -> (mtime_ns, size)
+        self._defs_by_file: Dict[str, List[_Definition]] = {}
+        self._by_fingerprint: Dict[str, Set[DefKey]] = {}
+        self._by_signature: Dict[Tuple[int, int], Set[DefKey]] = {}
+        self._classes: Set[DefKey] = set()
+        self._defs: Dict[DefKey, _Definition] = {}
+        self.built_at: Optional[float] = None
+        self.stats = {"builds": 0, "refreshes": 0, "incremental_checks": 0, "files_indexed": 0}
+
+    # ------------------------------------------------------------------
+    # Building
+
+    def is_stale(self) -> bool:
+        """Whether the index was never built or differs from the tree."""
+        if self.built_at is None:
+            return True
+        with self._lock:
+            changed, removed = self._diff_tree()
+        return bool(changed or removed)
+
+    def _diff_tree(self) -> Tuple[List[Path], List[str]]:
+        """Compare indexed (mtime_ns, size) stamps against the tree.
+
+        Returns:
+            Tuple of (new or modified paths, removed relative paths)
+        """
+        changed = []
+        present = set()
+        for path in self._iter_files():
+            rel = self._relative(path)
+            present.add(rel)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self._files.get(rel) != (stat.st_mtime_ns, stat.st_size):
+                changed.append(path)
+        removed = [rel for rel in self._files if rel not in present]
+        return changed, removed
+
+    def refresh(self, paths: Optional[Iterable[str]] = None) -> int:
+        """Re-index only the files added, modified or removed since indexing.
+
+        Builds the full index if it was never built.
+
+        Args:
+            paths: Files known to have changed (absolute or project
+                relative). Only these are checked; by default every file in
+                the tree is stat'ed.
+
+        Returns:
+            Number of files re-indexed or dropped
+        """
+        if self.built_at is None:
+            self.build()
+            return len(self._files)
+        with self._lock:
+            if paths is None:
+                changed, removed = self._diff_tree()
+            else:
+                changed, removed = self._diff_paths(paths)
+            for rel in removed:
+                self._remove_file(rel)
+            for path in changed:
+                self._index_file(path)
+            self.stats["refreshes"] += 1
+            self.stats["files_indexed"] = len(self._files)
+        if changed or removed:
+            logger.debug(f"Refreshed duplicate index: {len(changed)} changed, {len(removed)} removed")
+        return len(changed) + len(removed)
+
+    def _diff_paths(self, paths: Iterable[str]) -> Tuple[List[Path], List[str]]:
+        """Compare indexed stamps against the given files only.
+
+        Returns:
+            Tuple of (new or modified paths, removed relative paths)
+        """
+        changed = []
+        removed = []
+        for file_path in dict.fromkeys(paths):
+            path = Path(file_path)
+            if not path.is_absolute():
+                path = self.root / path
+            rel = self._relative(path)
+            try:
+                stat = path.stat()
+            except OSError:
+                stat = None
+            if stat is None or not rel.endswith(".py"):
+                if rel in self._files:
+                    removed.append(rel)
+            elif self._files.get(rel) != (stat.st_mtime_ns, stat.st_size):
+                changed.append(path)
+        return changed, removed
+
+    def build(self) -> None:
+        """(Re)index every Python file under the project root."""
+        start = time.time()
+        with self._lock:
+            self._files.clear()
+            self._defs_by_file.clear()
+            self._by_fingerprint.clear()
+            self._by_signature.clear()
+            self._classes.clear()
+            self._defs.clear()
+            for path in self._iter_files():
+                self._index_file(path)
+            self.built_at = time.time()
+            self.stats["builds"] += 1
+            self.stats["files_indexed"] = len(self._files)
+        logger.info(f"Indexed {len(self._files)} files ({len(self._defs)} definitions) in {time.time() - start:.1f}s")
+
+    def _iter_files(self):
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    yield Path(dirpath) / filename
+
+    def _relative(self, path: Path) -> str:
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.root / path
+        try:
+            return path.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return path.resolve().as_posix()
+
+    def _index_file(self, path: Path) -> List[_Definition]:
+        """Parse one file and add its definitions, replacing previous ones."""
+        rel = self._relative(path)
+        self._remove_file(rel)
+        try:
+            stat = path.stat()
+            source = path.read_text(encoding="utf-8")
+            tree = ast.parse(source)
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+            logger.debug(f"Skipping {rel}: {e}")
+            return []
+
+        definitions = self._extract(rel, tree, source)
+        self._files[rel] = (stat.st_mtime_ns, stat.st_size)
+        self._defs_by_file[rel] = definitions
+        for definition in definitions:
+            self._defs[definition.key] = definition
+            self._by_fingerprint.setdefault(definition.fingerprint, set()).add(definition.key)
+            if definition.signature is not None:
+                self._by_signature.setdefault(definition.signature, set()).add(definition.key)
+            if definition.category == "classes":
+                self._classes.add(definition.key)
+        return definitions
+
+    def _remove_file(self, rel: str) -> None:
+        for definition in self._defs_by_file.pop(rel, []):
+            self._defs.pop(definition.key, None)
+            self._by_fingerprint.get(definition.fingerprint, set()).discard(definition.key)
+            if definition.signature is not None:
+                self._by_signature.get(definition.signature, set()).discard(definition.key)
+            self._classes.discard(definition.key)
+        self._files.pop(rel, None)
+
+    def _extract(self, rel: str, tree: ast.AST, source: str) -> List[_Definition]:
+        definitions = []
+        lines = source.splitlines()
+
+        def visit(node: ast.AST, prefix: str) -> None:
+            for child in ast.iter_child_nodes(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    name = f"{prefix}{child.name}"
+                    if _statement_count(child) >= self.min_statements:
+                        definitions.append(self._definition(rel, name, child, lines))
+                    visit(child, f"{name}.")
+                else:
+                    visit(child, prefix)
+
+        visit(tree, "")
+        return definitions
+
+    def _definition(self, rel: str, name: str, node: ast.AST, lines: List[str]) -> _Definition:
+        body = _strip_docstring(node.body)
+        is_class = isinstance(node, ast.ClassDef)
+        if is_class:
+            shape = ast.Module(body=body, type_ignores=[])
+        else:
+            shape = ast.Module(body=[node.args] + body, type_ignores=[])
+        fingerprint = hashlib.sha1(ast.dump(shape).encode()).hexdigest()
+
+        if is_class:
+            methods = frozenset(child.name for child in node.body if isinstance(child, ast.FunctionDef))
+            bases = frozenset(base.id for base in node.bases if isinstance(base, ast.Name))
+            return _Definition(rel, name, "classes", fingerprint, None, None, methods, bases)
+
+        signature = (len(node.args.args) + len(node.args.kwonlyargs), len(body))
+        segment = lines[node.lineno - 1:node.end_lineno]
+        tokens = frozenset(token for line in segment for token in line.split())
+        return _Definition(rel, name, "functions", fingerprint, signature, tokens)
+
+    # ------------------------------------------------------------------
+    # Checking
+
+    def check_file(self, file_path: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Re-fingerprint one file and find its duplicates in the index.
+
+        Args:
+            file_path: Path of the patched file (absolute or project relative)
+
+        Returns:
+            Duplicates by category; each item names the patched definition
+            (``file``, ``name``) and the definition it duplicates
+        """
+        with self._lock:
+            self.stats["incremental_checks"] += 1
+            path = Path(file_path)
+            if not path.is_absolute():
+                path = self.root / path
+            definitions = self._index_file(path)
+
+            duplicates: Dict[str, List[Dict[str, Any]]] = {}
+            for definition in definitions:
+                for other_key, similarity in self._matches(definition):
+                    other = self._defs[other_key]
+                    duplicates.setdefault(definition.category, []).append({
+                        "file": file_path,
+                        "name": definition.name,
+                        "duplicate_file": other.file,
+                        "duplicate_name": other.name,
+                        "similarity": round(similarity, 3)
+                    })
+            return duplicates
+
+    def _matches(self, definition: _Definition):
+        seen = {definition.key}
+        for key in self._by_fingerprint.get(definition.fingerprint, ()):
+            if key not in seen:
+                seen.add(key)
+                yield key, 1.0
+
+        if definition.category == "classes":
+            for key in self._classes:
+                if key in seen:
+                    continue
+                other = self._defs[key]
+                # Same weighting as the scanner's class similarity
+                similarity = 0.7 * _jaccard(definition.methods, other.methods) + \
+                    0.3 * _jaccard(definition.bases, other.bases)
+                if similarity >= self.similarity_threshold:
+                    seen.add(key)
+                    yield key, similarity
+            return
+
+        for key in self._by_signature.get(definition.signature, ()):
+            if key in seen:
+                continue
+            similarity = _jaccard(definition.tokens, self._defs[key].tokens)
+            if similarity >= self.similarity_threshold:
+                seen.add(key)
+                yield key, similarity
+
+    def summary(self) -> Dict[str, Any]:
+        """Summary in the shape of a scan summary."""
+        return {
+            "type": "incremental_scan_summary",
+            "total_files": len(self._files),
+            "total_definitions": len(self._defs),
+            "index_age": None if self.built_at is None else time.time() - self.built_at
+        }
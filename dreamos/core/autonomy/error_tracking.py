@@ -2,13 +2,21 @@
 Error Tracking and Resilience
 ---------------------------
 Tracks errors, implements circuit breakers, and manages retry logic for the response loop system.
+
+Error counts are kept in per-agent rings of time buckets keyed by error type
+and severity, so windowed summaries cost O(buckets) no matter how many errors
+were recorded. Raw errors are only retained for a bounded count and age.
+Critical errors go to an append-only, rotating JSONL failure vault indexed by
+agent and error type.
 """
 
 import json
 import logging
+import math
+import os
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 from collections import defaultdict, deque
 from dataclasses import dataclass
 from enum import Enum
@@ -212,26 +220,239 @@ class CircuitBreaker:
         self.half_open_start = None
         logger.info("Circuit breaker manually reset")
 
+class _RingCounter:
+    """Error counts in a ring of fixed-width time buckets."""
+    
+    def __init__(self, bucket_seconds: int, num_buckets: int):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self.bucket_ids: List[int] = [-1] * num_buckets
+        self.counts: List[Dict[Tuple[str, str], int]] = [{} for _ in range(num_buckets)]
+    
+    def add(self, timestamp: float, key: Tuple[str, str], amount: int = 1):
+        """Count ``amount`` errors of ``key`` (error type, severity) at ``timestamp``."""
+        bucket = int(timestamp // self.bucket_seconds)
+        slot = bucket % self.num_buckets
+        if self.bucket_ids[slot] != bucket:
+            if self.bucket_ids[slot] > bucket:
+                return  # Older than the ring covers
+            self.bucket_ids[slot] = bucket
+            self.counts[slot] = {}
+        counts = self.counts[slot]
+        counts[key] = counts.get(key, 0) + amount
+    
+    def subtract(self, other: "_RingCounter"):
+        """Remove another ring's counts (same geometry) from this one."""
+        for slot, bucket in enumerate(other.bucket_ids):
+            if bucket == -1 or self.bucket_ids[slot] != bucket:
+                continue
+            counts = self.counts[slot]
+            for key, amount in other.counts[slot].items():
+                remaining = counts.get(key, 0) - amount
+                if remaining > 0:
+                    counts[key] = remaining
+                else:
+                    counts.pop(key, None)
+    
+    def totals(self, now: float, window: float) -> Dict[Tuple[str, str], int]:
+        """Counts over the buckets overlapping the last ``window`` seconds."""
+        current = int(now // self.bucket_seconds)
+        oldest = current - min(self.num_buckets - 1, int(math.ceil(window / self.bucket_seconds)))
+        totals: Dict[Tuple[str, str], int] = defaultdict(int)
+        for slot, bucket in enumerate(self.bucket_ids):
+            if oldest <= bucket <= current:
+                for key, amount in self.counts[slot].items():
+                    totals[key] += amount
+        return totals
+    
+    @property
+    def coverage(self) -> int:
+        """Longest window in seconds the ring can answer."""
+        return (self.num_buckets - 1) * self.bucket_seconds
+
+
+class FailureVault:
+    """Append-only, rotating JSONL archive of unfixable errors.
+    
+    Each archive line is one error. ``index.jsonl`` records the file and
+    byte offset of every entry by agent and error type, so lookups read only
+    the matching lines. Once the active archive exceeds ``max_bytes`` a new
+    one is started, and archives beyond ``max_files`` are deleted together
+    with their index entries.
+    """
+    
+    def __init__(self, vault_path: str, max_bytes: int = 10 * 1024 * 1024, max_files: int = 20):
+        """Initialize the failure vault.
+        
+        Args:
+            vault_path: Directory holding archives and the index
+            max_bytes: Size at which the active archive is rotated
+            max_files: Number of archives to keep
+        """
+        self.vault_path = Path(vault_path)
+        self.vault_path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.index_path = self.vault_path / "index.jsonl"
+        
+        # agent_id -> error_type -> [(archive name, offset)]
+        self.index: Dict[str, Dict[str, List[Tuple[str, int]]]] = defaultdict(lambda: defaultdict(list))
+        self._load_index()
+        archives = self._archives()
+        self.active = archives[-1] if archives else self._new_archive_path()
+    
+    def _archives(self) -> List[Path]:
+        return sorted(self.vault_path.glob("archive_*.jsonl"))
+    
+    def _new_archive_path(self) -> Path:
+        return self.vault_path / f"archive_{time.time_ns()}.jsonl"
+    
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final line after a crash
+                self.index[entry["agent_id"]][entry["error_type"]].append((entry["file"], entry["offset"]))
+    
+    def append(self, error: TrackedError) -> Tuple[str, int]:
+        """Archive an error.
+        
+        Returns:
+            Tuple of (archive file name, byte offset)
+        """
+        if self.active.exists() and self.active.stat().st_size >= self.max_bytes:
+            self._rotate()
+        
+        line = (json.dumps(error.to_dict()) + "\n").encode("utf-8")
+        with open(self.active, "ab") as f:
+            offset = f.tell()
+            f.write(line)
+        
+        entry = {"agent_id": error.agent_id, "error_type": error.error_type,
+                 "file": self.active.name, "offset": offset}
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.index[error.agent_id][error.error_type].append((self.active.name, offset))
+        return self.active.name, offset
+    
+    def _rotate(self):
+        """Start a new archive and drop the oldest beyond ``max_files``."""
+        self.active = self._new_archive_path()
+        archives = self._archives()
+        expired = {p.name for p in archives[:max(0, len(archives) + 1 - self.max_files)]}
+        if not expired:
+            return
+        for name in expired:
+            (self.vault_path / name).unlink(missing_ok=True)
+        
+        # Compact the index without the expired archives
+        for by_type in self.index.values():
+            for error_type, entries in by_type.items():
+                by_type[error_type] = [e for e in entries if e[0] not in expired]
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for agent_id, by_type in self.index.items():
+                for error_type, entries in by_type.items():
+                    for name, offset in entries:
+                        f.write(json.dumps({"agent_id": agent_id, "error_type": error_type,
+                                            "file": name, "offset": offset}) + "\n")
+        os.replace(tmp_path, self.index_path)
+    
+    def query(self,
+              agent_id: Optional[str] = None,
+              error_type: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read archived errors, newest first.
+        
+        Args:
+            agent_id: Optional agent ID to filter by
+            error_type: Optional error type to filter by
+            limit: Optional maximum number of errors to return
+            
+        Returns:
+            List of archived error dictionaries
+        """
+        locations = sorted(self._locations(agent_id, error_type), reverse=True)
+        if limit is not None:
+            locations = locations[:limit]
+        
+        results = []
+        handles: Dict[str, Any] = {}
+        try:
+            for name, offset in locations:
+                if name not in handles:
+                    try:
+                        handles[name] = open(self.vault_path / name, "rb")
+                    except FileNotFoundError:
+                        handles[name] = None
+                handle = handles[name]
+                if handle is None:
+                    continue
+                handle.seek(offset)
+                results.append(json.loads(handle.readline()))
+        finally:
+            for handle in handles.values():
+                if handle is not None:
+                    handle.close()
+        return results
+    
+    def _locations(self, agent_id: Optional[str], error_type: Optional[str]) -> Iterator[Tuple[str, int]]:
+        agents = [agent_id] if agent_id is not None else list(self.index)
+        for agent in agents:
+            by_type = self.index.get(agent, {})
+            types = [error_type] if error_type is not None else list(by_type)
+            for t in types:
+                yield from by_type.get(t, ())
+    
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Archived error counts by agent and error type."""
+        return {
+            agent_id: {t: len(entries) for t, entries in by_type.items() if entries}
+            for agent_id, by_type in self.index.items()
+        }
+
+
 class ErrorTracker:
     """Tracks errors and provides error analysis."""
     
     def __init__(self, 
                  max_errors: int = 1000,
                  error_window: int = 3600,
-                 failure_vault_path: str = "data/failure_vault"):
+                 failure_vault_path: str = "data/failure_vault",
+                 bucket_seconds: int = 60,
+                 history_window: Optional[int] = None,
+                 raw_retention: Optional[int] = None,
+                 vault_max_bytes: int = 10 * 1024 * 1024,
+                 vault_max_files: int = 20):
         """Initialize the error tracker.
         
         Args:
-            max_errors: Maximum number of errors to track
+            max_errors: Maximum number of raw errors to keep
             error_window: Time window for error analysis in seconds
             failure_vault_path: Path to store unfixable errors
+            bucket_seconds: Width of a counter bucket in seconds
+            history_window: Longest summary window supported (defaults to error_window)
+            raw_retention: Maximum age of raw errors in seconds (defaults to history_window)
+            vault_max_bytes: Size at which a vault archive is rotated
+            vault_max_files: Number of vault archives to keep
         """
         self.max_errors = max_errors
         self.error_window = error_window
+        self.bucket_seconds = bucket_seconds
+        self.history_window = max(history_window or error_window, error_window)
+        self.raw_retention = raw_retention or self.history_window
         self.failure_vault_path = Path(failure_vault_path)
-        self.failure_vault_path.mkdir(parents=True, exist_ok=True)
+        self.failure_vault = FailureVault(failure_vault_path, vault_max_bytes, vault_max_files)
         
         self.errors: deque[TrackedError] = deque(maxlen=max_errors)
+        self.critical_errors: deque[TrackedError] = deque(maxlen=max_errors)
+        self._num_buckets = int(math.ceil(self.history_window / bucket_seconds)) + 1
+        self._totals = self._new_ring()
+        self._agent_counters: Dict[str, _RingCounter] = {}
         self.circuit_breakers: Dict[str, CircuitBreaker] = defaultdict(
             lambda: CircuitBreaker()
         )
@@ -247,6 +468,10 @@ class ErrorTracker:
             recovery_strategy: Optional recovery strategy
         """
         self.errors.append(error)
+        if error.severity == ErrorSeverity.CRITICAL:
+            self.critical_errors.append(error)
+        self._count(error)
+        self._prune_raw_errors()
         
         # Update circuit breaker
         if error.severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL]:
@@ -258,7 +483,7 @@ class ErrorTracker:
         
         logger.error(
             f"Error recorded: {error.error_type} for agent {error.agent_id} - {error.message}",
-            extra=error.to_dict()
+            extra={"error": error.to_dict()}
         )
         
         # Handle unfixable errors
@@ -284,11 +509,35 @@ class ErrorTracker:
         """
         return self.circuit_breakers[agent_id].can_execute()
     
+    def _new_ring(self) -> _RingCounter:
+        return _RingCounter(self.bucket_seconds, self._num_buckets)
+    
+    def _count(self, error: TrackedError):
+        """Add an error to the global and per-agent counters."""
+        timestamp = error.timestamp.timestamp()
+        key = (error.error_type, error.severity.name)
+        self._totals.add(timestamp, key)
+        counter = self._agent_counters.get(error.agent_id)
+        if counter is None:
+            counter = self._agent_counters[error.agent_id] = self._new_ring()
+        counter.add(timestamp, key)
+    
+    def _prune_raw_errors(self):
+        """Drop raw errors older than the retention period."""
+        cutoff = datetime.now() - timedelta(seconds=self.raw_retention)
+        while self.errors and self.errors[0].timestamp < cutoff:
+            self.errors.popleft()
+        while self.critical_errors and self.critical_errors[0].timestamp < cutoff:
+            self.critical_errors.popleft()
+    
     def get_error_summary(self, 
                          agent_id: Optional[str] = None,
                          window: Optional[int] = None) -> Dict:
         """Get a summary of recent errors.
         
+        Counts are bucket-granular: the window is rounded up to whole
+        buckets and capped at ``history_window``.
+        
         Args:
             agent_id: Optional agent ID to filter by
             window: Optional time window in seconds
@@ -296,26 +545,20 @@ class ErrorTracker:
         Returns:
             Dictionary containing error statistics
         """
-        now = datetime.now()
-        window = window or self.error_window
-        
-        # Filter errors by time window and agent
-        recent_errors = [
-            e for e in self.errors
-            if (now - e.timestamp).total_seconds() <= window
-            and (not agent_id or e.agent_id == agent_id)
-        ]
+        window = min(window or self.error_window, self.history_window)
+        counter = self._agent_counters.get(agent_id) if agent_id else self._totals
+        totals = counter.totals(time.time(), window) if counter else {}
         
         # Count errors by type and severity
         error_types = defaultdict(int)
         severities = defaultdict(int)
         
-        for error in recent_errors:
-            error_types[error.error_type] += 1
-            severities[error.severity.name] += 1
+        for (error_type, severity), count in totals.items():
+            error_types[error_type] += count
+            severities[severity] += count
         
         return {
-            "total_errors": len(recent_errors),
+            "total_errors": sum(totals.values()),
             "error_types": dict(error_types),
             "severities": dict(severities),
             "window_seconds": window,
@@ -366,9 +609,8 @@ class ErrorTracker:
         window = window or self.error_window
         
         return [
-            e for e in self.errors
+            e for e in self.critical_errors
             if (now - e.timestamp).total_seconds() <= window
-            and e.severity == ErrorSeverity.CRITICAL
         ]
     
     def _archive_unfixable_error(self, error: TrackedError):
@@ -378,23 +620,32 @@ class ErrorTracker:
             error: Error to archive
         """
         try:
-            # Create error archive file
-            timestamp = error.timestamp.strftime("%Y%m%d_%H%M%S")
-            filename = f"{error.agent_id}_{error.error_type}_{timestamp}.json"
-            filepath = self.failure_vault_path / filename
-            
-            # Write error to file
-            with open(filepath, 'w') as f:
-                json.dump(error.to_dict(), f, indent=2)
+            name, offset = self.failure_vault.append(error)
             
             logger.info(
-                f"Archived unfixable error to {filepath}",
+                f"Archived unfixable error to {name}@{offset}",
                 extra={"error": error.to_dict()}
             )
             
         except Exception as e:
             logger.error(f"Failed to archive error: {e}")
     
+    def get_archived_errors(self,
+                            agent_id: Optional[str] = None,
+                            error_type: Optional[str] = None,
+                            limit: Optional[int] = None) -> List[Dict]:
+        """Get archived unfixable errors, newest first.
+        
+        Args:
+            agent_id: Optional agent ID to filter by
+            error_type: Optional error type to filter by
+            limit: Optional maximum number of errors to return
+            
+        Returns:
+            List of archived error dictionaries
+        """
+        return self.failure_vault.query(agent_id, error_type, limit)
+    
     def clear_errors(self, agent_id: Optional[str] = None):
         """Clear error history.
         
@@ -406,12 +657,22 @@ class ErrorTracker:
                 (e for e in self.errors if e.agent_id != agent_id),
                 maxlen=self.max_errors
             )
+            self.critical_errors = deque(
+                (e for e in self.critical_errors if e.agent_id != agent_id),
+                maxlen=self.max_errors
+            )
+            counter = self._agent_counters.pop(agent_id, None)
+            if counter is not None:
+                self._totals.subtract(counter)
             if agent_id in self.circuit_breakers:
                 del self.circuit_breakers[agent_id]
             if agent_id in self.recovery_strategies:
                 del self.recovery_strategies[agent_id]
         else:
             self.errors.clear()
+            self.critical_errors.clear()
+            self._totals = self._new_ring()
+            self._agent_counters.clear()
             self.circuit_breakers.clear()
             self.recovery_strategies.clear()
     
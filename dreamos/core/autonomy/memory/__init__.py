@@ -1,8 +1,10 @@
 # AUTO-GENERATED __init__.py
 # DO NOT EDIT MANUALLY - changes may be overwritten
 
+from . import dedupe_store
 from . import response_memory_tracker
 
 __all__ = [
+    'dedupe_store',
     'response_memory_tracker',
 ]
@@ -0,0 +1,454 @@
+"""
+Dedupe Store
+-----------
+Scalable processed-message store for long-running daemons.
+
+Hashes are kept in generations:
+
+1. The active generation - an in-memory dict backed by an append-only log
+   (``active.log``), one JSON line per hash. Adding a hash costs one dict
+   insert and one line append regardless of history size.
+2. Sealed segments - when the active generation reaches ``segment_size``
+   entries (or ``snapshot_interval`` seconds pass) it is snapshotted into an
+   immutable segment file of sorted fixed-width records (128-bit digest plus
+   timestamp), binary-searched through a memory map.
+
+A Bloom filter covering every live entry sits in front of the segments, so
+an unseen hash - the common case - is rejected with a few in-memory bit
+tests no matter how many segments exist; only filter hits are confirmed on disk. The
+filter grows by adding filters of doubling capacity and is rebuilt once
+expired entries make up most of it, keeping memory bounded by the window.
+
+Expiry is windowed: entries older than ``ttl_seconds`` are ignored and whole
+segments are dropped once they fall out of the time window or beyond
+``max_entries``. Segments and the manifest are written to a temp file and
+renamed, and the log is only truncated after the manifest referencing the
+new segment is in place, so a crash at any point loses nothing that was
+appended (set ``fsync`` to also survive power loss).
+"""
+
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RECORD = struct.Struct("<16sd")
+MANIFEST_VERSION = 2
+
+
+def _digest(message_hash: str) -> bytes:
+    """128-bit digest used as the on-disk key."""
+    return hashlib.blake2b(message_hash.encode(), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 128-bit digests.
+
+    Filters created with ``grow()`` double the bit count and keep the number
+    of hash functions, so positions computed for the largest filter of a
+    family are valid for every smaller one after reduction modulo its size.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, bits: Optional[bytearray] = None,
+                 num_hashes: Optional[int] = None, count: int = 0):
+        """Initialize the filter.
+
+        Args:
+            capacity: Entries the filter is sized for
+            error_rate: Target false-positive rate at capacity
+            bits: Optional existing bit array (when loading or growing)
+            num_hashes: Optional number of hash functions (when loading or growing)
+            count: Entries already in ``bits`` (when loading)
+        """
+        self.capacity = max(capacity, 1)
+        if bits is None:
+            num_bytes = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2) / 8)
+            bits = bytearray(max(1, num_bytes))
+        self.bits = bits
+        self.num_bits = len(bits) * 8
+        self.num_hashes = num_hashes or max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = count
+
+    def grow(self) -> "BloomFilter":
+        """Create the next, twice as large, filter of this family."""
+        return BloomFilter(self.capacity * 2, bits=bytearray(len(self.bits) * 2), num_hashes=self.num_hashes)
+
+    def positions(self, digest: bytes) -> List[int]:
+        """Bit positions of a digest, by double hashing its two halves."""
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add_positions(self, positions: List[int]) -> None:
+        bits, num_bits = self.bits, self.num_bits
+        for position in positions:
+            position %= num_bits
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def has_positions(self, positions: List[int]) -> bool:
+        bits, num_bits = self.bits, self.num_bits
+        for position in positions:
+            position %= num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, digest: bytes) -> None:
+        self.add_positions(self.positions(digest))
+
+    def __contains__(self, digest: bytes) -> bool:
+        return self.has_positions(self.positions(digest))
+
+
+class _Segment:
+    """An immutable, sorted run of digests on disk."""
+
+    def __init__(self, path: Path, count: int, min_ts: float, max_ts: float):
+        self.path = path
+        self.count = count
+        self.min_ts = min_ts
+        self.max_ts = max_ts
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+
+    def lookup(self, digest: bytes) -> Optional[float]:
+        """Timestamp of a digest, or None if absent."""
+        if self._map is None:
+            return None
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            key, ts = RECORD.unpack_from(self._map, mid * RECORD.size)
+            if key == digest:
+                return ts
+            if key < digest:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+    def records(self) -> Iterator[Tuple[bytes, float]]:
+        """Iterate over all (digest, timestamp) records."""
+        if self._map is not None:
+            yield from RECORD.iter_unpack(self._map)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.path.name,
+            "count": self.count,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts
+        }
+
+
+class DedupeStore:
+    """Append-only, windowed, Bloom-fronted set of processed hashes."""
+
+    def __init__(self, directory: str, config: Optional[Dict[str, Any]] = None):
+        """Initialize the store.
+
+        Args:
+            directory: Directory holding the log, segments and manifest
+            config: Optional store configuration
+        """
+        self.config = config or {}
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = self.config.get("segment_size", 100_000)
+        self.snapshot_interval = self.config.get("snapshot_interval", 3600)
+        self.ttl_seconds = self.config.get("ttl_seconds")
+        self.max_entries = self.config.get("max_entries")
+        self.use_bloom = self.config.get("bloom", True)
+        self.error_rate = self.config.get("bloom_error_rate", 0.001)
+        self.bloom_capacity = self.config.get("bloom_capacity", self.max_entries or 1_000_000)
+        self.fsync = self.config.get("fsync", False)
+
+        self.manifest_path = self.directory / "manifest.json"
+        self.log_path = self.directory / "active.log"
+        self._lock = threading.RLock()
+        self._active: Dict[str, float] = {}
+        self._segments: List[_Segment] = []
+        self._blooms: List[BloomFilter] = []
+        self._bloom_stale = 0
+        self._positions_cache: Optional[Tuple[bytes, int, List[int]]] = None
+        self._next_segment = 1
+        self._last_snapshot = time.time()
+        self.stats = {"lookups": 0, "bloom_rejects": 0, "disk_probes": 0, "snapshots": 0, "expired": 0}
+
+        self._load()
+        self._log = open(self.log_path, "a", encoding="utf-8")
+
+    # ------------------------------------------------------------------
+    # Loading
+
+    def _load(self) -> None:
+        bloom_entries = []
+        if self.manifest_path.exists():
+            try:
+                manifest = json.loads(self.manifest_path.read_text())
+                self._next_segment = manifest.get("next_segment", 1)
+                self._bloom_stale = manifest.get("bloom_stale", 0)
+                bloom_entries = manifest.get("blooms", [])
+                for entry in manifest.get("segments", []):
+                    self._segments.append(_Segment(
+                        self.directory / entry["name"], entry["count"], entry["min_ts"], entry["max_ts"]
+                    ))
+            except Exception as e:
+                logger.error(f"Error loading dedupe manifest {self.manifest_path}: {e}")
+
+        if self.use_bloom:
+            try:
+                for i, entry in enumerate(bloom_entries):
+                    bits = bytearray((self.directory / f"bloom-{i}.bin").read_bytes())
+                    self._blooms.append(BloomFilter(entry["capacity"], bits=bits,
+                                                    num_hashes=entry["num_hashes"], count=entry["count"]))
+            except Exception as e:
+                logger.warning(f"Rebuilding dedupe Bloom filter: {e}")
+                self._blooms = []
+            if self._segments and not self._blooms:
+                self._rebuild_bloom()
+
+        if self.log_path.exists():
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append
+                        continue
+                    message_hash, ts = record["h"], record["t"]
+                    digest = _digest(message_hash)
+                    if self._lookup_segments(digest) is None:
+                        self._active[message_hash] = ts
+                        self._bloom_add(digest)
+        self._expire()
+        logger.info(f"Loaded dedupe store with {len(self)} hashes in {len(self._segments)} segments")
+
+    # ------------------------------------------------------------------
+    # Bloom front
+
+    def _positions(self, digest: bytes) -> List[int]:
+        """Positions in the largest filter; they reduce to those of smaller ones."""
+        bloom = self._blooms[-1]
+        cached = self._positions_cache
+        # add() looks a digest up right before inserting it
+        if cached is not None and cached[0] == digest and cached[1] == bloom.num_bits:
+            return cached[2]
+        positions = bloom.positions(digest)
+        self._positions_cache = (digest, bloom.num_bits, positions)
+        return positions
+
+    def _bloom_add(self, digest: bytes) -> None:
+        if not self.use_bloom:
+            return
+        if not self._blooms:
+            self._blooms.append(BloomFilter(self.bloom_capacity, self.error_rate))
+        elif self._blooms[-1].count >= self._blooms[-1].capacity:
+            self._blooms.append(self._blooms[-1].grow())
+        self._blooms[-1].add_positions(self._positions(digest))
+
+    def _bloom_may_contain(self, digest: bytes) -> bool:
+        if not self.use_bloom or not self._blooms:
+            return True
+        positions = self._positions(digest)
+        return any(bloom.has_positions(positions) for bloom in reversed(self._blooms))
+
+    def _rebuild_bloom(self) -> None:
+        """Rebuild the filter from live entries, dropping expired ones."""
+        self._blooms = []
+        self._bloom_stale = 0
+        for segment in self._segments:
+            for digest, _ in segment.records():
+                self._bloom_add(digest)
+        for message_hash in self._active:
+            self._bloom_add(_digest(message_hash))
+
+    # ------------------------------------------------------------------
+    # Membership
+
+    def _lookup_segments(self, digest: bytes) -> Optional[float]:
+        if not self._segments:
+            return None
+        if not self._bloom_may_contain(digest):
+            self.stats["bloom_rejects"] += 1
+            return None
+        self.stats["disk_probes"] += 1
+        for segment in reversed(self._segments):
+            ts = segment.lookup(digest)
+            if ts is not None:
+                return ts
+        return None
+
+    def _fresh(self, ts: Optional[float]) -> bool:
+        if ts is None:
+            return False
+        return self.ttl_seconds is None or ts >= time.time() - self.ttl_seconds
+
+    def _lookup(self, message_hash: str, digest: bytes) -> bool:
+        self.stats["lookups"] += 1
+        ts = self._active.get(message_hash)
+        if ts is None:
+            ts = self._lookup_segments(digest)
+        return self._fresh(ts)
+
+    def contains(self, message_hash: str) -> bool:
+        """Check whether a hash was processed within the window.
+
+        Args:
+            message_hash: Message hash
+
+        Returns:
+            True if the hash is present and not expired
+        """
+        with self._lock:
+            return self._lookup(message_hash, _digest(message_hash))
+
+    __contains__ = contains
+
+    def add(self, message_hash: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Record a processed hash.
+
+        Args:
+            message_hash: Message hash
+            metadata: Optional metadata appended to the log line
+
+        Returns:
+            True if the hash was new
+        """
+        with self._lock:
+            digest = _digest(message_hash)
+            if self._lookup(message_hash, digest):
+                return False
+            ts = time.time()
+            if metadata:
+                line = json.dumps({"h": message_hash, "t": ts, "m": metadata}, default=str)
+            else:
+                line = f'{{"h": {json.dumps(message_hash)}, "t": {ts!r}}}'
+            self._log.write(line + "\n")
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+            self._active[message_hash] = ts
+            self._bloom_add(digest)
+
+            if len(self._active) >= self.segment_size or ts - self._last_snapshot >= self.snapshot_interval:
+                self.snapshot()
+            return True
+
+    def __len__(self) -> int:
+        return len(self._active) + sum(segment.count for segment in self._segments)
+
+    # ------------------------------------------------------------------
+    # Snapshotting and expiry
+
+    def snapshot(self) -> None:
+        """Seal the active generation into a segment and truncate the log."""
+        with self._lock:
+            self._last_snapshot = time.time()
+            if not self._active:
+                return
+
+            records = sorted((_digest(h), ts) for h, ts in self._active.items())
+            path = self.directory / f"seg-{self._next_segment:06d}.idx"
+            self._write_atomic(path, b"".join(RECORD.pack(d, ts) for d, ts in records))
+            timestamps = [ts for _, ts in records]
+            self._segments.append(_Segment(path, len(records), min(timestamps), max(timestamps)))
+            self._next_segment += 1
+            self._write_manifest()
+
+            # Only now is it safe to forget the log
+            self._log.close()
+            self._log = open(self.log_path, "w", encoding="utf-8")
+            self._active.clear()
+            self.stats["snapshots"] += 1
+            self._expire()
+
+    def _expire(self) -> None:
+        """Drop segments outside the time or count window."""
+        keep = list(self._segments)
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            keep = [s for s in keep if s.max_ts >= cutoff]
+        if self.max_entries is not None:
+            total = len(self._active)
+            window = []
+            for segment in reversed(keep):
+                if total + segment.count > self.max_entries and window:
+                    break
+                total += segment.count
+                window.append(segment)
+            keep = list(reversed(window))
+
+        if len(keep) == len(self._segments):
+            return
+        for segment in self._segments:
+            if segment not in keep:
+                self.stats["expired"] += segment.count
+                self._bloom_stale += segment.count
+                segment.close()
+                try:
+                    segment.path.unlink()
+                except OSError:
+                    pass
+        self._segments = keep
+
+        # Expired entries only cost false positives; rebuild once they dominate
+        if self.use_bloom and self._bloom_stale > len(self):
+            self._rebuild_bloom()
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        for i, bloom in enumerate(self._blooms):
+            self._write_atomic(self.directory / f"bloom-{i}.bin", bytes(bloom.bits))
+        self._write_atomic(self.manifest_path, json.dumps({
+            "version": MANIFEST_VERSION,
+            "next_segment": self._next_segment,
+            "segments": [segment.to_dict() for segment in self._segments],
+            "blooms": [
+                {"capacity": b.capacity, "num_hashes": b.num_hashes, "count": b.count}
+                for b in self._blooms
+            ],
+            "bloom_stale": self._bloom_stale
+        }).encode())
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return {
+            **self.stats,
+            "active": len(self._active),
+            "segments": len(self._segments),
+            "total": len(self),
+            "bloom_bytes": sum(len(bloom.bits) for bloom in self._blooms)
+        }
+
+    def close(self) -> None:
+        """Close the log and segment maps."""
+        with self._lock:
+            self._log.close()
+            for segment in self._segments:
+                segment.close()
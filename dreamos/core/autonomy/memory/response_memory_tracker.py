@@ -7,11 +7,12 @@ Tracks processed messages and prevents duplicate processing in the response loop
 import json
 import os
 import logging
-from typing import Set, Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime
 
 from ..base_tracker import BaseTracker
+from .dedupe_store import DedupeStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,11 +21,17 @@ logger = logging.getLogger(__name__)
 class ResponseMemoryTracker(BaseTracker):
     """Tracks processed messages to prevent duplicate processing."""
     
-    def __init__(self, memory_path: str):
+    def __init__(self, memory_path: str, config: Optional[Dict[str, Any]] = None):
         """Initialize the memory tracker.
         
+        Processed hashes live in a DedupeStore next to ``memory_path``
+        (``<name>.store/``), so tracking a message costs the same however
+        long the daemon has been running. A legacy ``memory_path`` JSON file
+        is imported once.
+        
         Args:
             memory_path: Path to store memory data
+            config: Optional DedupeStore configuration (windows, Bloom filter)
         """
         super().__init__(
             log_dir=os.path.dirname(memory_path),
@@ -33,21 +40,24 @@ class ResponseMemoryTracker(BaseTracker):
         )
         self.memory_path = Path(memory_path)
         self.memory_path.parent.mkdir(parents=True, exist_ok=True)
-        self.processed_hashes: Set[str] = set()
+        self.processed_hashes = DedupeStore(str(self.memory_path.with_suffix(".store")), config)
+        self.last_metadata: Optional[Dict[str, Any]] = None
         self._load_memory()
         logger.info(f"Initialized ResponseMemoryTracker at {self.memory_path}")
     
     def _load_memory(self):
-        """Load existing memory data."""
-        if self.memory_path.exists():
-            try:
-                with open(self.memory_path, 'r') as f:
-                    data = json.load(f)
-                    self.processed_hashes = set(data.get("hashes", []))
-                logger.info(f"Loaded {len(self.processed_hashes)} processed message hashes")
-            except Exception as e:
-                logger.error(f"Error loading memory data: {e}")
-                self.processed_hashes = set()
+        """Import hashes from a legacy memory file into an empty store."""
+        if len(self.processed_hashes) or not self.memory_path.exists():
+            return
+        try:
+            with open(self.memory_path, 'r') as f:
+                data = json.load(f)
+            for message_hash in data.get("hashes", []):
+                self.processed_hashes.add(message_hash)
+            self.processed_hashes.snapshot()
+            logger.info(f"Imported {len(self.processed_hashes)} processed message hashes")
+        except Exception as e:
+            logger.error(f"Error loading memory data: {e}")
     
     def is_processed(self, message_hash: str) -> bool:
         """Check if a message has been processed.
@@ -70,28 +80,12 @@ class ResponseMemoryTracker(BaseTracker):
             message_hash: Hash of the processed message
             metadata: Optional metadata about the processing
         """
-        if message_hash not in self.processed_hashes:
-            self.processed_hashes.add(message_hash)
-            self._save_memory(metadata)
-            logger.info(f"Tracked new message with hash: {message_hash[:8]}...")
-    
-    def _save_memory(self, metadata: Dict[str, Any] = None):
-        """Save memory data to file.
-        
-        Args:
-            metadata: Optional metadata to include
-        """
+        if not message_hash:
+            return
         try:
-            data = {
-                "hashes": list(self.processed_hashes),
-                "last_updated": datetime.now().isoformat(),
-                "count": len(self.processed_hashes)
-            }
-            if metadata:
-                data["metadata"] = metadata
-                
-            with open(self.memory_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            if self.processed_hashes.add(message_hash, metadata):
+                self.last_metadata = metadata
+                logger.info(f"Tracked new message with hash: {message_hash[:8]}...")
         except Exception as e:
             logger.error(f"Error saving memory data: {e}")
     
@@ -104,7 +98,8 @@ class ResponseMemoryTracker(BaseTracker):
         return {
             "processed_count": len(self.processed_hashes),
             "memory_path": str(self.memory_path),
-            "last_updated": datetime.now().isoformat()
+            "last_updated": datetime.now().isoformat(),
+            "store": self.processed_hashes.get_stats()
         }
 
     def mark_processed(self, message_hash: str) -> None:
@@ -115,10 +110,6 @@ class ResponseMemoryTracker(BaseTracker):
         """
         try:
             self.processed_hashes.add(message_hash)
-            
-            # Save to memory file
-            with open(self.memory_path, 'w') as f:
-                json.dump({"hashes": list(self.processed_hashes)}, f)
                 
             self._log_success(
                 message_hash,
@@ -131,4 +122,8 @@ class ResponseMemoryTracker(BaseTracker):
                 message_hash,
                 {"hash": message_hash, "error": str(e)},
                 "mark_processed_failed"
-            ) 
+            )
+
+    def close(self) -> None:
+        """Close the underlying dedupe store."""
+        self.processed_hashes.close()
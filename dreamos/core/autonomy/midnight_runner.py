@@ -65,7 +65,7 @@ class MidnightRunner(RunnerCore[str]):
             
             # Run full test suite
             test_results = await self.run_tests()
-            failed_tests = self.parse_test_failures(test_results["stdout"])
+            failed_tests = self.get_test_failures(test_results)
             
             if failed_tests:
                 self.logger.warning(
@@ -56,7 +56,9 @@ class PatchValidator:
                 }
             
             # Track the patch
-            await self.patch_tracker.track_patch(patch_id, file_path, "success")
+            await self.patch_tracker.track_patch(
+                patch_id, file_path, "success", validation=(is_valid, scanner_results)
+            )
             
             return True, {
                 "status": "validated",
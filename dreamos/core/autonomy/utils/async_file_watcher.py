@@ -1,90 +1,410 @@
-"""Async file watcher utility."""
+"""Async file watcher utility.
+
+Changes are delivered either from filesystem events (watchdog, i.e. inotify
+on Linux) or from a polling scan that runs in an executor, never on the
+event loop. Both paths coalesce changes into batches, available through the
+``changes()`` async iterator or by calling ``check_for_changes()``.
+
+The polling scan keeps a per-directory snapshot: a directory whose mtime is
+unchanged since the last scan is not re-listed, so a quiet tree costs one
+``stat`` per directory rather than per file. A directory's mtime does not
+change when a file inside it is rewritten in place, so every
+``full_scan_every``-th scan re-lists everything to bound how late such
+changes are seen. The snapshot can be persisted for a fast restart.
+"""
 
 import asyncio
+import json
 import logging
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+FileState = Tuple[int, int]  # (mtime_ns, size)
+
+
+class _DirState:
+    """Snapshot of one directory's direct entries."""
+
+    __slots__ = ("mtime_ns", "files", "subdirs")
+
+    def __init__(self, mtime_ns: int, files: Dict[str, FileState], subdirs: Set[str]):
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.subdirs = subdirs
+
+
+class DirectorySnapshot:
+    """Per-directory snapshot of a tree, updated incrementally by ``scan``."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._dirs: Dict[str, _DirState] = {}
+
+    def scan(self, full: bool = False) -> Tuple[List[str], List[str]]:
+        """Update the snapshot and report what changed.
+
+        Args:
+            full: Re-list every directory instead of skipping unchanged ones
+
+        Returns:
+            Tuple of (created or modified files, deleted files)
+        """
+        changed: List[str] = []
+        deleted: List[str] = []
+        if self.root.is_dir():
+            self._scan_dir(str(self.root), full, changed, deleted)
+        else:
+            for path in list(self._dirs):
+                self._drop_dir(path, deleted)
+        return changed, deleted
+
+    def _scan_dir(self, path: str, full: bool, changed: List[str], deleted: List[str]) -> None:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            self._drop_dir(path, deleted)
+            return
+
+        previous = self._dirs.get(path)
+        if previous is not None and previous.mtime_ns == mtime_ns and not full:
+            # Entries unchanged; subdirectories have their own mtimes
+            for name in previous.subdirs:
+                self._scan_dir(os.path.join(path, name), full, changed, deleted)
+            return
+
+        files: Dict[str, FileState] = {}
+        subdirs: Set[str] = set()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.name)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            self._drop_dir(path, deleted)
+            return
+
+        old_files = previous.files if previous is not None else {}
+        for name, state in files.items():
+            if old_files.get(name) != state:
+                changed.append(os.path.join(path, name))
+        for name in old_files.keys() - files.keys():
+            deleted.append(os.path.join(path, name))
+        if previous is not None:
+            for name in previous.subdirs - subdirs:
+                self._drop_dir(os.path.join(path, name), deleted)
+
+        self._dirs[path] = _DirState(mtime_ns, files, subdirs)
+        for name in subdirs:
+            self._scan_dir(os.path.join(path, name), full, changed, deleted)
+
+    def _drop_dir(self, path: str, deleted: List[str]) -> None:
+        state = self._dirs.pop(path, None)
+        if state is None:
+            return
+        deleted.extend(os.path.join(path, name) for name in state.files)
+        for name in state.subdirs:
+            self._drop_dir(os.path.join(path, name), deleted)
+
+    def forget(self, file_path: str) -> None:
+        """Drop a file so the next scan reports it again if it exists."""
+        state = self._dirs.get(os.path.dirname(file_path))
+        if state is not None:
+            state.files.pop(os.path.basename(file_path), None)
+            state.mtime_ns = -1  # force the directory to be re-listed
+
+    def files(self) -> Dict[str, float]:
+        """All known files mapped to their mtime in seconds."""
+        return {
+            os.path.join(path, name): state[0] / 1e9
+            for path, dir_state in self._dirs.items()
+            for name, state in dir_state.files.items()
+        }
+
+    def save(self, snapshot_path: Path) -> None:
+        """Persist the snapshot atomically."""
+        data = {
+            "root": str(self.root),
+            "dirs": {
+                path: [state.mtime_ns, state.files, sorted(state.subdirs)]
+                for path, state in self._dirs.items()
+            }
+        }
+        tmp_path = Path(str(snapshot_path) + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, snapshot_path)
+
+    def load(self, snapshot_path: Path) -> bool:
+        """Load a persisted snapshot of the same root.
+
+        Returns:
+            True if a snapshot was loaded
+        """
+        try:
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("root") != str(self.root):
+                return False
+            self._dirs = {
+                path: _DirState(mtime_ns, {name: tuple(state) for name, state in files.items()}, set(subdirs))
+                for path, (mtime_ns, files, subdirs) in data["dirs"].items()
+            }
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable watcher snapshot {snapshot_path}: {e}")
+            return False
+
+
 class AsyncFileWatcher:
     """Asynchronously watches a directory for file changes.
-    
-    This class provides functionality to monitor a directory for file changes
-    using polling. It maintains a cache of file modification times to detect
-    changes between polls.
+
+    Uses watchdog filesystem events when available (``backend="auto"`` or
+    ``"watchdog"``) and an off-loop polling scan otherwise (``"poll"``).
+    Changed files are reported once per batch; deletions update
+    ``watched_files``. The first batch reports every file already present,
+    unless a persisted snapshot was loaded.
     """
-    
-    def __init__(self, watch_dir: str, poll_interval: float = 1.0):
+
+    def __init__(
+        self,
+        watch_dir: str,
+        poll_interval: float = 1.0,
+        backend: str = "auto",
+        snapshot_path: Optional[str] = None,
+        debounce: float = 0.05,
+        full_scan_every: int = 10
+    ):
         """Initialize file watcher.
-        
+
         Args:
             watch_dir: Directory to watch for changes
             poll_interval: Time between polls in seconds
+            backend: "auto", "watchdog" or "poll"
+            snapshot_path: Optional file to persist the polling snapshot in
+            debounce: Quiet period used to coalesce event bursts, in seconds
+            full_scan_every: Re-list all directories every N polling scans
         """
         self.watch_dir = Path(watch_dir)
         self.poll_interval = poll_interval
+        self.backend = backend
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.debounce = debounce
+        self.full_scan_every = max(1, full_scan_every)
+        self._snapshot = DirectorySnapshot(self.watch_dir)
         self._file_cache: Dict[str, float] = {}
         self._last_check: Optional[datetime] = None
-    
+
+        self._observer = None
+        self._pending: Dict[str, bool] = {}  # path -> exists
+        self._pending_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scans = 0
+        self._last_save = 0.0
+        self._initialized = False
+        self.stats = {"batches": 0, "events": 0, "scans": 0, "full_scans": 0}
+
+    @property
+    def active_backend(self) -> str:
+        """Backend in use: "watchdog" once events are flowing, else "poll"."""
+        return "watchdog" if self._observer is not None else "poll"
+
+    async def start(self) -> None:
+        """Take the initial snapshot and start the event backend if possible."""
+        if self._initialized:
+            return
+        self._initialized = True
+        self._loop = asyncio.get_running_loop()
+        self._pending_event = asyncio.Event()
+
+        if self.snapshot_path is not None:
+            await self._loop.run_in_executor(None, self._snapshot.load, self.snapshot_path)
+
+        if self.backend in ("auto", "watchdog"):
+            self._start_observer()
+
+        # Files present at startup (or changed since the saved snapshot)
+        changed, deleted = await self._loop.run_in_executor(None, self._snapshot.scan, False)
+        self._file_cache = self._snapshot.files()
+        for path in changed:
+            self._pending[path] = True
+        for path in deleted:
+            self._pending[path] = False
+        if self._pending:
+            self._pending_event.set()
+
+    def _start_observer(self) -> None:
+        """Start a watchdog observer on the watch directory if available."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.debug("watchdog not installed, polling for file changes")
+            return
+
+        watcher = self
+
+        class _WatchEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+                    return
+                dest = getattr(event, "dest_path", "")
+                watcher._loop.call_soon_threadsafe(
+                    watcher._on_event, event.event_type, str(event.src_path), str(dest or "")
+                )
+
+        try:
+            self.watch_dir.mkdir(parents=True, exist_ok=True)
+            self._observer = Observer()
+            self._observer.schedule(_WatchEventHandler(), str(self.watch_dir), recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        except Exception as e:
+            logger.warning(f"File events unavailable for {self.watch_dir}, polling instead: {e}")
+            self._observer = None
+
+    def _on_event(self, event_type: str, src_path: str, dest_path: str) -> None:
+        """Record a filesystem event (runs on the event loop)."""
+        self.stats["events"] += 1
+        if event_type == "moved":
+            self._pending[src_path] = False
+            self._pending[dest_path] = True
+        else:
+            self._pending[src_path] = event_type != "deleted"
+        self._pending_event.set()
+
+    def _drain(self) -> List[str]:
+        """Turn pending changes into a batch of existing changed files."""
+        pending, self._pending = self._pending, {}
+        self._pending_event.clear()
+        changed = []
+        for path, exists in pending.items():
+            if exists and os.path.isfile(path):
+                changed.append(path)
+                try:
+                    self._file_cache[path] = os.stat(path).st_mtime
+                except OSError:
+                    pass
+            else:
+                self._file_cache.pop(path, None)
+        self._last_check = datetime.now()
+        if changed:
+            self.stats["batches"] += 1
+        return sorted(changed)
+
+    def _poll_scan(self) -> Tuple[List[str], List[str]]:
+        """One polling scan (runs in an executor)."""
+        self._scans += 1
+        full = self._scans % self.full_scan_every == 0
+        changed, deleted = self._snapshot.scan(full)
+        self.stats["scans"] += 1
+        self.stats["full_scans"] += int(full)
+
+        if self.snapshot_path is not None and (changed or deleted) and time.time() - self._last_save >= 30:
+            self._save_snapshot()
+        return changed, deleted
+
+    def _save_snapshot(self) -> None:
+        try:
+            self._snapshot.save(self.snapshot_path)
+            self._last_save = time.time()
+        except Exception as e:
+            logger.warning(f"Could not save watcher snapshot: {e}")
+
     async def check_for_changes(self) -> List[str]:
         """Check for file changes since last check.
-        
+
         Returns:
             List of paths to changed files
         """
+        if not self._initialized:
+            await self.start()
+
         if not self.watch_dir.exists():
             logger.warning(f"Watch directory {self.watch_dir} does not exist")
             return []
-        
-        changed_files: List[str] = []
-        current_time = datetime.now()
-        
+
         try:
-            # Get all files in directory
-            files = list(self.watch_dir.glob("**/*"))
-            
-            # Check each file
-            for file_path in files:
-                if not file_path.is_file():
-                    continue
-                
-                # Get modification time
-                mtime = file_path.stat().st_mtime
-                file_str = str(file_path)
-                
-                # Check if file is new or modified
-                if file_str not in self._file_cache or mtime > self._file_cache[file_str]:
-                    changed_files.append(file_str)
-                    self._file_cache[file_str] = mtime
-            
-            # Check for deleted files
-            deleted_files = set(self._file_cache.keys()) - {str(f) for f in files}
-            for file_str in deleted_files:
-                del self._file_cache[file_str]
-            
-            self._last_check = current_time
-            
+            if self._observer is None:
+                changed, deleted = await self._loop.run_in_executor(None, self._poll_scan)
+                for path in changed:
+                    self._pending[path] = True
+                for path in deleted:
+                    self._pending[path] = False
+            return self._drain()
         except Exception as e:
             logger.error(f"Error checking for file changes: {e}")
-        
-        return changed_files
-    
+            return []
+
+    async def changes(self) -> AsyncIterator[List[str]]:
+        """Yield coalesced batches of changed files as they happen."""
+        await self.start()
+        while self._initialized:
+            if self._observer is None:
+                batch = await self.check_for_changes()
+                if batch:
+                    yield batch
+                else:
+                    await asyncio.sleep(self.poll_interval)
+                continue
+
+            await self._pending_event.wait()
+            # Let a burst of events settle into one batch
+            deadline = self._loop.time() + self.poll_interval
+            while self._loop.time() < deadline:
+                count = self.stats["events"]
+                await asyncio.sleep(self.debounce)
+                if self.stats["events"] == count:
+                    break
+            batch = self._drain()
+            if batch:
+                yield batch
+
+    async def stop(self) -> None:
+        """Stop the event backend and persist the snapshot."""
+        self._initialized = False
+        event_driven = self._observer is not None
+        if event_driven:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self.snapshot_path is not None and self._loop is not None:
+            if event_driven:
+                # Events never touch the snapshot; bring it up to date
+                await self._loop.run_in_executor(None, self._sync_snapshot, list(self._pending))
+            await self._loop.run_in_executor(None, self._save_snapshot)
+
+    def _sync_snapshot(self, undelivered: List[str]) -> None:
+        """Rescan the snapshot, keeping undelivered changes for the next start."""
+        self._snapshot.scan(True)
+        for path in undelivered:
+            self._snapshot.forget(path)
+
     def get_file_info(self, file_path: str) -> Optional[Dict]:
         """Get information about a watched file.
-        
+
         Args:
             file_path: Path to the file
-            
+
         Returns:
             Dictionary with file information or None if file not found
         """
         path = Path(file_path)
         if not path.exists() or not path.is_file():
             return None
-        
+
         try:
             stat = path.stat()
             return {
@@ -95,18 +415,19 @@ class AsyncFileWatcher:
         except Exception as e:
             logger.error(f"Error getting file info for {file_path}: {e}")
             return None
-    
+
     def clear_cache(self) -> None:
         """Clear the file modification cache."""
         self._file_cache.clear()
+        self._snapshot = DirectorySnapshot(self.watch_dir)
         self._last_check = None
-    
+
     @property
     def last_check(self) -> Optional[datetime]:
         """Get timestamp of last check."""
         return self._last_check
-    
+
     @property
     def watched_files(self) -> Set[str]:
         """Get set of currently watched files."""
-        return set(self._file_cache.keys()) 
+        return set(self._file_cache.keys())
@@ -4,9 +4,11 @@ Base Bridge Handler
 Base class for bridge handlers with unified file system event handling.
 """
 
+import json
 import logging
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Set
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
 from dreamos.core.autonomy.base.file_handler import BaseFileHandler
 
 logger = logging.getLogger(__name__)
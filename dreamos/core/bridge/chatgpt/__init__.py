@@ -3,12 +3,14 @@
 
 from . import bridge
 from . import bridge_loop
+from . import packer
 from . import prompt
 from . import response_handler
 
 __all__ = [
     'bridge',
     'bridge_loop',
+    'packer',
     'prompt',
     'response_handler',
 ]
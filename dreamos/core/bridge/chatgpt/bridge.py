@@ -16,6 +16,7 @@ import aiohttp
 from ..base.bridge import BaseBridge, BridgeConfig
 from ..base.processor import BaseProcessor
 from .prompt import PromptManager
+from .packer import RequestPacker
 from ..monitoring.metrics import BridgeMetrics, BridgeHealth
 
 # Configure logging
@@ -49,6 +50,12 @@ class ChatGPTBridge(BaseBridge):
         self.timeout = config.get("timeout", 30)
         self._session: Optional[aiohttp.ClientSession] = None
         
+        # Optional packing of short, compatible prompts into one request
+        packing_config = self.config.get("packing", {})
+        self.packer: Optional[RequestPacker] = None
+        if packing_config.get("enabled", False):
+            self.packer = RequestPacker(self.chat, self.model, packing_config)
+        
         # Set up paths
         self.bridge_outbox = Path(self.config.get("paths", {}).get("bridge_outbox", "data/bridge_outbox"))
         self.bridge_inbox = Path(self.config.get("paths", {}).get("bridge_inbox", "data/bridge_inbox"))
@@ -99,6 +106,9 @@ class ChatGPTBridge(BaseBridge):
             except asyncio.CancelledError:
                 pass
             self._task = None
+            
+        if self.packer:
+            await self.packer.close()
                 
         if self._session:
             await self._session.close()
@@ -192,7 +202,12 @@ class ChatGPTBridge(BaseBridge):
             ]
             
             # Send to ChatGPT
-            response = await self.chat(messages)
+            if self.packer:
+                profile = prompt.get("metadata", {}).get("type", "general")
+                response = await self.packer.submit(messages, profile=profile)
+                self.metrics.record_packing(self.packer.stats)
+            else:
+                response = await self.chat(messages)
             
             # Update metrics
             self.metrics.update_metrics(
@@ -0,0 +1,253 @@
+"""
+Request Packer
+------------
+Packs short, compatible prompts into one multi-part ChatGPT request.
+
+Prompts submitted within a short window that share a model, prompt profile
+and sampling parameters are combined into a single structured request. The
+model is asked to answer with a JSON object keyed by part id, and each
+answer is demultiplexed back to the caller's future as a regular
+chat-completion response. Any part that cannot be parsed falls back to a
+single request of its own.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ChatFn = Callable[..., Awaitable[Dict[str, Any]]]
+PackKey = Tuple[str, str, float, int]
+
+PACKING_INSTRUCTIONS = (
+    "You will receive a JSON array of independent requests, each with an "
+    "\"id\" and a \"prompt\". Answer every request separately and respond ONLY "
+    "with a JSON object of the form "
+    "{\"responses\": [{\"id\": <id>, \"content\": <answer>}]}."
+)
+
+
+class _PendingPrompt:
+    """A prompt waiting in a packing window."""
+
+    __slots__ = ("messages", "future", "size")
+
+    def __init__(self, messages: List[Dict[str, str]], future: asyncio.Future):
+        self.messages = messages
+        self.future = future
+        self.size = sum(len(m.get("content", "")) for m in messages)
+
+
+class RequestPacker:
+    """Combines compatible prompts into packed upstream requests."""
+
+    def __init__(
+        self,
+        chat: ChatFn,
+        model: str,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        """Initialize the request packer.
+
+        Args:
+            chat: Coroutine function sending one chat request
+            model: Model name requests are sent to
+            config: Optional packing configuration
+        """
+        self.config = config or {}
+        self._chat = chat
+        self.model = model
+        self.window = self.config.get("window_seconds", 0.05)
+        self.max_prompts = self.config.get("max_prompts", 8)
+        self.max_prompt_chars = self.config.get("max_prompt_chars", 1000)
+        self.max_total_chars = self.config.get("max_total_chars", 6000)
+
+        self._groups: Dict[PackKey, List[_PendingPrompt]] = {}
+        self._timers: Dict[PackKey, asyncio.TimerHandle] = {}
+        self._inflight: set = set()
+
+        self.stats = {
+            "prompts_submitted": 0,
+            "prompts_packed": 0,
+            "packed_requests": 0,
+            "requests_saved": 0,
+            "fallbacks": 0
+        }
+
+    def is_packable(self, messages: List[Dict[str, str]]) -> bool:
+        """Check whether a request is short and simple enough to pack.
+
+        Args:
+            messages: Chat messages of the request
+
+        Returns:
+            True if the request may share a packed request
+        """
+        user_messages = [m for m in messages if m.get("role") == "user"]
+        if len(user_messages) != 1 or len(messages) > 2:
+            return False
+        return len(user_messages[0].get("content", "")) <= self.max_prompt_chars
+
+    async def submit(
+        self,
+        messages: List[Dict[str, str]],
+        profile: str = "general",
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> Dict[str, Any]:
+        """Submit a chat request, packing it with compatible requests.
+
+        Args:
+            messages: Chat messages ([system,] user)
+            profile: Prompt profile (template type) from the PromptManager
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens for this prompt's answer
+
+        Returns:
+            Chat-completion response for this prompt
+        """
+        self.stats["prompts_submitted"] += 1
+        if not self.is_packable(messages):
+            return await self._chat(messages, temperature=temperature, max_tokens=max_tokens)
+
+        loop = asyncio.get_event_loop()
+        key: PackKey = (self.model, profile, temperature, max_tokens)
+        pending = _PendingPrompt(messages, loop.create_future())
+
+        group = self._groups.setdefault(key, [])
+        if group and sum(p.size for p in group) + pending.size > self.max_total_chars:
+            self._flush(key)
+            group = self._groups.setdefault(key, [])
+        group.append(pending)
+
+        if len(group) >= self.max_prompts:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+
+        return await pending.future
+
+    def _flush(self, key: PackKey) -> None:
+        """Send the pending group for a key."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        group = self._groups.pop(key, [])
+        if not group:
+            return
+
+        task = asyncio.ensure_future(self._send_group(key, group))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send_group(self, key: PackKey, group: List[_PendingPrompt]) -> None:
+        """Send a group as one packed request and resolve each future."""
+        _, _, temperature, max_tokens = key
+
+        if len(group) == 1:
+            await self._send_single(group[0], temperature, max_tokens)
+            return
+
+        start = time.time()
+        try:
+            response = await self._chat(
+                self._build_packed_messages(group),
+                temperature=temperature,
+                max_tokens=max_tokens * len(group)
+            )
+            answers = self._parse_packed_response(response)
+        except Exception as e:
+            logger.warning(f"Packed request of {len(group)} prompts failed, unpacking: {e}")
+            answers = {}
+
+        fallbacks = []
+        for part_id, pending in enumerate(group):
+            if pending.future.done():
+                continue
+            if part_id in answers:
+                pending.future.set_result(self._build_part_response(response, part_id, answers[part_id]))
+            else:
+                fallbacks.append(pending)
+
+        packed = len(group) - len(fallbacks)
+        if packed:
+            self.stats["packed_requests"] += 1
+            self.stats["prompts_packed"] += packed
+            self.stats["requests_saved"] += packed - 1
+            logger.debug(f"Packed {packed} prompts into one request in {time.time() - start:.2f}s")
+
+        self.stats["fallbacks"] += len(fallbacks)
+        await asyncio.gather(*[
+            self._send_single(pending, temperature, max_tokens) for pending in fallbacks
+        ])
+
+    async def _send_single(self, pending: _PendingPrompt, temperature: float, max_tokens: int) -> None:
+        """Send one prompt as its own request."""
+        try:
+            response = await self._chat(pending.messages, temperature=temperature, max_tokens=max_tokens)
+            if not pending.future.done():
+                pending.future.set_result(response)
+        except Exception as e:
+            if not pending.future.done():
+                pending.future.set_exception(e)
+
+    def _build_packed_messages(self, group: List[_PendingPrompt]) -> List[Dict[str, str]]:
+        """Build the messages of a packed request."""
+        system = next(
+            (m["content"] for m in group[0].messages if m.get("role") == "system" and m.get("content")),
+            ""
+        )
+        parts = []
+        for part_id, pending in enumerate(group):
+            prompt = next(m["content"] for m in pending.messages if m.get("role") == "user")
+            parts.append({"id": part_id, "prompt": prompt})
+
+        instructions = f"{system}\n\n{PACKING_INSTRUCTIONS}" if system else PACKING_INSTRUCTIONS
+        return [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": json.dumps(parts)}
+        ]
+
+    def _parse_packed_response(self, response: Dict[str, Any]) -> Dict[int, str]:
+        """Extract per-part answers from a packed response.
+
+        Parts that are missing or malformed are simply absent from the
+        result, so their callers fall back to a single request.
+        """
+        content = response["choices"][0]["message"]["content"].strip()
+        if content.startswith("```"):
+            content = content.strip("`")
+            content = content[content.find("{"):]
+
+        answers = {}
+        for part in json.loads(content).get("responses", []):
+            try:
+                answers[int(part["id"])] = str(part["content"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return answers
+
+    def _build_part_response(self, response: Dict[str, Any], part_id: int, content: str) -> Dict[str, Any]:
+        """Build a chat-completion response for one demultiplexed part."""
+        return {
+            "id": f"{response.get('id', 'packed')}-{part_id}",
+            "object": response.get("object", "chat.completion"),
+            "created": response.get("created", int(time.time())),
+            "model": response.get("model", self.model),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "packed": True
+        }
+
+    async def close(self) -> None:
+        """Flush pending groups and wait for in-flight packed requests."""
+        for key in list(self._groups.keys()):
+            self._flush(key)
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
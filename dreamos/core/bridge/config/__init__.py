@@ -2,7 +2,9 @@
 # DO NOT EDIT MANUALLY - changes may be overwritten
 
 from . import loader
+from . import service
 
 __all__ = [
     'loader',
+    'service',
 ]
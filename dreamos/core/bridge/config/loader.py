@@ -6,9 +6,10 @@ Handles loading and validation of bridge configurations.
 
 import json
 import logging
+import threading
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
 from dreamos.core.utils.json_utils import load_json, save_json
 from dreamos.core.utils.file_ops import ensure_dir
 from dreamos.core.utils.logging_utils import get_logger
@@ -25,9 +26,15 @@ class BridgeMode(Enum):
     LIVE = "live"
     DEBUG = "debug"
 
+_services: Dict[Tuple[str, BridgeMode], Any] = {}
+_services_lock = threading.Lock()
+
 def load_config(base_config_path: Union[str, Path], mode: BridgeMode = BridgeMode.LIVE, agent_id: Optional[str] = None) -> Dict[str, Any]:
     """Load configuration for an agent or base config.
     
+    Served from a shared BridgeConfigService per (config path, mode): the
+    merged config is only re-read when one of its source files changed.
+    
     Args:
         base_config_path: Path to base config file
         mode: Bridge operation mode
@@ -40,8 +47,17 @@ def load_config(base_config_path: Union[str, Path], mode: BridgeMode = BridgeMod
         FileNotFoundError: If config file not found
         ValueError: If config is invalid
     """
-    loader = BridgeConfigLoader(base_config_path, mode)
-    return loader.load_config(agent_id)
+    from .service import BridgeConfigService
+    
+    key = (str(Path(base_config_path).resolve()), mode)
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            # Re-stat the sources on every call so edits are seen at once
+            service = _services[key] = BridgeConfigService(
+                base_config_path, mode, check_interval=0, watch=False
+            )
+    return service.load_config(agent_id)
 
 def _load_mode_config(config_dir: Path, mode: BridgeMode) -> Dict[str, Any]:
     """Load mode-specific configuration.
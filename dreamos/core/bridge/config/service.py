@@ -0,0 +1,278 @@
+"""
+Bridge Config Service
+------------------
+Memoized, hot-reloading access to merged bridge configurations.
+
+Merged and validated configs are cached per (mode, agent_id) as immutable
+snapshots. Source files are re-stat'ed at most once per ``check_interval``
+(or immediately on a watchdog event when watchdog is installed), and only a
+changed signature triggers a reload and notifies subscribers.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from .loader import BridgeConfigLoader, BridgeMode
+
+logger = logging.getLogger(__name__)
+
+ReloadCallback = Callable[[Optional[str], Mapping[str, Any]], None]
+FileSignature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert a config value into an immutable equivalent.
+
+    Args:
+        value: Dict, list or scalar config value
+
+    Returns:
+        MappingProxyType for dicts, tuple for lists, value otherwise
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert a frozen snapshot back into plain dicts and lists.
+
+    Args:
+        value: Frozen config value
+
+    Returns:
+        Mutable copy of the value
+    """
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class _CacheEntry:
+    """Cached snapshot with the signature of the files it was built from."""
+
+    __slots__ = ("snapshot", "signature", "checked_at")
+
+    def __init__(self, snapshot: Mapping[str, Any], signature: FileSignature, checked_at: float):
+        self.snapshot = snapshot
+        self.signature = signature
+        self.checked_at = checked_at
+
+
+class BridgeConfigService:
+    """Serves cached, immutable bridge config snapshots."""
+
+    def __init__(
+        self,
+        base_config_path: Union[str, Path],
+        mode: BridgeMode = BridgeMode.LIVE,
+        check_interval: float = 1.0,
+        watch: bool = True
+    ):
+        """Initialize the config service.
+
+        Args:
+            base_config_path: Path to base config file
+            mode: Bridge operation mode
+            check_interval: Seconds between mtime checks for a cached entry
+            watch: Use a watchdog observer for immediate invalidation if available
+        """
+        self.loader = BridgeConfigLoader(base_config_path, mode)
+        self.mode = mode
+        self.check_interval = check_interval
+        self._cache: Dict[Tuple[str, Optional[str]], _CacheEntry] = {}
+        self._subscribers: List[ReloadCallback] = []
+        self._lock = threading.RLock()
+        self._observer = None
+        self.stats = {"hits": 0, "misses": 0, "reloads": 0, "failed_reloads": 0}
+
+        if watch:
+            self._start_watcher()
+
+    def _source_paths(self, agent_id: Optional[str]) -> List[Path]:
+        """Get the files a merged config is built from."""
+        config_dir = self.loader.config_dir
+        paths = [
+            self.loader.base_config_path,
+            config_dir / f"config.{self.mode.value}.json"
+        ]
+        if agent_id:
+            paths.append(config_dir / "agents" / f"{agent_id}.json")
+        return paths
+
+    def _signature(self, agent_id: Optional[str]) -> FileSignature:
+        """Stat the source files of a config.
+
+        Missing files are part of the signature, so creating an agent or
+        mode override later is picked up as a change.
+        """
+        signature = []
+        for path in self._source_paths(agent_id):
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((str(path), None, None))
+        return tuple(signature)
+
+    def _build(self, agent_id: Optional[str]) -> Mapping[str, Any]:
+        """Load, merge and validate a config, returning a frozen snapshot."""
+        # The loader's per-agent cache would hide on-disk changes
+        self.loader.agent_configs.pop(agent_id, None)
+        return freeze(self.loader.load_config(agent_id))
+
+    def get(self, agent_id: Optional[str] = None) -> Mapping[str, Any]:
+        """Get the merged config snapshot for an agent.
+
+        Args:
+            agent_id: Optional agent ID
+
+        If a changed source file fails to load or validate, the error is
+        logged and the previous snapshot keeps being served until the
+        files change again.
+
+        Returns:
+            Immutable mapping of the merged, validated config
+
+        Raises:
+            FileNotFoundError: If the base config is missing on first load
+            ValueError: If the merged config is invalid on first load
+        """
+        key = (self.mode.value, agent_id)
+        entry = self._cache.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            self.stats["hits"] += 1
+            return entry.snapshot
+
+        with self._lock:
+            entry = self._cache.get(key)
+            signature = self._signature(agent_id)
+
+            if entry is not None and entry.signature == signature:
+                entry.checked_at = now
+                self.stats["hits"] += 1
+                return entry.snapshot
+
+            self.stats["misses"] += 1
+            try:
+                snapshot = self._build(agent_id)
+            except Exception as e:
+                if entry is None:
+                    raise
+                # Keep serving the last good snapshot; retry on the next change
+                self.stats["failed_reloads"] += 1
+                logger.error(f"Error reloading config for {agent_id or 'base'}, keeping previous: {e}")
+                entry.signature = signature
+                entry.checked_at = now
+                return entry.snapshot
+            self._cache[key] = _CacheEntry(snapshot, signature, now)
+
+        if entry is not None:
+            self.stats["reloads"] += 1
+            logger.info(f"Reloaded bridge config for {agent_id or 'base'}")
+            self._notify(agent_id, snapshot)
+
+        return snapshot
+
+    def load_config(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get a mutable copy of the merged config.
+
+        Drop-in replacement for ``BridgeConfigLoader.load_config`` for
+        callers that modify the returned dict.
+
+        Args:
+            agent_id: Optional agent ID
+
+        Returns:
+            Configuration dictionary
+        """
+        return thaw(self.get(agent_id))
+
+    def invalidate(self, agent_id: Optional[str] = None) -> None:
+        """Force the next lookup to re-check the source files.
+
+        Args:
+            agent_id: Agent to invalidate, or None for every cached entry
+        """
+        with self._lock:
+            for key, entry in self._cache.items():
+                if agent_id is None or key[1] == agent_id:
+                    entry.checked_at = float("-inf")
+
+    def reload(self) -> None:
+        """Re-check every cached config and notify subscribers of changes."""
+        self.invalidate()
+        for _, agent_id in list(self._cache.keys()):
+            try:
+                self.get(agent_id)
+            except Exception as e:
+                logger.error(f"Error reloading config for {agent_id or 'base'}: {e}")
+
+    def subscribe(self, callback: ReloadCallback) -> None:
+        """Register a callback invoked with (agent_id, snapshot) on reload.
+
+        Args:
+            callback: Reload callback
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ReloadCallback) -> None:
+        """Remove a reload callback.
+
+        Args:
+            callback: Reload callback
+        """
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _notify(self, agent_id: Optional[str], snapshot: Mapping[str, Any]) -> None:
+        """Invoke reload subscribers."""
+        for callback in list(self._subscribers):
+            try:
+                callback(agent_id, snapshot)
+            except Exception as e:
+                logger.error(f"Error in config reload subscriber: {e}")
+
+    def _start_watcher(self) -> None:
+        """Start a watchdog observer on the config directory if available."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.debug("watchdog not installed, using mtime polling for config reloads")
+            return
+
+        service = self
+
+        class _ConfigEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory and str(event.src_path).endswith(".json"):
+                    service.reload()
+
+        try:
+            self._observer = Observer()
+            self._observer.schedule(
+                _ConfigEventHandler(), str(self.loader.config_dir), recursive=True
+            )
+            self._observer.daemon = True
+            self._observer.start()
+        except Exception as e:
+            logger.warning(f"Config watcher unavailable, using mtime polling: {e}")
+            self._observer = None
+
+    def close(self) -> None:
+        """Stop the file watcher."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
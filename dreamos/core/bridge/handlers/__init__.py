@@ -6,6 +6,7 @@ from . import bridge
 from . import cursor_handler
 from . import inbox
 from . import inbox_handler
+from . import inbox_log
 from . import outbox
 from . import outbox_handler
 
@@ -15,6 +16,7 @@ __all__ = [
     'cursor_handler',
     'inbox',
     'inbox_handler',
+    'inbox_log',
     'outbox',
     'outbox_handler',
 ]
@@ -160,7 +160,7 @@ class BaseBridgeHandler(FileSystemEventHandler):
             await self._move_to_archive(file_path, failed_path)
             
             # Send Discord notification
-            self.discord.send_event(
+            self.discord.notify(
                 EventType.ERROR,
                 f"Failed to process file: {file_path.name}",
                 {"error": error}
@@ -4,6 +4,7 @@ Inbox Handler Module
 Handles incoming messages from external sources and routes them to agent mailboxes.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -11,6 +12,7 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 
 from .base import BaseBridgeHandler
+from .inbox_log import InboxLog, DEFAULT_COMPACT_THRESHOLD
 from ..chatgpt.bridge import ChatGPTBridge
 
 logger = logging.getLogger(__name__)
@@ -29,8 +31,12 @@ class BridgeInboxHandler(BaseBridgeHandler):
             bridge: ChatGPT bridge instance
             config: Optional configuration dictionary
         """
-        super().__init__(bridge, None, config)
+        inbox_dir = (config or {}).get("paths", {}).get("bridge_inbox", "data/bridge_inbox")
+        super().__init__(bridge, inbox_dir, config)
         self.mailbox_root = Path("agent_tools/mailbox")
+        self._logs: Dict[str, InboxLog] = {}
+        self._log_lock = asyncio.Lock()
+        self._compaction_task: Optional[asyncio.Future] = None
         
     def write_response(self, agent_id: str, message: Dict[str, Any]) -> bool:
         """Write a response to an agent's mailbox.
@@ -124,33 +130,109 @@ class BridgeInboxHandler(BaseBridgeHandler):
             logger.error(f"Error processing message batch: {e}")
             return False
             
+    def _get_log(self, file_path: Path) -> InboxLog:
+        """Get the inbox log for a file, creating it on first use.
+
+        Args:
+            file_path: Path to the JSONL inbox log
+
+        Returns:
+            InboxLog: Log bound to the file
+        """
+        key = str(file_path)
+        if key not in self._logs:
+            self._logs[key] = InboxLog(
+                file_path,
+                compact_threshold=self.config.get("inbox", {}).get(
+                    "compact_threshold_bytes", DEFAULT_COMPACT_THRESHOLD
+                )
+            )
+        return self._logs[key]
+
+    def append_message(self, file_path: Path, message: Dict[str, Any]) -> None:
+        """Append a message to an inbox log.
+
+        Args:
+            file_path: Path to the JSONL inbox log
+            message: Message to append
+        """
+        self._get_log(file_path).append(message)
+
     async def process_file(self, file_path: Path) -> bool:
-        """Process messages from a file.
-        
+        """Process messages appended to an inbox log since the last commit.
+
+        Only bytes after the committed offset are read. The offset is
+        committed past every message that was handled, so an interrupted
+        batch replays only the messages not yet handled and messages
+        appended concurrently are never lost. A message that cannot be
+        delivered is moved to the dead-letter file next to the failed
+        inbox files rather than blocking the log. Consumed prefixes are
+        compacted in the background.
+
         Args:
-            file_path: Path to file containing messages
-            
+            file_path: Path to the JSONL inbox log
+
         Returns:
             bool: True if file was processed successfully
         """
+        file_path = Path(file_path)
+        log = self._get_log(file_path)
+        loop = asyncio.get_event_loop()
+
         try:
-            # Read messages
-            with open(file_path) as f:
-                messages = json.load(f)
-                
-            if not isinstance(messages, list):
-                messages = [messages]
-                
-            # Process messages
-            success = await self.process_batch(messages)
-            
-            # Clear file after processing
-            if success:
-                with open(file_path, "w") as f:
-                    json.dump([], f)
-                    
-            return success
-            
+            async with self._log_lock:
+                entries, offset = await loop.run_in_executor(
+                    None, log.read_entries, self.config.get("inbox", {}).get("max_batch")
+                )
+                handled = None if entries else offset
+                try:
+                    for message, message_offset in entries:
+                        if not await self.process(message):
+                            await loop.run_in_executor(
+                                None, self._dead_letter, file_path, message
+                            )
+                        handled = message_offset
+                    handled = offset
+                finally:
+                    if handled is not None:
+                        await loop.run_in_executor(None, log.commit, handled)
+
+            if log.needs_compaction() and (
+                self._compaction_task is None or self._compaction_task.done()
+            ):
+                self._compaction_task = asyncio.ensure_future(self._compact(log))
+
+            return True
+
         except Exception as e:
             logger.error(f"Error processing file {file_path}: {e}")
-            return False 
\ No newline at end of file
+            return False
+
+    def _dead_letter(self, file_path: Path, message: Dict[str, Any]) -> None:
+        """Append an undeliverable message to the inbox's dead-letter file.
+
+        Args:
+            file_path: Inbox log the message was read from
+            message: Message that could not be processed
+        """
+        dead_path = self.failed_dir / f"{file_path.name}.dead.jsonl"
+        dead_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(dead_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "message": message,
+                "source": str(file_path),
+                "failed_at": datetime.utcnow().isoformat()
+            }, default=str) + "\n")
+        logger.warning(f"Moved undeliverable message from {file_path} to {dead_path}")
+
+    async def _compact(self, log: InboxLog) -> None:
+        """Compact a log's consumed prefix off the event loop.
+
+        Args:
+            log: Inbox log to compact
+        """
+        try:
+            async with self._log_lock:
+                await asyncio.get_event_loop().run_in_executor(None, log.compact)
+        except Exception as e:
+            logger.error(f"Error compacting inbox log {log.log_path}: {e}")
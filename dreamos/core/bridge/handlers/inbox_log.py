@@ -0,0 +1,266 @@
+"""
+Inbox Log Module
+-------------
+Append-only JSONL inbox with a persisted consumer offset.
+
+Producers append one JSON message per line. The consumer reads only the
+bytes written since the last committed offset, commits the new offset once
+a batch has been processed, and periodically compacts the consumed prefix
+away. Delivery is at-least-once: a crash between processing and commit
+replays the uncommitted batch.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from dreamos.core.io.atomic import safe_write
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPACT_THRESHOLD = 1024 * 1024
+
+
+class InboxLog:
+    """Append-only JSONL message log with a committed consumer cursor.
+
+    The cursor file stores the committed byte offset together with the inode
+    of the log it refers to. Compaction replaces the log with a new file that
+    starts exactly at the committed offset, so an inode mismatch on load means
+    the offset must restart from zero - even if the process crashed before
+    the cursor itself was rewritten.
+    """
+
+    def __init__(
+        self,
+        log_path: Union[str, Path],
+        cursor_path: Optional[Union[str, Path]] = None,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD
+    ):
+        """Initialize the inbox log.
+
+        Args:
+            log_path: Path to the JSONL log file
+            cursor_path: Path to the cursor file (defaults to ``<log>.offset``)
+            compact_threshold: Consumed bytes before compaction is worthwhile
+        """
+        self.log_path = Path(log_path)
+        self.cursor_path = Path(cursor_path) if cursor_path else self.log_path.with_name(
+            self.log_path.name + ".offset"
+        )
+        self.compact_threshold = compact_threshold
+        self._lock_path = self.log_path.with_name(self.log_path.name + ".lock")
+        self._thread_lock = threading.Lock()
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.log_path.touch(exist_ok=True)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialize appends and compaction across threads and processes."""
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _inode(self) -> Optional[int]:
+        """Return the inode of the current log file."""
+        try:
+            return os.stat(self.log_path).st_ino
+        except FileNotFoundError:
+            return None
+
+    def append(self, message: Dict[str, Any]) -> None:
+        """Append a message to the log.
+
+        Args:
+            message: JSON-serializable message
+        """
+        line = json.dumps(message, separators=(",", ":")) + "\n"
+        with self._locked():
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def committed_offset(self) -> int:
+        """Return the committed offset for the current log file.
+
+        Returns:
+            Byte offset of the first unconsumed message
+        """
+        try:
+            with open(self.cursor_path, "r") as f:
+                cursor = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable inbox cursor {self.cursor_path}, replaying log: {e}")
+            return 0
+
+        if cursor.get("inode") != self._inode():
+            # Log was compacted (or replaced) after this cursor was written
+            return 0
+        return int(cursor.get("offset", 0))
+
+    def commit(self, offset: int) -> None:
+        """Persist the consumer offset.
+
+        Args:
+            offset: Byte offset up to which messages have been processed
+        """
+        with self._locked():
+            self._write_cursor(offset)
+
+    def _write_cursor(self, offset: int) -> None:
+        """Write the cursor file for the current log inode."""
+        safe_write(
+            str(self.cursor_path),
+            json.dumps({"offset": offset, "inode": self._inode()})
+        )
+
+    def read_new(self, max_messages: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Read messages appended since the committed offset.
+
+        A trailing line without a newline is still being written and is left
+        for the next read. Lines that fail to parse are logged and skipped so
+        they cannot wedge the consumer. A legacy inbox holding one
+        (pretty-printed) JSON document is read whole instead.
+
+        Args:
+            max_messages: Optional cap on the number of messages returned
+
+        Returns:
+            Tuple of (messages, offset to commit once they are processed)
+        """
+        entries, offset = self.read_entries(max_messages)
+        return [message for message, _ in entries], offset
+
+    def read_entries(
+        self, max_messages: Optional[int] = None
+    ) -> Tuple[List[Tuple[Dict[str, Any], int]], int]:
+        """Read new messages, each with the offset that commits past it.
+
+        Messages sharing a line (a JSON array) can only be committed
+        together: all but the last carry the offset of the line's start.
+
+        Args:
+            max_messages: Optional cap on the number of messages returned
+
+        Returns:
+            Tuple of ((message, offset) pairs, offset to commit once all of
+            them are processed)
+        """
+        offset = self.committed_offset()
+        entries: List[Tuple[Dict[str, Any], int]] = []
+        if offset == 0:
+            legacy = self._read_legacy_document()
+            if legacy is not None:
+                messages, size = legacy
+                return [(message, size if i == len(messages) - 1 else 0)
+                        for i, message in enumerate(messages)], size
+
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                start = offset
+                offset += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError as e:
+                    logger.error(f"Skipping malformed inbox line at {offset - len(raw)}: {e}")
+                    continue
+                batch = message if isinstance(message, list) else [message]
+                entries.extend(
+                    (item, offset if i == len(batch) - 1 else start)
+                    for i, item in enumerate(batch)
+                )
+                if max_messages is not None and len(entries) >= max_messages:
+                    break
+
+        return entries, offset
+
+    def _read_legacy_document(self) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Read a pre-JSONL inbox written as a single JSON document.
+
+        Only tried when the first line is not valid JSON on its own, which
+        is how a multi-line document starts.
+
+        Returns:
+            Tuple of (messages, file size), or None if the file is not a
+            whole JSON document
+        """
+        with open(self.log_path, "rb") as f:
+            first = f.readline().strip()
+            if not first:
+                return None
+            try:
+                json.loads(first)
+                return None
+            except ValueError:
+                pass
+            f.seek(0)
+            data = f.read()
+        try:
+            document = json.loads(data)
+        except ValueError:
+            return None
+        logger.info(f"Read legacy JSON inbox {self.log_path} as one document")
+        messages = document if isinstance(document, list) else [document]
+        return messages, len(data)
+
+    def pending_bytes(self) -> int:
+        """Return the number of bytes not yet consumed."""
+        return max(os.path.getsize(self.log_path) - self.committed_offset(), 0)
+
+    def needs_compaction(self) -> bool:
+        """Check whether the consumed prefix is large enough to compact."""
+        return self.committed_offset() >= self.compact_threshold
+
+    def compact(self) -> int:
+        """Drop the consumed prefix of the log.
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        with self._locked():
+            offset = self.committed_offset()
+            if offset <= 0:
+                return 0
+
+            tmp_path = self.log_path.with_name(self.log_path.name + ".compact")
+            with open(self.log_path, "rb") as src, open(tmp_path, "wb") as dst:
+                src.seek(offset)
+                while True:
+                    chunk = src.read(64 * 1024)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                dst.flush()
+                os.fsync(dst.fileno())
+
+            os.replace(tmp_path, self.log_path)
+            self._write_cursor(0)
+
+        logger.info(f"Compacted {offset} consumed bytes from {self.log_path}")
+        return offset
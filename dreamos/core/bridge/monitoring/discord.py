@@ -4,11 +4,14 @@ Discord Integration Module
 Provides Discord webhook integration for bridge monitoring and notifications.
 """
 
+import asyncio
 import json
 import logging
+import time
+from collections import Counter, defaultdict
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import aiohttp
 
@@ -23,59 +26,383 @@ class EventType(Enum):
     INFO = "info"
     SUCCESS = "success"
 
+EVENT_COLORS = {
+    EventType.STARTUP: 0x00ff00,  # Green
+    EventType.SHUTDOWN: 0xff0000,  # Red
+    EventType.ERROR: 0xff0000,     # Red
+    EventType.WARNING: 0xffff00,   # Yellow
+    EventType.INFO: 0x0000ff,      # Blue
+    EventType.SUCCESS: 0x00ff00    # Green
+}
+
+# Discord accepts at most 10 embeds per webhook message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+
+def build_embed(event_type: EventType, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a Discord embed for a single event.
+    
+    Args:
+        event_type: Type of event
+        message: Event message
+        data: Optional event data
+        
+    Returns:
+        Embed dictionary
+    """
+    embed = {
+        "title": event_type.value.upper(),
+        "description": message,
+        "color": EVENT_COLORS.get(event_type, 0x808080),
+        "timestamp": datetime.now().isoformat()
+    }
+    if data:
+        embed["fields"] = [
+            {"name": k, "value": str(v), "inline": True}
+            for k, v in data.items()
+        ]
+    return embed
+
+
+class NotificationDispatcher:
+    """Queues, digests and rate-limits Discord webhook notifications.
+    
+    Events are queued without blocking the caller. A background worker
+    coalesces them per event type into one digest embed per window
+    (e.g. "142 success events in the last 10s") and posts the digests while
+    honouring ``429`` responses and ``X-RateLimit-*`` headers. Critical
+    events skip the digest and are sent on the next worker iteration.
+    """
+    
+    def __init__(
+        self,
+        webhook_url: str,
+        session: aiohttp.ClientSession,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        """Initialize the dispatcher.
+        
+        Args:
+            webhook_url: Discord webhook URL
+            session: HTTP session used for webhook posts
+            config: Optional dispatcher configuration
+        """
+        self.config = config or {}
+        self.webhook_url = webhook_url
+        self.session = session
+        self.window = self.config.get("window_seconds", 10.0)
+        self.max_queue = self.config.get("max_queue", 10000)
+        self.max_samples = self.config.get("max_samples", 5)
+        self.max_retries = self.config.get("max_retries", 5)
+        self.immediate_types = {
+            EventType(t) for t in self.config.get("immediate_types", ["startup", "shutdown"])
+        }
+        
+        self._queue: "asyncio.Queue[Tuple[EventType, str, Optional[Dict[str, Any]], bool]]" = asyncio.Queue(self.max_queue)
+        self._worker: Optional[asyncio.Task] = None
+        # Events taken off the queue but not yet sent; kept here so stop() can flush them
+        self._batch: List[Tuple[EventType, str, Optional[Dict[str, Any]], bool]] = []
+        self._blocked_until = 0.0
+        self.stats = Counter()
+        
+    async def start(self) -> None:
+        """Start the background worker."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+            
+    async def stop(self, flush: bool = True) -> None:
+        """Stop the background worker.
+        
+        Args:
+            flush: Send queued events before stopping
+        """
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        events, self._batch = self._batch + self._drain(), []
+        if flush:
+            await self._send_batch(events)
+            
+    def notify(
+        self,
+        event_type: EventType,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        critical: bool = False
+    ) -> bool:
+        """Queue an event without blocking.
+        
+        Args:
+            event_type: Type of event
+            message: Event message
+            data: Optional event data
+            critical: Send individually instead of in a digest
+            
+        Returns:
+            bool: False if the queue was full and the event was dropped
+        """
+        critical = critical or event_type in self.immediate_types
+        try:
+            self._queue.put_nowait((event_type, message, data, critical))
+            self.stats["queued"] += 1
+            return True
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            return False
+            
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be sent."""
+        return self._queue.qsize()
+        
+    def _drain(self) -> List[Tuple[EventType, str, Optional[Dict[str, Any]], bool]]:
+        """Take every queued event."""
+        events = []
+        while not self._queue.empty():
+            events.append(self._queue.get_nowait())
+        return events
+        
+    async def _run(self) -> None:
+        """Collect events for a window, then send digests."""
+        while True:
+            try:
+                first = await self._queue.get()
+                self._batch.append(first)
+                deadline = time.monotonic() + (0 if first[3] else self.window)
+                
+                # Critical events go out immediately with whatever is queued
+                while not self._batch[-1][3]:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        self._batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                        
+                self._batch.extend(self._drain())
+                await self._send_batch(self._batch)
+                self._batch = []
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in Discord notification dispatcher: {e}")
+                
+    def build_digests(
+        self,
+        events: List[Tuple[EventType, str, Optional[Dict[str, Any]], bool]]
+    ) -> List[Dict[str, Any]]:
+        """Coalesce events into embeds.
+        
+        Critical events keep their own embed. Everything else collapses into
+        one digest embed per event type with a count and a few samples.
+        
+        Args:
+            events: Queued events
+            
+        Returns:
+            List of embeds, critical first
+        """
+        embeds = []
+        grouped: Dict[EventType, List[str]] = defaultdict(list)
+        for event_type, message, data, critical in events:
+            if critical:
+                embeds.append(build_embed(event_type, message, data))
+            else:
+                grouped[event_type].append(message)
+                
+        for event_type, messages in grouped.items():
+            if len(messages) == 1:
+                embeds.append(build_embed(event_type, messages[0]))
+                continue
+            samples = "\n".join(f"- {m}" for m in messages[:self.max_samples])
+            more = len(messages) - self.max_samples
+            if more > 0:
+                samples += f"\n... and {more} more"
+            embeds.append(build_embed(
+                event_type,
+                f"{len(messages)} {event_type.value} events in the last {self.window:g}s\n{samples}",
+                {"count": len(messages)}
+            ))
+            self.stats["coalesced"] += len(messages) - 1
+            
+        return embeds
+        
+    async def _send_batch(self, events: List[Tuple[EventType, str, Optional[Dict[str, Any]], bool]]) -> None:
+        """Send a batch of events as digests."""
+        if not events:
+            return
+        embeds = self.build_digests(events)
+        for i in range(0, len(embeds), MAX_EMBEDS_PER_MESSAGE):
+            await self._post({"embeds": embeds[i:i + MAX_EMBEDS_PER_MESSAGE]})
+            
+    async def _post(self, payload: Dict[str, Any]) -> bool:
+        """Post a webhook payload, honouring Discord rate limits.
+        
+        Args:
+            payload: Webhook payload
+            
+        Returns:
+            bool: True if the payload was accepted
+        """
+        for _ in range(self.max_retries):
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                
+            try:
+                async with self.session.post(self.webhook_url, json=payload) as response:
+                    self._update_rate_limit(response.headers)
+                    
+                    if response.status == 429:
+                        self.stats["rate_limited"] += 1
+                        retry_after = self._retry_after(response.headers)
+                        try:
+                            body = await response.json(content_type=None)
+                            retry_after = float(body.get("retry_after", retry_after))
+                        except Exception:
+                            pass
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                        continue
+                        
+                    if response.status in (200, 204):
+                        self.stats["sent"] += 1
+                        return True
+                        
+                    logger.error(f"Failed to send Discord webhook: {response.status}")
+                    self.stats["failed"] += 1
+                    return False
+                    
+            except Exception as e:
+                logger.error(f"Error sending Discord webhook: {e}")
+                self.stats["failed"] += 1
+                return False
+                
+        logger.error("Giving up on Discord webhook after repeated rate limiting")
+        self.stats["failed"] += 1
+        return False
+        
+    def _retry_after(self, headers: Any) -> float:
+        """Read the retry delay from rate limit headers."""
+        for header in ("Retry-After", "X-RateLimit-Reset-After"):
+            value = headers.get(header)
+            if value is not None:
+                try:
+                    return float(value)
+                except ValueError:
+                    continue
+        return 1.0
+        
+    def _update_rate_limit(self, headers: Any) -> None:
+        """Pause sending until the bucket resets once it is exhausted."""
+        if headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset_after = float(headers.get("X-RateLimit-Reset-After", 1.0))
+            except (TypeError, ValueError):
+                reset_after = 1.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + reset_after)
+
+
 class DiscordHook:
     """Handles Discord webhook integration for notifications."""
     
-    def __init__(self, webhook_url: Optional[str] = None):
+    def __init__(
+        self,
+        webhook_url: Optional[str] = None,
+        digest: bool = False,
+        config: Optional[Dict[str, Any]] = None
+    ):
         """Initialize the Discord hook.
         
         Args:
             webhook_url: Optional Discord webhook URL
+            digest: Route events through a NotificationDispatcher
+            config: Optional dispatcher configuration
         """
         self.webhook_url = webhook_url
         self.session: Optional[aiohttp.ClientSession] = None
+        self.digest = digest
+        self.config = config or {}
+        self.dispatcher: Optional[NotificationDispatcher] = None
+        self._pending: set = set()
         
     async def start(self):
         """Start the Discord hook."""
         if self.webhook_url:
             self.session = aiohttp.ClientSession()
+            if self.digest:
+                self.dispatcher = NotificationDispatcher(self.webhook_url, self.session, self.config)
+                await self.dispatcher.start()
             
     async def stop(self):
         """Stop the Discord hook."""
+        if self.dispatcher:
+            await self.dispatcher.stop()
+            self.dispatcher = None
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
         if self.session:
             await self.session.close()
             self.session = None
             
-    async def send_event(self, event_type: EventType, message: str, data: Optional[Dict[str, Any]] = None):
+    def notify(
+        self,
+        event_type: EventType,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        critical: bool = False
+    ) -> None:
+        """Send an event without waiting for the webhook.
+        
+        Args:
+            event_type: Type of event
+            message: Event message
+            data: Optional event data
+            critical: Bypass the digest window
+        """
+        if not self.webhook_url or not self.session:
+            return
+        if self.dispatcher:
+            self.dispatcher.notify(event_type, message, data, critical)
+            return
+        task = asyncio.ensure_future(self.send_event(event_type, message, data))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+            
+    async def send_event(
+        self,
+        event_type: EventType,
+        message: str,
+        data: Optional[Dict[str, Any]] = None,
+        critical: bool = False
+    ):
         """Send an event to Discord.
         
+        With a dispatcher the event is queued and this returns immediately.
+        
         Args:
             event_type: Type of event
             message: Event message
             data: Optional event data
+            critical: Bypass the digest window
         """
         if not self.webhook_url or not self.session:
             return
             
-        try:
-            # Create embed
-            embed = {
-                "title": event_type.value.upper(),
-                "description": message,
-                "color": self._get_color(event_type),
-                "timestamp": datetime.now().isoformat()
-            }
+        if self.dispatcher:
+            self.dispatcher.notify(event_type, message, data, critical)
+            return
             
-            # Add data if provided
-            if data:
-                embed["fields"] = [
-                    {"name": k, "value": str(v), "inline": True}
-                    for k, v in data.items()
-                ]
-                
+        try:
             # Create payload
             payload = {
-                "embeds": [embed]
+                "embeds": [build_embed(event_type, message, data)]
             }
             
             # Send webhook
@@ -98,12 +425,4 @@ class DiscordHook:
         Returns:
             int: Color code
         """
-        colors = {
-            EventType.STARTUP: 0x00ff00,  # Green
-            EventType.SHUTDOWN: 0xff0000,  # Red
-            EventType.ERROR: 0xff0000,     # Red
-            EventType.WARNING: 0xffff00,   # Yellow
-            EventType.INFO: 0x0000ff,      # Blue
-            EventType.SUCCESS: 0x00ff00    # Green
-        }
-        return colors.get(event_type, 0x808080)  # Default to gray 
\ No newline at end of file
+        return EVENT_COLORS.get(event_type, 0x808080)  # Default to gray 
\ No newline at end of file
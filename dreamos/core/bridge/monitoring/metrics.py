@@ -72,6 +72,7 @@ class BridgeMetrics:
         self.average_response_time = 0
         self.last_error = None
         self.start_time = datetime.now()
+        self.packing: Dict[str, int] = {}
         
     def update_metrics(
         self,
@@ -99,6 +100,14 @@ class BridgeMetrics:
             self.last_error = error
             self.health.update(False, self.failed_requests)
             
+    def record_packing(self, stats: Dict[str, int]) -> None:
+        """Record request packing counters.
+        
+        Args:
+            stats: Packing counters (prompts packed, requests saved, fallbacks)
+        """
+        self.packing = dict(stats)
+            
     def get_metrics(self) -> Dict[str, Any]:
         """Get current metrics.
         
@@ -112,5 +121,6 @@ class BridgeMetrics:
             "failed_requests": self.failed_requests,
             "average_response_time": self.average_response_time,
             "last_error": self.last_error,
+            "packing": self.packing,
             "uptime": (datetime.now() - self.start_time).total_seconds()
         } 
\ No newline at end of file
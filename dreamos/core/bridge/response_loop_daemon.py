@@ -15,13 +15,14 @@ from watchdog.events import FileSystemEventHandler
 
 from dreamos.core.bridge.base import BridgeHandler
 from dreamos.core.bridge.monitoring import BridgeMonitor
-from dreamos.core.shared.processors import ProcessorMode
+from dreamos.core.bridge.monitoring.discord import DiscordHook, EventType
+from dreamos.core.shared.processors.mode import ProcessorMode
 from dreamos.core.utils.core_utils import (
     get_timestamp,
     format_timestamp,
     generate_id
 )
-from dreamos.core.utils.json_utils import load_json
+from dreamos.core.utils.json_utils import load_json, save_json
 from dreamos.core.utils.logging_utils import get_logger
 from dreamos.core.autonomy.base.response_loop_daemon import BaseResponseLoopDaemon
 from dreamos.core.autonomy.memory.response_memory_tracker import ResponseMemoryTracker
@@ -32,7 +33,7 @@ from dreamos.core.utils.core_utils import (
     format_duration,
     is_valid_uuid
 )
-from dreamos.core.utils import safe_move
+from dreamos.core.utils.core_utils import safe_move
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -47,10 +48,9 @@ class ResponseLoopDaemon(BaseResponseLoopDaemon):
             config: Optional configuration dictionary
             discord_token: Optional Discord token for notifications
         """
-        super().__init__(config)
-        
-        # Initialize components
-        self.bridge = BridgeHandler(config)
+        self.config = config or {}
+        super().__init__(self._create_response_processor(), self.config)
+        self.agent_id = self.config.get("agent_id", "bridge")
         
         # Set up paths
         self.runtime_dir = Path(self.config.get("paths", {}).get("runtime", "data/runtime"))
@@ -62,6 +62,9 @@ class ResponseLoopDaemon(BaseResponseLoopDaemon):
         for directory in [self.runtime_dir, self.agent_mailbox, self.archive_dir, self.failed_dir]:
             directory.mkdir(parents=True, exist_ok=True)
         
+        # Initialize components
+        self.bridge = BridgeHandler(self.agent_mailbox, config=self.config)
+        
         # Initialize memory tracker
         memory_path = self.runtime_dir / "memory" / f"response_log_{self.agent_id}.json"
         self.memory_tracker = ResponseMemoryTracker(str(memory_path))
@@ -75,8 +78,12 @@ class ResponseLoopDaemon(BaseResponseLoopDaemon):
         )
         
         # Initialize monitoring
-        self.monitor = BridgeMonitor()
-        self.discord = DiscordHook(discord_token)
+        self.monitor = BridgeMonitor(str(self.runtime_dir / "bridge_health.json"))
+        self.discord = DiscordHook(
+            discord_token,
+            digest=True,
+            config=self.config.get("discord", {})
+        )
         
         # Load state
         self.state_file = self.runtime_dir / "response_loop_state.json"
@@ -131,33 +138,31 @@ class ResponseLoopDaemon(BaseResponseLoopDaemon):
         """
         try:
             # Extract agent ID from filename
-            agent_id = extract_agent_id_from_file(file_path)
+            agent_id, error = extract_agent_id_from_file(file_path)
             if not agent_id:
-                logger.error(f"Could not extract agent ID from {file_path}")
+                logger.error(f"Could not extract agent ID from {file_path}: {error}")
                 return False
             
             # Read response data
             with open(file_path, 'r') as f:
                 response_data = json.load(f)
             
-            # Process response
-            success, error = await self.processor.process_response(response_data, agent_id)
+            # Process response (the processor raises on invalid responses)
+            try:
+                await self.processor.process(response_data)
+                success, error = True, None
+            except Exception as e:
+                success, error = False, str(e)
             
             if success:
                 # Archive successful response
                 archive_path = self.archive_dir / file_path.name
-                if not safe_move(str(file_path), str(archive_path)):
+                if not safe_move(str(file_path), str(archive_path), backup=False, atomic=False):
                     logger.error(f"Failed to archive response file {file_path}")
                     return False
                 
-                # Update metrics
-                self.monitor.update_metrics(
-                    agent_id=agent_id,
-                    response_type=response_data.get("type", "unknown")
-                )
-                
-                # Send Discord notification
-                await self.discord.send_event(
+                # Queue Discord notification (digested, never blocks processing)
+                self.discord.notify(
                     EventType.SUCCESS,
                     f"Processed response from agent {agent_id}",
                     {"file": str(file_path)}
@@ -167,15 +172,15 @@ class ResponseLoopDaemon(BaseResponseLoopDaemon):
             else:
                 # Move failed response to failed directory
                 failed_path = self.failed_dir / file_path.name
-                if not safe_move(str(file_path), str(failed_path)):
+                if not safe_move(str(file_path), str(failed_path), backup=False, atomic=False):
                     logger.error(f"Failed to move failed response {file_path}")
                     return False
                 
                 # Update agent state
                 self.agent_state.update_agent_state(agent_id, "failed")
                 
-                # Send Discord notification
-                await self.discord.send_event(
+                # Queue Discord notification (digested, never blocks processing)
+                self.discord.notify(
                     EventType.ERROR,
                     f"Failed to process response from agent {agent_id}",
                     {"error": error, "file": str(file_path)}
@@ -203,7 +208,7 @@ class ResponseLoopDaemon(BaseResponseLoopDaemon):
                 failed_files = list(self.failed_dir.glob(f"{agent_id}_*.json"))
                 for file in failed_files:
                     archive_path = self.archive_dir / file.name
-                    if not safe_move(str(file), str(archive_path)):
+                    if not safe_move(str(file), str(archive_path), backup=False, atomic=False):
                         logger.error(f"Failed to move failed file {file}")
                         return False
                 
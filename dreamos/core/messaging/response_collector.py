@@ -26,7 +26,7 @@ except ImportError:  # pragma: no cover - Windows only dependency
     auto = None
 import pyautogui
 import numpy as np
-from PIL import Image, ImageChops
+from PIL import Image
 import cv2
 import os
 import sys
@@ -44,6 +44,12 @@ from dreamos.core.utils.core_utils import (
     is_valid_uuid
 )
 from dreamos.core.utils import load_json
+from dreamos.core.agent.control.clipboard_service import ClipboardService, get_clipboard_service
+from dreamos.core.agent.control.collection_session import AgentCollection, CollectionSession
+from dreamos.core.agent.control.frame_grabber import get_frame_grabber, to_image
+from dreamos.core.agent.control.ocr_service import OCRService
+from dreamos.core.agent.control.region_stability import RegionStabilityTracker
+from dreamos.core.agent.control.template_matcher import TemplateMatcher
 from dreamos.core.log_manager import LogManager, LogConfig, LogLevel
 
 # Initialize logging
@@ -71,6 +77,7 @@ class CopyButtonDetector:
         """
         self.template_path = template_path
         self.template = None
+        self.matcher = None
         self.load_template()
         
     def load_template(self) -> None:
@@ -78,6 +85,7 @@ class CopyButtonDetector:
         try:
             if Path(self.template_path).exists():
                 self.template = cv2.imread(self.template_path, cv2.IMREAD_COLOR)
+                self.matcher = TemplateMatcher(self.template)
                 logger.info(f"Loaded copy button template from {self.template_path}")
             else:
                 logger.warning(f"Template not found at {self.template_path}")
@@ -88,31 +96,25 @@ class CopyButtonDetector:
         """Detect copy button in the given region.
         
         Args:
-            region: (left, top, right, bottom) coordinates to search in
+            region: (left, top, width, height) screen rectangle to search in
             
         Returns:
             (x, y) coordinates of button center if found, None otherwise
         """
         try:
-            if self.template is None:
+            if self.matcher is None:
                 return None
                 
-            # Capture region screenshot
-            screenshot = pyautogui.screenshot(region=region)
-            screenshot_np = np.array(screenshot)
-            screenshot_np = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
-            
-            # Template matching
-            result = cv2.matchTemplate(screenshot_np, self.template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            # If match confidence is high enough
-            if max_val >= 0.8:  # Adjust threshold as needed
-                # Get center of matched region
-                h, w = self.template.shape[:2]
-                center_x = max_loc[0] + w//2 + region[0]
-                center_y = max_loc[1] + h//2 + region[1]
-                logger.debug(f"Found copy button at ({center_x}, {center_y}) with confidence {max_val:.2f}")
+            # Multi-scale search, skipped when the region is unchanged
+            match = self.matcher.find(get_frame_grabber().region(region), key=tuple(region))
+            if match is not None:
+                x, y = match.center
+                center_x = x + region[0]
+                center_y = y + region[1]
+                logger.debug(
+                    f"Found copy button at ({center_x}, {center_y}) with confidence "
+                    f"{match.score:.2f} at scale {match.scale:g}"
+                )
                 return (center_x, center_y)
                 
             return None
@@ -125,7 +127,7 @@ class CopyButtonDetector:
         """Detect and click the copy button in the given region.
         
         Args:
-            region: (left, top, right, bottom) coordinates to search in
+            region: (left, top, width, height) screen rectangle to search in
             
         Returns:
             True if button was found and clicked, False otherwise
@@ -150,16 +152,19 @@ class AgentRegion:
                  check_interval: float = 0.5, 
                  stability_threshold: float = 0.95,
                  agent_id: Optional[str] = None,
-                 copy_button_region: Optional[Tuple[int, int, int, int]] = None):
+                 copy_button_region: Optional[Tuple[int, int, int, int]] = None,
+                 masks: Optional[List[Tuple[int, int, int, int]]] = None):
         """Initialize an agent region.
         
         Args:
             name: Name of the region
-            region: (left, top, right, bottom) coordinates of the region
+            region: (left, top, width, height) screen rectangle of the region
             check_interval: How often to check for changes (seconds)
-            stability_threshold: How similar consecutive screenshots must be to consider stable
+            stability_threshold: How similar a tile's perceptual hash must stay to count as unchanged
             agent_id: Optional SWARM agent ID
-            copy_button_region: Optional region where copy button appears
+            copy_button_region: Optional (left, top, width, height) rectangle where
+                the copy button appears
+            masks: Optional region-relative rectangles to ignore (e.g. a blinking caret)
         """
         self.name = name
         self.region = region
@@ -167,38 +172,28 @@ class AgentRegion:
         self.stability_threshold = stability_threshold
         self.agent_id = agent_id
         self.copy_button_region = copy_button_region
-        self.last_screenshot = None
         self.last_change_time = None
+        self.stability = RegionStabilityTracker(
+            dwell=check_interval,
+            max_distance=round((1.0 - stability_threshold) * 64),
+            masks=masks
+        )
         self.copy_detector = CopyButtonDetector()
         
     def capture(self) -> Image.Image:
         """Capture the region screenshot."""
-        return pyautogui.screenshot(region=self.region)
+        return to_image(self.capture_view())
+        
+    def capture_view(self) -> np.ndarray:
+        """Zero-copy BGRA view of the region from the shared frame."""
+        return get_frame_grabber().region(self.region)
         
     def is_stable(self) -> bool:
         """Check if the region content has stabilized."""
-        current = self.capture()
-        
-        if self.last_screenshot is None:
-            self.last_screenshot = current
+        result = self.stability.update(self.capture_view())
+        if result.changed_tiles:
             self.last_change_time = time.time()
-            return False
-            
-        # Compare current and last screenshot
-        diff = ImageChops.difference(current, self.last_screenshot)
-        similarity = 1.0 - (np.sum(diff) / (255.0 * diff.size[0] * diff.size[1]))
-        
-        if similarity < self.stability_threshold:
-            # Content changed
-            self.last_screenshot = current
-            self.last_change_time = time.time()
-            return False
-            
-        # Content stable for check_interval
-        if time.time() - self.last_change_time >= self.check_interval:
-            return True
-            
-        return False
+        return result.stable
         
     def try_copy_response(self) -> bool:
         """Attempt to copy the response using the copy button."""
@@ -209,12 +204,15 @@ class AgentRegion:
 class ResponseCollector:
     """Collects and saves Cursor agent responses for SWARM."""
     
-    def __init__(self, save_dir: str = "agent_responses", regions_file: str = "agent_regions.json"):
+    def __init__(self, save_dir: str = "agent_responses", regions_file: str = "agent_regions.json",
+                 clipboard: Optional[ClipboardService] = None, ocr: Optional[OCRService] = None):
         """Initialize the response collector.
         
         Args:
             save_dir: Directory to save responses
             regions_file: Path to JSON file containing agent regions
+            clipboard: Optional ClipboardService (defaults to the shared one)
+            ocr: Optional OCRService for regions whose response cannot be copied
         """
         self.save_dir = Path(save_dir)
         ensure_dir(self.save_dir)
@@ -223,13 +221,30 @@ class ResponseCollector:
         self.cursor_windows = []  # List of all Cursor windows
         self.active_window = None  # Currently active Cursor window
         self.agent_regions = {}  # Dict of agent name to AgentRegion
+        self.last_metrics = {}  # Metrics of the last collection session
+        self.clipboard = clipboard or get_clipboard_service()
+        self.ocr = ocr or OCRService()
         
         # Load agent regions from file
         self._load_agent_regions(regions_file)
         logger.info(f"Response collector initialized with save dir: {save_dir}")
     
+    @staticmethod
+    def _to_rect(coords: Dict[str, int]) -> Tuple[int, int, int, int]:
+        """Convert a left/top/right/bottom entry to (left, top, width, height)."""
+        return (
+            coords['left'],
+            coords['top'],
+            coords['right'] - coords['left'],
+            coords['bottom'] - coords['top']
+        )
+
     def _load_agent_regions(self, regions_file: str) -> None:
-        """Load agent regions from JSON file."""
+        """Load agent regions from JSON file.
+
+        The file stores edges (left, top, right, bottom); regions are kept
+        as (left, top, width, height), the FrameGrabber convention.
+        """
         try:
             regions = load_json(regions_file)
             if not regions:
@@ -237,12 +252,7 @@ class ResponseCollector:
                 return
                 
             for name, coords in regions.items():
-                region = (
-                    coords['left'],
-                    coords['top'],
-                    coords['right'],
-                    coords['bottom']
-                )
+                region = self._to_rect(coords)
                 # Extract agent ID from region name if present
                 agent_id = None
                 if '_' in name:
@@ -253,12 +263,7 @@ class ResponseCollector:
                 # Get copy button region if specified
                 copy_button_region = None
                 if 'copy_button' in coords:
-                    copy_button_region = (
-                        coords['copy_button']['left'],
-                        coords['copy_button']['top'],
-                        coords['copy_button']['right'],
-                        coords['copy_button']['bottom']
-                    )
+                    copy_button_region = self._to_rect(coords['copy_button'])
                 
                 self.agent_regions[name] = AgentRegion(
                     name=name,
@@ -351,15 +356,18 @@ class ResponseCollector:
         if timeout < 0:
             raise ValueError("Timeout must be non-negative")
 
-        if auto is None:
-            logger.warning("UIAutomation not available on this platform; skipping collection")
-            return False
-
         # Verify save directory is valid and writable
         if not os.path.exists(self.save_dir):
             raise OSError(f"Save directory does not exist: {self.save_dir}")
         if not os.access(self.save_dir, os.W_OK):
             raise OSError(f"Save directory is not writable: {self.save_dir}")
+
+        if self._regions_for(agent_id):
+            return bool(self.collect_all(timeout, agent_id, wait_all=False))
+
+        if auto is None:
+            logger.warning("UIAutomation not available on this platform; skipping collection")
+            return False
             
         try:
             # Find all Cursor windows
@@ -397,12 +405,6 @@ class ResponseCollector:
                     self.last_response = current_text
                     self._save_response(current_text, agent_id)
 
-                    # Try to copy response if copy button region is defined
-                    for name, region in self.agent_regions.items():
-                        if agent_id is None or region.agent_id == agent_id:
-                            if region.try_copy_response():
-                                logger.info(f"Successfully copied response for agent {region.agent_id}")
-
                     ts_end = time.time()
                     outbox_file.parent.mkdir(parents=True, exist_ok=True)
                     save_json({
@@ -414,26 +416,83 @@ class ResponseCollector:
 
                     return True
                 
-                # Check agent region stability
-                for name, region in self.agent_regions.items():
-                    if agent_id is None or region.agent_id == agent_id:
-                        if region.is_stable():
-                            logger.info(f"Agent {region.agent_id or 'unknown'} response stabilized")
-                            ts_end = time.time()
-                            outbox_file.parent.mkdir(parents=True, exist_ok=True)
-                            save_json({
-                                "status": "complete",
-                                "response": self.last_response or "",
-                                "started_at": start_time,
-                                "completed_at": ts_end
-                            }, outbox_file)
-                            return True
-                
                 time.sleep(0.1)  # Check every 100ms
             
         except Exception as e:
             logger.error(f"Error collecting response: {e}")
             return False
+
+    def _regions_for(self, agent_id: Optional[str] = None) -> Dict[str, AgentRegion]:
+        """Agent regions to watch, optionally only those of one agent."""
+        return {
+            name: region for name, region in self.agent_regions.items()
+            if agent_id is None or region.agent_id == agent_id
+        }
+
+    def collect_all(self, timeout: int = 300, agent_id: Optional[str] = None,
+                    grabber=None, outbox_dir: str = "runtime/bridge_outbox",
+                    wait_all: bool = True) -> Dict[str, str]:
+        """Collect responses from all agent regions concurrently.
+
+        Each response is saved and written to the bridge outbox as soon as its
+        agent finishes, rather than after the slowest one.
+
+        Args:
+            timeout: Maximum time to wait for all responses in seconds
+            agent_id: Optional SWARM agent ID to restrict collection to
+            grabber: Optional FrameGrabber (defaults to the shared one)
+            outbox_dir: Bridge outbox directory
+            wait_all: Wait for every region; False returns after the first response
+
+        Returns:
+            Mapping of region name to collected response
+        """
+        regions = self._regions_for(agent_id)
+        session = CollectionSession(
+            self._read_region_response,
+            grabber=grabber,
+            outbox_dir=outbox_dir,
+            on_complete=self._on_response_complete
+        )
+        for name, region in regions.items():
+            session.watch(
+                name, region.region, agent_id=region.agent_id,
+                dwell=region.stability.dwell,
+                max_distance=region.stability.max_distance,
+                masks=region.stability.masks + self._copy_button_masks(region)
+            )
+        try:
+            responses = session.collect(timeout, wait_all)
+        finally:
+            session.close()
+        self.last_metrics = session.get_metrics()
+        return responses
+
+    @staticmethod
+    def _copy_button_masks(region: AgentRegion) -> List[Tuple[int, int, int, int]]:
+        """Hide the copy button from change detection; clicking it changes its pixels."""
+        if not region.copy_button_region:
+            return []
+        left, top, width, height = region.copy_button_region
+        return [(left - region.region[0], top - region.region[1], width, height)]
+
+    def _read_region_response(self, name: str) -> Optional[str]:
+        """Copy a region's response via its copy button, falling back to OCR of the region.
+
+        Only a clipboard change that follows the click counts, so a copy that
+        silently failed never returns the previous clipboard contents. The
+        fallback reads the region's own pixels, never the foreground window,
+        which may belong to another agent.
+        """
+        region = self.agent_regions[name]
+        if region.copy_button_region:
+            capture = self.clipboard.capture(region.agent_id or name, region.try_copy_response)
+            if capture:
+                return capture.text
+        return self.ocr.read(region.capture_view()) or None
+
+    def _on_response_complete(self, agent: AgentCollection) -> None:
+        self._save_response(agent.response, agent.agent_id)
     
     def _save_response(self, response: str, agent_id: Optional[str] = None) -> None:
         """Save a response to file.
@@ -442,6 +501,9 @@ class ResponseCollector:
             response: The response text to save
             agent_id: Optional agent ID to include in filename
         """
+        if self.clipboard.seen(agent_id or "", response):
+            logger.info(f"Skipping duplicate response from {agent_id or 'unknown agent'}")
+            return
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             if agent_id:
@@ -450,7 +512,11 @@ class ResponseCollector:
                 filename = f"response_{timestamp}.txt"
                 
             filepath = self.save_dir / filename
-            safe_write(filepath, response)
+            if not safe_write(filepath, response):
+                logger.error(f"Error saving response to {filepath}")
+                return
+            # Record the hash only once saved, so a failed write can be retried
+            self.clipboard.is_new(agent_id or "", response)
             self.last_response = response
             self.response_count += 1
             logger.info(f"Saved response to {filepath}")
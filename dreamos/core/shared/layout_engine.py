@@ -0,0 +1,340 @@
+"""
+Layout Engine Module
+
+Loads every agent's coordinate layout once, validates all of them
+together and serves transformed coordinates from a cache.
+
+- Points and regions of all agents are transformed in one batch: scaled
+  from ``source_resolution`` to the primary monitor and offset by its
+  origin.
+- The transformed layouts are cached and rebuilt only when the monitor
+  topology or the config file changes. Both are checked at most every
+  ``check_interval`` seconds.
+- Overlapping regions of different agents are found with a sweep line
+  over region left edges instead of comparing every pair.
+- Point-in-region queries go through a uniform grid index.
+
+Regions use the inclusive ``(left, top, right, bottom)`` convention of
+``coordinate_utils.regions_overlap``: regions that share an edge overlap.
+"""
+
+import heapq
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .coordinate_utils import load_coordinates
+
+logger = logging.getLogger("shared.layout_engine")
+
+Rect = Tuple[int, int, int, int]  # (left, top, right, bottom), inclusive
+
+REQUIRED_POINTS = ("initial_spot", "input_box", "copy_button")
+
+
+@dataclass(frozen=True)
+class Monitor:
+    """One monitor of the virtual screen."""
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+
+@dataclass
+class LayoutIssue:
+    """A validation problem in an agent layout."""
+    agent_id: str
+    key: str
+    kind: str  # "missing", "off_screen", "duplicate" or "overlap"
+    message: str
+    other: Optional[Tuple[str, str]] = None  # (agent_id, key) of the conflicting entry
+
+
+def detect_monitors() -> Tuple[Monitor, ...]:
+    """Current monitor topology, primary monitor first."""
+    try:
+        import screeninfo
+        monitors = screeninfo.get_monitors()
+        if monitors:
+            monitors = sorted(monitors, key=lambda m: not getattr(m, "is_primary", False))
+            return tuple(Monitor(m.x, m.y, m.width, m.height) for m in monitors)
+    except Exception as e:
+        logger.debug(f"screeninfo unavailable, falling back to pyautogui: {e}")
+    try:
+        import pyautogui
+        width, height = pyautogui.size()
+        return (Monitor(0, 0, width, height),)
+    except Exception as e:
+        logger.debug(f"pyautogui unavailable, assuming 1920x1080: {e}")
+        return (Monitor(0, 0, 1920, 1080),)
+
+
+def _parse_region(value: Dict) -> Optional[Rect]:
+    if "top_left" in value and "bottom_right" in value:
+        return (value["top_left"]["x"], value["top_left"]["y"],
+                value["bottom_right"]["x"], value["bottom_right"]["y"])
+    if "width" in value and "height" in value and "x" in value and "y" in value:
+        return (value["x"], value["y"], value["x"] + value["width"], value["y"] + value["height"])
+    return None
+
+
+def find_overlaps(regions: Sequence[Tuple[Rect, object]]) -> List[Tuple[int, int]]:
+    """Index pairs of overlapping regions with different owners.
+
+    Sweeps regions by left edge, keeping the regions whose x-range is
+    still open in a heap ordered by right edge, and compares y-ranges only
+    against those.
+
+    Args:
+        regions: (rect, owner) pairs; regions of the same owner never conflict
+
+    Returns:
+        Sorted (i, j) index pairs with i < j
+    """
+    order = sorted(range(len(regions)), key=lambda i: regions[i][0][0])
+    active: List[Tuple[int, int]] = []  # (right, index)
+    pairs = []
+    for i in order:
+        (left, top, right, bottom), owner = regions[i]
+        while active and active[0][0] < left:
+            heapq.heappop(active)
+        for _, j in active:
+            (_, other_top, _, other_bottom), other_owner = regions[j]
+            if other_owner != owner and top <= other_bottom and other_top <= bottom:
+                pairs.append((min(i, j), max(i, j)))
+        heapq.heappush(active, (right, i))
+    return sorted(pairs)
+
+
+class LayoutEngine:
+    """Validated, cached agent layouts for the current monitor topology."""
+
+    def __init__(self, config_path: Optional[str] = None,
+                 source_resolution: Optional[Tuple[int, int]] = None,
+                 monitors: Callable[[], Tuple[Monitor, ...]] = detect_monitors,
+                 check_interval: float = 2.0,
+                 cell_size: int = 256,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the layout engine.
+
+        Args:
+            config_path: Optional coordinate config file, reloaded when it changes
+            source_resolution: Resolution the coordinates were recorded at (no scaling if None)
+            monitors: Callable returning the monitor topology, primary first
+            check_interval: Seconds between topology and config file checks
+            cell_size: Grid cell edge of the point-in-region index
+            clock: Time source
+        """
+        self.config_path = config_path
+        self.source_resolution = source_resolution
+        self.monitors = monitors
+        self.check_interval = check_interval
+        self.cell_size = cell_size
+        self.clock = clock
+
+        self.raw: Dict[str, Dict] = {}
+        self.topology: Tuple[Monitor, ...] = ()
+        self.scale = (1.0, 1.0)
+        self.offset = (0, 0)
+        self._layouts: Dict[str, Dict] = {}
+        self._points: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._regions: Dict[Tuple[str, str], Rect] = {}
+        self._grid: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}
+        self._config_stamp = None
+        self._next_check = 0.0
+        self._stale = True
+        self.stats = {"rebuilds": 0, "config_reloads": 0, "topology_changes": 0}
+
+        if config_path:
+            self.load_file(config_path)
+
+    # ------------------------------------------------------------------
+    # Loading
+
+    def load(self, coords: Dict[str, Dict]) -> None:
+        """Replace all agent layouts (untransformed, as stored in config)."""
+        self.raw = {agent_id: dict(layout) for agent_id, layout in coords.items() if isinstance(layout, dict)}
+        self._stale = True
+
+    def load_file(self, config_path: str) -> None:
+        """Load all agent layouts from a config file and watch it for changes."""
+        self.config_path = config_path
+        self._config_stamp = self._stamp()
+        self.load(load_coordinates(config_path))
+        self.stats["config_reloads"] += 1
+
+    def invalidate(self) -> None:
+        """Force the topology and config file to be re-checked on next access."""
+        self._next_check = 0.0
+        self._stale = True
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.config_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _ensure_fresh(self) -> None:
+        now = self.clock()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            if self.config_path and self._stamp() != self._config_stamp:
+                logger.info(f"Coordinate config {self.config_path} changed, reloading")
+                self.load_file(self.config_path)
+            topology = tuple(self.monitors())
+            if topology != self.topology:
+                if self.topology:
+                    logger.info(f"Monitor topology changed: {topology}")
+                    self.stats["topology_changes"] += 1
+                self.topology = topology
+                self._stale = True
+        if self._stale:
+            self._rebuild()
+
+    # ------------------------------------------------------------------
+    # Batch transform
+
+    def _rebuild(self) -> None:
+        primary = self.topology[0] if self.topology else Monitor(0, 0, 1920, 1080)
+        if self.source_resolution:
+            self.scale = (primary.width / self.source_resolution[0], primary.height / self.source_resolution[1])
+        else:
+            self.scale = (1.0, 1.0)
+        self.offset = (primary.x, primary.y)
+
+        point_keys, points, region_keys, regions = [], [], [], []
+        for agent_id, layout in self.raw.items():
+            for key, value in layout.items():
+                if not isinstance(value, dict):
+                    continue
+                region = _parse_region(value)
+                if region is not None:
+                    region_keys.append((agent_id, key))
+                    regions.append(region)
+                elif "x" in value and "y" in value:
+                    point_keys.append((agent_id, key))
+                    points.append((value["x"], value["y"]))
+
+        # One vectorised transform for every point and region corner of every agent
+        factor = np.array(self.scale)
+        shift = np.array(self.offset)
+        points = (np.array(points, dtype=np.float64).reshape(-1, 2) * factor).astype(np.int64) + shift
+        corners = (np.array(regions, dtype=np.float64).reshape(-1, 2, 2) * factor).astype(np.int64) + shift
+        self._points = {key: (int(x), int(y)) for key, (x, y) in zip(point_keys, points)}
+        self._regions = {key: tuple(int(v) for v in corner.ravel()) for key, corner in zip(region_keys, corners)}
+
+        # Non-geometric entries (e.g. window_title) pass through untouched
+        self._layouts = {
+            agent_id: {key: value for key, value in layout.items() if not isinstance(value, dict)}
+            for agent_id, layout in self.raw.items()
+        }
+        for (agent_id, key), (x, y) in self._points.items():
+            self._layouts[agent_id][key] = {"x": x, "y": y}
+        for (agent_id, key), (left, top, right, bottom) in self._regions.items():
+            self._layouts[agent_id][key] = {
+                "top_left": {"x": left, "y": top},
+                "bottom_right": {"x": right, "y": bottom},
+            }
+
+        self._grid = {}
+        for key, (left, top, right, bottom) in self._regions.items():
+            for cx in range(left // self.cell_size, right // self.cell_size + 1):
+                for cy in range(top // self.cell_size, bottom // self.cell_size + 1):
+                    self._grid.setdefault((cx, cy), []).append(key)
+
+        self._stale = False
+        self.stats["rebuilds"] += 1
+        logger.debug(f"Built layouts for {len(self._layouts)} agents on {len(self.topology)} monitors")
+
+    def transform_point(self, x: int, y: int) -> Tuple[int, int]:
+        """Transform one recorded point with the cached transform."""
+        self._ensure_fresh()
+        return (int(x * self.scale[0]) + self.offset[0], int(y * self.scale[1]) + self.offset[1])
+
+    # ------------------------------------------------------------------
+    # Queries
+
+    def agents(self) -> List[str]:
+        self._ensure_fresh()
+        return list(self._layouts)
+
+    def get(self, agent_id: str) -> Optional[Dict]:
+        """Transformed layout of an agent (CoordinateManager format)."""
+        self._ensure_fresh()
+        return self._layouts.get(agent_id)
+
+    def recorded(self, agent_id: str) -> Optional[Dict]:
+        """Untransformed layout of an agent, as stored in config."""
+        self._ensure_fresh()
+        return self.raw.get(agent_id)
+
+    def point(self, agent_id: str, key: str) -> Optional[Tuple[int, int]]:
+        self._ensure_fresh()
+        return self._points.get((agent_id, key))
+
+    def region(self, agent_id: str, key: str = "response_region") -> Optional[Rect]:
+        self._ensure_fresh()
+        return self._regions.get((agent_id, key))
+
+    def regions_at(self, x: int, y: int) -> List[Tuple[str, str]]:
+        """(agent_id, key) of every region containing a screen point."""
+        self._ensure_fresh()
+        candidates = self._grid.get((x // self.cell_size, y // self.cell_size), [])
+        return [
+            key for key in candidates
+            if self._regions[key][0] <= x <= self._regions[key][2] and self._regions[key][1] <= y <= self._regions[key][3]
+        ]
+
+    def agent_at(self, x: int, y: int) -> Optional[str]:
+        """Agent whose region contains a screen point, if exactly one does."""
+        owners = {agent_id for agent_id, _ in self.regions_at(x, y)}
+        return owners.pop() if len(owners) == 1 else None
+
+    # ------------------------------------------------------------------
+    # Validation
+
+    def validate(self, required: Sequence[str] = REQUIRED_POINTS) -> List[LayoutIssue]:
+        """Validate all layouts together.
+
+        Checks required points, points outside every monitor, points shared
+        by different agents and regions of different agents that overlap.
+        A point shared between keys of one agent (e.g. ``initial_spot`` and
+        ``input_box_initial``) is an alias, not a conflict.
+
+        Args:
+            required: Point keys every agent must have
+
+        Returns:
+            List of issues (empty when every layout is valid)
+        """
+        self._ensure_fresh()
+        issues = []
+        for agent_id, layout in self._layouts.items():
+            for key in required:
+                if key not in layout:
+                    issues.append(LayoutIssue(agent_id, key, "missing", f"Missing required coordinate: {key}"))
+
+        owners: Dict[Tuple[int, int], Tuple[str, str]] = {}
+        for (agent_id, key), point in self._points.items():
+            if self.topology and not any(m.contains(*point) for m in self.topology):
+                issues.append(LayoutIssue(agent_id, key, "off_screen", f"Coordinates off screen for {key}: {point}"))
+            owner = owners.setdefault(point, (agent_id, key))
+            if owner[0] != agent_id:
+                issues.append(LayoutIssue(
+                    agent_id, key, "duplicate", f"{key} at {point} duplicates {owner[0]}.{owner[1]}", owner
+                ))
+
+        keys = list(self._regions)
+        for i, j in find_overlaps([(self._regions[key], key[0]) for key in keys]):
+            (agent_a, key_a), (agent_b, key_b) = keys[i], keys[j]
+            issues.append(LayoutIssue(agent_a, key_a, "overlap", f"{key_a} overlaps {agent_b}.{key_b}", (agent_b, key_b)))
+        return issues
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call cost of BridgeConfigLoader.load_config versus the
+cached BridgeConfigService.get.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.bridge.config.loader import BridgeConfigLoader, BridgeMode
+from dreamos.core.bridge.config.service import BridgeConfigService
+
+BASE_CONFIG = {
+    "paths": {"base": "data", "archive": "data/archive", "failed": "data/failed"},
+    "bridge": {"api_key": "bench", "model": "gpt-4", "timeout": 30},
+    "handlers": {f"handler_{i}": {"enabled": True, "retries": i} for i in range(50)},
+    "processors": {f"processor_{i}": {"batch": i} for i in range(50)},
+    "monitoring": {"interval": 10},
+    "logging": {"level": "INFO"}
+}
+
+
+def _time_calls(fn, iterations: int) -> float:
+    """Return mean microseconds per call."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(f"agent-{i % 8}")
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = Path(tmp)
+        (config_dir / "config.json").write_text(json.dumps(BASE_CONFIG))
+        (config_dir / "config.test.json").write_text(json.dumps({"monitoring": {"interval": 1}}))
+        (config_dir / "agents").mkdir()
+        for i in range(8):
+            (config_dir / "agents" / f"agent-{i}.json").write_text(
+                json.dumps({"bridge": {"model": f"model-{i}"}})
+            )
+
+        loader = BridgeConfigLoader(config_dir / "config.json", BridgeMode.TEST)
+        service = BridgeConfigService(config_dir / "config.json", BridgeMode.TEST, watch=False)
+
+        uncached = _time_calls(loader.load_config, args.iterations)
+        cached = _time_calls(service.get, args.iterations)
+
+    print(f"BridgeConfigLoader.load_config: {uncached:9.2f} us/call")
+    print(f"BridgeConfigService.get:        {cached:9.2f} us/call")
+    print(f"Speedup:                        {uncached / cached:9.1f}x")
+    print(f"Cache stats: {service.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Compare response capture through the copy button on a simulated clipboard.
+
+immediate - read the clipboard right after the click (the collector's old
+            clipboard read)
+delay     - sleep COPY_BUTTON_DELAY after the click, then read
+service   - ClipboardService: wait for the clipboard sequence to change,
+            read once, dedupe by content hash before saving
+
+Each capture is one agent's copy click. The application fills the
+clipboard after a random delay, some clicks copy nothing, and some
+responses repeat the agent's previous one. Every clipboard read costs
+--read-latency, like pyperclip's subprocess backends. Latencies cover
+captures that returned text; misses are counted separately.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.clipboard_service import ClipboardService, FakeClipboardBackend
+from dreamos.core.agent.control.timing import COPY_BUTTON_DELAY
+
+
+def workload(count: int, agents: int, seed: int = 0):
+    """(agent, text or None if the copy fails, clipboard delay) per capture."""
+    rng = random.Random(seed)
+    last = {}
+    jobs = []
+    for i in range(count):
+        agent = f"agent-{rng.randrange(agents)}"
+        if rng.random() < 0.1:
+            text = None
+        elif agent in last and rng.random() < 0.1:
+            text = last[agent]
+        else:
+            text = f"response {i} from {agent}"
+        if text is not None:
+            last[agent] = text
+        delay = rng.uniform(0.6, 0.9) if rng.random() < 0.05 else rng.uniform(0.01, 0.15)
+        jobs.append((agent, text, delay))
+    return jobs
+
+
+def run(mode: str, jobs, read_latency: float):
+    backend = FakeClipboardBackend("text the user copied earlier", read_latency=read_latency)
+    service = ClipboardService(backend, copy_timeout=1.0)
+    latencies, wrong, missed, saved, duplicates = [], 0, 0, 0, 0
+    last_saved = {}
+    for agent, text, delay in jobs:
+        def click():
+            if text is not None:
+                backend.copy_later(text, delay)
+            return True
+
+        started = time.perf_counter()
+        if mode == "service":
+            capture = service.capture(agent, click)
+            got = capture.text if capture else None
+        else:
+            click()
+            if mode == "delay":
+                time.sleep(COPY_BUTTON_DELAY)
+            got = backend.read()
+        latency = time.perf_counter() - started
+
+        if got is None:
+            missed += 1  # the caller falls back to UI Automation or OCR
+        else:
+            latencies.append(latency)
+            wrong += got != text  # stale or another agent's text saved under this agent
+            if mode != "service" or service.is_new(agent, got):
+                saved += 1
+                duplicates += last_saved.get(agent) == got
+                last_saved[agent] = got
+        time.sleep(1.0)  # let late copies land before the next click
+    return latencies, wrong, missed, saved, duplicates, backend.reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--captures", type=int, default=30)
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--read-latency", type=float, default=0.012)
+    args = parser.parse_args()
+
+    jobs = workload(args.captures, args.agents)
+    failed = sum(1 for _, text, _ in jobs if text is None)
+    print(f"{len(jobs)} captures over {args.agents} agents ({failed} copies fail)")
+    print(f"{'':<10} {'mean ms':>8} {'max ms':>8} {'wrong':>6} {'missed':>7} {'saved':>6} {'dupes':>6} {'reads':>6}")
+    for mode in ("immediate", "delay", "service"):
+        latencies, wrong, missed, saved, duplicates, reads = run(mode, jobs, args.read_latency)
+        print(f"{mode:<10} {statistics.mean(latencies) * 1000:8.1f} {max(latencies) * 1000:8.1f} "
+              f"{wrong:6d} {missed:7d} {saved:6d} {duplicates:6d} {reads:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compare how long finished agent responses wait before reaching the bridge
+outbox: the old one-agent-at-a-time collection versus CollectionSession,
+on synthetic frames.
+
+sequential  - the old start_collecting loop: poll one agent's region until
+              it has been stable for the dwell, copy it, then move on to
+              the next agent
+session     - CollectionSession watching every region at once
+
+Each agent generates text for a random duration; --idle agents never
+respond, so anything emitted for them is a false completion. Lag runs from
+the end of an agent's output to its outbox write.
+All durations are multiplied by --time-scale and reported back in real
+seconds.
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.collection_session import CollectionSession
+from dreamos.core.agent.control.frame_grabber import FrameGrabber, SyntheticFrameSource
+from dreamos.core.agent.control.metrics import LatencyHistogram
+from dreamos.core.agent.control.region_stability import RegionStabilityTracker
+
+
+class ScriptedScreen(SyntheticFrameSource):
+    """Regions that generate text between scripted start and stop times."""
+
+    def __init__(self, width, height, schedule):
+        super().__init__(width=width, height=height)
+        self.schedule = schedule
+        self.started = time.monotonic()
+
+    def grab(self):
+        elapsed = time.monotonic() - self.started
+        self.active_regions = [r for r, (start, stop) in self.schedule.items() if start <= elapsed < stop]
+        return super().grab()
+
+
+def sequential(grabber, regions, copy_time, dwell, timeout, emitted):
+    for name, region in regions.items():
+        tracker = RegionStabilityTracker(dwell=dwell)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if tracker.update(grabber.grab().view(region)).stable:
+                time.sleep(copy_time)
+                emitted[name] = time.monotonic()
+                break
+            time.sleep(0.05 * dwell)
+
+
+def concurrent(grabber, regions, copy_time, dwell, timeout, emitted):
+    def read_response(name):
+        time.sleep(copy_time)
+        return name
+
+    config = {"stability_dwell": dwell, "collection_hz": 10 / dwell, "frame_timeout": dwell}
+    with tempfile.TemporaryDirectory() as outbox:
+        session = CollectionSession(
+            read_response, grabber=grabber, outbox_dir=outbox, config=config,
+            on_complete=lambda agent: emitted.__setitem__(agent.name, time.monotonic())
+        )
+        for name, region in regions.items():
+            session.watch(name, region)
+        session.collect(timeout)
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--idle", type=int, default=1, help="agents that never respond")
+    parser.add_argument("--min-duration", type=float, default=20)
+    parser.add_argument("--max-duration", type=float, default=90)
+    parser.add_argument("--copy-time", type=float, default=1.0, help="copy button click + clipboard read")
+    parser.add_argument("--dwell", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--time-scale", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scale = args.time_scale
+    rng = random.Random(args.seed)
+    regions = {f"agent_{i}": (10 + 170 * (i % 8), 10 + 130 * (i // 8), 160, 120) for i in range(args.agents)}
+    responding = list(regions)[:args.agents - args.idle]
+    rng.shuffle(responding)
+    finish = {name: rng.uniform(args.min_duration, args.max_duration) * scale for name in responding}
+    width = 10 + 170 * min(8, args.agents)
+    height = 10 + 130 * (1 + (args.agents - 1) // 8)
+
+    print(f"{args.agents} agents ({args.idle} idle), responses take "
+          f"{args.min_duration:g}-{args.max_duration:g} s")
+    for label, collect in (("sequential", sequential), ("session", concurrent)):
+        schedule = {regions[name]: (0.0, stop) for name, stop in finish.items()}
+        grabber = FrameGrabber(ScriptedScreen(width, height, schedule), max_hz=200)
+        emitted = {}
+        started = time.monotonic()
+        collect(grabber, regions, args.copy_time * scale, args.dwell * scale, args.timeout * scale, emitted)
+        elapsed = (time.monotonic() - started) / scale
+        grabber.stop()
+
+        lag = LatencyHistogram((2, 5, 10, 30, 60, 120, 300))
+        for name, at in emitted.items():
+            if name in finish:
+                lag.observe((at - started - finish[name]) / scale)
+        snapshot = lag.snapshot()
+        mean = snapshot["sum"] / max(1, snapshot["count"])
+        false = len(set(emitted) - set(finish))
+        print(f"{label:<11} {snapshot['count']:2d}/{len(finish)} emitted  {false} false  lag mean {mean:6.1f} s  "
+              f"max {snapshot['max']:6.1f} s  run {elapsed:6.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-message dedupe cost (check + track) as history grows, for the
+DedupeStore and for the previous set-plus-JSON-rewrite approach.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.autonomy.memory.dedupe_store import DedupeStore
+
+
+def _hash(i: int) -> str:
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+def bench_store(directory: Path, total: int, checkpoints: int) -> None:
+    """Fill the store to ``total`` hashes, reporting amortized cost per chunk.
+
+    Each chunk checks and tracks new hashes and re-checks a sample of old
+    ones, so snapshot, Bloom and disk-probe costs are all included.
+    """
+    store = DedupeStore(str(directory))
+    step = total // checkpoints
+    print(f"{'processed':>12} {'us/message':>11} {'dup us/check':>13} {'segments':>9} {'bloom KB':>9}")
+    for checkpoint in range(checkpoints):
+        first = checkpoint * step
+        start = time.perf_counter()
+        for i in range(first, first + step):
+            message_hash = _hash(i)
+            if not store.contains(message_hash):
+                store.add(message_hash)
+        elapsed = time.perf_counter() - start
+
+        # Duplicates of old messages go through the filter hit + disk path
+        sample = range(0, first + step, max(1, (first + step) // 1000))
+        start = time.perf_counter()
+        assert all(store.contains(_hash(i)) for i in sample)
+        dup_elapsed = time.perf_counter() - start
+
+        stats = store.get_stats()
+        print(f"{first + step:>12,} {elapsed / step * 1e6:>11.1f} {dup_elapsed / len(sample) * 1e6:>13.1f} "
+              f"{stats['segments']:>9} {stats['bloom_bytes'] / 1024:>9.0f}")
+    store.close()
+
+
+def bench_legacy(path: Path, total: int, checkpoints: int, probe: int) -> None:
+    """The previous approach: a set rewritten to JSON on every new hash."""
+    hashes = set()
+    step = total // checkpoints
+    print(f"{'processed':>12} {'us/message':>11}   (set + JSON rewrite)")
+    for checkpoint in range(1, checkpoints + 1):
+        hashes.update(_hash(i) for i in range(len(hashes), checkpoint * step - probe))
+        start = time.perf_counter()
+        for i in range(len(hashes), len(hashes) + probe):
+            message_hash = _hash(i)
+            if message_hash not in hashes:
+                hashes.add(message_hash)
+                with open(path, "w") as f:
+                    json.dump({"hashes": list(hashes)}, f, indent=2)
+        elapsed = time.perf_counter() - start
+        print(f"{len(hashes):>12,} {elapsed / probe * 1e6:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--total", type=int, default=1_000_000,
+                        help="hashes to process (use 10000000 for the 10M target)")
+    parser.add_argument("--checkpoints", type=int, default=5)
+    parser.add_argument("--probe", type=int, default=50)
+    parser.add_argument("--legacy-total", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_store(Path(tmp) / "store", args.total, args.checkpoints)
+        print()
+        bench_legacy(Path(tmp) / "legacy.json", args.legacy_total, args.checkpoints, args.probe)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark change detection over a large tree: the previous glob-and-stat
+poll versus the scandir snapshot scan (incremental and full), snapshot
+restart, and event-to-batch latency with the watchdog backend.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.autonomy.utils.async_file_watcher import AsyncFileWatcher, DirectorySnapshot
+
+
+def _build_tree(root: Path, files: int, per_dir: int) -> None:
+    for i in range(files):
+        directory = root / f"d{i // per_dir:05d}"
+        if i % per_dir == 0:
+            directory.mkdir(parents=True)
+        (directory / f"f{i}.json").write_text("{}")
+
+
+def _legacy_poll(root: Path, cache: dict) -> list:
+    """The previous check: glob the whole tree and stat every file."""
+    changed = []
+    for path in root.glob("**/*"):
+        if path.is_file():
+            mtime = path.stat().st_mtime
+            if str(path) not in cache or cache[str(path)] != mtime:
+                changed.append(str(path))
+                cache[str(path)] = mtime
+    return changed
+
+
+def _timed(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def _event_latency(root: Path, samples: int) -> float:
+    watcher = AsyncFileWatcher(str(root), backend="watchdog", debounce=0.01)
+    batches = watcher.changes()
+    await watcher.start()
+    if watcher.active_backend != "watchdog":
+        await watcher.stop()
+        return float("nan")
+    await watcher.check_for_changes()  # drop the startup batch
+    latencies = []
+    for i in range(samples):
+        start = time.perf_counter()
+        (root / "d00000" / f"event{i}.json").write_text("{}")
+        await batches.__anext__()
+        latencies.append(time.perf_counter() - start)
+    await watcher.stop()
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        start = time.perf_counter()
+        _build_tree(root, args.files, args.per_dir)
+        print(f"tree: {args.files:,} files in {args.files // args.per_dir:,} dirs "
+              f"(built in {time.perf_counter() - start:.1f}s)")
+
+        cache = {}
+        _legacy_poll(root, cache)
+        legacy = _timed(lambda: _legacy_poll(root, cache), args.repeat)
+
+        snapshot = DirectorySnapshot(root)
+        initial = _timed(lambda: DirectorySnapshot(root).scan(), 1)
+        snapshot.scan()
+        incremental = _timed(lambda: snapshot.scan(), args.repeat)
+        full = _timed(lambda: snapshot.scan(full=True), args.repeat)
+
+        snapshot_path = Path(tmp) / "snapshot.json"
+        save = _timed(lambda: snapshot.save(snapshot_path), 1)
+        restart = _timed(lambda: (DirectorySnapshot(root).load(snapshot_path), ), 1)
+
+        latency = asyncio.run(_event_latency(root, 5))
+
+    print(f"legacy glob+stat poll (quiet tree): {legacy * 1000:9.1f} ms")
+    print(f"scandir initial scan:               {initial * 1000:9.1f} ms")
+    print(f"scandir incremental (quiet tree):   {incremental * 1000:9.1f} ms")
+    print(f"scandir full verify:                {full * 1000:9.1f} ms")
+    print(f"snapshot save / restart load:       {save * 1000:9.1f} / {restart * 1000:.1f} ms")
+    print(f"watchdog event -> batch latency:    {latency * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Simulate fix dispatch with fake agents and report failures fixed per hour,
+comparing the FixDispatchScheduler against the previous sequential routing.
+
+Time is compressed: one simulated minute lasts ``--ms-per-minute`` real
+milliseconds. Each failing file has a per-attempt fix probability; some are
+unfixable. Agents work through their assigned batches one at a time.
+
+The sequential baseline uses the same scheduler configured like the old
+code: one file per agent, every verification runs the full suite, one
+verification at a time, and failed files are retried immediately. This is
+generous to the old code, which never released an agent after a failed fix.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agents.fix_scheduler import FixDispatchScheduler
+
+
+class FakeAgent:
+    """Works through assigned batches, answering after a random delay."""
+
+    def __init__(self, agent_id: str, minute: float, rng: random.Random, fix_chance: dict):
+        self.agent_id = agent_id
+        self.minute = minute
+        self.rng = rng
+        self.fix_chance = fix_chance
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.scheduler = None
+        self.task = None
+
+    async def send(self, batch):
+        await self.queue.put(batch.test_file)
+
+    async def work(self):
+        while True:
+            test_file = await self.queue.get()
+            await asyncio.sleep(self.rng.uniform(3, 8) * self.minute)
+            response = "fix" if self.rng.random() < self.fix_chance[test_file] else "wrong"
+            asyncio.ensure_future(self.scheduler.handle_response(self.agent_id, test_file, response))
+
+
+async def simulate(config: dict, verify_minutes: float, args) -> float:
+    rng = random.Random(args.seed)
+    minute = args.ms_per_minute / 1000
+    files = [f"tests/test_module_{i}.py" for i in range(args.files)]
+    fix_chance = {f: 0.0 if rng.random() < args.unfixable else rng.uniform(0.3, 0.9) for f in files}
+
+    agents = {f"agent{i + 1}": FakeAgent(f"agent{i + 1}", minute, rng, fix_chance) for i in range(args.agents)}
+
+    async def send(agent_id, batch):
+        await agents[agent_id].send(batch)
+
+    async def verify(agent_id, test_file, response):
+        await asyncio.sleep(verify_minutes * minute)
+        return response == "fix"
+
+    scheduler = FixDispatchScheduler(
+        {"agents": list(agents), **config,
+         "backoff_base": config.get("backoff_base", 0) * minute,
+         "backoff_max": 120 * minute},
+        send=send, verify=verify
+    )
+    for agent in agents.values():
+        agent.scheduler = scheduler
+        agent.task = asyncio.create_task(agent.work())
+
+    for test_file in files:
+        for n in range(rng.randint(1, 4)):
+            scheduler.add_failure(test_file, f"{test_file}::test_{n}")
+    await scheduler.dispatch()
+    await asyncio.sleep(args.hours * 60 * minute)
+
+    for agent in agents.values():
+        agent.task.cancel()
+    return scheduler.stats["fixed"] / args.hours
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--unfixable", type=float, default=0.15)
+    parser.add_argument("--hours", type=float, default=4)
+    parser.add_argument("--suite-minutes", type=float, default=3.0, help="full-suite run time")
+    parser.add_argument("--file-minutes", type=float, default=0.3, help="single-file run time")
+    parser.add_argument("--ms-per-minute", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    sequential = asyncio.run(simulate(
+        {"max_in_flight": 1, "max_parallel_verifications": 1, "backoff_base": 0},
+        args.suite_minutes, args
+    ))
+    scheduled = asyncio.run(simulate(
+        {"max_in_flight": 2, "max_parallel_verifications": 4, "backoff_base": 10},
+        args.file_minutes, args
+    ))
+
+    print(f"{args.files} failing files, {args.agents} agents, {args.unfixable:.0%} unfixable, {args.hours:g}h simulated")
+    print(f"sequential routing:  {sequential:6.1f} failures fixed/hour")
+    print(f"dispatch scheduler:  {scheduled:6.1f} failures fixed/hour")
+    print(f"speedup: {scheduled / sequential:.1f}x" if sequential else "")
+
+
+if __name__ == "__main__":
+    main()
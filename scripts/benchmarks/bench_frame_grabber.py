@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark region polling with per-consumer captures versus the shared
+FrameGrabber, headlessly, using the synthetic frame source.
+
+Per-consumer capture mirrors ``pyautogui.screenshot(region=...)``: grab the
+screen, crop the region and build a PIL image, once per consumer. The
+shared grabber captures once per tick and hands out views.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.frame_grabber import FrameGrabber, SyntheticFrameSource
+
+
+def _regions(count: int, width: int, height: int) -> list:
+    cols = 4
+    rows = (count + cols - 1) // cols
+    w, h = width // cols, height // rows
+    return [((i % cols) * w, (i // cols) * h, w, h) for i in range(count)]
+
+
+def bench_per_consumer(source, regions, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for left, top, width, height in regions:
+            pixels, _, _ = source.grab()
+            crop = pixels[top:top + height, left:left + width, 2::-1]
+            Image.fromarray(np.ascontiguousarray(crop), "RGB")
+    return (time.perf_counter() - start) / ticks
+
+
+def bench_shared(grabber, regions, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        frame = grabber.grab()
+        for region in regions:
+            frame.view(region)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--regions", type=int, default=8)
+    parser.add_argument("--hz", type=float, default=10)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    regions = _regions(args.regions, args.width, args.height)
+    per_consumer = bench_per_consumer(
+        SyntheticFrameSource(args.width, args.height, active_regions=regions), regions, args.ticks
+    )
+    shared = bench_shared(
+        FrameGrabber(SyntheticFrameSource(args.width, args.height, active_regions=regions)), regions, args.ticks
+    )
+
+    budget = 1000 / args.hz
+    print(f"{args.regions} regions at {args.hz:g} Hz on {args.width}x{args.height} ({budget:.0f} ms per tick)")
+    print(f"per-consumer capture: {per_consumer * 1000:7.2f} ms/tick, {args.regions * args.hz:5.0f} captures/s")
+    print(f"shared frame grabber: {shared * 1000:7.2f} ms/tick, {args.hz:5.0f} captures/s")
+    print(f"speedup: {per_consumer / shared:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Compare failure detection latency of the old sequential heartbeat loop with
+HeartbeatSupervisor on simulated agents.
+
+sequential  - the old AgentRestarter loop: probe agents one by one, restart
+              failed agents inline, then sleep 10 s
+supervisor  - concurrent probes with adaptive intervals and 4 restart workers
+
+Agents fail at random times. Detection latency runs from the failure to
+the probe that condemns the agent; restart latency runs to the start of
+its restart. All durations are multiplied by --time-scale and reported
+back in real seconds.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.metrics import LatencyHistogram
+from dreamos.core.agent.control.recovery.heartbeat_supervisor import HeartbeatSupervisor
+
+
+class Agents:
+    def __init__(self, count: int, probe_time: float, restart_time: float, failure_threshold: int):
+        self.ids = [f"agent-{i}" for i in range(count)]
+        self.probe_time = probe_time
+        self.restart_time = restart_time
+        self.failure_threshold = failure_threshold
+        self.failed_at = {}
+        self.failed_probes = {}
+        self.detection = []
+        self.latency = []
+
+    async def list_agents(self):
+        return self.ids
+
+    async def probe(self, agent_id):
+        await asyncio.sleep(self.probe_time)
+        if agent_id not in self.failed_at:
+            return True
+        self.failed_probes[agent_id] = self.failed_probes.get(agent_id, 0) + 1
+        if self.failed_probes[agent_id] == self.failure_threshold:
+            self.detection.append(time.monotonic() - self.failed_at[agent_id])
+        return False
+
+    async def restart(self, agent_id):
+        self.latency.append(time.monotonic() - self.failed_at[agent_id])
+        await asyncio.sleep(self.restart_time)
+        del self.failed_at[agent_id]
+        self.failed_probes.pop(agent_id, None)
+        return True
+
+    async def inject_failures(self, count: int, duration: float, seed: int = 0):
+        rng = random.Random(seed)
+        for at in sorted(rng.uniform(0, duration) for _ in range(count)):
+            await asyncio.sleep(max(0.0, at - (time.monotonic() - self.started)))
+            healthy = [a for a in self.ids if a not in self.failed_at]
+            self.failed_at[rng.choice(healthy)] = time.monotonic()
+
+
+async def sequential(agents, interval: float):
+    while True:
+        for agent_id in await agents.list_agents():
+            if not await agents.probe(agent_id):
+                await agents.restart(agent_id)
+        await asyncio.sleep(interval)
+
+
+async def measure(name, agents, runner, failures, duration, scale):
+    agents.started = time.monotonic()
+    task = asyncio.create_task(runner())
+    await agents.inject_failures(failures, duration)
+    await asyncio.sleep(duration * 0.5)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    for label, values in (("detection", agents.detection), ("restart", agents.latency)):
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.observe(value / scale)
+        snapshot = histogram.snapshot()
+        mean = snapshot["sum"] / max(1, snapshot["count"])
+        print(f"{name:<11} {label:<9} {snapshot['count']:3d}/{failures}  mean {mean:6.1f} s  "
+              f"p95 <= {snapshot['p95']:g} s  max {snapshot['max']:6.1f} s")
+
+
+async def main_async(args):
+    scale = args.time_scale
+    duration = args.duration * scale
+
+    def make_agents(failure_threshold):
+        return Agents(args.agents, args.probe_time * scale, args.restart_time * scale, failure_threshold)
+
+    legacy = make_agents(1)
+    await measure("sequential", legacy, lambda: sequential(legacy, 10 * scale), args.failures, duration, scale)
+
+    agents = make_agents(2)
+    config = {
+        "restart_workers": 4,
+        "heartbeat_interval": 10 * scale,
+        "heartbeat_min_interval": 2 * scale,
+        "heartbeat_max_interval": 30 * scale,
+        "probe_timeout": 5 * scale,
+    }
+    supervisor = HeartbeatSupervisor(agents.list_agents, agents.probe, agents.restart, config)
+
+    async def run_supervisor():
+        await supervisor.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await supervisor.stop()
+
+    await measure("supervisor", agents, run_supervisor, args.failures, duration, scale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=40)
+    parser.add_argument("--failures", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=300, help="seconds over which failures happen")
+    parser.add_argument("--probe-time", type=float, default=0.2)
+    parser.add_argument("--restart-time", type=float, default=65, help="includes the 60 s retry cooldown")
+    parser.add_argument("--time-scale", type=float, default=0.01)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measure messages per minute when broadcasting to several agents, on the
+fake input backend.
+
+legacy     - the old send_message: click, fixed sleeps around clear/type/
+             enter (timing.py), keystroke typing at --typing-interval
+             seconds per character, one agent after another
+scheduler  - InputScheduler: verified focus, clipboard paste, pipelined
+             across agents with the default send settle time per agent
+
+All delays are multiplied by --time-scale to keep the run short; reported
+rates are converted back to real time.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.input_scheduler import FakeInputBackend, InputScheduler, InputTarget
+from dreamos.core.agent.control.timing import (
+    FOCUS_ESTABLISH_DELAY,
+    MESSAGE_SEND_DELAY,
+    TEXT_CLEAR_DELAY,
+    TYPING_COMPLETE_DELAY,
+)
+
+
+def legacy(backend, jobs, scale: float, typing_interval: float) -> None:
+    for target, text in jobs:
+        backend.click(target.x, target.y)
+        time.sleep(FOCUS_ESTABLISH_DELAY * scale)
+        backend.hotkey("ctrl", "a")
+        backend.press("backspace")
+        time.sleep(TEXT_CLEAR_DELAY * scale)
+        backend.write(text, typing_interval * scale)
+        time.sleep(TYPING_COMPLETE_DELAY * scale)
+        backend.press("enter")
+        time.sleep(MESSAGE_SEND_DELAY * scale)
+
+
+def scheduled(backend, jobs, scale: float) -> None:
+    scheduler = InputScheduler(backend, send_settle=MESSAGE_SEND_DELAY * scale)
+    futures = [scheduler.submit(target, text) for target, text in jobs]
+    assert all(future.result() for future in futures)
+    scheduler.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=2, help="messages per agent")
+    parser.add_argument("--length", type=int, default=300, help="characters per message")
+    parser.add_argument("--typing-interval", type=float, default=0.02, help="legacy seconds per keystroke")
+    parser.add_argument("--time-scale", type=float, default=0.1)
+    args = parser.parse_args()
+
+    targets = [InputTarget(f"agent-{i}", 100 * i, 500) for i in range(1, args.agents + 1)]
+    text = ("x" * (args.length - 1)) + "."
+    jobs = [(target, text) for _ in range(args.messages) for target in targets]
+    scale = args.time_scale
+
+    print(f"{len(jobs)} messages of {args.length} chars to {args.agents} agents")
+    for name, run in (("legacy", lambda b: legacy(b, jobs, scale, args.typing_interval)),
+                      ("scheduler", lambda b: scheduled(b, jobs, scale))):
+        backend = FakeInputBackend(targets, action_delay=0.005 * scale, focus_latency=0.05 * scale, processing=0.0)
+        started = time.perf_counter()
+        run(backend)
+        elapsed = (time.perf_counter() - started) / scale
+        assert len(backend.sent) == len(jobs)
+        print(f"{name:<10} {elapsed:7.1f} s  {len(jobs) / elapsed * 60:6.1f} messages/min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Compare per-call coordinate handling with LayoutEngine on synthetic agent
+layouts spread over several monitors.
+
+legacy  - pairwise regions_overlap over every region pair; each lookup
+          re-transforms the agent's coordinate dict; point-in-region scans
+          every region
+engine  - one batch transform, sweep-line validation, cached lookups and a
+          grid index for point-in-region
+
+The legacy transform gets the resolution for free (the real code queries
+pyautogui or screeninfo on every call), so its numbers are a lower bound.
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.shared.coordinate_utils import regions_overlap
+from dreamos.core.shared.layout_engine import LayoutEngine, Monitor
+
+REGION_KEYS = ("response_region", "input_region", "toolbar_region")
+
+
+def synthetic_layouts(count: int, monitors, seed: int = 0):
+    """Agents tiled four to a row over the monitors, with a few misplaced ones."""
+    rng = random.Random(seed)
+    rows = -(-count // (4 * len(monitors)))
+    layouts = {}
+    for i in range(count):
+        monitor = monitors[i % len(monitors)]
+        slot = i // len(monitors)
+        width, height = monitor.width // 4, monitor.height // rows
+        x = monitor.x + (slot % 4) * width
+        y = monitor.y + (slot // 4) * height
+        if rng.random() < 0.05:
+            x += width // 2  # overlaps a neighbour
+        layout = {
+            "initial_spot": {"x": x + 20, "y": y + 20},
+            "input_box": {"x": x + 40, "y": y + height - 40},
+            "copy_button": {"x": x + width - 40, "y": y + 60},
+        }
+        for n, key in enumerate(REGION_KEYS):
+            top = y + n * height // 3
+            layout[key] = {
+                "top_left": {"x": x + 4, "y": top + 4},
+                "bottom_right": {"x": x + width - 4, "y": top + height // 3 - 4},
+            }
+        layouts[f"Agent-{i + 1}"] = layout
+    return layouts
+
+
+def legacy_transform(coords, scale, offset):
+    transformed = {}
+    for key, value in coords.items():
+        if "top_left" in value:
+            transformed[key] = {
+                corner: {"x": int(value[corner]["x"] * scale[0]) + offset[0],
+                         "y": int(value[corner]["y"] * scale[1]) + offset[1]}
+                for corner in ("top_left", "bottom_right")
+            }
+        else:
+            transformed[key] = {"x": int(value["x"] * scale[0]) + offset[0],
+                                "y": int(value["y"] * scale[1]) + offset[1]}
+    return transformed
+
+
+def timed(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=64)
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    monitors = (Monitor(0, 0, 2560, 1440), Monitor(-1920, 0, 1920, 1080),
+                Monitor(2560, 0, 1920, 1080), Monitor(0, -1440, 2560, 1440))
+    layouts = synthetic_layouts(args.agents, monitors)
+    scale, offset = (1.0, 1.0), (0, 0)
+    rng = random.Random(1)
+    agent_ids = list(layouts)
+    queries = [(rng.choice(agent_ids), rng.randrange(-1920, 4480), rng.randrange(-1440, 1440))
+               for _ in range(args.lookups)]
+    region_count = args.agents * len(REGION_KEYS)
+    print(f"{args.agents} agent layouts, {region_count} regions, {len(monitors)} monitors")
+
+    # Validation
+    def legacy_validate():
+        regions = [(agent, layout[key]) for agent, layout in layouts.items() for key in REGION_KEYS]
+        return sum(1 for (a, ra), (b, rb) in itertools.combinations(regions, 2)
+                   if a != b and regions_overlap(ra, rb))
+
+    engine = LayoutEngine(monitors=lambda: monitors, check_interval=3600)
+    engine.load(layouts)
+
+    def engine_validate():
+        engine.invalidate()
+        return sum(1 for issue in engine.validate() if issue.kind == "overlap")
+
+    legacy_ms, legacy_overlaps = timed(legacy_validate, args.repeat)
+    engine_ms, engine_overlaps = timed(engine_validate, args.repeat)
+    assert legacy_overlaps == engine_overlaps
+    print(f"validate (load + check)   legacy {legacy_ms:8.2f} ms   engine {engine_ms:8.2f} ms   "
+          f"({engine_overlaps} overlaps)")
+
+    # Per-call coordinate lookups
+    started = time.perf_counter()
+    for agent_id, _, _ in queries:
+        legacy_transform(layouts[agent_id], scale, offset)["input_box"]
+    legacy_us = (time.perf_counter() - started) / len(queries) * 1e6
+    engine.get(agent_ids[0])
+    started = time.perf_counter()
+    for agent_id, _, _ in queries:
+        engine.get(agent_id)["input_box"]
+    engine_us = (time.perf_counter() - started) / len(queries) * 1e6
+    print(f"agent lookup              legacy {legacy_us:8.2f} us   engine {engine_us:8.2f} us")
+
+    # Point-in-region
+    flat = [(agent, key, layout[key]) for agent, layout in layouts.items() for key in REGION_KEYS]
+    started = time.perf_counter()
+    legacy_hits = 0
+    for _, x, y in queries:
+        legacy_hits += sum(1 for _, _, r in flat
+                           if r["top_left"]["x"] <= x <= r["bottom_right"]["x"]
+                           and r["top_left"]["y"] <= y <= r["bottom_right"]["y"])
+    legacy_us = (time.perf_counter() - started) / len(queries) * 1e6
+    started = time.perf_counter()
+    engine_hits = sum(len(engine.regions_at(x, y)) for _, x, y in queries)
+    engine_us = (time.perf_counter() - started) / len(queries) * 1e6
+    assert legacy_hits == engine_hits
+    print(f"point-in-region           legacy {legacy_us:8.2f} us   engine {engine_us:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark OCR time per update on a recorded scrolling response.
+
+By default a recording is synthesized: an agent response grows one line
+per frame inside an 800x400 region and scrolls once the region is full.
+``--frames`` replays an .npz recording (``frames`` array of region pixels).
+
+For every frame the whole-region read (the old ``image_to_string`` per
+update) is compared against ``OCRService``, which only recognises lines it
+has not seen. Recognition needs tesseract; without it only the
+segmentation/caching overhead and the number of lines sent to OCR are
+reported.
+"""
+
+import argparse
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.ocr_service import OCRService, default_ocr_backend, to_gray
+
+WORDS = ("the agent updated tests for response loop module and fixed import "
+         "errors in bridge handler while keeping coverage stable").split()
+
+
+def synthesize(frames: int, width: int = 800, height: int = 400, line_height: int = 20):
+    rng = np.random.default_rng(0)
+    document = np.full((line_height * (frames + 2), width, 3), 30, dtype=np.uint8)
+    recording = []
+    for i in range(frames):
+        text = " ".join(rng.choice(WORDS, size=int(rng.integers(5, 11))))
+        cv2.putText(document, text, (10, (i + 1) * line_height - 5), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.5, (220, 220, 220), 1, cv2.LINE_AA)
+        bottom = max(height, (i + 1) * line_height + 4)
+        recording.append(document[bottom - height:bottom].copy())
+    return recording
+
+
+class _CountingBackend:
+    """Wraps a backend, or stands in for a missing one, counting recognised lines."""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.calls = 0
+
+    def recognize(self, image):
+        self.calls += 1
+        return self.backend.recognize(image) if self.backend else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", help="replay an .npz recording")
+    parser.add_argument("--count", type=int, default=60, help="frames to synthesize")
+    args = parser.parse_args()
+
+    recording = list(np.load(args.frames)["frames"]) if args.frames else synthesize(args.count)
+
+    backend = None
+    if shutil.which("tesseract"):
+        backend = default_ocr_backend()
+    else:
+        print("tesseract not found: reporting lines sent to OCR and pipeline overhead only")
+    counting = _CountingBackend(backend)
+    service = OCRService(backend=counting)
+
+    full_seconds = 0.0
+    if backend is not None:
+        import pytesseract
+        for pixels in recording:
+            started = time.perf_counter()
+            pytesseract.image_to_string(to_gray(pixels))
+            full_seconds += time.perf_counter() - started
+
+    total_lines = 0
+    started = time.perf_counter()
+    for pixels in recording:
+        total_lines += len(service.read_lines(pixels))
+    incremental_seconds = time.perf_counter() - started
+
+    updates = len(recording)
+    print(f"{updates} updates of {recording[0].shape[1]}x{recording[0].shape[0]}, "
+          f"{total_lines / updates:.1f} visible lines per update")
+    print(f"lines recognised per update: whole-region {total_lines / updates:.1f}, "
+          f"incremental {counting.calls / updates:.2f} (cache hits {service.stats['hits']})")
+    if backend is not None:
+        print(f"OCR ms per update: whole-region {full_seconds / updates * 1000:.1f}, "
+              f"incremental {incremental_seconds / updates * 1000:.1f}")
+    else:
+        print(f"incremental pipeline overhead: {incremental_seconds / updates * 1000:.2f} ms per update")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark patch validation latency: a full project scan filtered to the
+patched file versus an incremental check against the resident
+DuplicateIndex.
+
+CodexPatchTracker's full path calls Scanner.scan_project() from
+agent_tools.swarm_tools.scanner, which is not in this tree. The full scan
+timed here is tools/swarm/scanner.Scanner.scan(), the same all-pairs
+duplicate search.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.autonomy.duplicate_index import DuplicateIndex
+from tools.swarm.scanner import Scanner
+
+
+def _pick_files(root: Path, count: int) -> list:
+    files = sorted(p for p in root.rglob("*.py") if p.stat().st_size > 2000 and ".venv" not in p.parts)
+    step = max(1, len(files) // count)
+    return files[::step][:count]
+
+
+async def _full_scan(root: Path, file_path: Path, output_dir: str) -> float:
+    start = time.perf_counter()
+    results = await Scanner(str(root), output_dir=output_dir).scan()
+    [item for category in results.duplicates.values() for item in category
+     if str(file_path) in (item.get("file1"), item.get("file2"))]
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--root", default=str(project_root),
+                        help="tree to validate against (the full scan is quadratic in definitions)")
+    parser.add_argument("--patches", type=int, default=5)
+    parser.add_argument("--full-scans", type=int, default=1)
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    patched = _pick_files(root, args.patches)
+
+    index = DuplicateIndex(str(root))
+    start = time.perf_counter()
+    index.build()
+    build_time = time.perf_counter() - start
+
+    incremental = []
+    for file_path in patched:
+        start = time.perf_counter()
+        index.check_file(str(file_path))
+        incremental.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full = [asyncio.run(_full_scan(root, patched[i % len(patched)], tmp)) for i in range(args.full_scans)]
+
+    print(f"root: {root} ({index.summary()['total_files']} files, {index.summary()['total_definitions']} definitions)")
+    print(f"full scan per patch:        {statistics.mean(full) * 1000:10.1f} ms")
+    print(f"incremental check per patch:{statistics.mean(incremental) * 1000:10.1f} ms")
+    print(f"index build (once per tracker): {build_time * 1000:.1f} ms")
+    print(f"speedup: {statistics.mean(full) / statistics.mean(incremental):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
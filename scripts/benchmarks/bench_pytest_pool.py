@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-test verification latency of a cold ``pytest`` subprocess
+versus a warm PytestWorkerPool.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.autonomy.base.pytest_pool import PytestWorkerPool
+
+TEST_TEMPLATE = '''
+import json
+import asyncio
+
+from pkg.module_{i} import value
+
+
+def test_value_{i}():
+    assert value() == {i}
+'''
+
+
+def _build_project(root: Path, count: int) -> list:
+    """Create a small project with one test per module."""
+    (root / "pkg").mkdir()
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "tests").mkdir()
+    node_ids = []
+    for i in range(count):
+        (root / "pkg" / f"module_{i}.py").write_text(f"def value():\n    return {i}\n")
+        (root / "tests" / f"test_module_{i}.py").write_text(TEST_TEMPLATE.format(i=i))
+        node_ids.append(f"tests/test_module_{i}.py::test_value_{i}")
+    return node_ids
+
+
+async def _time_subprocess(root: Path, node_ids: list) -> list:
+    timings = []
+    for node_id in node_ids:
+        start = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", node_id,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=str(root)
+        )
+        if await process.wait() != 0:
+            raise RuntimeError(f"{node_id} failed under subprocess")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def _time_pool(root: Path, node_ids: list, size: int) -> list:
+    pool = PytestWorkerPool(str(root), {"size": size, "warm_paths": ["tests"]})
+    await pool.start()
+    timings = []
+    try:
+        for node_id in node_ids:
+            start = time.perf_counter()
+            result = await pool.run([node_id])
+            if result["exit_code"] != 0:
+                raise RuntimeError(f"{node_id} failed in pool: {result['outcomes']}")
+            timings.append(time.perf_counter() - start)
+    finally:
+        await pool.close()
+    return timings
+
+
+def _report(label: str, timings: list) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:<22} mean {statistics.mean(timings) * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        node_ids = _build_project(root, args.tests)
+        cold = asyncio.run(_time_subprocess(root, node_ids))
+        warm = asyncio.run(_time_pool(root, node_ids, args.workers))
+
+    _report("subprocess pytest:", cold)
+    _report("PytestWorkerPool.run:", warm)
+    print(f"speedup: {statistics.mean(cold) / statistics.mean(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Compare region stability detectors on a recorded frame sequence.
+
+Detectors:
+  md5        - the old visual watchdog: any pixel change resets the dwell
+  full-diff  - the old AgentRegion check: mean absolute difference of the
+               whole region against the last changed frame (threshold 0.95)
+  tile-hash  - RegionStabilityTracker (per-tile dHash + mean brightness)
+
+By default a sequence is synthesized: an agent "types" a response word by
+word, then sits idle while the caret blinks. ``--record`` captures a real
+region with the frame grabber to an .npz file and ``--frames`` replays one.
+For each detector the script prints the per-frame cost, whether it ever
+called the region stable while text was still arriving, and when it first
+called it stable after typing ended.
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.region_stability import RegionStabilityTracker
+
+
+def synthesize(width: int, height: int, fps: float, typing_s: float, idle_s: float, blink_s: float = 0.5):
+    """Frames of text appearing word by word, then a blinking caret."""
+    rng = np.random.default_rng(0)
+    canvas = np.full((height, width, 4), 30, dtype=np.uint8)
+    canvas[..., 3] = 255
+    frames = []
+    x, y = 10, 10
+    typing_frames = int(typing_s * fps)
+    for i in range(typing_frames + int(idle_s * fps)):
+        if i < typing_frames:
+            word = int(rng.integers(3, 9)) * 6
+            if x + word > width - 10:
+                x, y = 10, y + 14
+            canvas[y:y + 10, x:x + word, :3] = (rng.integers(0, 2, size=(10, word)) * 220)[..., None]
+            x += word + 6
+        frame = canvas.copy()
+        if i >= typing_frames and int(i / fps / blink_s) % 2 == 0:
+            frame[y:y + 10, x:x + 2, :3] = 220  # caret
+        frames.append(frame)
+    return frames, typing_frames
+
+
+def record(path: str, region, fps: float, seconds: float) -> None:
+    from dreamos.core.agent.control.frame_grabber import get_frame_grabber
+    grabber = get_frame_grabber()
+    frames = []
+    for _ in range(int(seconds * fps)):
+        frames.append(np.array(grabber.region(region, max_age=0)))
+        time.sleep(1 / fps)
+    np.savez_compressed(path, frames=np.stack(frames), fps=fps)
+    print(f"recorded {len(frames)} frames to {path}")
+
+
+class MD5Detector:
+    def __init__(self, dwell):
+        self.dwell, self.last, self.changed_at = dwell, None, 0.0
+
+    def update(self, pixels, now):
+        digest = hashlib.md5(np.ascontiguousarray(pixels).tobytes()).hexdigest()
+        if digest != self.last:
+            self.last, self.changed_at = digest, now
+        return now - self.changed_at >= self.dwell
+
+
+class FullDiffDetector:
+    def __init__(self, dwell, threshold=0.95):
+        self.dwell, self.threshold, self.last, self.changed_at = dwell, threshold, None, 0.0
+
+    def update(self, pixels, now):
+        if self.last is None:
+            self.last, self.changed_at = pixels, now
+            return False
+        diff_sum = np.abs(pixels[..., :3].astype(np.int16) - self.last[..., :3]).sum()
+        similarity = 1.0 - diff_sum / (255.0 * pixels.shape[0] * pixels.shape[1])
+        if similarity < self.threshold:
+            self.last, self.changed_at = pixels, now
+        return now - self.changed_at >= self.dwell
+
+
+class TileHashDetector:
+    def __init__(self, dwell):
+        self.tracker = RegionStabilityTracker(dwell=dwell)
+
+    def update(self, pixels, now):
+        return self.tracker.update(pixels, now=now).stable
+
+
+def evaluate(detector, frames, fps, typing_frames):
+    false_stable, settled_at, cost = 0, None, 0.0
+    for i, pixels in enumerate(frames):
+        started = time.perf_counter()
+        stable = detector.update(pixels, i / fps)
+        cost += time.perf_counter() - started
+        if stable and 0 < i < typing_frames:
+            false_stable += 1
+        if stable and i >= typing_frames and settled_at is None:
+            settled_at = (i - typing_frames) / fps
+    return cost / len(frames), false_stable, settled_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", help="replay an .npz recording (frames, fps[, typing_frames])")
+    parser.add_argument("--record", help="record a screen region to this .npz file and exit")
+    parser.add_argument("--region", type=int, nargs=4, default=[0, 0, 800, 600])
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--typing", type=float, default=4.0)
+    parser.add_argument("--idle", type=float, default=5.0)
+    parser.add_argument("--dwell", type=float, default=1.0)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, tuple(args.region), args.fps, args.typing + args.idle)
+        return
+
+    if args.frames:
+        data = np.load(args.frames)
+        frames, fps = list(data["frames"]), float(data["fps"])
+        typing_frames = int(data["typing_frames"]) if "typing_frames" in data else int(args.typing * fps)
+    else:
+        fps = args.fps
+        frames, typing_frames = synthesize(args.region[2], args.region[3], fps, args.typing, args.idle)
+
+    height, width = frames[0].shape[:2]
+    print(f"{len(frames)} frames of {width}x{height} at {fps:g} fps, typing ends at frame {typing_frames}, "
+          f"dwell {args.dwell:g}s")
+    print(f"{'detector':<10} {'ms/frame':>9} {'false stable':>13} {'stable after typing':>20}")
+    for name, detector in (("md5", MD5Detector(args.dwell)),
+                           ("full-diff", FullDiffDetector(args.dwell)),
+                           ("tile-hash", TileHashDetector(args.dwell))):
+        cost, false_stable, settled_at = evaluate(detector, frames, fps, typing_frames)
+        settled = f"{settled_at:.1f}s" if settled_at is not None else "never"
+        print(f"{name:<10} {cost * 1000:9.2f} {false_stable:13d} {settled:>20}")
+
+
+if __name__ == "__main__":
+    main()
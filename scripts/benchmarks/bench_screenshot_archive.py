@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compare debug screenshot storage and comparison cost: one PNG per shot
+(the old ScreenshotLogger) versus ScreenshotArchive.
+
+png      - PIL PNG per shot; compare_screenshots reopens both PNGs and
+           diffs them pixel by pixel
+archive  - keyframes plus XOR deltas in pack segments; compare uses the
+           tile hash signatures stored in the index
+
+Screenshots are synthetic: a desktop with a few windows where each shot
+types a new line of text, and every --scroll-every shots the response
+pane scrolls.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.screenshot_archive import ScreenshotArchive
+
+
+def synthetic_shots(count: int, width: int, height: int, scroll_every: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), (32, 34, 40), dtype=np.uint8)
+    image[:28] = (60, 62, 70)  # title bar
+    image[28:, :240] = (44, 46, 52)  # sidebar
+    pane = image[60:height - 120, 260:width - 20]
+    line = 0
+    for i in range(count):
+        if scroll_every and i and i % scroll_every == 0:
+            pane[:-16] = pane[16:].copy()
+            pane[-16:] = (32, 34, 40)
+            line = max(0, line - 1)
+        y = (line * 16) % (pane.shape[0] - 16)
+        glyphs = rng.integers(0, 2, size=(10, pane.shape[1] // 2), dtype=np.uint8).repeat(2, axis=1)
+        pane[y:y + 10, :glyphs.shape[1]] = glyphs[..., None] * 200
+        line += 1
+        yield image.copy()
+
+
+def legacy_compare(path1: Path, path2: Path) -> float:
+    """The old compare_screenshots pixel loop."""
+    img1 = Image.open(path1)
+    img2 = Image.open(path2)
+    diff = Image.new('RGB', img1.size)
+    for x in range(img1.width):
+        for y in range(img1.height):
+            r1, g1, b1 = img1.getpixel((x, y))
+            r2, g2, b2 = img2.getpixel((x, y))
+            diff.putpixel((x, y), (abs(r1 - r2), abs(g1 - g2), abs(b1 - b2)))
+    total_pixels = img1.width * img1.height
+    diff_pixels = sum(1 for x in range(img1.width) for y in range(img1.height)
+                      if any(c > 30 for c in diff.getpixel((x, y))))
+    return 1 - (diff_pixels / total_pixels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shots", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--scroll-every", type=int, default=10)
+    parser.add_argument("--compares", type=int, default=1000)
+    parser.add_argument("--legacy-compares", type=int, default=1, help="the pixel loop takes seconds per call")
+    args = parser.parse_args()
+
+    shots = list(synthetic_shots(args.shots, args.width, args.height, args.scroll_every))
+    raw = shots[0].nbytes
+    print(f"{args.shots} shots of {args.width}x{args.height} ({raw / 1024:.0f} KiB raw each)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        png_dir = Path(tmp) / "png"
+        png_dir.mkdir()
+        started = time.perf_counter()
+        paths = []
+        for i, shot in enumerate(shots):
+            path = png_dir / f"shot_{i:05d}.png"
+            Image.fromarray(shot).save(path)
+            paths.append(path)
+        png_write = (time.perf_counter() - started) / len(shots)
+        png_bytes = sum(path.stat().st_size for path in paths)
+
+        started = time.perf_counter()
+        for _ in range(args.legacy_compares):
+            legacy_compare(paths[-2], paths[-1])
+        png_compare = (time.perf_counter() - started) / args.legacy_compares
+
+        archive = ScreenshotArchive(Path(tmp) / "archive")
+        started = time.perf_counter()
+        entries = [archive.add("agent-1", "response", shot) for shot in shots]
+        archive_write = (time.perf_counter() - started) / len(shots)
+        stats = archive.get_stats()
+
+        started = time.perf_counter()
+        for i in range(args.compares):
+            archive.similarity(entries[i % len(entries)].signature, entries[(i + 1) % len(entries)].signature)
+        archive_compare = (time.perf_counter() - started) / args.compares
+
+        started = time.perf_counter()
+        for entry in entries[-20:]:
+            archive.load(entry)
+        archive_load = (time.perf_counter() - started) / 20
+        archive.close()
+
+    print(f"{'':<8} {'bytes/shot':>11} {'write ms':>9} {'compare ms':>11}")
+    print(f"{'png':<8} {png_bytes / len(shots):11.0f} {png_write * 1000:9.1f} {png_compare * 1000:11.1f}")
+    print(f"{'archive':<8} {stats['bytes_per_screenshot']:11.0f} {archive_write * 1000:9.1f} "
+          f"{archive_compare * 1000:11.3f}")
+    print(f"archive: {stats['keyframes']} keyframes, {stats['deltas']} deltas, "
+          f"decode {archive_load * 1000:.1f} ms per shot")
+
+
+if __name__ == "__main__":
+    main()
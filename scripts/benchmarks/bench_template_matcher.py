@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark copy-button detection on stored screenshots at 100%, 125% and
+150% display scaling.
+
+The screenshot directory holds ``template.png`` (the button captured at
+100%) and ``screen_100.png``, ``screen_125.png``, ``screen_150.png``.
+``--generate`` writes a synthetic set: an editor-like screen with a copy
+button, scaled up the way a higher DPI setting would.
+
+Detectors:
+  single-scale - the old CopyButtonDetector: one full-resolution
+                 TM_CCOEFF_NORMED pass over the BGR region
+  cold         - TemplateMatcher on a frame it has not seen (coarse-to-fine
+                 multi-scale search)
+  roi          - the frame changed away from the button, but inside its
+                 cache tiles, so only the last-known location is searched
+  cached       - the frame is unchanged since the last search
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from dreamos.core.agent.control.template_matcher import TemplateMatcher
+
+SCALES = (100, 125, 150)
+
+
+def draw_copy_button(canvas: np.ndarray, x: int, y: int) -> None:
+    """Two overlapping outlined squares, like the Cursor copy icon."""
+    cv2.rectangle(canvas, (x + 2, y + 2), (x + 14, y + 14), (200, 200, 200), 2)
+    cv2.rectangle(canvas, (x + 8, y + 8), (x + 20, y + 20), (37, 37, 37), -1)
+    cv2.rectangle(canvas, (x + 8, y + 8), (x + 20, y + 20), (200, 200, 200), 2)
+
+
+def generate(directory: Path, width: int = 1600, height: int = 900) -> None:
+    rng = np.random.default_rng(0)
+    screen = np.full((height, width, 3), 37, dtype=np.uint8)
+    for y in range(20, height - 20, 18):
+        x = 20
+        while x < width - 200:
+            word = int(rng.integers(3, 10)) * 7
+            shade = int(rng.choice([150, 180, 210]))
+            screen[y:y + 10, x:x + word] = (rng.integers(0, 2, size=(10, word, 1)) * shade).astype(np.uint8)
+            x += word + 7
+    screen[:, width - 180:] = 30
+    button = (width - 60, height // 2)
+    screen[button[1] - 4:button[1] + 26, button[0] - 4:button[0] + 26] = 37
+    draw_copy_button(screen, *button)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(directory / "template.png"), screen[button[1] - 2:button[1] + 24, button[0] - 2:button[0] + 24])
+    for scale in SCALES:
+        scaled = cv2.resize(screen, None, fx=scale / 100, fy=scale / 100, interpolation=cv2.INTER_LINEAR)
+        cv2.imwrite(str(directory / f"screen_{scale}.png"), scaled)
+    print(f"wrote synthetic screenshots to {directory}")
+
+
+def single_scale(screen: np.ndarray, template: np.ndarray):
+    result = cv2.matchTemplate(np.ascontiguousarray(screen), template, cv2.TM_CCOEFF_NORMED)
+    _, score, _, loc = cv2.minMaxLoc(result)
+    h, w = template.shape[:2]
+    return ((loc[0] + w // 2, loc[1] + h // 2) if score >= 0.8 else None), score
+
+
+def timed(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--screenshots", default="benchmarks/copy_button")
+    parser.add_argument("--generate", action="store_true")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    directory = Path(args.screenshots)
+    if args.generate or not (directory / "template.png").exists():
+        generate(directory)
+    template = cv2.imread(str(directory / "template.png"), cv2.IMREAD_COLOR)
+
+    print(f"{'scaling':<8} {'detector':<13} {'ms':>8}  result")
+    for scale in SCALES:
+        screen = cv2.imread(str(directory / f"screen_{scale}.png"), cv2.IMREAD_COLOR)
+
+        ms, (loc, score) = timed(lambda: single_scale(screen, template), args.repeat)
+        print(f"{scale:>7}% {'single-scale':<13} {ms:8.2f}  {loc or 'not found'} (score {score:.2f})")
+
+        def cold():
+            return TemplateMatcher(template).find(screen)
+        ms, match = timed(cold, args.repeat)
+        found = f"{match.center} scale {match.scale:g} (score {match.score:.2f})" if match else "not found"
+        print(f"{'':>8} {'cold':<13} {ms:8.2f}  {found}")
+
+        matcher = TemplateMatcher(template)
+        matcher.find(screen, key="region")
+        edited = screen.copy()
+        if match is not None:
+            # Highlight the padding row above the icon: the button's tiles change, the icon does not
+            edited[match.y:match.y + 2, match.x:match.x + match.width] = 120
+        frames = [edited, screen]
+
+        def roi():
+            frames.reverse()
+            return matcher.find(frames[0], key="region")
+        ms, _ = timed(roi, args.repeat)
+        print(f"{'':>8} {'roi':<13} {ms:8.2f}  stats {matcher.stats}")
+
+        ms, _ = timed(lambda: matcher.find(frames[0], key="region"), args.repeat)
+        print(f"{'':>8} {'cached':<13} {ms:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
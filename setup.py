@@ -23,7 +23,7 @@ setup(
         "pydantic>=2.0.0"
     ],
     package_data={
-        "dreamos": ["utils/*"],
+        "dreamos": ["utils/*", "core/autonomy/base/pytest_plugin/*.py"],
     },
     entry_points={
         'console_scripts': [
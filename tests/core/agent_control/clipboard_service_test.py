@@ -0,0 +1,57 @@
+"""Tests for sequenced clipboard capture on a fake clipboard."""
+
+import pytest
+
+from dreamos.core.agent.control.clipboard_service import ClipboardService, FakeClipboardBackend
+
+
+def _copy_button(backend, text, delay=0.02, owner="cursor"):
+    """A copy button whose application fills the clipboard after a delay."""
+    def click():
+        backend.copy_later(text, delay, owner=owner)
+        return True
+    return click
+
+
+@pytest.mark.parametrize("native_sequence", [True, False])
+def test_capture_waits_for_the_copy_and_attributes_it(native_sequence):
+    backend = FakeClipboardBackend("stale text", native_sequence=native_sequence)
+    service = ClipboardService(backend, poll_interval=0.002, copy_timeout=0.3)
+
+    capture = service.capture("agent-1", _copy_button(backend, "fresh response"))
+    assert capture.text == "fresh response" and capture.owner == "cursor"
+    assert 0.015 < capture.latency < 0.2
+    assert service.attributed_to(capture.sequence) == "agent-1"
+
+    # A click that copies nothing never yields the stale contents
+    assert service.capture("agent-2", lambda: True, timeout=0.05) is None
+    assert service.capture("agent-2", lambda: False) is None
+    stats = service.get_stats()
+    assert stats["captures"] == 1 and stats["timeouts"] == 1 and stats["trigger_failures"] == 1
+    assert stats["capture_latency"]["count"] == 1
+
+
+def test_own_pastes_are_not_taken_for_copies():
+    backend = FakeClipboardBackend()
+    service = ClipboardService(backend, poll_interval=0.002, copy_timeout=0.3)
+
+    def click_while_pasting():
+        service.write("message being pasted")  # input scheduler pasting into another agent
+        backend.copy_later("agent response", 0.03)
+        return True
+
+    capture = service.capture("agent-1", click_while_pasting)
+    assert capture.text == "agent response"
+    assert service.get_stats()["ignored_own_writes"] == 1
+
+
+def test_duplicate_responses_are_flagged_per_agent():
+    backend = FakeClipboardBackend()
+    service = ClipboardService(backend, poll_interval=0.002)
+
+    first = service.capture("agent-1", _copy_button(backend, "same answer", delay=0.0))
+    assert not first.duplicate and service.is_new("agent-1", first.text)
+    again = service.capture("agent-1", _copy_button(backend, "same answer", delay=0.0))
+    assert again.duplicate and not service.is_new("agent-1", again.text)
+    assert service.is_new("agent-2", "same answer")
+    assert service.get_stats()["duplicates"] == 1
@@ -0,0 +1,161 @@
+"""Tests for concurrent response collection on synthetic frames."""
+
+import asyncio
+import json
+import time
+
+from dreamos.core.agent.control.collection_session import CollectionSession, CollectionState
+from dreamos.core.agent.control.frame_grabber import FrameGrabber, SyntheticFrameSource
+
+REGIONS = {f"agent_{i}": (20 + 210 * i, 20, 200, 120) for i in range(3)}
+CONFIG = {"collection_hz": 50, "stability_dwell": 0.15, "frame_timeout": 0.05, "copy_retry_delay": 0.01}
+
+
+class ScriptedScreen(SyntheticFrameSource):
+    """Regions that generate text between scripted start and stop times."""
+
+    def __init__(self, schedule):
+        super().__init__(width=660, height=200)
+        self.schedule = schedule  # region -> (start, stop), seconds after creation
+        self.started = time.monotonic()
+
+    def grab(self):
+        elapsed = time.monotonic() - self.started
+        self.active_regions = [r for r, (start, stop) in self.schedule.items() if start <= elapsed < stop]
+        return super().grab()
+
+
+def _session(schedule, tmp_path, read_response=None):
+    grabber = FrameGrabber(ScriptedScreen(schedule), max_hz=100)
+    session = CollectionSession(
+        read_response or (lambda name: f"response from {name}"),
+        grabber=grabber,
+        outbox_dir=str(tmp_path),
+        config=CONFIG
+    )
+    for name, region in REGIONS.items():
+        session.watch(name, region, agent_id=name.split("_")[1])
+    return session, grabber
+
+
+def test_agents_are_collected_concurrently_as_they_finish(tmp_path):
+    schedule = {REGIONS["agent_0"]: (0.1, 0.9), REGIONS["agent_1"]: (0.1, 0.3), REGIONS["agent_2"]: (0.1, 0.6)}
+    session, grabber = _session(schedule, tmp_path)
+    started = time.time()
+    try:
+        responses = session.collect(timeout=5)
+    finally:
+        session.close()
+        grabber.stop()
+
+    assert responses == {name: f"response from {name}" for name in REGIONS}
+    # Outboxes land in finishing order, each shortly after its agent went quiet
+    outboxes = {name: json.loads((tmp_path / f"agent-{name[-1]}.json").read_text()) for name in REGIONS}
+    completed = sorted(outboxes, key=lambda name: outboxes[name]["completed_at"])
+    assert completed == ["agent_1", "agent_2", "agent_0"]
+    assert outboxes["agent_1"]["completed_at"] - started < 0.7
+    assert all(box["status"] == "complete" for box in outboxes.values())
+
+    metrics = session.get_metrics()
+    assert metrics["completed"] == 3
+    assert metrics["outbox_latency"]["count"] == 3 and metrics["outbox_latency"]["max"] < 0.25
+
+
+def test_idle_agent_times_out_without_blocking_others(tmp_path):
+    schedule = {REGIONS["agent_0"]: (0.05, 0.2), REGIONS["agent_2"]: (0.05, 0.3)}
+    session, grabber = _session(schedule, tmp_path)
+    try:
+        responses = session.collect(timeout=1.0)
+    finally:
+        session.close()
+        grabber.stop()
+
+    assert set(responses) == {"agent_0", "agent_2"}
+    assert session.agents["agent_1"].state is CollectionState.IDLE
+    assert not (tmp_path / "agent-1.json").exists()
+
+
+def test_first_response_ends_session_unless_waiting_for_all(tmp_path):
+    schedule = {REGIONS["agent_0"]: (0.05, 0.2)}  # the other agents stay idle
+    session, grabber = _session(schedule, tmp_path)
+    started = time.monotonic()
+    try:
+        responses = session.collect(timeout=5, wait_all=False)
+    finally:
+        session.close()
+        grabber.stop()
+
+    assert responses == {"agent_0": "response from agent_0"}
+    assert time.monotonic() - started < 1.0
+
+
+def test_copy_is_discarded_when_region_resumes(tmp_path):
+    # agent_0 pauses long enough to look stable, then keeps generating while it is being copied
+    schedule = {REGIONS["agent_0"]: (0.05, 0.2), REGIONS["agent_1"]: (0.05, 0.2), REGIONS["agent_2"]: (0.05, 0.2)}
+    schedule[(REGIONS["agent_0"][0], 60, 200, 80)] = (0.45, 0.7)
+    copies = []
+
+    def read_response(name):
+        copies.append(name)
+        time.sleep(0.15 if name == "agent_0" and copies.count(name) == 1 else 0.0)
+        return f"{name} copy {copies.count(name)}"
+
+    session, grabber = _session(schedule, tmp_path, read_response)
+    try:
+        responses = session.collect(timeout=3)
+    finally:
+        session.close()
+        grabber.stop()
+
+    # The first copy of agent_0 is stale: only the copy of the finished response is emitted
+    assert responses["agent_0"] == "agent_0 copy 2"
+    assert session.get_metrics()["discarded"] == 1
+
+
+def _settle(grabber, seconds=0.3):
+    """Let scripted generation finish before the session starts."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        grabber.grab()
+        time.sleep(0.02)
+
+
+def test_response_finished_before_the_session_is_collected(tmp_path):
+    schedule = {REGIONS["agent_0"]: (0.0, 0.1)}
+    session, grabber = _session(schedule, tmp_path)
+    _settle(grabber)
+
+    async def from_running_loop():
+        # collect() is safe to call from code already inside an event loop
+        return session.collect(timeout=3, wait_all=False)
+
+    started = time.monotonic()
+    try:
+        responses = asyncio.run(from_running_loop())
+    finally:
+        session.close()
+        grabber.stop()
+
+    assert responses == {"agent_0": "response from agent_0"}
+    assert time.monotonic() - started < 1.5
+    assert session.agents["agent_1"].state is CollectionState.IDLE
+
+
+def test_region_is_compared_against_the_pre_prompt_snapshot(tmp_path):
+    region = (20, 20, 200, 120)
+    screen = ScriptedScreen({(20, 20, 200, 8): (0.0, 0.05)})  # one line of output
+    grabber = FrameGrabber(screen, max_hz=100)
+    before = grabber.grab().view(region).copy()
+    before[:] = 40  # the panel was blank when the prompt was sent
+    _settle(grabber, 0.1)
+
+    session = CollectionSession(lambda name: "short answer", grabber=grabber,
+                                outbox_dir=str(tmp_path), config={**CONFIG, "initial_content": 1.0})
+    session.watch("agent_0", region, agent_id="0", baseline=before)
+    try:
+        responses = session.collect(timeout=2)
+    finally:
+        session.close()
+        grabber.stop()
+
+    assert responses == {"agent_0": "short answer"}
@@ -0,0 +1,57 @@
+"""Tests for the shared frame grabber."""
+
+import time
+
+import numpy as np
+
+from dreamos.core.agent.control import frame_grabber as fg
+from dreamos.core.agent.control.frame_grabber import FrameGrabber, SyntheticFrameSource
+
+
+def test_regions_share_one_capture_per_tick():
+    source = SyntheticFrameSource(320, 200, active_regions=[(0, 0, 100, 50)])
+    grabber = FrameGrabber(source)
+    grabber.register_region("agent-1", (0, 0, 100, 50))
+
+    views = [grabber.region("agent-1", max_age=1.0), grabber.region((100, 50, 40, 30), max_age=1.0)]
+    assert source.grabs == 1 and grabber.stats["reused"] == 1
+    assert views[0].shape == (50, 100, 4) and views[1].shape == (30, 40, 4)
+    assert np.shares_memory(views[0], grabber.latest().pixels)
+    assert not views[0].flags.writeable
+
+    grabber.grab()
+    previous = grabber.previous().view(grabber.regions["agent-1"])
+    assert not np.array_equal(previous, grabber.region("agent-1", max_age=1.0))
+    assert grabber.region_image("agent-1").size == (100, 50)
+
+
+def test_capture_rate_follows_subscribers():
+    grabber = FrameGrabber(SyntheticFrameSource(64, 64), max_hz=50)
+    assert grabber.capture_hz == 0
+    slow = grabber.subscribe(5)
+    fast = grabber.subscribe(200)
+    assert grabber.capture_hz == 50
+    frame = grabber.wait_for_frame(0, timeout=2)
+    assert frame is not None
+
+    grabber.unsubscribe(fast)
+    grabber.unsubscribe(slow)
+    time.sleep(0.1)
+    captured = grabber.stats["captures"]
+    time.sleep(0.3)
+    assert grabber.stats["captures"] == captured
+    grabber.stop()
+
+
+def test_visual_watchdog_hashes_shared_frame():
+    from dreamos.core.agent.control.visual_watchdog import hash_screen_region
+
+    fg.set_frame_grabber(FrameGrabber(SyntheticFrameSource(64, 64, active_regions=[(0, 0, 32, 32)])))
+    try:
+        first = hash_screen_region((0, 0, 32, 32))
+        assert hash_screen_region((0, 0, 32, 32)) == first
+        fg.get_frame_grabber().grab()
+        assert hash_screen_region((0, 0, 32, 32)) != first
+        assert hash_screen_region((32, 32, 32, 32)) == hash_screen_region((32, 32, 32, 32))
+    finally:
+        fg.set_frame_grabber(None)
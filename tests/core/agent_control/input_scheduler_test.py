@@ -0,0 +1,87 @@
+"""Tests for the input injection scheduler."""
+
+import asyncio
+import sys
+import time
+import types
+
+from dreamos.core.agent.control import input_scheduler
+from dreamos.core.agent.control.clipboard_service import ClipboardService, FakeClipboardBackend
+from dreamos.core.agent.control.input_scheduler import FakeInputBackend, InputScheduler, InputTarget
+
+TARGETS = [InputTarget(f"agent-{i}", 100 * i, 500) for i in range(1, 5)]
+
+
+def test_broadcast_is_pipelined_across_agents():
+    backend = FakeInputBackend(TARGETS, processing=0.3)
+    scheduler = InputScheduler(backend, send_settle=0.0)
+    futures = [scheduler.submit(target, f"hello {target.agent_id}") for target in TARGETS]
+    assert all(future.result(timeout=5) for future in futures)
+    scheduler.stop()
+
+    assert [(agent, text) for agent, text, _ in backend.sent] == [
+        (t.agent_id, f"hello {t.agent_id}") for t in TARGETS
+    ]
+    # Every agent got its message before the first one finished processing
+    assert backend.sent[-1][2] - backend.sent[0][2] < 0.3
+
+
+def test_same_agent_waits_for_previous_send_to_settle():
+    backend = FakeInputBackend(TARGETS[:2], processing=0.2)
+    scheduler = InputScheduler(backend, send_settle=0.0)
+
+    async def run():
+        return await asyncio.gather(
+            scheduler.send(TARGETS[0], "first"),
+            scheduler.send(TARGETS[0], "second"),
+            scheduler.send(TARGETS[1], "other"),
+        )
+
+    assert asyncio.run(run()) == [True, True, True]
+    scheduler.stop()
+    times = {text: sent_at for _, text, sent_at in backend.sent}
+    assert [text for _, text, _ in backend.sent] == ["first", "other", "second"]
+    assert times["second"] - times["first"] >= 0.2
+
+
+def test_unfocusable_target_fails_without_blocking_others():
+    backend = FakeInputBackend(TARGETS[:1])
+    scheduler = InputScheduler(backend, send_settle=0.0, focus_timeout=0.05)
+    lost = scheduler.submit(InputTarget("ghost", 1, 1), "nobody home")
+    found = scheduler.submit(TARGETS[0], "hi")
+    assert lost.result(timeout=5) is False and found.result(timeout=5) is True
+    scheduler.stop()
+    assert scheduler.stats == {"sent": 1, "failed": 1, "focus_retries": 1}
+
+
+def test_pyautogui_backend_waits_for_focus_without_a_window_title(monkeypatch):
+    clicks = []
+    fake_pyautogui = types.SimpleNamespace(click=lambda x, y, _pause: clicks.append((x, y)))
+    monkeypatch.setitem(sys.modules, "pyautogui", fake_pyautogui)
+    backend = input_scheduler.PyAutoGUIInputBackend(
+        ClipboardService(FakeClipboardBackend()), focus_delay=0.05
+    )
+
+    untitled = InputTarget("agent-1", 10, 20)
+    backend.click(untitled.x, untitled.y)
+    assert not backend.is_focused(untitled)
+    time.sleep(0.06)
+    assert backend.is_focused(untitled)
+
+    titled = InputTarget("agent-2", 30, 40, window_title="Cursor")
+    monkeypatch.setattr(input_scheduler, "_active_window_title", lambda: "notes - Cursor")
+    backend.click(titled.x, titled.y)
+    assert backend.is_focused(titled)
+    monkeypatch.setattr(input_scheduler, "_active_window_title", lambda: "Terminal")
+    assert not backend.is_focused(titled)
+
+    # No way to read titles here: fall back to the delay
+    fresh = input_scheduler.PyAutoGUIInputBackend(
+        ClipboardService(FakeClipboardBackend()), focus_delay=0.05
+    )
+    monkeypatch.setattr(input_scheduler, "_active_window_title", lambda: None)
+    fresh.click(titled.x, titled.y)
+    assert not fresh.is_focused(titled)
+    time.sleep(0.06)
+    assert fresh.is_focused(titled)
+    assert clicks == [(10, 20), (30, 40), (30, 40)]
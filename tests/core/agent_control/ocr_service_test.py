@@ -0,0 +1,63 @@
+"""Tests for incremental line OCR."""
+
+import cv2
+import numpy as np
+
+from dreamos.core.agent.control.ocr_service import OCRService, to_gray
+
+
+class LabelBackend:
+    """Recognises the synthetic lines by their pixel signature."""
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.calls = 0
+
+    def recognize(self, image):
+        self.calls += 1
+        return self.labels.get(int(np.asarray(image).sum()), "?")
+
+
+def _document(texts, line_height=20, width=400):
+    document = np.full((line_height * len(texts) + 10, width, 4), 30, dtype=np.uint8)
+    for i, text in enumerate(texts):
+        cv2.putText(document, text, (8, (i + 1) * line_height - 5), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.5, (220, 220, 220, 255), 1, cv2.LINE_AA)
+    return document
+
+
+def _labels(texts):
+    gray = to_gray(_document(texts))
+    boxes = OCRService().segment(gray)
+    return {int(gray[t:b, l:r].sum()): text for (t, b, l, r), text in zip(boxes, texts)}
+
+
+def test_lines_are_read_in_order_and_cached():
+    texts = ["first line of the reply", "second line", "third and final line"]
+    backend = LabelBackend(_labels(texts))
+    service = OCRService(backend=backend)
+
+    assert service.read(_document(texts)) == "\n".join(texts)
+    assert backend.calls == 3
+    assert service.read(_document(texts)) == "\n".join(texts)
+    assert backend.calls == 3 and service.stats["hits"] == 3
+
+
+def test_scrolling_only_recognises_new_lines():
+    texts = [f"response line number {i}" for i in range(8)]
+    backend = LabelBackend(_labels(texts))
+    service = OCRService(backend=backend, max_workers=2)
+    document = _document(texts)
+
+    service.read_lines(document[:100])
+    calls = backend.calls
+    lines = service.read_lines(document[40:140])  # scrolled down two lines
+    # Lines 2-3 were fully visible before; 4 was clipped by the old bottom edge
+    assert [line.text for line in lines if line.cached] == texts[2:4]
+    assert backend.calls - calls == 3
+    assert [line.top for line in lines] == sorted(line.top for line in lines)
+
+
+def test_blank_region_has_no_lines():
+    service = OCRService(backend=LabelBackend({}))
+    assert service.read(np.full((50, 80, 3), 30, dtype=np.uint8)) == ""
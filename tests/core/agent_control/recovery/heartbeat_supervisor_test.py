@@ -0,0 +1,104 @@
+"""Tests for concurrent heartbeat supervision with simulated agents."""
+
+import asyncio
+import time
+
+from dreamos.core.agent.control.metrics import LatencyHistogram
+from dreamos.core.agent.control.recovery.heartbeat_supervisor import HeartbeatSupervisor
+
+CONFIG = {
+    "heartbeat_interval": 0.05,
+    "heartbeat_min_interval": 0.01,
+    "heartbeat_max_interval": 0.2,
+    "probe_timeout": 0.05,
+    "failure_threshold": 2,
+}
+
+
+class SimulatedAgents:
+    """Agents whose heartbeats can die or hang, with a slow restart."""
+
+    def __init__(self, count: int, restart_time: float = 0.0):
+        self.ids = [f"agent-{i}" for i in range(count)]
+        self.dead = {}  # agent_id -> time of death
+        self.hung = set()
+        self.probes = []  # (agent_id, time)
+        self.restarting = []  # (agent_id, time)
+        self.restarted = []
+        self.restart_time = restart_time
+
+    async def list_agents(self):
+        return self.ids
+
+    async def probe(self, agent_id):
+        self.probes.append((agent_id, time.monotonic()))
+        if agent_id in self.hung:
+            await asyncio.sleep(10)
+        return agent_id not in self.dead
+
+    async def restart(self, agent_id):
+        self.restarting.append((agent_id, time.monotonic()))
+        await asyncio.sleep(self.restart_time)
+        self.dead.pop(agent_id, None)
+        self.hung.discard(agent_id)
+        self.restarted.append((agent_id, time.monotonic()))
+        return True
+
+
+def _run(agents, scenario, config=CONFIG):
+    async def run():
+        supervisor = HeartbeatSupervisor(agents.list_agents, agents.probe, agents.restart, config)
+        await supervisor.start()
+        try:
+            await scenario(supervisor)
+        finally:
+            await supervisor.stop()
+        return supervisor
+    return asyncio.run(run())
+
+
+def test_dead_and_hung_agents_are_restarted_quickly():
+    agents = SimulatedAgents(50)
+
+    async def scenario(supervisor):
+        await asyncio.sleep(0.3)
+        agents.dead["agent-3"] = time.monotonic()
+        agents.hung.add("agent-7")
+        await asyncio.sleep(0.5)
+
+    supervisor = _run(agents, scenario)
+    assert {agent for agent, _ in agents.restarted} == {"agent-3", "agent-7"}
+    metrics = supervisor.get_metrics()
+    assert metrics["timeouts"] >= 2 and metrics["restarts"] == 2
+    # Healthy agents backed off, the latency histogram saw both detections
+    assert metrics["agents"]["agent-0"]["interval"] > CONFIG["heartbeat_interval"]
+    assert metrics["detection_latency"]["count"] == 2
+    assert metrics["detection_latency"]["max"] < CONFIG["heartbeat_max_interval"] + 0.2
+
+
+def test_slow_restart_does_not_stall_probing():
+    agents = SimulatedAgents(10, restart_time=1.0)
+    agents.dead["agent-0"] = time.monotonic()
+
+    async def scenario(supervisor):
+        await asyncio.sleep(0.1)
+        agents.dead["agent-1"] = time.monotonic()
+        await asyncio.sleep(0.4)
+        # agent-1 failed while agent-0 is restarting: it waits in the queue, not in the probe loop
+        metrics = supervisor.get_metrics()
+        assert metrics["restart_queue"] == 1 and metrics["agents"]["agent-1"]["restarting"]
+
+    _run(agents, scenario)
+    assert [agent for agent, _ in agents.restarting] == ["agent-0"]
+    restart_started = agents.restarting[0][1]
+    probed_during_restart = {agent for agent, at in agents.probes if at > restart_started + 0.1}
+    assert len(probed_during_restart) >= 8
+
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram((1, 5, 10))
+    for value in (0.5, 3, 4, 7, 12):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "5": 2, "10": 1, "+Inf": 1}
+    assert snapshot["p50"] == 5 and snapshot["p95"] == 12
@@ -0,0 +1,76 @@
+"""Tests for perceptual-hash region stability."""
+
+import numpy as np
+
+from dreamos.core.agent.control import frame_grabber as fg
+from dreamos.core.agent.control.frame_grabber import FrameGrabber, SyntheticFrameSource
+from dreamos.core.agent.control.region_stability import RegionStabilityTracker, StabilityEngine
+
+
+def _text_region(lines: int, caret: bool = False) -> np.ndarray:
+    """Dark 256x128 BGRA region with ``lines`` rows of glyph noise and an optional caret."""
+    rng = np.random.default_rng(1)
+    pixels = np.full((128, 256, 4), 30, dtype=np.uint8)
+    for line in range(lines):
+        y = 4 + line * 12
+        pixels[y:y + 8, 8:248, :3] = (rng.integers(0, 2, size=(8, 240)) * 220)[..., None]
+    if caret:
+        y = 4 + lines * 12
+        pixels[y:y + 8, 8:10, :3] = 220
+    return pixels
+
+
+def test_caret_blink_is_stable_but_new_text_is_not():
+    tracker = RegionStabilityTracker(tile_size=64, dwell=1.0)
+    assert not tracker.update(_text_region(3), now=0.0).stable
+
+    for i in range(1, 12):
+        result = tracker.update(_text_region(3, caret=i % 2 == 1), now=i * 0.1)
+        assert result.changed_tiles == []
+    assert result.stable and result.stable_for >= 1.0
+
+    result = tracker.update(_text_region(4), now=1.2)
+    assert result.changed_tiles and {row for row, _ in result.changed_tiles} == {0}
+    assert not result.stable
+
+
+def test_masks_hide_large_flicker():
+    noisy = _text_region(2)
+    noisy[70:128, 0:64, :3] = 255
+    tracker = RegionStabilityTracker(dwell=0.5, masks=[(0, 64, 64, 64)])
+    tracker.update(_text_region(2), now=0.0)
+    assert tracker.update(noisy, now=0.6).stable
+
+    unmasked = RegionStabilityTracker(dwell=0.5)
+    unmasked.update(_text_region(2), now=0.0)
+    assert unmasked.update(noisy, now=0.6).changed_tiles == [(1, 0)]
+
+
+
+def test_content_fraction_ignores_blank_and_masked_areas():
+    tracker = RegionStabilityTracker(tile_size=64)
+    assert tracker.content_fraction(_text_region(0)) == 0.0
+    assert tracker.content_fraction(_text_region(3)) == 0.5  # text fills the top row of tiles
+
+    blinking = _text_region(0, caret=True)
+    assert tracker.content_fraction(blinking) == 0.125
+    tracker.add_mask((8, 4, 2, 8))
+    assert tracker.content_fraction(blinking) == 0.0
+
+def test_engine_and_watchdog_read_the_shared_grabber():
+    from dreamos.core.agent.control.visual_watchdog import has_region_stabilized
+
+    grabber = FrameGrabber(SyntheticFrameSource(256, 128, active_regions=[(0, 0, 128, 128)]))
+    engine = StabilityEngine(grabber, dwell=0.0)
+    engine.watch("busy", (0, 0, 128, 128))
+    engine.watch("idle", (128, 0, 128, 128))
+    engine.update()
+    results = engine.update(max_age=0)
+    assert results["busy"].changed_tiles and results["idle"].stable
+
+    fg.set_frame_grabber(grabber)
+    try:
+        assert has_region_stabilized((128, 0, 128, 128), duration=0.1, poll_interval=0.02)
+        assert not has_region_stabilized((0, 0, 128, 128), duration=0.1, poll_interval=0.02)
+    finally:
+        fg.set_frame_grabber(None)
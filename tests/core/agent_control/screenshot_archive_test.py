@@ -0,0 +1,71 @@
+"""Tests for the keyframe + delta screenshot archive."""
+
+import numpy as np
+
+from dreamos.core.agent.control.screenshot_archive import ScreenshotArchive
+
+
+def _shots(count, seed=0, shape=(240, 320, 3)):
+    """A desktop-like image with a few text rows changing between shots."""
+    rng = np.random.default_rng(seed)
+    image = np.full(shape, 40, dtype=np.uint8)
+    image[:30] = (200, 200, 210)
+    shots = []
+    for i in range(count):
+        y = 40 + (i * 6) % (shape[0] - 50)
+        image[y:y + 4, 10:shape[1] - 10] = rng.integers(0, 2, size=(4, shape[1] - 20, 1), dtype=np.uint8) * 220
+        shots.append(image.copy())
+    return shots
+
+
+def test_round_trip_through_keyframes_and_deltas(tmp_path):
+    archive = ScreenshotArchive(tmp_path, keyframe_interval=4)
+    shots = _shots(10)
+    entries = [archive.add("agent-1", "prompt", shot, timestamp=float(i)) for i, shot in enumerate(shots)]
+    archive.add("agent-1", "other", shots[0][:100], timestamp=3.5)
+
+    assert [entry.keyframe for entry in entries] == [True, False, False, False] * 2 + [True, False]
+    for entry, shot in zip(entries, shots):
+        assert np.array_equal(archive.load(entry), shot)
+    stats = archive.get_stats()
+    assert stats["deltas"] == 7 and stats["bytes_per_screenshot"] < shots[0].nbytes / 20
+
+    # Index lookups and precomputed similarity
+    assert [e.seq for e in archive.entries("agent-1", "prompt", since=2, until=4)] == [3, 4, 5]
+    assert archive.latest("agent-1").name == "other"
+    assert 0.8 < entries[1].similarity < 1.0  # one row of tiles changed
+    assert archive.similarity(entries[0].signature, entries[0].signature) == 1.0
+
+    # A reopened archive serves the same index and appends to a fresh segment
+    archive.close()
+    reopened = ScreenshotArchive(tmp_path, keyframe_interval=4)
+    assert len(reopened) == 11
+    assert np.array_equal(reopened.load(reopened.get(entries[6].seq)), shots[6])
+    assert reopened.add("agent-1", "prompt", shots[0]).keyframe
+
+
+def test_byte_budget_drops_oldest_segments(tmp_path):
+    archive = ScreenshotArchive(tmp_path, byte_budget=12_000, segment_bytes=4_000)
+    shots = _shots(60, shape=(120, 160, 3))
+    for i, shot in enumerate(shots):
+        archive.add("agent-1", "loop", shot, timestamp=float(i))
+
+    assert archive.total_bytes <= 12_000 and archive.stats["dropped_segments"] > 0
+    kept = archive.entries("agent-1", "loop")
+    assert kept[-1].seq == 60 and kept[0].seq > 1
+    # Chains never reach into dropped segments
+    assert all(np.array_equal(archive.load(entry), shots[entry.seq - 1]) for entry in kept)
+    assert len(list(tmp_path.glob("segment-*.pack"))) == archive.get_stats()["segments"]
+
+
+def test_export_keeps_rgb_colours(tmp_path):
+    from PIL import Image
+
+    archive = ScreenshotArchive(tmp_path / "archive")
+    shot = np.zeros((20, 30, 3), dtype=np.uint8)
+    shot[:, :10] = (255, 0, 0)  # red
+    shot[:, 20:] = (0, 0, 255)  # blue
+    entry = archive.add("agent-1", "prompt", shot)
+
+    exported = archive.export(entry, tmp_path / "prompt.png")
+    assert np.array_equal(np.asarray(Image.open(exported).convert("RGB")), shot)
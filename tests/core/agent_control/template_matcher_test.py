@@ -0,0 +1,61 @@
+"""Tests for the multi-scale template matcher."""
+
+import cv2
+import numpy as np
+
+from dreamos.core.agent.control.template_matcher import TemplateMatcher
+
+
+def _button() -> np.ndarray:
+    icon = np.full((26, 26, 3), 37, dtype=np.uint8)
+    cv2.rectangle(icon, (4, 4), (16, 16), (200, 200, 200), 2)
+    cv2.rectangle(icon, (10, 10), (22, 22), (37, 37, 37), -1)
+    cv2.rectangle(icon, (10, 10), (22, 22), (200, 200, 200), 2)
+    return icon
+
+
+def _screen(button_at=None, scale: float = 1.0) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    screen = np.full((300, 400, 3), 37, dtype=np.uint8)
+    for y in range(10, 200, 16):
+        screen[y:y + 8, 10:250] = (rng.integers(0, 2, size=(8, 240, 1)) * 190).astype(np.uint8)
+    if button_at is not None:
+        x, y = button_at
+        screen[y:y + 26, x:x + 26] = _button()
+    if scale != 1.0:
+        screen = cv2.resize(screen, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    return screen
+
+
+def test_finds_button_at_display_scaling():
+    for scale in (1.0, 1.25, 1.5):
+        match = TemplateMatcher(_button()).find(_screen((320, 240), scale))
+        assert match is not None and match.scale == scale
+        assert abs(match.center[0] - round(333 * scale)) <= 2
+        assert abs(match.center[1] - round(253 * scale)) <= 2
+    assert TemplateMatcher(_button()).find(_screen()) is None
+
+
+def test_unchanged_frames_and_last_location_skip_full_search():
+    matcher = TemplateMatcher(_button())
+    screen = _screen((320, 240))
+    first = matcher.find(screen, key="r")
+    assert matcher.find(screen, key="r") == first
+    assert matcher.stats == {"cached": 1, "roi": 0, "full": 1}
+
+    # Text changes elsewhere: still cached
+    edited = screen.copy()
+    edited[10:18, 10:100] = 255
+    assert matcher.find(edited, key="r") == first
+    # Button nudged a few pixels: found again around the last location
+    moved = _screen((324, 238))
+    assert matcher.find(moved, key="r").center == (337, 251)
+    assert matcher.stats == {"cached": 2, "roi": 1, "full": 1}
+
+
+def test_button_appearing_is_found_in_changed_tiles():
+    matcher = TemplateMatcher(_button())
+    assert matcher.find(_screen(), key="r") is None
+    match = matcher.find(_screen((60, 250)), key="r")
+    assert match is not None and match.center == (73, 263)
+    assert matcher.stats["full"] == 2
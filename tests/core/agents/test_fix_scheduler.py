@@ -0,0 +1,96 @@
+"""Tests for concurrent fix dispatch."""
+
+import asyncio
+
+from dreamos.core.agents.fix_scheduler import FixDispatchScheduler
+
+
+def test_batches_by_file_and_respects_in_flight_limit():
+    sent = []
+
+    async def send(agent_id, batch):
+        sent.append((agent_id, batch.test_file, list(batch.test_names)))
+
+    async def run():
+        scheduler = FixDispatchScheduler({"agents": ["a1", "a2"], "max_in_flight": 2}, send=send)
+        for i in range(6):
+            scheduler.add_failure(f"test_{i}.py", f"test_{i}.py::test_one")
+        scheduler.add_failure("test_0.py", "test_0.py::test_two")
+        assert await scheduler.dispatch() == 4
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert sent[0] == ("a1", "test_0.py", ["test_0.py::test_one", "test_0.py::test_two"])
+    assert scheduler.get_status()["in_flight"] == {"a1": 2, "a2": 2}
+    assert len(scheduler.ready_batches()) == 2
+
+
+def test_parallel_verification_and_backoff_of_unfixable_tests():
+    now = [0.0]
+    active = [0, 0]  # current, peak concurrent verifications
+
+    async def verify(agent_id, test_file, response):
+        active[0] += 1
+        active[1] = max(active)
+        await asyncio.sleep(0.05)
+        active[0] -= 1
+        return response == "fix"
+
+    async def send(agent_id, batch):
+        pass
+
+    async def run():
+        scheduler = FixDispatchScheduler(
+            {"agents": ["a1", "a2", "a3"], "max_in_flight": 1, "max_parallel_verifications": 2,
+             "backoff_base": 100},
+            send=send, verify=verify, clock=lambda: now[0]
+        )
+        for name in ("hard.py", "easy1.py", "easy2.py", "easy3.py"):
+            scheduler.add_failure(name, f"{name}::test")
+        await scheduler.dispatch()
+        results = await asyncio.gather(
+            scheduler.handle_response("a1", "hard.py", "wrong"),
+            scheduler.handle_response("a2", "easy1.py", "fix"),
+            scheduler.handle_response("a3", "easy2.py", "fix"),
+        )
+        return scheduler, results
+
+    scheduler, results = asyncio.run(run())
+    assert results == [False, True, True]
+    assert active[1] == 2
+
+    # The failed file backs off; the untouched file is dispatched meanwhile
+    assert scheduler.assignments == {"easy3.py": scheduler.assignments["easy3.py"]}
+    assert scheduler.batches["hard.py"].attempts == 1
+    assert scheduler.get_status()["backing_off"] == 1
+    now[0] = 100
+    assert [b.test_file for b in scheduler.ready_batches()] == ["hard.py"]
+
+
+def test_passing_file_drops_its_batch_and_frees_the_agent():
+    async def send(agent_id, batch):
+        pass
+
+    async def verify(agent_id, test_file, response):
+        return True
+
+    async def run():
+        scheduler = FixDispatchScheduler({"agents": ["a1"], "max_in_flight": 1}, send=send, verify=verify)
+        scheduler.set_failures("flaky.py", ["test_one", "test_two"])
+        scheduler.set_failures("other.py", ["test_three"])
+        await scheduler.dispatch()
+        assert scheduler.assignments == {"flaky.py": "a1"}
+
+        # Re-running keeps the sent batch's tests until it comes back
+        scheduler.set_failures("flaky.py", ["test_two"])
+        assert scheduler.batches["flaky.py"].test_names == ["test_one", "test_two"]
+
+        scheduler.discard("flaky.py")
+        late = await scheduler.handle_response("a1", "flaky.py", "fix")
+        await scheduler.dispatch()
+        return scheduler, late
+
+    scheduler, late = asyncio.run(run())
+    assert not late
+    assert "flaky.py" not in scheduler.batches
+    assert scheduler.assignments == {"other.py": "a1"}
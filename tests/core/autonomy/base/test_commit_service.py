@@ -0,0 +1,86 @@
+"""Tests for the batched git commit service."""
+
+import asyncio
+import subprocess
+
+from dreamos.core.autonomy.base.commit_service import GitCommitService
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+def _init_repo(path):
+    _git(path, "init", "-q")
+    _git(path, "config", "user.email", "agent@example.com")
+    _git(path, "config", "user.name", "agent")
+    (path / "README").write_text("repo\n")
+    _git(path, "add", "README")
+    _git(path, "commit", "-q", "-m", "init")
+
+
+def test_fixes_batch_into_one_commit_per_area(tmp_path):
+    _init_repo(tmp_path)
+    ownership = {"agent-1": ["core/"], "agent-2": ["ui/"]}
+    for name in ("core/a.py", "core/b.py", "ui/c.py"):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("fixed = True\n")
+
+    async def run():
+        service = GitCommitService(str(tmp_path), ownership, {"batch_window": 0.2})
+        futures = [
+            await service.submit("core/a.py", "Fix a"),
+            await service.submit("ui/c.py", "Fix c"),
+            await service.submit("core/b.py", "Fix b"),
+        ]
+        assert service.queue_depth == 3
+        shas = await asyncio.gather(*futures)
+        metrics = service.get_metrics()
+        await service.stop()
+        return shas, metrics
+
+    shas, metrics = asyncio.run(run())
+    assert shas[0] == shas[2] != shas[1]
+    assert metrics["commits"] == 2 and metrics["queue_depth"] == 0
+    assert metrics["latency_mean"] >= 0.2
+
+    log = _git(tmp_path, "log", "--format=%s", "-3").splitlines()
+    assert sorted(log[:2]) == ["Fix c", "agent-1: 2 fixes"]
+    assert _git(tmp_path, "status", "--porcelain") == ""
+
+
+def test_unchanged_file_resolves_without_commit(tmp_path):
+    _init_repo(tmp_path)
+
+    async def run():
+        service = GitCommitService(str(tmp_path), config={"batch_window": 0})
+        sha = await (await service.submit("README", "No-op"))
+        await service.stop()
+        return sha, service.stats
+
+    sha, stats = asyncio.run(run())
+    assert sha is None and stats["empty_commits"] == 1
+
+
+def test_area_matches_whole_path_components(tmp_path):
+    service = GitCommitService(str(tmp_path), {"agent-1": ["core/"], "ui": "agent-2"})
+    assert service.area_for("core/a.py") == "agent-1"
+    assert service.area_for(str(tmp_path / "core" / "a.py")) == "agent-1"
+    assert service.area_for("core_old/a.py") == "codex"
+    assert service.area_for(str(tmp_path / "ui" / "c.py")) == "agent-2"
+    assert service.area_for("/elsewhere/core/a.py") == "codex"
+
+
+def test_submit_rejected_once_stopping(tmp_path):
+    _init_repo(tmp_path)
+
+    async def run():
+        service = GitCommitService(str(tmp_path), config={"batch_window": 0})
+        await (await service.submit("README", "No-op"))
+        await service.stop()
+        try:
+            await service.submit("README", "Late")
+        except RuntimeError as e:
+            return str(e)
+
+    assert asyncio.run(run()) == "commit service is stopping"
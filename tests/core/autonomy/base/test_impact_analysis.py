@@ -0,0 +1,129 @@
+"""Tests for change-aware test selection."""
+
+import os
+import subprocess
+import time
+
+import pytest
+
+from dreamos.core.autonomy.base.impact_analysis import TestImpactEngine
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "core.py").write_text("def add(a, b):\n    return a + b\n")
+    (tmp_path / "pkg" / "api.py").write_text("from .core import add\n")
+    (tmp_path / "pkg" / "other.py").write_text("X = 1\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_api.py").write_text("from pkg.api import add\n")
+    (tmp_path / "tests" / "test_other.py").write_text("from pkg import other\n")
+
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "add", ".")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    return tmp_path
+
+
+def _engine_after_full_run(project):
+    engine = TestImpactEngine(str(project), {"full_run_every": 100})
+    selection = engine.select()
+    assert selection.full_run
+    engine.record_run(selection, 10.0)
+    return engine
+
+
+def _touch(path, content):
+    path.write_text(content)
+    future = time.time() + 5
+    os.utime(path, (future, future))
+
+
+def test_first_run_is_full_and_persists_map(project):
+    engine = _engine_after_full_run(project)
+    assert engine.map_path.exists()
+    assert "pkg/api.py" in engine.test_imports["tests/test_api.py"]
+
+
+def test_transitive_import_change_selects_only_affected_tests(project):
+    engine = _engine_after_full_run(project)
+    _touch(project / "pkg" / "core.py", "def add(a, b):\n    return b + a\n")
+
+    selection = engine.select()
+
+    assert not selection.full_run
+    assert selection.targets == ["tests/test_api.py"]
+
+
+def test_no_changes_selects_nothing(project):
+    engine = _engine_after_full_run(project)
+    selection = engine.select()
+    assert not selection.full_run
+    assert selection.targets == []
+
+
+def test_conftest_change_forces_full_run(project):
+    engine = _engine_after_full_run(project)
+    _touch(project / "tests" / "conftest.py", "")
+
+    selection = engine.select()
+
+    assert selection.full_run
+    assert "conftest.py" in selection.reason
+
+
+def test_periodic_full_run(project):
+    engine = TestImpactEngine(str(project), {"full_run_every": 1})
+    engine.record_run(engine.select(), 10.0)
+    engine.record_run(engine.select(), 1.0)
+
+    assert engine.select().reason == "periodic full run"
+
+
+def test_skipped_fraction_expands_files_to_node_ids(project):
+    engine = _engine_after_full_run(project)
+    engine.coverage_map = {
+        "pkg/core.py": {"tests/test_api.py::test_a", "tests/test_api.py::test_b"},
+        "pkg/other.py": {"tests/test_other.py::test_c", "tests/test_other.py::test_d"},
+    }
+    _touch(project / "pkg" / "core.py", "def add(a, b):\n    return b + a\n")
+
+    selection = engine.select()
+
+    assert selection.targets == ["tests/test_api.py"]
+    assert selection.selected_tests == 2
+    assert selection.skipped_fraction == 0.5
+
+
+def test_edits_made_during_a_run_are_selected_next(project):
+    engine = TestImpactEngine(str(project), {"full_run_every": 100})
+    selection = engine.select()
+    # Edited after selection but before the run is recorded
+    (project / "pkg" / "core.py").write_text("def add(a, b):\n    return b + a\n")
+    time.sleep(0.01)
+    engine.record_run(selection, 10.0)
+
+    assert engine.select().targets == ["tests/test_api.py"]
+
+
+def test_failed_tests_are_reselected_until_they_pass(project):
+    engine = _engine_after_full_run(project)
+    failing = "tests/test_other.py::test_c"
+    engine.record_run(engine.select(), 1.0, failed=[failing])
+
+    selection = engine.select()
+    assert selection.targets == [failing]
+    engine.record_run(selection, 1.0, failed=[])
+    assert engine.select().targets == []
+
+
+def test_unattributed_failure_forces_full_run(project):
+    engine = _engine_after_full_run(project)
+    engine.record_run(engine.select(), 1.0, failed=None)
+
+    assert engine.select().reason == "previous failures unknown"
@@ -0,0 +1,142 @@
+"""Tests for the warm pytest worker pool."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from dreamos.core.autonomy.base.pytest_pool import PytestWorkerPool
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "core.py").write_text("def add(a, b):\n    return a + b\n")
+    (tmp_path / "pkg" / "api.py").write_text("from .core import add\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_api.py").write_text(
+        "from pkg.api import add\n\n\ndef test_add():\n    assert add(1, 2) == 3\n"
+    )
+    return tmp_path
+
+
+def test_run_and_collect(project):
+    async def scenario():
+        pool = PytestWorkerPool(str(project), {"size": 1})
+        try:
+            node_ids = await pool.collect(["tests", "-k", "test_add"])
+            result = await pool.run(node_ids)
+        finally:
+            await pool.close()
+        return node_ids, result
+
+    node_ids, result = asyncio.run(scenario())
+    assert node_ids == ["tests/test_api.py::test_add"]
+    assert result["exit_code"] == 0
+    assert result["outcomes"] == {"tests/test_api.py::test_add": "passed"}
+
+
+def test_changed_source_is_reloaded(project):
+    async def scenario():
+        pool = PytestWorkerPool(str(project), {"size": 1})
+        try:
+            first = await pool.run(["tests/test_api.py"])
+            core = project / "pkg" / "core.py"
+            core.write_text("def add(a, b):\n    return a - b\n")
+            future = time.time() + 5
+            os.utime(core, (future, future))
+            second = await pool.run(["tests/test_api.py"])
+        finally:
+            await pool.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["exit_code"] == 0
+    assert second["exit_code"] == 1
+
+
+def test_worker_recycled_after_max_runs(project):
+    async def scenario():
+        pool = PytestWorkerPool(str(project), {"size": 1, "max_runs": 1})
+        try:
+            await pool.run(["tests/test_api.py"])
+            await pool.run(["tests/test_api.py"])
+        finally:
+            await pool.close()
+        return pool.stats
+
+    stats = asyncio.run(scenario())
+    assert stats["recycled"] == 2
+    assert stats["crashed"] == 0
+
+
+def test_collect_output_larger_than_default_stream_limit(project):
+    (project / "tests" / "test_many.py").write_text(
+        "import pytest\n\n\n@pytest.mark.parametrize('case', range(4000))\n"
+        "def test_parametrized_case_with_a_long_name(case):\n    pass\n"
+    )
+
+    async def scenario():
+        pool = PytestWorkerPool(str(project), {"size": 1, "warm_paths": ["tests"]})
+        try:
+            return await pool.collect(["tests"])
+        finally:
+            await pool.close()
+
+    node_ids = asyncio.run(scenario())
+    assert len(node_ids) == 4001
+    assert len("\n".join(node_ids)) > 64 * 1024
+
+
+def test_failed_warm_up_kills_worker_and_resets_pool(project, monkeypatch):
+    from dreamos.core.autonomy.base import pytest_pool
+
+    spawned = []
+    original_request = pytest_pool.PytestWorker.request
+
+    async def failing_request(self, payload, timeout):
+        spawned.append(self)
+        raise ValueError("Separator is found, but chunk is longer than limit")
+
+    async def scenario():
+        pool = PytestWorkerPool(str(project), {"size": 1, "warm_paths": ["tests"]})
+        monkeypatch.setattr(pytest_pool.PytestWorker, "request", failing_request)
+        with pytest.raises(ValueError):
+            await pool.start()
+        assert not pool._started and not pool._workers
+
+        monkeypatch.setattr(pytest_pool.PytestWorker, "request", original_request)
+        try:
+            return await pool.run(["tests/test_api.py"])
+        finally:
+            await pool.close()
+
+    result = asyncio.run(scenario())
+    assert spawned[0].process.returncode is not None
+    assert result["exit_code"] == 0
+
+
+def test_close_fails_pending_requests(project):
+    async def scenario():
+        pool = PytestWorkerPool(str(project), {"size": 1})
+        await pool.start()
+        busy = await pool._acquire()  # the only worker is checked out
+        pending = asyncio.ensure_future(pool.run(["tests/test_api.py"]))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+
+        await pool.close()
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(pending, 5)
+
+        # A closed pool restarts on the next request, without stale wake-ups
+        try:
+            return busy, await asyncio.wait_for(pool.run(["tests/test_api.py"]), 60)
+        finally:
+            await pool.close()
+
+    busy, result = asyncio.run(scenario())
+    assert not busy.alive
+    assert result["exit_code"] == 0
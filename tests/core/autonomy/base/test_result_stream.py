@@ -0,0 +1,98 @@
+"""Tests for streamed pytest results."""
+
+import asyncio
+import os
+import sys
+
+from dreamos.core.autonomy.base.result_stream import run_pytest_streaming
+
+SUITE = '''
+import time
+
+
+def test_broken():
+    assert 1 + 1 == 3, "arithmetic"
+
+
+def test_slow():
+    time.sleep(1.5)
+
+
+def test_ok():
+    pass
+'''
+
+
+def test_failures_stream_before_suite_finishes(tmp_path):
+    (tmp_path / "test_suite.py").write_text(SUITE)
+    dispatched = []
+
+    async def on_result(event):
+        if event.failed:
+            dispatched.append(event)
+
+    run = asyncio.run(run_pytest_streaming(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "-p", "no:randomly", "test_suite.py"],
+        on_result=on_result,
+        cwd=str(tmp_path)
+    ))
+
+    assert run.exit_code == 1
+    assert run.collected == 3
+    assert {e.test_name: e.outcome for e in run.events} == {
+        "test_broken": "failed", "test_slow": "passed", "test_ok": "passed"
+    }
+    assert [e.nodeid for e in dispatched] == ["test_suite.py::test_broken"]
+    assert "arithmetic" in dispatched[0].message
+    assert dispatched[0].digest
+    assert list(run.failures()) == ["test_suite.py::test_broken"]
+
+    metrics = run.metrics()
+    # Dispatched while test_slow was still running
+    assert metrics["time_to_first_dispatch"] < metrics["duration"] - 1.0
+
+
+def test_files_are_reported_once_their_last_test_ran(tmp_path):
+    (tmp_path / "test_a.py").write_text("def test_one():\n    assert False\n\n\ndef test_two():\n    assert False\n")
+    (tmp_path / "test_b.py").write_text("import time\n\n\ndef test_slow():\n    time.sleep(1.5)\n")
+    seen = []
+
+    async def on_result(event):
+        seen.append(event.test_name)
+
+    async def on_file_finished(test_file):
+        seen.append(test_file)
+
+    run = asyncio.run(run_pytest_streaming(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "-p", "no:randomly", "test_a.py", "test_b.py"],
+        on_result=on_result,
+        on_file_finished=on_file_finished,
+        cwd=str(tmp_path)
+    ))
+
+    assert seen == ["test_one", "test_two", "test_a.py", "test_slow", "test_b.py"]
+    metrics = run.metrics()
+    # test_a.py was handed over while test_b.py was still running
+    assert metrics["time_to_first_dispatch"] < metrics["duration"] - 1.0
+
+
+def test_same_named_tests_in_different_files_are_kept_apart(tmp_path):
+    for name in ("a", "b"):
+        (tmp_path / f"test_{name}.py").write_text(f"def test_it():\n    assert False, '{name}'\n")
+    # A project module named like one of the runner's must not be shadowed
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "result_stream.py").write_text("VALUE = 'project'\n")
+    (tmp_path / "test_shadow.py").write_text(
+        "import result_stream\n\n\ndef test_project_module():\n    assert result_stream.VALUE == 'project'\n"
+    )
+
+    run = asyncio.run(run_pytest_streaming(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "-p", "no:randomly"],
+        env={**os.environ, "PYTHONPATH": str(tmp_path / "src")},
+        cwd=str(tmp_path)
+    ))
+
+    failures = run.failures()
+    assert sorted(failures) == ["test_a.py::test_it", "test_b.py::test_it"]
+    assert "'a'" in failures["test_a.py::test_it"]
+    assert "test_shadow.py::test_project_module" not in failures
@@ -0,0 +1,103 @@
+"""Tests for timer-wheel stuck detection and journaled state backups."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from dreamos.core.autonomy.base.state_manager import AgentStateType, BaseStateManager
+from dreamos.core.autonomy.base.timer_wheel import TimerWheel
+
+
+def test_timer_wheel_fires_on_deadline_and_rearms():
+    now = [0.0]
+    wheel = TimerWheel(tick=1.0, slots=4, levels=2, clock=lambda: now[0])
+    fired = []
+    wheel.schedule("a", 3, fired.append)
+    wheel.schedule("b", 40, fired.append)  # beyond the wheel's 16-tick range
+    wheel.schedule("a", 9, fired.append)   # re-arm replaces the first deadline
+    wheel.schedule("c", 5, fired.append)
+    assert wheel.cancel("c")
+
+    for t in range(1, 50):
+        now[0] = t
+        wheel.advance()
+        if t == 8:
+            assert fired == []
+        if t == 9:
+            assert fired == ["a"]
+    assert fired == ["a", "b"] and len(wheel) == 0
+
+
+@pytest.fixture(scope="module")
+def manager(tmp_path_factory):
+    # Prometheus metrics are process-global, so the module shares one manager
+    return BaseStateManager({
+        "backup_dir": str(tmp_path_factory.mktemp("backups")),
+        "journal_compact_every": 3,
+        "stuck_check_tick": 0.01
+    })
+
+
+def test_stuck_callback_fires_when_timeout_expires(manager):
+    stuck = []
+    manager.add_stuck_callback(stuck.append)
+    manager.ERROR_RETRY_TIMEOUT = timedelta(seconds=0.05)
+
+    async def run():
+        manager.start_stuck_monitor()
+        await manager.update_state("stuck-agent", AgentStateType.IDLE)
+        await manager.update_state("stuck-agent", AgentStateType.ERROR)
+        await asyncio.sleep(0.2)
+        await manager.stop_stuck_monitor()
+
+    asyncio.run(run())
+    assert stuck == ["stuck-agent"]
+    assert manager.get_stuck_agents() == ["stuck-agent"]
+
+
+def _restart(manager, agent_id):
+    """Forget everything a new process would not know about an agent."""
+    del manager.agents[agent_id]
+    manager._journal_seq.pop(agent_id, None)
+    manager._journal_entries.pop(agent_id, None)
+
+
+def test_recovery_replays_snapshot_and_journal_tail(manager):
+    states = [AgentStateType.IDLE, AgentStateType.PROCESSING, AgentStateType.IDLE,
+              AgentStateType.PROCESSING, AgentStateType.ARCHIVING]
+
+    async def run():
+        for i, state in enumerate(states):
+            await manager.update_state("agent-1", state, {"step": i})
+        expected = dict(manager.agents["agent-1"], history=list(manager.agents["agent-1"]["history"]))
+        _restart(manager, "agent-1")
+        assert (await manager._load_backup("agent-1")) == (True, None)
+        return expected
+
+    expected = asyncio.run(run())
+    assert manager._snapshot_file("agent-1").exists()
+    assert len(manager._journal_file("agent-1").read_text().splitlines()) == 2
+    assert manager.agents["agent-1"] == expected
+    assert [entry["state"] for entry in manager.get_history("agent-1")] == states[:-1]
+
+
+def test_updates_after_restart_continue_the_journal(manager):
+    async def run():
+        for state in (AgentStateType.IDLE, AgentStateType.PROCESSING, AgentStateType.IDLE,
+                      AgentStateType.PROCESSING):
+            await manager.update_state("agent-2", state)
+        _restart(manager, "agent-2")
+        # A torn write from the crashed process
+        with open(manager._journal_file("agent-2"), "a") as f:
+            f.write('{"seq": 9, "op": "tra')
+
+        # No recover_from_crash: the new process just carries on
+        await manager.update_state("agent-2", AgentStateType.ERROR, {"after": "restart"})
+        _restart(manager, "agent-2")
+        return await manager._load_backup("agent-2")
+
+    assert asyncio.run(run()) == (True, None)
+    assert manager.get_state("agent-2") == AgentStateType.ERROR
+    assert manager.agents["agent-2"]["metadata"] == {"after": "restart"}
+    assert manager._journal_seq["agent-2"] == 5
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Bridge Load Harness
+-----------------
+End-to-end load test for the bridge pipeline against a local fake LLM.
+
+Synthetic agent traffic is written into the bridge outbox and driven
+through the real components:
+
+1. ``bridge``        - ChatGPTBridge.send_message against FakeLLMServer,
+                       answers written to the agent mailbox
+2. ``response_loop`` - ResponseLoopDaemon._process_response_file on each
+                       mailbox response
+3. ``inbox``         - BridgeInboxHandler.process_file over the JSONL inbox
+
+Each stage reports throughput, p50/p95/p99 latency and memory per op and is
+checked against ``benchmark.performance_thresholds`` in
+``benchmark_config.json``. Results are written as JSON so runs can be
+diffed between releases with ``--baseline``.
+
+Usage:
+    python -m tests.core.autonomy.benchmarks.bridge_load_harness \\
+        --agents 8 --messages 50 --output results.json --baseline previous.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .fake_llm_server import FakeLLMServer
+
+CONFIG_PATH = Path(__file__).parent / "benchmark_config.json"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile of samples using linear interpolation.
+
+    Args:
+        samples: Sample values
+        pct: Percentile in [0, 100]
+
+    Returns:
+        Percentile value, or 0.0 for no samples
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class StageResult:
+    """Latency samples and counters for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies_ms: List[float] = []
+        self.errors = 0
+        self.wall_seconds = 0.0
+        self.peak_memory_bytes = 0
+
+    @property
+    def ops(self) -> int:
+        return len(self.latencies_ms)
+
+    def summary(self, thresholds: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize the stage and check it against thresholds."""
+        ops = self.ops
+        ops_per_sec = ops / self.wall_seconds if self.wall_seconds else 0.0
+        mean_ms = sum(self.latencies_ms) / ops if ops else 0.0
+        mem_per_op_mb = self.peak_memory_bytes / ops / (1024 * 1024) if ops else 0.0
+
+        checks = {
+            "min_ops_per_sec": ops_per_sec >= thresholds.get("min_ops_per_sec", 0),
+            "max_ms_per_op": mean_ms <= thresholds.get("max_ms_per_op", float("inf")),
+            "max_memory_per_op_mb": mem_per_op_mb <= thresholds.get("max_memory_per_op_mb", float("inf"))
+        }
+        return {
+            "ops": ops,
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "ops_per_sec": round(ops_per_sec, 2),
+            "mean_ms": round(mean_ms, 3),
+            "p50_ms": round(percentile(self.latencies_ms, 50), 3),
+            "p95_ms": round(percentile(self.latencies_ms, 95), 3),
+            "p99_ms": round(percentile(self.latencies_ms, 99), 3),
+            "memory_per_op_mb": round(mem_per_op_mb, 6),
+            "checks": checks,
+            "passed": all(checks.values())
+        }
+
+
+async def _run_stage(
+    result: StageResult,
+    items: List[Any],
+    op: Callable[[Any], Awaitable[bool]],
+    max_concurrent: int
+) -> None:
+    """Run op over items with bounded concurrency, timing each call."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def timed(item: Any) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ok = await op(item)
+            except Exception:
+                ok = False
+            result.latencies_ms.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                result.errors += 1
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[timed(item) for item in items])
+    finally:
+        result.wall_seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        result.peak_memory_bytes = max(peak - baseline, 0)
+        tracemalloc.stop()
+
+
+class BridgeLoadHarness:
+    """Drives ChatGPTBridge, ResponseLoopDaemon and the inbox handler under load."""
+
+    def __init__(self, config: Dict[str, Any], workdir: Path):
+        """Initialize the harness.
+
+        Args:
+            config: Benchmark configuration (see benchmark_config.json)
+            workdir: Scratch directory for outbox, mailbox and inbox files
+        """
+        self.config = config
+        self.workdir = Path(workdir)
+        self.load = config.get("load_test", {})
+        self.processing = config.get("processing", {})
+        self.thresholds = config.get("benchmark", {}).get("performance_thresholds", {})
+
+        self.paths = {
+            name: self.workdir / Path(path).name
+            for name, path in config.get("paths", {}).items()
+        }
+        self.paths.setdefault("agent_mailbox", self.workdir / "mailbox")
+        self.paths.setdefault("bridge_inbox", self.workdir / "bridge_inbox")
+        self.paths.setdefault("delivered", self.workdir / "delivered")
+        self.paths.setdefault("templates", self.workdir / "templates")
+        for path in self.paths.values():
+            path.mkdir(parents=True, exist_ok=True)
+        # PromptManager falls back to general.j2; keep the prompt as the raw message
+        (self.paths["templates"] / "general.j2").write_text("{{ message }}")
+
+        self.server = FakeLLMServer(
+            latency=self.load.get("latency"),
+            error_rate=self.load.get("error_rate", 0.0),
+            rate_limit_rate=self.load.get("rate_limit_rate", 0.0),
+            seed=self.load.get("seed")
+        )
+
+    def _component_config(self) -> Dict[str, Any]:
+        """Config shared by the bridge components under test."""
+        return {
+            "model": "fake-model",
+            "max_retries": self.processing.get("max_retries", 3),
+            "timeout": self.config.get("benchmark", {}).get("timeout_seconds", 30),
+            "paths": {name: str(path) for name, path in self.paths.items()},
+            "inbox": {"max_batch": self.processing.get("batch_size", 100)}
+        }
+
+    def generate_traffic(self, agents: int, messages_per_agent: int) -> List[Path]:
+        """Write synthetic agent prompts into the bridge outbox.
+
+        Args:
+            agents: Number of simulated agents
+            messages_per_agent: Messages per agent
+
+        Returns:
+            Paths of the generated outbox files
+        """
+        files = []
+        for agent in range(1, agents + 1):
+            for seq in range(messages_per_agent):
+                path = self.paths["bridge_outbox"] / f"Agent-{agent}_{seq:06d}.json"
+                path.write_text(json.dumps({
+                    "agent_id": f"Agent-{agent}",
+                    "task_id": f"task-{agent}-{seq}",
+                    "content": f"Status update {seq} from Agent-{agent}: tests passing, continuing.",
+                    "metadata": {"type": "general", "agent_id": f"Agent-{agent}"}
+                }))
+                files.append(path)
+        return files
+
+    async def run(self, agents: int, messages_per_agent: int) -> Dict[str, Any]:
+        """Run the full pipeline and return the results document.
+
+        Args:
+            agents: Number of simulated agents
+            messages_per_agent: Messages per agent
+
+        Returns:
+            JSON-serializable results
+        """
+        from dreamos.core.bridge.chatgpt.bridge import ChatGPTBridge
+        from dreamos.core.bridge.handlers.inbox import BridgeInboxHandler
+        from dreamos.core.bridge.response_loop_daemon import ResponseLoopDaemon
+
+        os.environ.setdefault("OPENAI_API_KEY", "fake-load-test-key")
+        max_concurrent = self.processing.get("max_concurrent", 16)
+        warmup = self.config.get("benchmark", {}).get("warmup_iterations", 0)
+        stages = {name: StageResult(name) for name in ("bridge", "response_loop", "inbox")}
+
+        outbox_files = self.generate_traffic(agents, messages_per_agent)
+        component_config = self._component_config()
+
+        async with self.server, ChatGPTBridge(component_config) as bridge:
+            bridge.api_url = self.server.url
+            # Warm up connection pool and template cache
+            for _ in range(warmup):
+                await bridge.send_message("warmup", {"type": "general"})
+
+            mailbox_files: List[Path] = []
+
+            async def bridge_op(path: Path) -> bool:
+                message = json.loads(path.read_text())
+                response = await bridge.send_message(message["content"], message["metadata"])
+                reply = self.paths["agent_mailbox"] / path.name
+                reply.write_text(json.dumps({
+                    "agent_id": message["agent_id"],
+                    "task_id": message["task_id"],
+                    "type": "response",
+                    "status": "success",
+                    "data": {"task_id": message["task_id"]},
+                    "content": response["choices"][0]["message"]["content"],
+                    "timestamp": datetime.now().isoformat()
+                }))
+                mailbox_files.append(reply)
+                path.unlink()
+                return True
+
+            await _run_stage(stages["bridge"], outbox_files, bridge_op, max_concurrent)
+
+        daemon = ResponseLoopDaemon(component_config)
+        inbox_log = self.paths["bridge_inbox"] / "inbox.jsonl"
+        inbox_handler = BridgeInboxHandler(bridge, component_config)
+        inbox_handler.mailbox_root = self.paths["delivered"]
+
+        async def response_loop_op(path: Path) -> bool:
+            message = json.loads(path.read_text())
+            ok = await daemon._process_response_file(path)
+            inbox_handler.append_message(inbox_log, {
+                "recipient": message["agent_id"],
+                "task_id": message["task_id"],
+                "output": message["content"],
+                "sender": "load-harness"
+            })
+            return ok
+
+        await _run_stage(stages["response_loop"], mailbox_files, response_loop_op, max_concurrent)
+
+        # The inbox consumes in batches; attribute batch time evenly per message
+        batch_size = self.processing.get("batch_size", 100)
+        batches = list(range(0, len(mailbox_files), batch_size))
+
+        async def inbox_op(_: int) -> bool:
+            return await inbox_handler.process_file(inbox_log)
+
+        inbox_stage = StageResult("inbox_batches")
+        await _run_stage(inbox_stage, batches, inbox_op, 1)
+        per_message_ms = [
+            ms / batch_size for ms in inbox_stage.latencies_ms for _ in range(batch_size)
+        ][:len(mailbox_files)]
+        stages["inbox"].latencies_ms = per_message_ms
+        stages["inbox"].errors = inbox_stage.errors
+        stages["inbox"].wall_seconds = inbox_stage.wall_seconds
+        stages["inbox"].peak_memory_bytes = inbox_stage.peak_memory_bytes
+
+        summaries = {name: stage.summary(self.thresholds) for name, stage in stages.items()}
+        total_wall = sum(stage.wall_seconds for stage in stages.values())
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": _git_revision(),
+            "workload": {
+                "agents": agents,
+                "messages_per_agent": messages_per_agent,
+                "max_concurrent": max_concurrent,
+                "fake_server": {
+                    "latency": self.load.get("latency", {}),
+                    "error_rate": self.load.get("error_rate", 0.0),
+                    "rate_limit_rate": self.load.get("rate_limit_rate", 0.0)
+                }
+            },
+            "thresholds": self.thresholds,
+            "stages": summaries,
+            "end_to_end": {
+                "messages": len(outbox_files),
+                "wall_seconds": round(total_wall, 4),
+                "messages_per_sec": round(len(outbox_files) / total_wall, 2) if total_wall else 0.0
+            },
+            "server": dict(self.server.stats),
+            "passed": all(summary["passed"] for summary in summaries.values())
+        }
+
+
+def _git_revision() -> Optional[str]:
+    """Return the current git revision, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def diff_results(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Compute per-stage relative changes against a baseline run.
+
+    Args:
+        current: Results of this run
+        baseline: Results of a previous run
+
+    Returns:
+        Mapping of stage -> metric -> percent change
+    """
+    metrics = ("ops_per_sec", "p50_ms", "p95_ms", "p99_ms", "memory_per_op_mb")
+    diff: Dict[str, Dict[str, float]] = {}
+    for stage, summary in current.get("stages", {}).items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        diff[stage] = {}
+        for metric in metrics:
+            before = previous.get(metric, 0)
+            after = summary.get(metric, 0)
+            diff[stage][metric] = round((after - before) / before * 100, 1) if before else 0.0
+    return diff
+
+
+def load_config(path: Path = CONFIG_PATH) -> Dict[str, Any]:
+    """Load the benchmark configuration."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bridge end-to-end load test")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH)
+    parser.add_argument("--agents", type=int)
+    parser.add_argument("--messages", type=int, help="Messages per agent")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Previous results JSON to diff against")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    load = config.get("load_test", {})
+    agents = args.agents or load.get("agents", 8)
+    messages = args.messages or load.get("messages_per_agent", 25)
+
+    with tempfile.TemporaryDirectory(prefix="bridge_load_") as workdir:
+        harness = BridgeLoadHarness(config, Path(workdir))
+        results = asyncio.run(harness.run(agents, messages))
+
+    if args.baseline and args.baseline.exists():
+        results["diff_vs_baseline"] = diff_results(results, json.loads(args.baseline.read_text()))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output)
+    print(output)
+    return 0 if results["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Fake LLM Server
+-------------
+Local chat-completions endpoint for bridge load tests.
+
+Serves ``POST /v1/chat/completions`` in the OpenAI response shape with a
+configurable latency distribution, error rate and optional SSE streaming,
+so the real ChatGPTBridge can be driven without network access or cost.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+
+class LatencyModel:
+    """Samples simulated upstream latency in seconds.
+
+    Supported distributions are ``fixed`` (``mean_ms``), ``uniform``
+    (``min_ms``..``max_ms``) and ``lognormal`` (``mean_ms`` with ``sigma``).
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, seed: Optional[int] = None):
+        self.config = config or {}
+        self.distribution = self.config.get("distribution", "fixed")
+        self._random = random.Random(seed)
+
+    def sample(self) -> float:
+        """Sample a latency in seconds."""
+        if self.distribution == "uniform":
+            low = self.config.get("min_ms", 5)
+            high = self.config.get("max_ms", 50)
+            return self._random.uniform(low, high) / 1000
+        if self.distribution == "lognormal":
+            mean = max(self.config.get("mean_ms", 20), 0.001)
+            sigma = self.config.get("sigma", 0.5)
+            # Parameterize so that the distribution mean equals mean_ms
+            mu = math.log(mean) - sigma ** 2 / 2
+            return self._random.lognormvariate(mu, sigma) / 1000
+        return self.config.get("mean_ms", 10) / 1000
+
+
+class FakeLLMServer:
+    """Minimal chat-completions server for load testing."""
+
+    def __init__(
+        self,
+        latency: Optional[Dict[str, Any]] = None,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None
+    ):
+        """Initialize the fake server.
+
+        Args:
+            latency: Latency model configuration
+            error_rate: Fraction of requests answered with HTTP 500
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            seed: Optional random seed for reproducible runs
+        """
+        self.latency = LatencyModel(latency, seed)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "streamed": 0}
+
+    @property
+    def url(self) -> str:
+        """Chat-completions URL of the running server."""
+        return f"http://{self.host}:{self.port}/v1/chat/completions"
+
+    async def start(self) -> None:
+        """Start serving."""
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._handle_completion)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the port actually bound when port=0
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeLLMServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    async def _handle_completion(self, request: web.Request) -> web.StreamResponse:
+        """Answer a chat-completion request."""
+        self.stats["requests"] += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency.sample())
+
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                status=429,
+                headers={"Retry-After": "1"}
+            )
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response(
+                {"error": {"message": "Simulated server error", "type": "server_error"}},
+                status=500
+            )
+
+        content = self._answer(body.get("messages", []))
+        if body.get("stream"):
+            self.stats["streamed"] += 1
+            return await self._stream(request, body, content)
+
+        prompt_tokens = sum(len(m.get("content", "").split()) for m in body.get("messages", []))
+        completion_tokens = len(content.split())
+        return web.json_response({
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-model"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    async def _stream(self, request: web.Request, body: Dict[str, Any], content: str) -> web.StreamResponse:
+        """Stream an answer as server-sent events, one word per chunk."""
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for word in content.split(" "):
+            chunk = {
+                "object": "chat.completion.chunk",
+                "model": body.get("model", "fake-model"),
+                "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}]
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def _answer(self, messages: Any) -> str:
+        """Build a deterministic answer echoing the last user message."""
+        user = next(
+            (m.get("content", "") for m in reversed(messages) if m.get("role") == "user"),
+            ""
+        )
+        return f"Acknowledged: {user[:200]}"
@@ -0,0 +1,60 @@
+"""Tests for the bridge load-test harness and fake LLM server."""
+
+import aiohttp
+import pytest
+
+from .bridge_load_harness import BridgeLoadHarness, diff_results, load_config, percentile
+from .fake_llm_server import FakeLLMServer
+
+
+def test_percentile_interpolates():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == pytest.approx(50.5)
+    assert percentile(samples, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
+
+
+def test_diff_results_reports_percent_change():
+    baseline = {"stages": {"bridge": {"ops_per_sec": 100.0, "p95_ms": 10.0}}}
+    current = {"stages": {"bridge": {"ops_per_sec": 120.0, "p95_ms": 8.0}}}
+    diff = diff_results(current, baseline)
+    assert diff["bridge"]["ops_per_sec"] == 20.0
+    assert diff["bridge"]["p95_ms"] == -20.0
+
+
+@pytest.mark.asyncio
+async def test_fake_server_answers_and_injects_errors():
+    async with FakeLLMServer(latency={"mean_ms": 1}, error_rate=1.0, seed=1) as failing:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(failing.url, json={"messages": []}) as response:
+                assert response.status == 500
+
+    async with FakeLLMServer(latency={"mean_ms": 1}) as server:
+        async with aiohttp.ClientSession() as session:
+            payload = {"model": "m", "messages": [{"role": "user", "content": "ping"}]}
+            async with session.post(server.url, json=payload) as response:
+                body = await response.json()
+    assert body["choices"][0]["message"]["content"] == "Acknowledged: ping"
+    assert server.stats["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_harness_runs_the_pipeline_end_to_end(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the response processor keeps metrics under ./data
+    config = load_config()
+    config["benchmark"]["warmup_iterations"] = 1
+    config["load_test"]["latency"] = {"mean_ms": 1}
+    harness = BridgeLoadHarness(config, tmp_path / "work")
+
+    results = await harness.run(agents=1, messages_per_agent=2)
+
+    stages = results["stages"]
+    assert {name: (stage["ops"], stage["errors"]) for name, stage in stages.items()} == {
+        "bridge": (2, 0), "response_loop": (2, 0), "inbox": (2, 0)
+    }
+    assert results["end_to_end"]["messages"] == 2
+    assert results["server"]["requests"] == 3  # warm-up plus one per message
+    assert not list(harness.paths["bridge_outbox"].iterdir())
+    assert len(list(harness.paths["archive"].glob("Agent-1_*.json"))) == 2  # daemon archived both
+    delivered = harness.paths["delivered"] / "agent-Agent-1" / "response.json"
+    assert delivered.exists()
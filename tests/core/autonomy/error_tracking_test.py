@@ -0,0 +1,51 @@
+"""Tests for windowed error tracking and the failure vault."""
+
+from datetime import datetime, timedelta
+
+from dreamos.core.autonomy.error_tracking import ErrorSeverity, ErrorTracker, FailureVault, TrackedError
+
+
+def _error(agent_id, severity=ErrorSeverity.MEDIUM, error_type="base_error", age=0):
+    return TrackedError(
+        timestamp=datetime.now() - timedelta(seconds=age),
+        message="boom",
+        severity=severity,
+        agent_id=agent_id,
+        context={},
+        error_type=error_type
+    )
+
+
+def test_windowed_summary_counts_beyond_raw_retention(tmp_path):
+    tracker = ErrorTracker(max_errors=10, error_window=3600, failure_vault_path=str(tmp_path))
+    for _ in range(500):
+        tracker.record_error(_error("agent-1"))
+    tracker.record_error(_error("agent-2", ErrorSeverity.HIGH, "timeout"))
+    tracker.record_error(_error("agent-2", age=1800))
+
+    assert len(tracker.errors) == 10
+    summary = tracker.get_error_summary()
+    assert summary["total_errors"] == 502
+    assert summary["severities"] == {"MEDIUM": 501, "HIGH": 1}
+
+    recent = tracker.get_error_summary(agent_id="agent-2", window=600)
+    assert recent["total_errors"] == 1 and recent["error_types"] == {"timeout": 1}
+
+    tracker.clear_errors("agent-1")
+    assert tracker.get_error_summary()["total_errors"] == 2
+    assert tracker.get_error_summary(agent_id="agent-1")["total_errors"] == 0
+
+
+def test_failure_vault_appends_indexes_and_rotates(tmp_path):
+    tracker = ErrorTracker(failure_vault_path=str(tmp_path), vault_max_bytes=400, vault_max_files=3)
+    for i in range(12):
+        tracker.record_error(_error(f"agent-{i % 2}", ErrorSeverity.CRITICAL, f"type-{i % 3}"))
+
+    assert len(list(tmp_path.glob("archive_*.jsonl"))) <= 3
+    archived = tracker.get_archived_errors(agent_id="agent-0", error_type="type-0")
+    assert archived and all(e["agent_id"] == "agent-0" and e["error_type"] == "type-0" for e in archived)
+    assert len(tracker.get_critical_errors()) == 12
+
+    reopened = FailureVault(str(tmp_path), max_bytes=400, max_files=3)
+    assert reopened.counts() == tracker.failure_vault.counts()
+    assert reopened.query(limit=1) == tracker.get_archived_errors(limit=1)
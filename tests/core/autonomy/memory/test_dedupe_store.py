@@ -0,0 +1,57 @@
+"""Tests for the windowed dedupe store."""
+
+import time
+
+from dreamos.core.autonomy.memory.dedupe_store import BloomFilter, DedupeStore, _digest
+
+
+def test_membership_across_segments_and_restart(tmp_path):
+    store = DedupeStore(str(tmp_path), {"segment_size": 10})
+    for i in range(25):
+        assert store.add(f"hash-{i}")
+    assert not store.add("hash-3")
+    assert store.get_stats()["segments"] == 2
+    store.close()
+
+    reopened = DedupeStore(str(tmp_path), {"segment_size": 10})
+    assert len(reopened) == 25
+    assert all(f"hash-{i}" in reopened for i in range(25))
+    assert "hash-999" not in reopened
+    assert reopened.get_stats()["bloom_rejects"] > 0
+
+
+def test_torn_log_line_is_ignored(tmp_path):
+    store = DedupeStore(str(tmp_path))
+    store.add("kept")
+    store.close()
+    with open(tmp_path / "active.log", "a") as f:
+        f.write('{"h": "torn", "t"')
+
+    reopened = DedupeStore(str(tmp_path))
+    assert "kept" in reopened
+    assert "torn" not in reopened
+
+
+def test_count_and_time_windows(tmp_path):
+    store = DedupeStore(str(tmp_path), {"segment_size": 10, "max_entries": 20})
+    for i in range(40):
+        store.add(f"hash-{i}")
+    assert "hash-0" not in store
+    assert "hash-39" in store
+    assert len(store) <= 20
+
+    timed = DedupeStore(str(tmp_path / "ttl"), {"ttl_seconds": 0.05})
+    timed.add("old")
+    time.sleep(0.1)
+    assert "old" not in timed
+    assert timed.add("old")
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    digests = [_digest(str(i)) for i in range(1000)]
+    for digest in digests:
+        bloom.add(digest)
+    assert all(digest in bloom for digest in digests)
+    false_positives = sum(_digest(f"x{i}") in bloom for i in range(10000))
+    assert false_positives < 300
@@ -0,0 +1,119 @@
+"""Tests for the incremental duplicate index."""
+
+from dreamos.core.autonomy.duplicate_index import DuplicateIndex
+
+ORIGINAL = '''
+def load_items(path, limit):
+    """Load items."""
+    items = []
+    with open(path) as f:
+        for line in f:
+            items.append(line.strip())
+    return items[:limit]
+'''
+
+RENAMED_COPY = '''
+def read_entries(path, limit):
+    items = []
+    with open(path) as f:
+        for line in f:
+            items.append(line.strip())
+    return items[:limit]
+'''
+
+UNRELATED = '''
+def total(values, start):
+    result = start
+    for value in values:
+        result += value
+    return result
+'''
+
+
+def test_patched_file_checked_against_index(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "loader.py").write_text(ORIGINAL)
+    (tmp_path / "pkg" / "math_utils.py").write_text(UNRELATED)
+    (tmp_path / "patched.py").write_text(UNRELATED.replace("total", "other_total"))
+
+    index = DuplicateIndex(str(tmp_path))
+    assert index.is_stale()
+    index.build()
+    assert not index.is_stale()
+
+    # Unrelated until the patch introduces a renamed copy
+    (tmp_path / "patched.py").write_text(RENAMED_COPY)
+    assert index.is_stale()
+    duplicates = index.check_file("patched.py")
+    assert [(d["name"], d["duplicate_file"], d["similarity"]) for d in duplicates["functions"]] == [
+        ("read_entries", "pkg/loader.py", 1.0)
+    ]
+
+    # The index follows the file's new content
+    (tmp_path / "patched.py").write_text("def tiny():\n    return 1\n")
+    assert index.check_file("patched.py") == {}
+    assert index.check_file(str(tmp_path / "pkg" / "math_utils.py")) == {}
+
+
+def test_near_duplicate_found_by_signature(tmp_path):
+    (tmp_path / "a.py").write_text(ORIGINAL)
+    index = DuplicateIndex(str(tmp_path), {"similarity_threshold": 0.7})
+    index.build()
+    (tmp_path / "b.py").write_text(ORIGINAL.replace("line.strip()", "line.rstrip()"))
+    duplicates = index.check_file("b.py")
+    assert duplicates["functions"][0]["duplicate_file"] == "a.py"
+    assert duplicates["functions"][0]["similarity"] < 1.0
+
+
+def test_refresh_reindexes_only_changed_files(tmp_path):
+    (tmp_path / "a.py").write_text(ORIGINAL)
+    (tmp_path / "b.py").write_text(UNRELATED)
+    (tmp_path / "c.py").write_text(UNRELATED.replace("total", "c_total"))
+    index = DuplicateIndex(str(tmp_path))
+    index.build()
+
+    (tmp_path / "b.py").write_text(RENAMED_COPY)
+    (tmp_path / "c.py").unlink()
+    assert index.refresh() == 2
+    assert not index.is_stale()
+    assert index.refresh() == 0
+
+    # The refreshed b.py is a duplicate target; the deleted c.py is gone
+    (tmp_path / "d.py").write_text(RENAMED_COPY.replace("read_entries", "fetch") + UNRELATED)
+    duplicates = index.check_file("d.py")
+    assert sorted(d["duplicate_file"] for d in duplicates["functions"]) == ["a.py", "b.py"]
+
+
+def test_classes_compared_like_the_scanner(tmp_path):
+    (tmp_path / "a.py").write_text(
+        "class Store(Base):\n    def get(self):\n        return 1\n\n"
+        "    def put(self, v):\n        self.v = v\n"
+    )
+    index = DuplicateIndex(str(tmp_path))
+    index.build()
+
+    # Same methods and base, different bodies: 0.7 * 1.0 + 0.3 * 1.0
+    (tmp_path / "b.py").write_text(
+        "class Cache(Base):\n    def get(self):\n        return self.v\n\n"
+        "    def put(self, v):\n        self.items.append(v)\n"
+    )
+    assert index.check_file("b.py")["classes"][0]["duplicate_name"] == "Store"
+
+    # Same methods, other base: 0.7 falls below the 0.8 threshold
+    (tmp_path / "b.py").write_text((tmp_path / "b.py").read_text().replace("Base", "Other"))
+    assert "classes" not in index.check_file("b.py")
+
+
+def test_refresh_checks_only_given_paths(tmp_path):
+    (tmp_path / "a.py").write_text(ORIGINAL)
+    (tmp_path / "b.py").write_text(UNRELATED)
+    index = DuplicateIndex(str(tmp_path))
+    index.build()
+
+    (tmp_path / "a.py").write_text(UNRELATED.replace("total", "a_total"))
+    (tmp_path / "b.py").unlink()
+    assert index.refresh(["b.py"]) == 1
+    assert index.is_stale()
+    assert index.refresh([str(tmp_path / "a.py")]) == 1
+    assert not index.is_stale()
+    assert index.refresh(["a.py", "missing.py"]) == 0
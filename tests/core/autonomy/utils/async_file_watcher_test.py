@@ -0,0 +1,102 @@
+"""Tests for the async file watcher."""
+
+import asyncio
+import os
+
+from dreamos.core.autonomy.utils.async_file_watcher import AsyncFileWatcher, DirectorySnapshot
+
+
+def _touch(path, content="x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_snapshot_reports_created_modified_and_deleted(tmp_path):
+    _touch(tmp_path / "a.json")
+    _touch(tmp_path / "sub" / "b.json")
+    snapshot = DirectorySnapshot(tmp_path)
+
+    changed, deleted = snapshot.scan()
+    assert sorted(changed) == [str(tmp_path / "a.json"), str(tmp_path / "sub" / "b.json")]
+    assert snapshot.scan() == ([], [])
+
+    _touch(tmp_path / "sub" / "c.json")
+    (tmp_path / "a.json").unlink()
+    changed, deleted = snapshot.scan()
+    assert changed == [str(tmp_path / "sub" / "c.json")]
+    assert deleted == [str(tmp_path / "a.json")]
+
+    # In-place rewrites leave the directory mtime alone; a full scan sees them
+    target = tmp_path / "sub" / "b.json"
+    stat = os.stat(target)
+    target.write_text("rewritten")
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert snapshot.scan(full=True)[0] == [str(target)]
+
+
+def test_snapshot_restart_only_reports_new_files(tmp_path):
+    watch_dir = tmp_path / "watch"
+    _touch(watch_dir / "old.json")
+    snapshot_path = tmp_path / "snapshot.json"
+
+    async def run():
+        watcher = AsyncFileWatcher(str(watch_dir), backend="poll", snapshot_path=str(snapshot_path))
+        assert await watcher.check_for_changes() == [str(watch_dir / "old.json")]
+        await watcher.stop()
+
+        _touch(watch_dir / "new.json")
+        restarted = AsyncFileWatcher(str(watch_dir), backend="poll", snapshot_path=str(snapshot_path))
+        changed = await restarted.check_for_changes()
+        assert restarted.watched_files == {str(watch_dir / "old.json"), str(watch_dir / "new.json")}
+        await restarted.stop()
+        return changed
+
+    assert asyncio.run(run()) == [str(watch_dir / "new.json")]
+
+
+def test_watchdog_restart_only_reports_changes_since_stop(tmp_path):
+    watch_dir = tmp_path / "watch"
+    _touch(watch_dir / "old.json")
+    snapshot_path = tmp_path / "snapshot.json"
+
+    async def next_batch(watcher):
+        for _ in range(100):
+            batch = await watcher.check_for_changes()
+            if batch:
+                return batch
+            await asyncio.sleep(0.05)
+        return []
+
+    async def run():
+        watcher = AsyncFileWatcher(str(watch_dir), backend="watchdog", snapshot_path=str(snapshot_path))
+        assert await watcher.check_for_changes() == [str(watch_dir / "old.json")]
+        assert watcher.active_backend == "watchdog"
+        _touch(watch_dir / "during.json")
+        assert await next_batch(watcher) == [str(watch_dir / "during.json")]
+        await watcher.stop()
+
+        _touch(watch_dir / "after.json")
+        restarted = AsyncFileWatcher(str(watch_dir), backend="watchdog", snapshot_path=str(snapshot_path))
+        changed = await restarted.check_for_changes()
+        await restarted.stop()
+        return changed
+
+    assert asyncio.run(run()) == [str(watch_dir / "after.json")]
+
+
+def test_changes_yields_coalesced_batches(tmp_path):
+    async def run():
+        watcher = AsyncFileWatcher(str(tmp_path), poll_interval=0.05)
+        batches = watcher.changes()
+        await watcher.start()
+        for i in range(5):
+            _touch(tmp_path / f"{i}.json", "first")
+            _touch(tmp_path / f"{i}.json", "second")
+        batch = await asyncio.wait_for(batches.__anext__(), timeout=5)
+        while len(batch) < 5:
+            batch += await asyncio.wait_for(batches.__anext__(), timeout=5)
+        await watcher.stop()
+        return batch
+
+    batch = asyncio.run(run())
+    assert sorted(batch) == [str(tmp_path / f"{i}.json") for i in range(5)]
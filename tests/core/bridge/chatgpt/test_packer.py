@@ -0,0 +1,75 @@
+"""Tests for packing compatible prompts into one ChatGPT request."""
+
+import asyncio
+import json
+
+import pytest
+
+from dreamos.core.bridge.chatgpt.packer import RequestPacker
+
+
+def _completion(content):
+    return {"id": "resp", "model": "test-model", "choices": [{"message": {"role": "assistant", "content": content}}]}
+
+
+class FakeChat:
+    """Answers packed requests with a JSON object and single requests verbatim."""
+
+    def __init__(self, drop_ids=()):
+        self.calls = []
+        self.drop_ids = set(drop_ids)
+
+    async def __call__(self, messages, temperature=0.7, max_tokens=1000):
+        self.calls.append(messages)
+        user = messages[-1]["content"]
+        try:
+            parts = json.loads(user)
+        except ValueError:
+            return _completion(f"answer:{user}")
+        responses = [
+            {"id": p["id"], "content": f"answer:{p['prompt']}"}
+            for p in parts if p["id"] not in self.drop_ids
+        ]
+        return _completion(json.dumps({"responses": responses}))
+
+
+def _messages(text):
+    return [{"role": "system", "content": "be brief"}, {"role": "user", "content": text}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_prompts_share_one_request():
+    chat = FakeChat()
+    packer = RequestPacker(chat, "test-model", {"window_seconds": 0.01})
+
+    results = await asyncio.gather(*[packer.submit(_messages(f"p{i}")) for i in range(4)])
+
+    assert len(chat.calls) == 1
+    assert [r["choices"][0]["message"]["content"] for r in results] == [f"answer:p{i}" for i in range(4)]
+    assert packer.stats["requests_saved"] == 3
+
+
+@pytest.mark.asyncio
+async def test_unparsed_part_falls_back_to_single_request():
+    chat = FakeChat(drop_ids={1})
+    packer = RequestPacker(chat, "test-model", {"window_seconds": 0.01})
+
+    results = await asyncio.gather(*[packer.submit(_messages(f"p{i}")) for i in range(3)])
+
+    assert [r["choices"][0]["message"]["content"] for r in results] == ["answer:p0", "answer:p1", "answer:p2"]
+    assert len(chat.calls) == 2
+    assert packer.stats["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_different_profiles_are_not_packed_together():
+    chat = FakeChat()
+    packer = RequestPacker(chat, "test-model", {"window_seconds": 0.01})
+
+    await asyncio.gather(
+        packer.submit(_messages("a"), profile="status"),
+        packer.submit(_messages("b"), profile="format")
+    )
+
+    assert len(chat.calls) == 2
+    assert packer.stats["requests_saved"] == 0
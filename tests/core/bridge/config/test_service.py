@@ -0,0 +1,100 @@
+"""Tests for the cached bridge config service."""
+
+import json
+import os
+
+import pytest
+
+from dreamos.core.bridge.config.loader import BridgeMode
+from dreamos.core.bridge.config.service import BridgeConfigService
+
+
+BASE_CONFIG = {
+    "paths": {"base": "data", "archive": "data/archive", "failed": "data/failed"},
+    "bridge": {"api_key": "test", "model": "gpt-4"},
+    "handlers": {},
+    "processors": {},
+    "monitoring": {},
+    "logging": {}
+}
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+def _touch_forward(path):
+    # Guarantee a new mtime even on filesystems with coarse timestamps
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def service(tmp_path):
+    _write(tmp_path / "config.json", BASE_CONFIG)
+    svc = BridgeConfigService(tmp_path / "config.json", BridgeMode.TEST, check_interval=0, watch=False)
+    yield svc
+    svc.close()
+
+
+def test_snapshots_are_cached_and_immutable(service):
+    first = service.get("agent-1")
+    second = service.get("agent-1")
+
+    assert first is second
+    assert service.stats["misses"] == 1
+    with pytest.raises(TypeError):
+        first["bridge"]["model"] = "other"
+
+
+def test_agent_override_change_triggers_reload(service, tmp_path):
+    agent_path = tmp_path / "agents" / "agent-1.json"
+    assert service.get("agent-1")["bridge"]["model"] == "gpt-4"
+
+    reloads = []
+    service.subscribe(lambda agent_id, snapshot: reloads.append((agent_id, snapshot)))
+
+    _write(agent_path, {"bridge": {"model": "gpt-4o"}})
+    _touch_forward(agent_path)
+
+    assert service.get("agent-1")["bridge"]["model"] == "gpt-4o"
+    assert [agent_id for agent_id, _ in reloads] == ["agent-1"]
+
+
+def test_load_config_returns_mutable_copy(service):
+    config = service.load_config()
+    config["bridge"]["model"] = "changed"
+
+    assert service.get()["bridge"]["model"] == "gpt-4"
+
+
+def test_failed_reload_keeps_previous_snapshot(service, tmp_path):
+    base_path = tmp_path / "config.json"
+    first = service.get()
+
+    base_path.write_text("{not json")
+    _touch_forward(base_path)
+    assert service.get() is first
+    assert service.stats["failed_reloads"] == 1
+
+    # Not retried until the files change again
+    assert service.get() is first
+    assert service.stats["failed_reloads"] == 1
+
+    _write(base_path, {**BASE_CONFIG, "bridge": {"api_key": "test", "model": "gpt-4o"}})
+    _touch_forward(base_path)
+    assert service.get()["bridge"]["model"] == "gpt-4o"
+
+
+def test_module_load_config_uses_shared_service(tmp_path):
+    from dreamos.core.bridge.config import loader
+
+    base_path = tmp_path / "config.json"
+    _write(base_path, BASE_CONFIG)
+    first = loader.load_config(base_path, BridgeMode.TEST)
+    first["bridge"]["model"] = "changed"
+
+    assert loader.load_config(str(base_path), BridgeMode.TEST)["bridge"]["model"] == "gpt-4"
+    service = loader._services[(str(base_path.resolve()), BridgeMode.TEST)]
+    assert service.stats["misses"] == 1
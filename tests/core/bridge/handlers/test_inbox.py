@@ -0,0 +1,100 @@
+"""Tests for BridgeInboxHandler.process_file over JSONL and legacy inbox files."""
+
+import json
+
+import pytest
+
+from dreamos.core.bridge.handlers.inbox import BridgeInboxHandler
+
+
+def _message(task_id, recipient="1"):
+    return {"recipient": recipient, "task_id": task_id, "output": f"output {task_id}"}
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # mailboxes are written relative to the working directory
+    return BridgeInboxHandler(None, {"paths": {
+        "bridge_inbox": str(tmp_path / "inbox"),
+        "archive": str(tmp_path / "archive"),
+        "failed": str(tmp_path / "failed"),
+    }})
+
+
+def _delivered(tmp_path, agent="1"):
+    response = tmp_path / "agent_tools" / "mailbox" / f"agent-{agent}" / "response.json"
+    return json.loads(response.read_text())["content"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_process_file_consumes_only_new_jsonl_messages(handler, tmp_path):
+    inbox = tmp_path / "inbox" / "messages.jsonl"
+    handler.append_message(inbox, _message("t1"))
+    handler.append_message(inbox, _message("t2"))
+
+    assert await handler.process_file(inbox)
+    assert _delivered(tmp_path) == "t2"
+    log = handler._get_log(inbox)
+    assert log.committed_offset() == inbox.stat().st_size
+
+    handler.append_message(inbox, _message("t3"))
+    assert await handler.process_file(inbox)
+    assert _delivered(tmp_path) == "t3"
+    assert log.read_new()[0] == []
+
+
+@pytest.mark.asyncio
+async def test_process_file_reads_legacy_pretty_printed_inbox(handler, tmp_path):
+    inbox = tmp_path / "inbox" / "legacy.json"
+    inbox.parent.mkdir(parents=True, exist_ok=True)
+    inbox.write_text(json.dumps([_message("old-1"), _message("old-2", recipient="2")], indent=2))
+
+    assert await handler.process_file(inbox)
+    assert _delivered(tmp_path, "1") == "old-1"
+    assert _delivered(tmp_path, "2") == "old-2"
+    assert handler._get_log(inbox).committed_offset() == inbox.stat().st_size
+
+    # New messages appended after the legacy document are still picked up
+    handler.append_message(inbox, _message("new-1"))
+    assert await handler.process_file(inbox)
+    assert _delivered(tmp_path, "1") == "new-1"
+
+
+@pytest.mark.asyncio
+async def test_undeliverable_message_is_dead_lettered_not_replayed(handler, tmp_path):
+    inbox = tmp_path / "inbox" / "messages.jsonl"
+    handler.append_message(inbox, _message("t1"))
+    handler.append_message(inbox, {"recipient": "1"})  # no task_id or output
+    handler.append_message(inbox, _message("t2", recipient="2"))
+
+    assert await handler.process_file(inbox)
+    assert _delivered(tmp_path, "1") == "t1"
+    assert _delivered(tmp_path, "2") == "t2"
+    assert handler._get_log(inbox).committed_offset() == inbox.stat().st_size
+
+    dead = (tmp_path / "failed" / "messages.jsonl.dead.jsonl").read_text().splitlines()
+    assert [json.loads(line)["message"] for line in dead] == [{"recipient": "1"}]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_commits_past_handled_messages(handler, tmp_path, monkeypatch):
+    inbox = tmp_path / "inbox" / "messages.jsonl"
+    for task_id in ("t1", "t2", "t3"):
+        handler.append_message(inbox, _message(task_id))
+
+    delivered = []
+    original = handler.process
+
+    async def crash_on_t2(message):
+        if message["task_id"] == "t2":
+            raise RuntimeError("mailbox unavailable")
+        delivered.append(message["task_id"])
+        return await original(message)
+
+    monkeypatch.setattr(handler, "process", crash_on_t2)
+    assert not await handler.process_file(inbox)
+    monkeypatch.setattr(handler, "process", original)
+
+    messages, _ = handler._get_log(inbox).read_new()
+    assert delivered == ["t1"]
+    assert [m["task_id"] for m in messages] == ["t2", "t3"]
@@ -0,0 +1,70 @@
+"""Tests for the offset-tracked JSONL inbox log."""
+
+from dreamos.core.bridge.handlers.inbox_log import InboxLog
+
+
+def test_read_new_only_returns_uncommitted_messages(tmp_path):
+    log = InboxLog(tmp_path / "inbox.jsonl")
+    log.append({"id": 1})
+    log.append({"id": 2})
+
+    messages, offset = log.read_new()
+    assert [m["id"] for m in messages] == [1, 2]
+
+    # Nothing is consumed until the offset is committed
+    assert log.read_new()[0] == messages
+    log.commit(offset)
+
+    log.append({"id": 3})
+    messages, _ = log.read_new()
+    assert [m["id"] for m in messages] == [3]
+
+
+def test_partial_trailing_line_is_left_for_next_read(tmp_path):
+    log = InboxLog(tmp_path / "inbox.jsonl")
+    log.append({"id": 1})
+    with open(log.log_path, "a") as f:
+        f.write('{"id": 2')
+
+    messages, offset = log.read_new()
+    assert [m["id"] for m in messages] == [1]
+    log.commit(offset)
+
+    with open(log.log_path, "a") as f:
+        f.write("}\n")
+    messages, _ = log.read_new()
+    assert [m["id"] for m in messages] == [2]
+
+
+def test_compaction_drops_consumed_prefix(tmp_path):
+    log = InboxLog(tmp_path / "inbox.jsonl", compact_threshold=1)
+    for i in range(5):
+        log.append({"id": i})
+
+    messages, offset = log.read_new(max_messages=3)
+    log.commit(offset)
+    assert log.needs_compaction()
+
+    assert log.compact() == offset
+    assert log.committed_offset() == 0
+
+    messages, _ = log.read_new()
+    assert [m["id"] for m in messages] == [3, 4]
+
+
+def test_stale_cursor_after_compaction_restarts_at_zero(tmp_path):
+    log = InboxLog(tmp_path / "inbox.jsonl")
+    log.append({"id": 1})
+    log.append({"id": 2})
+    _, offset = log.read_new(max_messages=1)
+    log.commit(offset)
+
+    # Simulate a crash after the log was replaced but before the cursor
+    # was rewritten: the cursor still refers to the old inode.
+    tail = log.log_path.read_bytes()[offset:]
+    replacement = log.log_path.with_name("replacement")
+    replacement.write_bytes(tail)
+    replacement.replace(log.log_path)
+
+    messages, _ = log.read_new()
+    assert [m["id"] for m in messages] == [2]
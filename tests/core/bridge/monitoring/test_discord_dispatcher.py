@@ -0,0 +1,114 @@
+"""Tests for the digesting Discord notification dispatcher against a local webhook stub."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from dreamos.core.bridge.monitoring.discord import EventType, NotificationDispatcher
+
+
+class WebhookStub:
+    """Local webhook endpoint that can rate-limit the first N posts."""
+
+    def __init__(self, rate_limit_first: int = 0):
+        self.rate_limit_first = rate_limit_first
+        self.payloads = []
+        self.attempts = 0
+        self._runner = None
+        self.url = None
+
+    async def _handle(self, request):
+        self.attempts += 1
+        if self.attempts <= self.rate_limit_first:
+            return web.json_response(
+                {"message": "You are being rate limited.", "retry_after": 0.05},
+                status=429,
+                headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.05"}
+            )
+        self.payloads.append(await request.json())
+        return web.Response(status=204)
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/webhook", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/webhook"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_events_are_coalesced_into_one_digest_per_type():
+    async with WebhookStub() as stub, aiohttp.ClientSession() as session:
+        dispatcher = NotificationDispatcher(stub.url, session, {"window_seconds": 0.1})
+        await dispatcher.start()
+
+        for i in range(20):
+            dispatcher.notify(EventType.SUCCESS, f"Processed response {i}")
+        for i in range(3):
+            dispatcher.notify(EventType.ERROR, f"Failed response {i}")
+
+        await asyncio.sleep(0.3)
+        await dispatcher.stop()
+
+    assert len(stub.payloads) == 1
+    embeds = stub.payloads[0]["embeds"]
+    assert [e["title"] for e in embeds] == ["SUCCESS", "ERROR"]
+    assert embeds[0]["description"].startswith("20 success events")
+    assert dispatcher.stats["coalesced"] == 21
+
+
+@pytest.mark.asyncio
+async def test_critical_events_bypass_the_digest_window():
+    async with WebhookStub() as stub, aiohttp.ClientSession() as session:
+        dispatcher = NotificationDispatcher(stub.url, session, {"window_seconds": 60})
+        await dispatcher.start()
+
+        dispatcher.notify(EventType.ERROR, "Bridge down", critical=True)
+        await asyncio.sleep(0.2)
+
+        assert len(stub.payloads) == 1
+        assert stub.payloads[0]["embeds"][0]["description"] == "Bridge down"
+        await dispatcher.stop(flush=False)
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_the_open_digest_window():
+    async with WebhookStub() as stub, aiohttp.ClientSession() as session:
+        dispatcher = NotificationDispatcher(stub.url, session, {"window_seconds": 60})
+        await dispatcher.start()
+
+        for i in range(5):
+            dispatcher.notify(EventType.SUCCESS, f"Processed response {i}")
+        await asyncio.sleep(0.05)  # the worker has taken them into its window
+        assert dispatcher.queue_depth == 0
+        await dispatcher.stop(flush=True)
+
+    assert len(stub.payloads) == 1
+    assert stub.payloads[0]["embeds"][0]["description"].startswith("5 success events")
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_posts_are_retried_after_reset():
+    async with WebhookStub(rate_limit_first=2) as stub, aiohttp.ClientSession() as session:
+        dispatcher = NotificationDispatcher(stub.url, session, {"window_seconds": 0})
+        assert await dispatcher._post({"content": "hello"})
+
+    assert stub.attempts == 3
+    assert stub.payloads == [{"content": "hello"}]
+    assert dispatcher.stats["rate_limited"] == 2
+
+
+def test_notify_drops_when_queue_is_full():
+    dispatcher = NotificationDispatcher("http://unused", None, {"max_queue": 1})
+    assert dispatcher.notify(EventType.INFO, "first")
+    assert not dispatcher.notify(EventType.INFO, "second")
+    assert dispatcher.stats["dropped"] == 1
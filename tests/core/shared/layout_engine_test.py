@@ -0,0 +1,90 @@
+"""Tests for the cached, sweep-line validated layout engine."""
+
+import itertools
+import json
+import random
+
+from dreamos.core.shared.coordinate_utils import regions_overlap
+from dreamos.core.shared.layout_engine import LayoutEngine, Monitor, find_overlaps
+
+
+def _layout(x, y, width=300, height=200):
+    return {
+        "initial_spot": {"x": x + 10, "y": y + 10},
+        "input_box": {"x": x + 20, "y": y + height - 20},
+        "copy_button": {"x": x + width - 20, "y": y + 30},
+        "response_region": {
+            "top_left": {"x": x, "y": y},
+            "bottom_right": {"x": x + width, "y": y + height},
+        },
+        "window_title": f"Cursor {x},{y}",
+    }
+
+
+class Topology:
+    def __init__(self, *monitors):
+        self.monitors = monitors
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.monitors
+
+
+def test_sweep_matches_pairwise_overlaps():
+    rng = random.Random(3)
+    regions = []
+    for owner in range(80):
+        x, y = rng.randrange(0, 3000), rng.randrange(0, 2000)
+        rect = (x, y, x + rng.randrange(10, 300), y + rng.randrange(10, 300))
+        regions.append((rect, owner % 60))
+    pairwise = [
+        (i, j) for i, j in itertools.combinations(range(len(regions)), 2)
+        if regions[i][1] != regions[j][1] and regions_overlap(
+            {"top_left": {"x": regions[i][0][0], "y": regions[i][0][1]},
+             "bottom_right": {"x": regions[i][0][2], "y": regions[i][0][3]}},
+            {"top_left": {"x": regions[j][0][0], "y": regions[j][0][1]},
+             "bottom_right": {"x": regions[j][0][2], "y": regions[j][0][3]}},
+        )
+    ]
+    assert pairwise and find_overlaps(regions) == pairwise
+
+
+def test_layouts_are_transformed_once_and_validated_together():
+    topology = Topology(Monitor(0, 0, 3840, 2160), Monitor(-1920, 0, 1920, 1080))
+    engine = LayoutEngine(source_resolution=(1920, 1080), monitors=topology, clock=lambda: 0.0)
+    engine.load({
+        "Agent-1": _layout(0, 0),
+        "Agent-2": _layout(400, 0),
+        "Agent-3": _layout(250, 100),  # overlaps Agent-1 and Agent-2
+    })
+
+    assert engine.get("Agent-2")["input_box"] == {"x": 840, "y": 360}
+    assert engine.get("Agent-2")["window_title"] == "Cursor 400,0"
+    assert engine.recorded("Agent-2")["input_box"] == {"x": 420, "y": 180}
+    assert engine.region("Agent-1") == (0, 0, 600, 400)
+    assert engine.agent_at(100, 100) == "Agent-1" and engine.agent_at(550, 300) is None
+
+    issues = engine.validate()
+    assert {(i.agent_id, i.other[0]) for i in issues} == {("Agent-1", "Agent-3"), ("Agent-2", "Agent-3")}
+    # Nothing was re-read or rebuilt for any of those queries
+    assert engine.stats["rebuilds"] == 1 and topology.calls == 1
+
+
+def test_cache_is_invalidated_by_topology_and_config_changes(tmp_path):
+    config = tmp_path / "coords.json"
+    config.write_text(json.dumps({"Agent-1": _layout(100, 100)}))
+    now = [0.0]
+    topology = Topology(Monitor(0, 0, 1920, 1080))
+    engine = LayoutEngine(str(config), monitors=topology, check_interval=1.0, clock=lambda: now[0])
+    assert engine.point("Agent-1", "input_box") == (120, 280)
+
+    topology.monitors = (Monitor(1920, 0, 1920, 1080),)  # primary moved
+    assert engine.point("Agent-1", "input_box") == (120, 280)  # within check interval
+    now[0] = 1.5
+    assert engine.point("Agent-1", "input_box") == (2040, 280)
+
+    config.write_text(json.dumps({"Agent-1": _layout(100, 100), "Agent-2": _layout(700, 100)}))
+    engine.invalidate()
+    assert engine.agents() == ["Agent-1", "Agent-2"]
+    assert engine.stats["topology_changes"] == 1 and engine.stats["config_reloads"] == 2
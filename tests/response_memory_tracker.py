@@ -13,6 +13,7 @@ from datetime import datetime
 from typing import Dict, Any
 
 from ..response_memory_tracker import ResponseMemoryTracker
+from ..dedupe_store import DedupeStore
 
 @pytest.fixture
 def temp_memory_file():
@@ -39,7 +40,7 @@ def sample_message() -> Dict[str, Any]:
 def test_initialization(memory_tracker, temp_memory_file):
     """Test memory tracker initialization."""
     assert memory_tracker.memory_path == Path(temp_memory_file)
-    assert isinstance(memory_tracker.processed_hashes, set)
+    assert isinstance(memory_tracker.processed_hashes, DedupeStore)
     assert len(memory_tracker.processed_hashes) == 0
 
 def test_track_processing(memory_tracker, sample_message):
@@ -52,13 +53,12 @@ def test_track_processing(memory_tracker, sample_message):
     # Verify hash was added
     assert message_hash in memory_tracker.processed_hashes
     
-    # Verify file was created and contains correct data
-    with open(memory_tracker.memory_path, 'r') as f:
-        data = json.load(f)
-        assert "hashes" in data
-        assert message_hash in data["hashes"]
-        assert "metadata" in data
-        assert data["metadata"] == sample_message
+    # Verify the hash and metadata were appended to the store log
+    assert memory_tracker.last_metadata == sample_message
+    with open(memory_tracker.processed_hashes.log_path, 'r') as f:
+        record = json.loads(f.readlines()[-1])
+        assert record["h"] == message_hash
+        assert record["m"] == sample_message
 
 def test_is_processed(memory_tracker):
     """Test duplicate detection."""
@@ -96,7 +96,7 @@ def test_invalid_file_handling():
         
         # Should handle gracefully
         tracker = ResponseMemoryTracker(f.name)
-        assert isinstance(tracker.processed_hashes, set)
+        assert isinstance(tracker.processed_hashes, DedupeStore)
         assert len(tracker.processed_hashes) == 0
 
 def test_get_stats(memory_tracker):
@@ -150,10 +150,9 @@ def test_metadata_persistence(memory_tracker, sample_message):
     new_tracker = ResponseMemoryTracker(str(memory_tracker.memory_path))
     
     # Verify metadata was persisted
-    with open(new_tracker.memory_path, 'r') as f:
-        data = json.load(f)
-        assert "metadata" in data
-        assert data["metadata"] == metadata
+    with open(new_tracker.processed_hashes.log_path, 'r') as f:
+        record = json.loads(f.readlines()[-1])
+        assert record["m"] == metadata
 
 def test_error_handling(memory_tracker):
     """Test error handling in memory operations."""